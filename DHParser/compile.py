@@ -38,7 +38,7 @@ from __future__ import annotations
 
 import functools
 import os
-from typing import Any, Optional, Tuple, List, Set, Dict, Union, Callable, NamedTuple
+from typing import Any, Optional, Tuple, List, Set, Dict, Union, Callable, NamedTuple, Iterator
 
 from DHParser.configuration import get_config_value
 from DHParser.preprocess import PreprocessorFunc, gen_neutral_srcmap_func
@@ -81,6 +81,9 @@ class CancelRequest(Exception):
     pass
 
 
+_visitor_names_cache = dict()  # type: Dict[type, Dict[str, str]]
+
+
 class Compiler:
     """
     Class Compiler is the abstract base class for compilers. Compiler
@@ -126,8 +129,11 @@ class Compiler:
     :ivar tree: The root of the abstract syntax tree.
     :ivar finalizers:  A stack of tuples (function, parameters) that will be
         called in reverse order after compilation.
-    :ivar method_dict: A cache that maps node-names to their respective
-        compile-methods.
+    :ivar method_dict: A table that maps node-names to their respective
+        compile-methods. Before compilation starts, it is filled with
+        the bound ``on_XXX``-methods of the compiler class by
+        :py:meth:`Compiler.__call__()`. For all other node-names it
+        serves as a cache.
     :ivar has_attribute_visitors:  A flag indicating that the class has
         attribute-visitor-methods which are named 'attr_ATTRIBUTENAME'
         and will be called if the currently processed node has one
@@ -150,11 +156,17 @@ class Compiler:
         error if there is an attempt to be compiled one and the same
         node a second time.
     :ivar _debug_already_compiled: A set of nodes that have already been compiled.
+    :ivar _fast_dispatch: A flag indicating that neither a cancel-query nor
+        attribute-visitors nor debugging need to be taken care of during
+        compilation, so that :py:meth:`Compiler.compile()` can pick
+        and call the compilation-methods directly from ``method_dict``.
+        The flag is set anew on each call of the compiler-object.
     """
 
     def __init__(self):
-        self.has_attribute_visitors: bool = any(field[0:5] == 'attr_' and callable(getattr(self, field))
-                                          for field in dir(self))
+        self.has_attribute_visitors: bool = any(
+            field[0:5] == 'attr_' and field != 'attr_visitor_name' and callable(getattr(self, field))
+            for field in dir(self))
         self.forbid_returning_None: bool = True
         self.cancel_query = None  # type: Optional[CancelQuery]
         self.reset()
@@ -171,6 +183,7 @@ class Compiler:
         self._debug_already_compiled = set()              # type: Set[Node]
         self.finalizers = []  # type: List[Tuple[Callable, Tuple]]
         self.method_dict = {}  # type: Dict[str, CompileMethod]
+        self._fast_dispatch = False
 
     def visitor_name(self, node_name: str) -> str:
         """
@@ -194,6 +207,45 @@ class Compiler:
             letters.append(ch)
         return 'on_' + ''.join(letters)
 
+    def _visitor_names(self) -> Dict[str, str]:
+        """
+        Returns a dictionary that maps all node-names for which the compiler
+        class defines a visitor-method to the name of this method, e.g.::
+
+            >>> class C(Compiler):
+            ...     def on_expression(self, node): return node
+            ...     def on_Text__(self, node): return node
+            >>> sorted(C()._visitor_names().items())
+            [(':Text', 'on_Text__'), ('Text__', 'on_Text__'), ('expression', 'on_expression')]
+
+        Visitor-methods with names that cannot be derived from a node-name
+        without ambiguity, e.g. ``on_212d2d``, are omitted and will be
+        looked up on demand by :py:meth:`Compiler.find_compilation_method()`.
+        The dictionary is computed only once for each compiler class.
+        """
+        cls = self.__class__
+        try:
+            return _visitor_names_cache[cls]
+        except KeyError:
+            pass
+        visitor_names = dict()  # type: Dict[str, str]
+        fallbacks = []  # type: List[Tuple[str, str]]
+        for method_name in dir(cls):
+            if method_name[:3] == 'on_' and callable(getattr(cls, method_name)):
+                name = method_name[3:]
+                candidates = [name]
+                if name[-2:] == '__':
+                    candidates.append(':' + name[:-2])
+                for candidate in candidates:
+                    if self.visitor_name(candidate) == method_name:
+                        visitor_names[candidate] = method_name
+                if name[:2] == '3a' and len(name) > 2:
+                    fallbacks.append((':' + name[2:], method_name))
+        for name, method_name in fallbacks:
+            visitor_names.setdefault(name, method_name)
+        _visitor_names_cache[cls] = visitor_names
+        return visitor_names
+
     def attr_visitor_name(self, attr_name: str) -> str:
         """
         Returns the visitor_method name for `attr_name`, e.g.::
@@ -262,7 +314,12 @@ class Compiler:
         self._dirty_flag = True
         self.cancel_query = cancel_query
         self.tree = root if isinstance(root, RootNode) else RootNode(root)
+        self.method_dict.update((name, getattr(self, method_name))
+                                for name, method_name in self._visitor_names().items())
         self.prepare(self.tree)
+        self._fast_dispatch = cancel_query is None and not self.has_attribute_visitors \
+            and not self._debug \
+            and self.__class__.find_compilation_method is Compiler.find_compilation_method
         try:
             result = self.compile(self.tree)
             while self.finalizers:
@@ -289,37 +346,65 @@ class Compiler:
     def fallback_compiler(self, node: Node) -> Any:
         """This is a generic compiler function that will be called on
         all those node types for which no compiler method `on_XXX` has
-        been defined."""
-        replacements = {}  # type: Dict[int, Node]
-        if node.children:
-            for child in node.children:
+        been defined.
+
+        Descendants that are compiled by the fallback compiler as well
+        are processed with an explicit stack rather than by recursive
+        calls of :py:meth:`Compiler.compile`, so that deeply nested trees
+        do not exceed Python's recursion limit."""
+        fallbacks = (Compiler.fallback_compiler, Compiler.wildcard)
+        stack = [(node, iter(node.children), {})]  # type: List[Tuple[Node, Iterator[Node], Dict[int, Node]]]
+        while stack:
+            parent, children, replacements = stack[-1]
+            for child in children:
+                if child._children and getattr(self.method_dict.get(child.name, None)
+                                               or self.find_compilation_method(child),
+                                               '__func__', None) in fallbacks:
+                    # same as self.compile(child), but without recursion
+                    if self._debug:
+                        assert child not in self._debug_already_compiled
+                        self._debug_already_compiled.add(child)
+                    if self.cancel_query is not None and self.cancel_query():
+                        self.tree.new_error(child, "Compilation stopped by cancel request!",
+                                            CANCELED)
+                        raise CancelRequest
+                    self.path.append(child)
+                    stack.append((child, iter(child.children), {}))
+                    break
                 nd = self.compile(child)
                 if id(nd) != id(child):
                     replacements[id(child)] = nd
                 if nd is not None and not isinstance(nd, Node):
-                    tn = node.name
+                    tn = parent.name
                     raise TypeError(
                         f'Fallback compiler for Node "{tn}" received a value of type '
                         f'`{type(nd)}` from child "{child.name}" instead of the required '
                         f'return type `Node`. Override method `fallback_compiler()` or '
                         f'add method `{self.visitor_name(tn)}(self, node)` in class '
                         f'`{self.__class__.__name__}` to avoid this error!')
-            if replacements:
-                # replace Nodes the identity of which has been changed during transformation
-                # and drop any returned None-results
-                result = []
-                for child in node.children:
-                    nd = replacements.get(id(child), child)
-                    if nd is not None and nd.name != EMPTY_PTYPE:
-                        result.append(nd)
-                node.result = tuple(result)
-        if self.has_attribute_visitors:
-            self.visit_attributes(node)
+            else:
+                stack.pop()
+                if replacements:
+                    # replace Nodes the identity of which has been changed during transformation
+                    # and drop any returned None-results
+                    result = []
+                    for child in parent.children:
+                        nd = replacements.get(id(child), child)
+                        if nd is not None and nd.name != EMPTY_PTYPE:
+                            result.append(nd)
+                    parent.result = tuple(result)
+                if self.has_attribute_visitors:
+                    self.visit_attributes(parent)
+                if stack:
+                    # the remaining steps of self.compile(parent)
+                    self.path.pop()
+                    if self.has_attribute_visitors:
+                        self.visit_attributes(parent)
         return node
 
     def find_compilation_method(self, node: Node) -> CompileMethod:
         def wildcard_or_fallback():
-            if self.wildcard != Compiler.wildcard:
+            if getattr(self.wildcard, '__func__', None) is not Compiler.wildcard:
                 return self.wildcard
             else:
                 return self.fallback_compiler
@@ -368,6 +453,18 @@ class Compiler:
         :returns: An object of any type (determined by the
             sub-class deriving from class Compile).
         """
+        if self._fast_dispatch and find_compilation_method is None:
+            try:
+                compiler = self.method_dict[node.name]
+            except KeyError:
+                compiler = self.find_compilation_method(node)
+            self.path.append(node)
+            result = compiler(node)
+            self.path.pop()
+            if result is None and self.forbid_returning_None:
+                raise self._returned_None_error(node)
+            return result
+
         if self._debug:
             assert node not in self._debug_already_compiled
             self._debug_already_compiled.add(node)
@@ -385,15 +482,18 @@ class Compiler:
         if self.has_attribute_visitors:
             self.visit_attributes(node)
         if result is None and self.forbid_returning_None:
-            raise CompilerError(
-                ('Method on_%s returned `None` instead of a valid compilation '
-                 'result! It is recommended to use `nodetree.EMPTY_NODE` as a '
-                 'void value. This Error can be turned off by adding '
-                 '`self.forbid_returning_None = False` to the reset()-Method of your'
-                 'compiler class, in case on_%s actually SHOULD be allowed to '
-                 'return None.') % (node.name.replace(':', '3a'), self.visitor_name(node.name)))
+            raise self._returned_None_error(node)
         return result
 
+    def _returned_None_error(self, node: Node) -> CompilerError:
+        return CompilerError(
+            ('Method on_%s returned `None` instead of a valid compilation '
+             'result! It is recommended to use `nodetree.EMPTY_NODE` as a '
+             'void value. This Error can be turned off by adding '
+             '`self.forbid_returning_None = False` to the reset()-Method of your'
+             'compiler class, in case on_%s actually SHOULD be allowed to '
+             'return None.') % (node.name.replace(':', '3a'), self.visitor_name(node.name)))
+
 
 def logfile_basename(filename_or_text, function_or_class_or_instance) -> str:
     """Generates a reasonable logfile-name (without extension) based on
@@ -585,9 +585,40 @@ CONFIG_PRESET['max_parser_dropouts'] = 1
 # a suitable reentry point will be searched. A value smaller than zero
 # means that the complete remaining text will be searched. A value of zero
 # effectively turns of resuming after error.
-# Default value: 10000
+# Default value: 50000
 CONFIG_PRESET['reentry_search_window'] = 50000
 
+# The "error budget" protects the parser against pathological inputs where
+# error recovery cascades, e.g. when parsing documents from untrusted sources
+# on a server. `max_resumptions` is the maximum number of times the parser
+# resumes parsing after an error with the help of resume- or skip-rules.
+# `max_errors_per_region` is the maximum number of errors that is recorded
+# within a region of `error_region_size` characters. If either limit is
+# exceeded, the error budget is exhausted: No further errors are recorded,
+# memoized results are released after each top-level retry and, instead of
+# searching for reentry-points, the parser skips to the next line and
+# restarts with the root parser (i.e. the next top-level item) until the end
+# of the document has been reached. (In this case, the value of
+# `max_parser_dropouts` is ignored.) A negative value means no limit.
+# Default values: -1, -1, 1000
+CONFIG_PRESET['max_resumptions'] = -1
+CONFIG_PRESET['max_errors_per_region'] = -1
+CONFIG_PRESET['error_region_size'] = 1000
+
+# Limits for the duration of parsing a single document. `parser_time_limit`
+# is the maximum wall-clock time in seconds and `parser_call_limit` the
+# maximum number of parser calls (including memoized calls) for parsing a
+# document. If either limit is exceeded, parsing is canceled and the partial
+# syntax tree that has been parsed so far is returned with an error of code
+# CANCELED. Other than the time limit, the call limit is deterministic, i.e.
+# independent of the speed of the machine. Both limits are checked in
+# Parser.__call__() by counting down a counter, so that there is practically
+# no overhead. A value smaller or equal zero (time limit) or smaller than
+# zero (call limit) means no limit.
+# Default values: 0.0, -1
+CONFIG_PRESET['parser_time_limit'] = 0.0
+CONFIG_PRESET['parser_call_limit'] = -1
+
 # Turns on tracking of the parsing history. As this slows down parsing,
 # it should only be turned on for debugging.
 # Default value: False
@@ -646,12 +677,15 @@ CONFIG_PRESET['infinite_loop_warning'] = False
 #                  unist-Specification (https://github.com/syntax-tree/unist).
 # 'xast'         - a JSON-Variant for XML-syntax-trees following the
 #                  xast-Specification (https://github.com/syntax-tree/xast).
+# 'binary'       - DHParser's compact binary format, which is the fastest
+#                  to write and to read back. The serialization yields bytes
+#                  instead of a string! See nodetree.Node.as_binary()
 # Default values: "compact" for concrete syntax trees and "XML" for abstract
 #                 syntax trees and "sxpr" (read "S-Expression") for any other
 #                 kind of tree.
 _serializations = frozenset({'XML', 'HTML', 'json', 'dict.json', 'indented', 'tree',
                              'S-expression', 'sxpr', 'SXML', 'SXML1', 'SXML2',
-                             'xast', 'ndst'})
+                             'xast', 'ndst', 'binary'})
 CONFIG_PRESET['CST_serialization'] = ''
 CONFIG_PRESET['AST_serialization'] = ''
 CONFIG_PRESET['default_serialization'] = 'sxpr'
@@ -850,6 +884,65 @@ CONFIG_PRESET['batch_processing_parallelization'] = True
 # Default value: 4
 CONFIG_PRESET['batch_processing_max_chunk_size'] = 4
 
+# Determines whether dsl.process_file() writes the serializations of the
+# target stages to disk one after the other or concurrently. Possible
+# values are:
+# 'off' -            Serializations are written one after the other.
+# 'multithreading' - Serializations are written by a thread-pool. Because
+#         of the global interpreter lock, this only overlaps the writing
+#         of the files.
+# 'multicore' -      Each tree is converted into the binary format once and
+#         handed over to a pool of processes that write the serializations
+#         in parallel. This pays off for large documents that are written
+#         in several formats, but not for batches of small documents that
+#         are processed in parallel, anyway.
+# The configuration value 'debug_parallel_execution' takes precedence.
+# Default value: 'off'
+ALLOWED_PRESET_VALUES['serialization_parallelization'] = frozenset({
+    'off', 'multithreading', 'multicore'})
+CONFIG_PRESET['serialization_parallelization'] = 'off'
+
+# Determines whether transform.transformer() transforms the children of
+# the root-node in parallel, provided that the transformation-table has
+# been declared as "subtree-local" with the entry '__subtree_local__': True
+# (see transform.traverse_subtrees_in_parallel()). Possible values are:
+# 'off' -       The tree is transformed in a single pass by traverse().
+# 'multicore' - The children of the root-node are handed over to a pool of
+#         processes in DHParser's binary format. This pays off for large
+#         documents with many top-level sections, only.
+# The configuration value 'debug_parallel_execution' takes precedence.
+# Default value: 'off'
+ALLOWED_PRESET_VALUES['transformation_parallelization'] = frozenset({'off', 'multicore'})
+CONFIG_PRESET['transformation_parallelization'] = 'off'
+
+# Determines whether pipeline.run_pipeline() processes independent junctions,
+# e.g. several junctions that start from the AST, concurrently. Possible
+# values are:
+# 'off' -            Junctions are processed one after the other.
+# 'multithreading' - Independent junctions are processed by a thread-pool.
+#         Because of the global interpreter lock, this pays off only for
+#         junctions that spend most of their time in code that releases
+#         the GIL or on a free-threaded Python build.
+# 'multicore' -      Independent junctions are handed over to a pool of
+#         processes in DHParser's binary format. Junctions the factories of
+#         which cannot be pickled are processed in the calling process.
+# The configuration value 'debug_parallel_execution' takes precedence.
+# Default value: 'off'
+ALLOWED_PRESET_VALUES['pipeline_parallelization'] = frozenset({
+    'off', 'multithreading', 'multicore'})
+CONFIG_PRESET['pipeline_parallelization'] = 'off'
+
+# Name of a directory where pipeline.full_pipeline() and, thus, also
+# dsl.process_file() and dsl.batch_process() cache the concrete syntax-tree
+# and the target-stages of the processed documents. Stages are only
+# recomputed, if either the document, the code of the stage or of any
+# of the stages upstream, the configuration or the version of DHParser
+# have changed. The cache is shared by all runs and processes that use the
+# same directory. Stale entries are never removed automatically.
+# An empty string means that the stage cache is turned off.
+# Default value: ''
+CONFIG_PRESET['pipeline_stage_cache'] = ''
+
 # Maximum allowed source size for remote procedure calls (including
 # parameters) in server.Server. The default value is rather large in
 # order to allow transmitting complete source texts as parameter.
@@ -882,6 +975,13 @@ CONFIG_PRESET['server_default_port'] = 8888
 # Default value: False
 CONFIG_PRESET['debug_compiler'] = False
 
+# Makes DHParser.transform.traverse() compile the sequences of transformations
+# in transformation-tables into a single function per node-name (see
+# DHParser.transform.compile_transformations()). Turn this off, if tracebacks
+# of errors raised by transformations shall list the transformations one by one.
+# Default value: True
+CONFIG_PRESET['compile_transformations'] = True
+
 # Makes DHParser.dsl.grammar_provider() write generated Python code to
 # the log-file (if logging is on) or to the console (if logging is off)
 # Default value: '' (empty string, i.e. no log)
@@ -961,10 +1061,23 @@ CONFIG_PRESET['test_suppress_lookahead_failures'] = True
 # a) when running tests on sub-parsers, in case that the preprocessor
 # cannot deal with snippets which do not represent full documents or
 # b) when you'd like to keep preprocessor matters out of the tests.
-# 'test_skip_preprocessor' is best 
+# 'test_skip_preprocessor' is best
 # Default value: False
 CONFIG_PRESET['test_skip_preprocessor'] = False
 
+# Name of a directory (relative to the directory of the test-files) where
+# the results of successful grammar-tests are cached. Tests are only
+# rerun if either the test-code, the expected results, the grammar,
+# the transformation-table or any of the compilation stages have changed.
+# An empty string means that the test-result cache is turned off.
+# Default value: ''
+CONFIG_PRESET['test_result_cache'] = ''
+
+# Ignore cached test-results and rerun all tests. (The cache will
+# be refreshed, nonetheless.)
+# Default value: False
+CONFIG_PRESET['test_force_rerun'] = False
+
 ########################################################################
 #
 # deprecation warnings
@@ -31,21 +31,23 @@ from typing import Any, cast, List, Tuple, Union, Iterator, Iterable, Optional,
 
 import DHParser.ebnf
 from DHParser.compile import Compiler, compile_source, CompilerFactory
-from DHParser.pipeline import full_pipeline, Junction
-from DHParser.configuration import get_config_value, set_config_value
+from DHParser.pipeline import full_pipeline, Junction, root_fields, restore_tree
+from DHParser.configuration import get_config_value, set_config_value, get_config_values, \
+    add_config_values
 from DHParser.ebnf import EBNFCompiler, DHPARSER_IMPORTS, \
     get_ebnf_preprocessor, get_ebnf_grammar, get_ebnf_transformer, get_ebnf_compiler
 from DHParser.error import Error, is_error, has_errors, only_errors, canonical_error_strings, \
     ErrorCode, ERROR
 from DHParser.log import suspend_logging, resume_logging, is_logging, append_log
-from DHParser.nodetree import Node
+from DHParser.nodetree import Node, RootNode, parse_binary
 from DHParser.parse import Grammar, ParserFactory
 from DHParser.preprocess import nil_preprocessor, PreprocessorFunc, \
     PreprocessorFactory
 from DHParser.transform import TransformerFunc, TransformerFactory
 from DHParser.toolkit import DHPARSER_DIR, load_if_file, is_python_code, is_filename, \
     compile_python_object, re, as_identifier, cpu_count, LazyRE, CancelQuery, md5, \
-    deprecated, deprecation_warning, instantiate_executor, PickMultiCoreExecutor
+    deprecated, deprecation_warning, instantiate_executor, PickMultiCoreExecutor, \
+    ExecutorWrapper
 from DHParser.versionnumber import __version__, __version_info__
 
 
@@ -63,6 +65,7 @@ __all__ = ('DefinitionError',
            'recompile_grammar',
            'create_scripts',
            'restore_server_script',
+           'write_serializations',
            'process_file',
            'batch_process')
 
@@ -777,6 +780,82 @@ def restore_server_script(ebnf_filename: str,
 #######################################################################
 
 
+def _write_serialization(tree: Union[Node, bytes], how: str, filename: str,
+                         fields: Optional[Dict[str, Any]] = None,
+                         config: Optional[Dict[str, Any]] = None) -> str:
+    """Writes the serialization ``how`` of ``tree`` to the file ``filename``
+    and returns the file name. ``tree`` can also be passed in DHParser's binary
+    format, which is much cheaper to hand over to another process than a
+    pickled tree. In this case, ``fields`` contains the fields of the root-node,
+    like ``inline_tags``, which are not covered by the binary format (see
+    :py:func:`pipeline.root_fields`).
+    ``config`` transfers configuration values of the calling thread to the
+    thread or process that runs this function."""
+    if config:
+        add_config_values(config)
+    if how == 'binary':
+        with open(filename, 'wb') as f:
+            if isinstance(tree, bytes):
+                f.write(tree)
+            else:
+                tree.serialize_to(f, how)
+    else:
+        if isinstance(tree, bytes):
+            tree = parse_binary(tree) if fields is None else restore_tree(tree, fields)
+        with open(filename, 'w', encoding='utf-8') as f:
+            tree.serialize_to(f, how)
+    return filename
+
+
+def write_serializations(jobs: List[Tuple[Node, str, str]]):
+    """Writes trees in the given serializations to disk. ``jobs`` is a list
+    of triples (tree, serialization, file name). Depending on the
+    configuration value 'serialization_parallelization' the files are
+    written one after the other or by a thread- or process-pool."""
+    mode = get_config_value('serialization_parallelization')
+    if mode == 'off' or len(jobs) <= 1:
+        for tree, how, filename in jobs:
+            _write_serialization(tree, how, filename)
+        return
+    config = get_config_values('*_serialization', '*_sxpr_threshold',
+                               'xml_attribute_error_handling')
+    tasks: List[Optional[Tuple[Union[Node, bytes], str, str, Optional[Dict[str, Any]]]]] = \
+        [(tree, how, filename, None) for tree, how, filename in jobs]
+    local = []  # type: List[Tuple[Node, str, str]]
+    if mode == 'multicore':
+        pool = instantiate_executor(True, PickMultiCoreExecutor)
+        if isinstance(pool, ExecutorWrapper):  # i.e. neither threads nor a single thread
+            import pickle
+            binaries = dict()  # type: Dict[int, Optional[Tuple[bytes, Optional[Dict[str, Any]]]]]
+            for i, (tree, how, filename) in enumerate(jobs):
+                if id(tree) not in binaries:
+                    # the source mapping is not needed for serialization
+                    fields = root_fields(tree, exclude={'source_mapping'}) \
+                        if isinstance(tree, RootNode) else None
+                    try:
+                        pickle.dumps(fields)
+                        binaries[id(tree)] = (tree.as_binary(), fields)
+                    except (pickle.PicklingError, AttributeError, TypeError):
+                        binaries[id(tree)] = None
+                if binaries[id(tree)] is None:
+                    local.append(jobs[i])
+                    tasks[i] = None
+                else:
+                    tasks[i] = (binaries[id(tree)][0], how, filename, binaries[id(tree)][1])
+    else:
+        import concurrent.futures
+        pool = instantiate_executor(True, concurrent.futures.ThreadPoolExecutor)
+    try:
+        futures = [pool.submit(_write_serialization, *task, config)
+                   for task in tasks if task is not None]
+        for tree, how, filename in local:
+            _write_serialization(tree, how, filename)
+        for f in futures:
+            f.result()
+    finally:
+        pool.shutdown(wait=True)
+
+
 def process_file(source: str, out_dir: str,
                  preprocessor_factory: PreprocessorFactory,
                  parser_factory: ParserFactory,
@@ -830,6 +909,7 @@ def process_file(source: str, out_dir: str,
 
     # write data
     errors = [];  errstrs = set()
+    jobs = []  # type: List[Tuple[Node, str, str]]
     items = end_results.items() if len(end_results) == len(targets) else results.items()
     for t, r in items:
         result, err = r
@@ -848,12 +928,11 @@ def process_file(source: str, out_dir: str,
                     if s == 'default':  s = get_config_value('default_serialization').lower()
                     elif s == 's-expression':  s = 'sxpr'
                     elif s == 'indented':  s = 'tree'
-                    data = result.serialize(s)
-                    with open('.'.join([path, s]), 'w', encoding='utf-8') as f:
-                        f.write(data)
+                    jobs.append((result, s, '.'.join([path, s])))
             else:
                 with open(path, 'w', encoding='utf-8') as f:
                     f.write(str(result))
+    write_serializations(jobs)
 
     errors.sort(key=lambda e: e.pos)
     if errors:
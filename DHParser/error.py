@@ -103,6 +103,7 @@ __all__ = ('ErrorCode',
            'CAPTURE_STACK_NOT_EMPTY_NON_ROOT_ONLY',
            'AUTOCAPTURED_SYMBOL_NOT_CLEARED_NON_ROOT',
            'ERROR_WHILE_RECOVERING_FROM_ERROR',
+           'ERROR_BUDGET_EXHAUSTED',
            'PARSER_NEVER_TOUCHES_DOCUMENT',
            'PARSER_NEVER_TOUCHES_DOCUMENT',
            'PARSER_LOOKAHEAD_FAILURE_ONLY',
@@ -219,6 +220,7 @@ UNDEFINED_MACRO                          = ErrorCode(1180)
 RECURSIVE_MACRO_CALL                     = ErrorCode(1190)
 
 ERROR_WHILE_RECOVERING_FROM_ERROR        = ErrorCode(1301)
+ERROR_BUDGET_EXHAUSTED                   = ErrorCode(1305)
 
 # EBNF-specific and static analysis errors
 
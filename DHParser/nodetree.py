@@ -92,11 +92,16 @@ The source code of the module ``nodetree`` consists of four main sections:
 
 from __future__ import annotations
 
+from array import array
 import copy
 from enum import IntEnum
 import functools
+import gc
+import io
 import json
-from typing import Callable, cast, Iterator, Sequence, List, \
+from json.decoder import scanstring
+from json.encoder import encode_basestring, encode_basestring_ascii
+from typing import Callable, cast, Iterator, Iterable, Sequence, List, \
     Union, Tuple, Container, Optional, Dict, Any, NamedTuple
 
 from DHParser.configuration import get_config_value, ALLOWED_PRESET_VALUES
@@ -211,7 +216,9 @@ __all__ = ('WHITESPACE_PTYPE',
            'DEFAULT_START_INDEX_SENTINEL',
            'LocationInfo',
            'NodeLocation',
+           'ContentMatch',
            'ContentMapping',
+           'LazyContentMapping',
            'SerPart',
            'SerLocation',
            'SerializationMapping',
@@ -226,7 +233,12 @@ __all__ = ('WHITESPACE_PTYPE',
            'parse_sxml',
            'parse_xml',
            'parse_json',
+           'BINARY_TREE_MAGIC',
+           'parse_binary',
            'deserialize',
+           'LazyNode',
+           'write_tree_file',
+           'open_tree_file',
            'flatten_sxpr',
            'flatten_xml')
 
@@ -413,6 +425,8 @@ def create_path_match_function(criterion: PathSelector) -> PathMatchFunction:
 
 RX_IS_SXPR = LazyRE(r'\s*\(')
 RX_IS_XML = LazyRE(r'\s*<')
+BINARY_TREE_MAGIC = b'DHPB'
+BINARY_TREE_VERSION = 1
 RX_ATTR_NAME = LazyRE(r'[\w.:-]')
 
 
@@ -526,6 +540,31 @@ NO_REFLOW = lambda tab, content, depth: content
 RX_CTRL_CHARS = re.compile(r'''[\x00-\x08\x0B-\x1F]''')
 
 
+class _ChunkedWriter:
+    """Collects the small strings that the streaming serializers produce
+    and passes them on to the file-like object ``fp`` in batches of
+    ``batch_size`` strings, so that neither the complete serialization
+    has to be held in memory nor ``fp.write()`` is called for every
+    single tag."""
+    __slots__ = ('fp', 'chunks', 'batch_size')
+
+    def __init__(self, fp, batch_size: int = 4096):
+        self.fp = fp
+        self.chunks: List[str] = []
+        self.batch_size = batch_size
+
+    def write(self, s: str):
+        self.chunks.append(s)
+        if len(self.chunks) >= self.batch_size:
+            self.fp.write(''.join(self.chunks))
+            self.chunks.clear()
+
+    def flush(self):
+        if self.chunks:
+            self.fp.write(''.join(self.chunks))
+            self.chunks.clear()
+
+
 class Node:  # (collections.abc.Sized): Base class omitted for cython-compatibility
     """
     Represents a node in a tree data structure. This can, for example, be
@@ -646,15 +685,66 @@ class Node:  # (collections.abc.Sized): Base class omitted for cython-compatibil
         self.name = name         # type: str
 
     def __deepcopy__(self, memo):
-        if self._children:
-            duplicate = self.__class__(self.name, copy.deepcopy(self._children), False)
-        else:
-            duplicate = self.__class__(self.name, self.result, True)
-        duplicate._pos = self._pos
-        if self.has_attr():
-            duplicate.attr.update(self._attributes)
-            # duplicate.attr.update(copy.deepcopy(self._attributes))
-            # duplicate._attributes = copy.deepcopy(self._attributes)  # this is not cython compatible
+        # The tree is copied without recursion, so that deeply nested trees
+        # do not exceed the recursion limit: First, the branch-nodes are
+        # collected in pre-order with an explicit stack, then they are copied
+        # in reverse order, i.e. children before their parents. Copies are
+        # created with __new__, because calling __init__ (and thus
+        # _set_result()) for every node of a large tree is comparatively
+        # expensive. The string-results of leaf-nodes are immutable and
+        # therefore shared between the original and the copy. Since copying
+        # does not create any reference cycles, the cyclic garbage collector,
+        # which would otherwise be triggered many times by the allocation of
+        # a large number of nodes, is paused while copying.
+        if gc.isenabled():
+            gc.disable()
+            try:
+                return Node.__deepcopy__(self, memo)
+            finally:
+                gc.enable()
+        node_deepcopy = Node.__deepcopy__
+        new = Node.__new__
+        branches = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            branches.append(node)
+            for child in node._children:
+                if child._children and id(child) not in memo:
+                    if type(child).__deepcopy__ is node_deepcopy:
+                        stack.append(child)
+                    else:
+                        memo[id(child)] = copy.deepcopy(child, memo)
+        for node in reversed(branches):
+            copies = []
+            for child in node._children:
+                duplicate = memo.get(id(child), None)
+                if duplicate is None:
+                    if type(child).__deepcopy__ is not node_deepcopy:
+                        duplicate = copy.deepcopy(child, memo)
+                    else:
+                        duplicate = new(child.__class__)
+                        duplicate._result = child._result
+                        duplicate._children = ()
+                        duplicate.name = child.name
+                        duplicate._pos = child._pos
+                        attributes = getattr(child, '_attributes', None)
+                        if attributes:
+                            duplicate._attributes = attributes.copy()
+                        memo[id(child)] = duplicate
+                copies.append(duplicate)
+            duplicate = new(node.__class__)
+            if copies:
+                duplicate._children = duplicate._result = tuple(copies)
+            else:
+                duplicate._children = ()
+                duplicate._result = node._result
+            duplicate.name = node.name
+            duplicate._pos = node._pos
+            attributes = getattr(node, '_attributes', None)
+            if attributes:
+                duplicate._attributes = attributes.copy()
+            memo[id(node)] = duplicate
         return duplicate
 
     def __str__(self):
@@ -680,10 +770,19 @@ class Node:  # (collections.abc.Sized): Base class omitted for cython-compatibil
     def strlen(self) -> int:
         """Returns the length of the string-content of this node.
         Use len(node.children) for the number of children of this node!"""
-        if self._children:
-            return sum(child.strlen() for child in self._children)
-        else:
+        if not self._children:
             return len(self._result)
+        length = 0
+        stack = [iter(self._children)]
+        while stack:
+            for child in stack[-1]:
+                if child._children:
+                    stack.append(iter(child._children))
+                    break
+                length += len(child._result)
+            else:
+                stack.pop()
+        return length
 
     def __len__(self):
         raise AssertionError(
@@ -717,14 +816,18 @@ class Node:  # (collections.abc.Sized): Base class omitted for cython-compatibil
         :returns: True, if the tree originating in node `self` is equal by
             value to the tree originating in node `other`.
         """
-        if self.name == other.name and self.has_equal_attr(other, ignore_attr_order):
-            if self._children:
-                return (len(self._children) == len(other._children)
-                        and all(a.equals(b, ignore_attr_order)
-                                for a, b in zip(self._children, other._children)))
-            else:
-                return self.result == other.result
-        return False
+        stack = [(self, other)]
+        while stack:
+            a, b = stack.pop()
+            if a.name != b.name or not a.has_equal_attr(b, ignore_attr_order):
+                return False
+            if a._children:
+                if len(a._children) != len(b._children):
+                    return False
+                stack.extend(zip(reversed(a._children), reversed(b._children)))
+            elif a.result != b.result:
+                return False
+        return True
 
     @property
     def anonymous(self) -> bool:
@@ -814,8 +917,16 @@ class Node:  # (collections.abc.Sized): Base class omitted for cython-compatibil
         """
         if self._children:
             fragments = []
-            for child in self._children:
-                fragments.extend(child._leaf_data())
+            stack = [iter(self._children)]
+            while stack:
+                for child in stack[-1]:
+                    if child._children:
+                        stack.append(iter(child._children))
+                        break
+                    child._result = str(child._result)
+                    fragments.append(child._result)
+                else:
+                    stack.pop()
             return fragments
         self._result = str(self._result)
         return [self._result]
@@ -828,10 +939,7 @@ class Node:  # (collections.abc.Sized): Base class omitted for cython-compatibil
         concatenated.
         """
         if self._children:
-            fragments = []
-            for child in self._children:
-                fragments.extend(child._leaf_data())
-            return ''.join(fragments)
+            return ''.join(self._leaf_data())
         self._result = str(self._result)
         return self._result
 
@@ -1229,17 +1337,19 @@ class Node:  # (collections.abc.Sized): Base class omitted for cython-compatibil
 
     def walk_tree(self, include_root: bool = False, reverse: bool = False) -> Iterator[Node]:
         """Yields all nodes of the tree. (Faster than select())"""
-        def walk_recursive(nd: Node) -> Iterator[Node]:
-            nonlocal reverse
-            child_iterator = reversed(nd._children) if reverse else nd._children
-            for child in child_iterator:
-                yield child
-                if child._children:
-                    yield from walk_recursive(child)
-
         if include_root:
             yield self
-        yield from walk_recursive(self)
+        # an explicit stack of child-iterators replaces recursion
+        stack = [reversed(self._children) if reverse else iter(self._children)]
+        while stack:
+            for child in stack[-1]:
+                yield child
+                if child._children:
+                    stack.append(reversed(child._children) if reverse
+                                 else iter(child._children))
+                    break
+            else:
+                stack.pop()
 
     def select_if(self, match_func: NodeMatchFunction,
                   include_root: bool = False, reverse: bool = False,
@@ -1250,21 +1360,20 @@ class Node:  # (collections.abc.Sized): Base class omitted for cython-compatibil
         :py:meth:`Node.select()` for a detailed description and examples.
         The tree is traversed pre-order by the iterator.
         """
-        def select_if_recursive(nd: Node) -> Iterator[Node]:
-            nonlocal match_func, reverse, skip_func
-            child_iterator = reversed(nd._children) if reverse else nd._children
-            for child in child_iterator:
+        if include_root:
+            if match_func(self):  yield self
+            if skip_func(self):  return
+        stack = [reversed(self._children) if reverse else iter(self._children)]
+        while stack:
+            for child in stack[-1]:
                 if match_func(child):
                     yield child
                 if child._children and not skip_func(child):
-                    yield from select_if_recursive(child)
-
-        if include_root:
-            if match_func(self):  yield self
-            if not skip_func(self):
-                yield from select_if_recursive(self)
-        else:
-            yield from select_if_recursive(self)
+                    stack.append(reversed(child._children) if reverse
+                                 else iter(child._children))
+                    break
+            else:
+                stack.pop()
 
     def select(self, criteria: NodeSelector,
                include_root: bool = False, reverse: bool = False,
@@ -1401,20 +1510,21 @@ class Node:  # (collections.abc.Sized): Base class omitted for cython-compatibil
 
     def walk_tree_paths(self, include_root: bool=False, reverse: bool=False):
         """Yields all paths of the tree. (Faster than select_paths_if())"""
-        def recursive(path) -> Iterator[Path]:
-            nonlocal reverse
-            top = path[-1]
-            child_iterator = reversed(top._children) if reverse else top._children
+        path = [self]
+        if include_root:
+            yield path
+        stack = [(path, reversed(self._children) if reverse else iter(self._children))]
+        while stack:
+            path, child_iterator = stack[-1]
             for child in child_iterator:
                 child_path = path + [child]
                 yield child_path
                 if child._children:
-                    yield from recursive(child_path)
-
-        path = [self]
-        if include_root:
-            yield path
-        yield from recursive(path)
+                    stack.append((child_path, reversed(child._children) if reverse
+                                              else iter(child._children)))
+                    break
+            else:
+                stack.pop()
 
     def select_path_if(self, match_func: PathMatchFunction,
                        include_root: bool = False,
@@ -1793,106 +1903,162 @@ class Node:  # (collections.abc.Sized): Base class omitted for cython-compatibil
 
         :returns:  A list of strings that, if concatenated, yield a
             serialized tree representation of the node and its children.
-        """
-        head = open_fn(self)
-        tail = close_fn(self)
 
-        if not inline:
-            reflow = inline_fn(self)    # reflow is done on the first inlined element
-            inline = reflow
-            if reflow and reflow_fn is not NO_REFLOW:
-                reflow_as_oneliner(self, xml_space_policy=XMLSpacePolicy.RESPECT)
-        else:
-            reflow = False
-
-        if inline:
-            usetab = (tab * depth) if reflow else ''
-            hlf, tlf = '', ''
-        else:
-            usetab = (tab * depth)
-            hlf = '\n'
-            tlf = '\n' if density == 0 or (tail[0:1] == '<') else ''
-
-        def update_mapping(content):
+        The tree is traversed with an explicit stack rather than by
+        recursion, so that the depth of the tree is not limited by
+        Python's recursion limit.
+        """
+        def update_mapping(node, content, head, tail, usetab, tlf):
             lh = len(head) + len(usetab)
             lt = len(tail) + (len(usetab) if tlf else 0)
             if len(content) == 0:
-                mapping[self] = (lh, 0, lt)
-            if len(content) == 1:
-                mapping[self] = (lh, len(content[0]) - lh - lt, lt)
+                mapping[node] = (lh, 0, lt)
+            elif len(content) == 1:
+                mapping[node] = (lh, len(content[0]) - lh - lt, lt)
             else:
-                mapping[self] = (lh, [len(line) for line in content], lt)
-
-        if not self.result:
-            if mapping is not NO_MAPPING_SENTINEL:  update_mapping([])
-            return [usetab + head + tail]
+                # for multi-line content only the overall length, the number of
+                # lines and the length of the last line are needed later on
+                total = 0
+                for line in content:  total += len(line)
+                mapping[node] = (lh, (total, len(content), len(content[-1])), lt)
+
+        def finish(node, content, reflow, head, tail, usetab, tlf, depth):
+            if reflow and len(content) == 1:
+                content = [reflow_fn(tab, content[0], depth)]
+            else:
+                assert reflow_fn is NO_REFLOW or not reflow or len(content) == 1, \
+                    f"Reflow but len(content) == {len(content)} > 1 !? Apply reflow_as_oneliner() " \
+                    "to all inline-tags, before calling Node.as_xml(..., reflow_col=N), N > 0.\n" \
+                    "    for inner in tree.select(inline_tags):" \
+                    "        reflow_as_oneliner(inner)" \
+                    f"Error occurred in this tag:\n{node.as_sxpr()}"
+            if mapping is not NO_MAPPING_SENTINEL:
+                update_mapping(node, content, head, tail, usetab, tlf)
+            return content
 
-        if self._children:
-            content = [usetab + head] if head else []
-            for child in self._children:
-                subtree = child._tree_repr(tab, open_fn, close_fn, data_fn, density,
-                        inline, inline_fn, allow_omissions, reflow_fn, mapping, depth + 1)
-                if subtree:
-                    if inline:
-                        content.append('\n'.join(subtree))
-                    else:
-                        content.extend(subtree)
-            if inline:
-                content.append(tail)
-                content = [''.join(content)]
-            elif tlf:
-                content.append(usetab + tail)
+        # frames: (node, children-iterator, content, inline, reflow, head, tail, usetab, tlf,
+        #          depth, shared, oneliner)
+        stack = []
+        node = self
+        oneliner = False
+        while True:
+            head = open_fn(node)
+            tail = close_fn(node)
+
+            if not inline:
+                reflow = inline_fn(node)    # reflow is done on the first inlined element
+                node_inline = reflow
+                # the leaves of reflowed elements are made one-liners on the fly,
+                # which is the same as calling reflow_as_oneliner(node, RESPECT) beforehand
+                oneliner = reflow and reflow_fn is not NO_REFLOW
             else:
-                content[-1] += tail
+                reflow = False
+                node_inline = True
+            if oneliner and node.has_attr() and node._attributes.get('xml:space') == 'preserve':
+                oneliner = False
+
+            if node_inline:
+                usetab = (tab * depth) if reflow else ''
+                hlf, tlf = '', ''
+            else:
+                usetab = (tab * depth)
+                hlf = '\n'
+                tlf = '\n' if density == 0 or (tail[0:1] == '<') else ''
+
+            if not node.result:
+                if mapping is not NO_MAPPING_SENTINEL:
+                    update_mapping(node, [], head, tail, usetab, tlf)
+                content = [usetab + head + tail]
+
+            elif node._children:
+                if stack and not node_inline and not stack[-1][3] \
+                        and mapping is NO_MAPPING_SENTINEL:
+                    # write directly into the parent's list of lines to avoid
+                    # copying the lines again and again on each level of the tree
+                    content = stack[-1][2]
+                    if head:  content.append(usetab + head)
+                    shared = True
+                else:
+                    content = [usetab + head] if head else []
+                    shared = False
+                stack.append((node, iter(node._children), content, node_inline, reflow,
+                              head, tail, usetab, tlf, depth, shared, oneliner))
+                content = None
 
-        else:
-            res = self.content
-            if not inline and not head and allow_omissions:
-                # strip whitespace for omitted non-inline node, e.g. CharData in mixed elements
-                res = res.strip()  # WARNING: This changes the data in subtle ways
-            if density & 1 and (res.find('\n') < 0 or reflow_fn is not NO_REFLOW):
-                # except for XML, add a gap between opening statement and content
-                if not inline and head and head not in ("&", "&#x") \
-                        and (head[-1:] != '>' and head != '<!--'):
-                    gap = ' '
-                elif inline and head[:1] == '(':  gap = ' '
-                else:  gap = ''
-                content = [''.join((usetab, head, gap, data_fn(res), tail))]
             else:
-                lines = [data_fn(s) for s in res.split('\n')]
-                N = len(lines)
-                i, k = 0, N - 1
-                if not inline and allow_omissions:
-                    # Strip preceding and succeeding whitespace.
-                    # WARNING: This changes the data in subtle ways
-                    while i < N and not lines[i]:
-                        i += 1
-                    while k >= 0 and not lines[k]:
-                        k -= 1
-                tb = usetab + (tab if reflow or not inline else '')
-                content = [usetab + head, tb] if hlf else [usetab + head]  # + tb?
-                for line in lines[i:k]:
-                    content[-1] += line
-                    content.append(tb)
-                content[-1] += lines[k]
-                if tlf:
+                if oneliner:
+                    node.result = RX_WHITESPACE.sub(' ', node.content)
+                res = node.content
+                if not node_inline and not head and allow_omissions:
+                    # strip whitespace for omitted non-inline node, e.g. CharData in mixed elements
+                    res = res.strip()  # WARNING: This changes the data in subtle ways
+                if density & 1 and (res.find('\n') < 0 or reflow_fn is not NO_REFLOW):
+                    # except for XML, add a gap between opening statement and content
+                    if not node_inline and head and head not in ("&", "&#x") \
+                            and (head[-1:] != '>' and head != '<!--'):
+                        gap = ' '
+                    elif node_inline and head[:1] == '(':  gap = ' '
+                    else:  gap = ''
+                    content = [''.join((usetab, head, gap, data_fn(res), tail))]
+                else:
+                    lines = [data_fn(s) for s in res.split('\n')]
+                    N = len(lines)
+                    i, k = 0, N - 1
+                    if not node_inline and allow_omissions:
+                        # Strip preceding and succeeding whitespace.
+                        # WARNING: This changes the data in subtle ways
+                        while i < N and not lines[i]:
+                            i += 1
+                        while k >= 0 and not lines[k]:
+                            k -= 1
+                    tb = usetab + (tab if reflow or not node_inline else '')
+                    content = [usetab + head, tb] if hlf else [usetab + head]  # + tb?
+                    for line in lines[i:k]:
+                        content[-1] += line
+                        content.append(tb)
+                    content[-1] += lines[k]
+                    if tlf:
+                        content.append(usetab + tail)
+                    else:
+                        content[-1] += tail
+                content = finish(node, content, reflow, head, tail, usetab, tlf, depth)
+
+            # add the content to the parent's content and proceed with the next
+            # sibling or, if there is none, finish the parent
+            while stack:
+                frame = stack[-1]
+                if content:
+                    if frame[3]:
+                        frame[2].append('\n'.join(content))
+                    else:
+                        frame[2].extend(content)
+                child = next(frame[1], None)
+                if child is not None:
+                    node = child
+                    inline = frame[3]
+                    depth = frame[9] + 1
+                    oneliner = frame[11]
+                    break
+                stack.pop()
+                node, _, content, node_inline, reflow, head, tail, usetab, tlf, depth, shared, _ \
+                    = frame
+                if node_inline:
+                    content.append(tail)
+                    content = [''.join(content)]
+                elif tlf:
                     content.append(usetab + tail)
                 else:
                     content[-1] += tail
-
-        if reflow and len(content) == 1:
-            content = [reflow_fn(tab, content[0], depth)]
-        else:
-            assert reflow_fn is NO_REFLOW or not reflow or len(content) == 1, \
-                f"Reflow but len(content) == {len(content)} > 1 !? Apply reflow_as_oneliner() " \
-                "to all inline-tags, before calling Node.as_xml(..., reflow_col=N), N > 0.\n" \
-                "    for inner in tree.select(inline_tags):" \
-                "        reflow_as_oneliner(inner)" \
-                f"Error occurred in this tag:\n{self.as_sxpr()}"
-        if mapping is not NO_MAPPING_SENTINEL: update_mapping(content)
-        return content
+                if shared:
+                    content = None  # lines have already been added to the parent's list
+                else:
+                    content = finish(node, content, reflow, head, tail, usetab, tlf, depth)
+            else:
+                return content
 
     def _finalize_mapping(self, mapping: RawMappingType):
+        # Multi-line content is recorded by _tree_repr() as a tuple
+        # (overall length of the lines, number of lines, length of last line).
         def update_children(node: Node, closing: int):
             child = None
             not_inline = isinstance(mapping[node][1], Sequence)
@@ -1902,8 +2068,7 @@ class Node:  # (collections.abc.Sized): Base class omitted for cython-compatibil
                 if not_inline:
                    mp_child_0 += 1
                 if isinstance(mp_child_1, Sequence):
-                    # content = mapping[child][1]
-                    mp_child_1 = sum(mp_child_1) + len(mp_child_1)
+                    mp_child_1 = mp_child_1[0] + mp_child_1[1]
                 else:
                     mp_child_1 = mp_child_0 + mp_child_1 + mp_child_2
                 mapping[child] = (mp_child_0, mp_child_1, mp_child_2)
@@ -1914,19 +2079,120 @@ class Node:  # (collections.abc.Sized): Base class omitted for cython-compatibil
         mp_self = mapping[self]
         if self.children:
             if isinstance(mp_self[1], Sequence) \
-                    and mp_self[1][-1] == mp_self[2]:
+                    and mp_self[1][2] == mp_self[2]:
                 closing = 1
             else:
                 closing = 0
             update_children(self, closing)
             if isinstance(mp_self[1], Sequence):
-                mapping[self] = (mp_self[0], sum(mp_self[1]) + len(mp_self[1]) - 1, mp_self[2])
+                mapping[self] = (mp_self[0], mp_self[1][0] + mp_self[1][1] - 1, mp_self[2])
             else:
                 mapping[self] = (mp_self[0], mp_self[0] + mp_self[1] + mp_self[2], mp_self[2])
+        elif isinstance(mp_self[1], Sequence):
+            mapping[self] = (mp_self[0], mp_self[1][0] + mp_self[1][1] - 1, mp_self[2])
         else:
             mapping[self] = (mp_self[0], mp_self[0] + cast(int, mp_self[1]) + mp_self[2], mp_self[2])
 
 
+    @cython.locals(i=cython.int, k=cython.int, N=cython.int)
+    def _write_tree(self, write: Callable[[str], None], tab, open_fn, close_fn,
+                    data_fn=lambda i: i, density=0, inline=False,
+                    inline_fn=lambda node: False, allow_omissions=False, depth=0):
+        """
+        Writes a tree representation of this node and its children in a
+        single depth-first pass by passing the pieces of the serialization
+        to the function ``write``. The output is the same as that of
+        ``'\\n'.join(self._tree_repr(...))``, only that reflowing and the
+        generation of serialization mappings are not supported. See
+        :py:meth:`Node._tree_repr` for a description of the parameters.
+        """
+        # frames: (children-iterator, inline, tail, usetab, tlf, depth)
+        stack = []
+        node = self
+        while True:
+            head = open_fn(node)
+            tail = close_fn(node)
+
+            if not inline:
+                reflow = inline_fn(node)
+                node_inline = reflow
+            else:
+                reflow = False
+                node_inline = True
+
+            if node_inline:
+                usetab = (tab * depth) if reflow else ''
+                hlf, tlf = '', ''
+            else:
+                usetab = (tab * depth)
+                hlf = '\n'
+                tlf = '\n' if density == 0 or (tail[0:1] == '<') else ''
+
+            if not node.result:
+                write(usetab + head + tail)
+
+            elif node._children:
+                if head:
+                    write(usetab + head)
+                stack.append((iter(node._children), node_inline, tail, usetab, tlf, depth,
+                              not head))
+
+            else:
+                res = node.content
+                if not node_inline and not head and allow_omissions:
+                    res = res.strip()  # WARNING: This changes the data in subtle ways
+                if density & 1 and res.find('\n') < 0:
+                    if not node_inline and head and head not in ("&", "&#x") \
+                            and (head[-1:] != '>' and head != '<!--'):
+                        gap = ' '
+                    elif node_inline and head[:1] == '(':  gap = ' '
+                    else:  gap = ''
+                    write(''.join((usetab, head, gap, data_fn(res), tail)))
+                else:
+                    lines = [data_fn(s) for s in res.split('\n')]
+                    N = len(lines)
+                    i, k = 0, N - 1
+                    if not node_inline and allow_omissions:
+                        while i < N and not lines[i]:
+                            i += 1
+                        while k >= 0 and not lines[k]:
+                            k -= 1
+                    tb = usetab + (tab if reflow or not node_inline else '')
+                    write(usetab + head)
+                    if hlf:
+                        write('\n' + tb)
+                    lf_tb = '\n' + tb
+                    for line in lines[i:k]:
+                        write(line)
+                        write(lf_tb)
+                    write(lines[k])
+                    if tlf:
+                        write('\n' + usetab + tail)
+                    else:
+                        write(tail)
+
+            # proceed with the next sibling or, if there is none, close the parent
+            while stack:
+                frame = stack[-1]
+                child = next(frame[0], None)
+                if child is not None:
+                    node = child
+                    inline = frame[1]
+                    depth = frame[5] + 1
+                    if frame[6]:  # first line of a parent without opening string
+                        stack[-1] = frame[:6] + (False,)
+                    elif not inline:
+                        write('\n')
+                    break
+                stack.pop()
+                _, node_inline, tail, usetab, tlf, depth, _ = frame
+                if tlf:
+                    write('\n' + usetab + tail)
+                else:
+                    write(tail)
+            else:
+                return
+
     def _reflow(self, tab: str, content: str, reflow_col: int) -> str:
         stripped = content.strip()
         i = content.find(stripped)
@@ -1954,54 +2220,17 @@ class Node:  # (collections.abc.Sized): Base class omitted for cython-compatibil
             wrapped.pop()
         return ''.join(wrapped)
 
-    def as_sxpr(self, src: Optional[str] = None,
-                indentation: int = 2,
-                compact: bool = True,
-                flatten_threshold: int = 92,
-                sxml: int = 0, reflow_col: int = 0,  # example: 80
-                mapping: RawMappingType = NO_MAPPING_SENTINEL) -> str:
-        """
-        Serializes the tree as S-expression, i.e. in lisp-like form. If this
-        method is called on a RootNode-object, error strings will be displayed
-        as pseudo-attributes of the nodes where the error is located.
-
-        :param src:  The source text or `None`. In case the source text is
-            given, the position of the element in the text will be
-            reported as position, line, column. In case the empty string is
-            given rather than None, only the position value will be
-            reported in case it has been initialized, i.e. pos >= 0.
-        :param indentation: The number of whitespaces for indentation
-        :param compact:  If True, a compact representation is returned where
-            closing brackets remain on the same line as the last element.
-        :param flatten_threshold:  Return the S-expression in flattened form if
-            the flattened expression does not exceed the threshold length.
-            A negative number means that it will always be flattened.
-        :param sxml:  If >= 1, attributes are rendered according to the
-            `SXML <https://okmij.org/ftp/Scheme/SXML.html>`_-conventions,
-            e.g. `` (@ (attr "value")`` instead of `` `(attr "value") ``
-            if 2, the attribute node (@) will always be present, even if empty.
-        :param reflow_col:  If > 0, the serialized form of the tree will be
-            reflowed to the given column width.
-        :param mapping:  If not NO_MAPPING_SENTINEL, the passed dictionary
-            will be filled with a mapping of the nodes to the length of their
-            opening, overall length and closing, respectively, e.g.
-            '(name "Fritz")' -> (5, 14, 1)
-
-        :returns: A string containing the S-expression serialization of the tree.
-        """
-        if not (0 <= sxml <= 2): raise ValueError(f"sxml must be 0 <= sxml <= 2, but not {sxml}")
-        if mapping and mapping is not NO_MAPPING_SENTINEL:
-            raise ValueError(f"Parameter 'mapping' must either be empty or "
-                             f"DHParser.nodetree.NO_MAPPING_SENTINEL, but not: {mapping}")
-
-        left_bracket, right_bracket, density = ('(', ')', 1) if compact else ('(', ')', 0)
+    def _sxpr_fns(self, src: Optional[str], sxml: int) \
+            -> Tuple[Callable[[Node], str], Callable[[Node], str], Callable[[str], str]]:
+        """Returns the opening-, closing- and data-functions for serializing
+        the tree as S-expression. See :py:meth:`Node.as_sxpr`."""
+        left_bracket, right_bracket = '(', ')'
         if isinstance(self, RootNode) and (src == '' or src == self.source):
             lbreaks = self.lbreaks
         else:
             lbreaks = [] if src is None else linebreaks(src)
         root = cast(RootNode, self) if isinstance(self, RootNode) \
             else None  # type: Optional[RootNode]
-        inner_content: str = ""
 
         def attr(name: str, value: str):
             if sxml:  return f' ({name} "{value}")'
@@ -2048,6 +2277,54 @@ class Node:  # (collections.abc.Sized): Base class omitted for cython-compatibil
                 else "'%s'" % strg if strg.find("'") < 0 \
                 else '"%s"' % strg.replace('"', r'\"')
 
+
+
+        return opening, closing, pretty
+
+    def as_sxpr(self, src: Optional[str] = None,
+                indentation: int = 2,
+                compact: bool = True,
+                flatten_threshold: int = 92,
+                sxml: int = 0, reflow_col: int = 0,  # example: 80
+                mapping: RawMappingType = NO_MAPPING_SENTINEL) -> str:
+        """
+        Serializes the tree as S-expression, i.e. in lisp-like form. If this
+        method is called on a RootNode-object, error strings will be displayed
+        as pseudo-attributes of the nodes where the error is located.
+
+        :param src:  The source text or `None`. In case the source text is
+            given, the position of the element in the text will be
+            reported as position, line, column. In case the empty string is
+            given rather than None, only the position value will be
+            reported in case it has been initialized, i.e. pos >= 0.
+        :param indentation: The number of whitespaces for indentation
+        :param compact:  If True, a compact representation is returned where
+            closing brackets remain on the same line as the last element.
+        :param flatten_threshold:  Return the S-expression in flattened form if
+            the flattened expression does not exceed the threshold length.
+            A negative number means that it will always be flattened.
+        :param sxml:  If >= 1, attributes are rendered according to the
+            `SXML <https://okmij.org/ftp/Scheme/SXML.html>`_-conventions,
+            e.g. `` (@ (attr "value")`` instead of `` `(attr "value") ``
+            if 2, the attribute node (@) will always be present, even if empty.
+        :param reflow_col:  If > 0, the serialized form of the tree will be
+            reflowed to the given column width.
+        :param mapping:  If not NO_MAPPING_SENTINEL, the passed dictionary
+            will be filled with a mapping of the nodes to the length of their
+            opening, overall length and closing, respectively, e.g.
+            '(name "Fritz")' -> (5, 14, 1)
+
+        :returns: A string containing the S-expression serialization of the tree.
+        """
+        if not (0 <= sxml <= 2): raise ValueError(f"sxml must be 0 <= sxml <= 2, but not {sxml}")
+        if mapping and mapping is not NO_MAPPING_SENTINEL:
+            raise ValueError(f"Parameter 'mapping' must either be empty or "
+                             f"DHParser.nodetree.NO_MAPPING_SENTINEL, but not: {mapping}")
+
+        density = 1 if compact else 0
+        opening, closing, pretty = self._sxpr_fns(src, sxml)
+        inner_content: str = ""
+
         def reflow(tab: str, content: str, depth: int) -> str:
             if len(content) < reflow_col:
                 return content
@@ -2107,6 +2384,44 @@ class Node:  # (collections.abc.Sized): Base class omitted for cython-compatibil
         return self.as_sxpr(src, indentation, compact, flatten_threshold, sxml=normal_form,
                             reflow_col=reflow_col, mapping=mapping)
 
+    def _exceeds_flatten_threshold(self, threshold: int) -> bool:
+        """Returns True, if the flattened S-expression of the tree would
+        certainly be longer than ``threshold``. The check stops as soon as
+        a lower bound for the length of the flattened S-expression has
+        surpassed the threshold."""
+        length = 0
+        for nd in self.select_if(lambda _: True, include_root=True):
+            length += len(nd.name) + 2
+            if not nd._children and nd._result:
+                # flattening may remove whitespace, but no other characters
+                length += 2 + len(''.join(nd.content[:threshold + 1].split()))
+            if length > threshold:
+                return True
+        return False
+
+    def write_sxpr(self, fp, src: Optional[str] = None,
+                   indentation: int = 2,
+                   compact: bool = True,
+                   flatten_threshold: int = 92,
+                   sxml: int = 0, reflow_col: int = 0):
+        """Writes the tree as S-expression to the file-like object ``fp``.
+        The output is the same as that of :py:meth:`Node.as_sxpr`, but it
+        is generated in a single pass and passed on to ``fp`` piecemeal.
+        Only if the S-expression will be flattened or reflowed, it is
+        generated as a whole with :py:meth:`Node.as_sxpr`, first.
+        See :py:meth:`Node.as_sxpr` for a description of the parameters."""
+        if not (0 <= sxml <= 2): raise ValueError(f"sxml must be 0 <= sxml <= 2, but not {sxml}")
+        if reflow_col > 0 or not (flatten_threshold == 0
+                                  or (0 < flatten_threshold < INFINITE
+                                      and self._exceeds_flatten_threshold(flatten_threshold))):
+            fp.write(self.as_sxpr(src, indentation, compact, flatten_threshold, sxml, reflow_col))
+            return
+        opening, closing, pretty = self._sxpr_fns(src, sxml)
+        writer = _ChunkedWriter(fp)
+        self._write_tree(writer.write, ' ' * indentation, opening, closing, pretty,
+                         density=1 if compact else 0)
+        writer.flush()
+
     def collect_empty_tags(self) -> Set[str]:
         """Collects the names of all nodes for which it is True that
         all nodes with that name are empty. Example::
@@ -2119,56 +2434,27 @@ class Node:  # (collections.abc.Sized): Base class omitted for cython-compatibil
         """
         empty_tags = set()
         not_empty = set()
-        for nd in self.walk_tree(include_root=True):
-            tag = nd.name
-            if tag not in not_empty:
-                if nd.result:
-                    not_empty.add(tag)
-                    try:
-                        empty_tags.remove(tag)
-                    except KeyError:
-                        pass
-                else:
-                    empty_tags.add(tag)
-        return empty_tags
-
-    def as_xml(self, src: Optional[str] = None,
-               indentation: int = 2,
-               inline_tags: AbstractSet[str] = frozenset(),
-               string_tags: AbstractSet[str] = LEAF_PTYPES,
-               empty_tags: AbstractSet[str] = AUTO_EMPTY_TAGS,
-               strict_mode: bool = True, reflow_col: int = 0,  # example: 80
-               mapping: RawMappingType = NO_MAPPING_SENTINEL) -> str:
-        """Serializes the tree of nodes as XML.
-
-        :param src: The source text or `None`. In case the source text is
-                given, the position will also be reported as line and column.
-        :param indentation: The number of whitespaces for indentation
-        :param inline_tags:  A set of tag names, the content of which will always be
-                written on a single line, unless it contains explicit line feeds (`\\n`).
-                In addition, all nodes that have the attribute ``xml:space="preserve"``
-                will be inlined.
-        :param string_tags: A set of tags from which only the content will be printed, but
-                neither the opening tag nor its attr nor the closing tag. This
-                allows producing a mix of plain text and child tags in the output,
-                which otherwise is not supported by the Node object, because it
-                requires its content to be either a tuple of children or string content.
-        :param empty_tags: A set of tags which shall be rendered as empty elements, e.g.
-                "<empty/>" instead of "<empty></empty>".
-        :param strict_mode: If True, violation of stylistic or interoperability rules
-                raises a ValueError.
-        :param reflow_col: If > 0, the serialized form of the tree will be
-            reflown to the given column width. This is useful for pretty-printing
-        :param mapping: If not NO_MAPPING_SENTINEL, the passed dictionary
-            will be filled with a mapping of the nodes to the length of their
-            opening, the overall length and closing, respectively, e.g.
-            '<name>Fritz</name>' -> (6, 18, 7)
-        :returns: The XML-string representing the tree originating in `self`
-        """
-        if mapping and mapping is not NO_MAPPING_SENTINEL:
-            raise ValueError("Parameter 'mapping' must either be empty or "
-                             "DHParser.nodetree.NO_MAPPING_SENTINEL, but not: " + str(mapping))
-
+        stack = [self]
+        while stack:
+            nd = stack.pop()
+            children = nd._children
+            if children:
+                stack.extend(children)
+                not_empty.add(nd.name)
+            elif nd._result:
+                not_empty.add(nd.name)
+            else:
+                empty_tags.add(nd.name)
+        return empty_tags - not_empty
+
+    def _xml_fns(self, src: Optional[str],
+                 inline_tags: AbstractSet[str],
+                 string_tags: AbstractSet[str],
+                 empty_tags: AbstractSet[str],
+                 strict_mode: bool) -> Tuple[Callable[[Node], str], Callable[[Node], str],
+                                             Callable[[str], str], Callable[[Node], bool]]:
+        """Returns the opening-, closing-, data- and inlining-functions for
+        serializing the tree as XML. See :py:meth:`Node.as_xml`."""
         root = cast(RootNode, self) if isinstance(self, RootNode) \
             else None  # type: Optional[RootNode]
         if isinstance(self, RootNode) and (src == '' or src == self.source):
@@ -2196,59 +2482,80 @@ class Node:  # (collections.abc.Sized): Base class omitted for cython-compatibil
                 'variable "xml_attribute_error_handling": ' + attr_err_handling
             attr_filter = attr_err_ignore
 
+        tag_names = dict()  # type: Dict[str, str]  # cache for xml_tag_name()
+
         def opening(node: Node) -> str:
             """Returns the opening string for the representation of `node`."""
             nonlocal self, attr_filter, _empty_tags, line_breaks
-            if node is self and node.name == ':XML':  return ''
-            if node.name in string_tags and not node.has_attr():
-                if node.name == CHAR_REF_PTYPE and node.content.isalnum(): return "&#x"
-                elif node.name == ENTITY_REF_PTYPE: return "&"
+            name = node.name
+            if node is self and name == ':XML':  return ''
+            attributes = node._attributes if node.has_attr() else None
+            if not attributes and name in string_tags:
+                if name == CHAR_REF_PTYPE and node.content.isalnum(): return "&#x"
+                elif name == ENTITY_REF_PTYPE: return "&"
                 else: return ''
-            txt = ['<', xml_tag_name(node.name)]
-            if node.has_attr():
-                if node.name[0:1] == '?' and node.name[1:4].lower() != 'xml' \
-                        and node.has_attr('instructions__'):
-                    assert len(node.attr) == 1
-                    txt.append(' ' + node.attr['instructions__'])
+            try:
+                txt = ['<', tag_names[name]]
+            except KeyError:
+                tag_names[name] = xml_tag_name(name)
+                txt = ['<', tag_names[name]]
+            if attributes:
+                if name[0:1] == '?' and name[1:4].lower() != 'xml' \
+                        and 'instructions__' in attributes:
+                    assert len(attributes) == 1
+                    txt.append(' ' + attributes['instructions__'])
                 else:
-                    txt.extend(' %s=%s' % (k, attr_filter(str(v))) for k, v in node.attr.items())
-            if src and not (node.has_attr('line') or node.has_attr('col')):
-                txt.append(' line="%i" col="%i"' % line_col(line_breaks, node._pos))
-            if src == '' and not (node.has_attr() and '_pos' in node.attr) and node._pos >= 0:
-                txt.append(' _pos="%i"' % node._pos)
-            if root and id(node) in root.error_nodes and not node.has_attr('err'):
-                txt.append(' err=' + fix_XML_attribute_value(
-                    ''.join(str(err) for err in root.node_errors(node))))
-            if node.name[0:1] == '?' and not node.result:
-                _empty_tags.add(node.name)
-            if node.name in _empty_tags:
-                if node.name[0:1] != '?' and node.result:
+                    txt.extend(' %s=%s' % (k, attr_filter(str(v))) for k, v in attributes.items())
+                if src and not ('line' in attributes or 'col' in attributes):
+                    txt.append(' line="%i" col="%i"' % line_col(line_breaks, node._pos))
+                if src == '' and '_pos' not in attributes and node._pos >= 0:
+                    txt.append(' _pos="%i"' % node._pos)
+                if root and id(node) in root.error_nodes and 'err' not in attributes:
+                    txt.append(' err=' + fix_XML_attribute_value(
+                        ''.join(str(err) for err in root.node_errors(node))))
+            else:
+                if src:
+                    txt.append(' line="%i" col="%i"' % line_col(line_breaks, node._pos))
+                elif src == '' and node._pos >= 0:
+                    txt.append(' _pos="%i"' % node._pos)
+                if root and id(node) in root.error_nodes:
+                    txt.append(' err=' + fix_XML_attribute_value(
+                        ''.join(str(err) for err in root.node_errors(node))))
+            if name[0:1] == '?' and not node._result:
+                _empty_tags.add(name)
+            if name in _empty_tags:
+                if name[0:1] != '?' and node._result:
                     if strict_mode:
                         raise ValueError(
-                            f'Empty element "{node.name}" with content: '
+                            f'Empty element "{name}" with content: '
                             f'"{abbreviate_middle(str(node.result), 40)}" !? '
                             f'Use Node.as_xml(..., strict_mode=False) to suppress this error!')
-                if node.name[0:1] == '?':  ending = '?>'
-                elif node.result:  ending = '>'
+                if name[0:1] == '?':  ending = '?>'
+                elif node._result:  ending = '>'
                 else:  ending = '/>'
-            elif node.name == '!--':
+            elif name == '!--':
                 ending = ""
             else:
                 ending = ">"
-            return "".join(txt + [ending])
+            txt.append(ending)
+            return "".join(txt)
 
         def closing(node: Node):
             """Returns the closing string for the representation of `node`."""
             nonlocal self
-            if node is self and node.name == ':XML':  return ''
-            if (node.name in _empty_tags and not node.result) \
-                    or (node.name in string_tags and not node.has_attr()):
-                if node.name == CHAR_REF_PTYPE and node.content.isalnum(): return ";"
-                elif node.name == ENTITY_REF_PTYPE: return ";"
+            name = node.name
+            if node is self and name == ':XML':  return ''
+            if (name in _empty_tags and not node._result) \
+                    or (name in string_tags and not node.has_attr()):
+                if name == CHAR_REF_PTYPE and node.content.isalnum(): return ";"
+                elif name == ENTITY_REF_PTYPE: return ";"
                 else: return ''
-            elif node.name == '!--':
+            elif name == '!--':
                 return '-->'
-            return '</' + xml_tag_name(node.name) + '>'
+            try:
+                return '</' + tag_names[name] + '>'
+            except KeyError:
+                return '</' + xml_tag_name(name) + '>'
 
         def sanitizer(content: str) -> str:
             """Substitute "&", "<", ">" in XML-content by the respective entities."""
@@ -2263,9 +2570,54 @@ class Node:  # (collections.abc.Sized): Base class omitted for cython-compatibil
             printed on several lines to avoid unwanted gaps in the output.
             """
             return node.name in inline_tags \
-                   or (node.get_attr('xml:space', 'default') == 'preserve')
+                   or (node.has_attr() and node._attributes.get('xml:space') == 'preserve')
                    # or (node.name in string_tags and not node.children)
 
+        return opening, closing, sanitizer, inlining
+
+    def as_xml(self, src: Optional[str] = None,
+               indentation: int = 2,
+               inline_tags: AbstractSet[str] = frozenset(),
+               string_tags: AbstractSet[str] = LEAF_PTYPES,
+               empty_tags: AbstractSet[str] = AUTO_EMPTY_TAGS,
+               strict_mode: bool = True, reflow_col: int = 0,  # example: 80
+               mapping: RawMappingType = NO_MAPPING_SENTINEL) -> str:
+        """Serializes the tree of nodes as XML.
+
+        :param src: The source text or `None`. In case the source text is
+                given, the position will also be reported as line and column.
+        :param indentation: The number of whitespaces for indentation
+        :param inline_tags:  A set of tag names, the content of which will always be
+                written on a single line, unless it contains explicit line feeds (`\\n`).
+                In addition, all nodes that have the attribute ``xml:space="preserve"``
+                will be inlined.
+        :param string_tags: A set of tags from which only the content will be printed, but
+                neither the opening tag nor its attr nor the closing tag. This
+                allows producing a mix of plain text and child tags in the output,
+                which otherwise is not supported by the Node object, because it
+                requires its content to be either a tuple of children or string content.
+        :param empty_tags: A set of tags which shall be rendered as empty elements, e.g.
+                "<empty/>" instead of "<empty></empty>".
+        :param strict_mode: If True, violation of stylistic or interoperability rules
+                raises a ValueError.
+        :param reflow_col: If > 0, the serialized form of the tree will be
+            reflown to the given column width. This is useful for pretty-printing
+        :param mapping: If not NO_MAPPING_SENTINEL, the passed dictionary
+            will be filled with a mapping of the nodes to the length of their
+            opening, the overall length and closing, respectively, e.g.
+            '<name>Fritz</name>' -> (6, 18, 7)
+        :returns: The XML-string representing the tree originating in `self`
+        """
+        if mapping and mapping is not NO_MAPPING_SENTINEL:
+            raise ValueError("Parameter 'mapping' must either be empty or "
+                             "DHParser.nodetree.NO_MAPPING_SENTINEL, but not: " + str(mapping))
+
+        # string_tags = frozenset(string_tags)
+        if reflow_col > 0:
+           inline_tags = frozenset(inline_tags) | string_tags
+        opening, closing, sanitizer, inlining = self._xml_fns(
+            src, inline_tags, string_tags, empty_tags, strict_mode)
+
         def reflow(tab: str, content: str, depth: int) -> str:
             lstripped = content.lstrip()
             if lstripped[0:1] != '<':
@@ -2273,9 +2625,6 @@ class Node:  # (collections.abc.Sized): Base class omitted for cython-compatibil
                 tab = ''
             return self._reflow(tab, content, reflow_col)
 
-        # string_tags = frozenset(string_tags)
-        if reflow_col > 0:
-           inline_tags = frozenset(inline_tags) | string_tags
         d = -1 if self.name == ":XML" else 0
         reflow_fn = reflow if reflow_col > 0 else NO_REFLOW
         xml = '\n'.join(self._tree_repr(
@@ -2285,6 +2634,30 @@ class Node:  # (collections.abc.Sized): Base class omitted for cython-compatibil
             self._finalize_mapping(mapping)
         return xml
 
+    def write_xml(self, fp, src: Optional[str] = None,
+                  indentation: int = 2,
+                  inline_tags: AbstractSet[str] = frozenset(),
+                  string_tags: AbstractSet[str] = LEAF_PTYPES,
+                  empty_tags: AbstractSet[str] = AUTO_EMPTY_TAGS,
+                  strict_mode: bool = True, reflow_col: int = 0):
+        """Writes the tree as XML to the file-like object ``fp``. The output
+        is the same as that of :py:meth:`Node.as_xml`, but it is generated
+        in a single pass and passed on to ``fp`` piecemeal, which saves
+        memory and time when serializing large trees. (If ``reflow_col > 0``
+        the XML is generated as a whole with :py:meth:`Node.as_xml`, first.)
+        See :py:meth:`Node.as_xml` for a description of the parameters."""
+        if reflow_col > 0:
+            fp.write(self.as_xml(src, indentation, inline_tags, string_tags, empty_tags,
+                                 strict_mode, reflow_col))
+            return
+        opening, closing, sanitizer, inlining = self._xml_fns(
+            src, inline_tags, string_tags, empty_tags, strict_mode)
+        writer = _ChunkedWriter(fp)
+        self._write_tree(writer.write, ' ' * indentation, opening, closing, sanitizer,
+                         density=1, inline_fn=inlining, allow_omissions=bool(string_tags),
+                         depth=-1 if self.name == ":XML" else 0)
+        writer.flush()
+
     def as_html(self, css: str='', head: str='', lang: str='en',
                 empty_tags: AbstractSet[str] = HTML_EMPTY_TAGS,
                 **kwargs) -> str:
@@ -2363,16 +2736,31 @@ class Node:  # (collections.abc.Sized): Base class omitted for cython-compatibil
             {'letters': [['a', 'A'], ['b', 'B'], ['c', 'C'], ['a', 'doublette']]}
 
         """
-        def list_flavor(node):
-            jo = [node.name,
-                  [list_flavor(nd) for nd in node._children]
-                  if node._children else str(node._result)]
-            pos = node._pos
-            if include_pos and pos >= 0:
-                jo.append(pos)
-            if node.has_attr():
-                jo.append(node.attr)
-            return jo
+        def list_flavor(root):
+            # explicit stack instead of recursion; frames: (node, children-iterator, JSON-list)
+            stack = [(root, iter(root._children), [])]
+            while True:
+                node, children, child_objs = stack[-1]
+                for child in children:
+                    if child._children:
+                        stack.append((child, iter(child._children), []))
+                        break
+                    jo = [child.name, str(child._result)]
+                    if include_pos and child._pos >= 0:
+                        jo.append(child._pos)
+                    if child.has_attr():
+                        jo.append(child.attr)
+                    child_objs.append(jo)
+                else:
+                    stack.pop()
+                    jo = [node.name, child_objs if node._children else str(node._result)]
+                    if include_pos and node._pos >= 0:
+                        jo.append(node._pos)
+                    if node.has_attr():
+                        jo.append(node.attr)
+                    if not stack:
+                        return jo
+                    stack[-1][2].append(jo)
 
         def dict_flavor(node):
             names = set()
@@ -2486,10 +2874,91 @@ class Node:  # (collections.abc.Sized): Base class omitted for cython-compatibil
 
         """
         if not indent or indent <= 0:  indent = None
+        if not as_dict:
+            fp = io.StringIO()
+            self.write_json(fp, indent, ensure_ascii, as_dict, include_pos)
+            return fp.getvalue()
         return json.dumps(self.to_json_obj(as_dict=as_dict, include_pos=include_pos),
                           indent=indent, ensure_ascii=ensure_ascii,
                           separators=(', ', ': ') if indent is not None else (',', ':'))
 
+    def write_json(self, fp, indent: Optional[int] = 2, ensure_ascii=False,
+                   as_dict: bool=False, include_pos: bool=True):
+        """Writes the tree as JSON to the file-like object ``fp``. The output
+        is the same as that of :py:meth:`Node.as_json`. List-flavored JSON
+        is written in a single pass directly from the tree. For the
+        dictionary-flavor, the JSON-object of the tree is generated first
+        and then passed on to ``fp`` piecemeal by ``json.dump()``."""
+        if not indent or indent <= 0:  indent = None
+        writer = _ChunkedWriter(fp)
+        if as_dict:
+            json.dump(self.to_json_obj(as_dict=as_dict, include_pos=include_pos), writer,
+                      indent=indent, ensure_ascii=ensure_ascii,
+                      separators=(', ', ': ') if indent is not None else (',', ':'))
+            writer.flush()
+            return
+
+        write = writer.write
+        encode = encode_basestring_ascii if ensure_ascii else encode_basestring
+        if indent is None:
+            separator = ','
+
+            def newline(level: int) -> str:
+                return ''
+        else:
+            # the same layout as json.dumps(..., indent=indent, separators=(', ', ': '))
+            separator = ', '
+            newlines = ['\n']
+
+            def newline(level: int) -> str:
+                """Returns the line-break and indentation for the nesting-level."""
+                while level >= len(newlines):
+                    newlines.append('\n' + ' ' * (indent * len(newlines)))
+                return newlines[level]
+
+        def close_node(node: Node, level: int):
+            nl = newline(level + 1)
+            if include_pos and node._pos >= 0:
+                write(separator + nl + str(node._pos))
+            if node.has_attr():
+                attributes = json.dumps(node.attr, ensure_ascii=ensure_ascii, indent=indent,
+                                        separators=(', ', ': ') if indent else (',', ':'))
+                if indent:
+                    attributes = attributes.replace('\n', nl)
+                write(separator + nl + attributes)
+            write(newline(level) + ']')
+
+        # explicit stack of (node, children-iterator) instead of recursion;
+        # node-arrays are nested two levels deep in their parent's array
+        stack = []
+        node = self
+        while True:
+            level = 2 * len(stack)
+            nl = newline(level + 1)
+            if node._children:
+                write('[' + nl + encode(node.name) + separator + nl + '[' + newline(level + 2))
+                stack.append((node, iter(node._children)))
+                comma = False
+            else:
+                write('[' + nl + encode(node.name) + separator + nl + encode(str(node._result)))
+                close_node(node, level)
+                comma = True
+            while stack:
+                node, children = stack[-1]
+                child = next(children, None)
+                if child is not None:
+                    if comma:  write(separator + newline(2 * len(stack)))
+                    node = child
+                    break
+                stack.pop()
+                level = 2 * len(stack)
+                write(newline(level + 1) + ']')
+                close_node(node, level)
+                comma = True
+            else:
+                break
+        writer.flush()
+
 
     def as_unist_obj(self, flavor: str = "xast", lbreaks: List[int] = []) -> Dict:
         """Returns the tree as JSON-Object conforming to the
@@ -2569,30 +3038,162 @@ class Node:  # (collections.abc.Sized): Base class omitted for cython-compatibil
         return self.as_ndst(src=src, indent=indent)
 
 
-    # serialization meta-method ###
+    # Binary serialization ###
 
-    @cython.locals(vsize=cython.int, i=cython.int, threshold=cython.int)
-    def serialize(self, how: str = 'default') -> str:
-        """
-        Serializes the tree originating in the node `self` either as
-        S-expression, XML, JSON, or in compact form. Possible values for
-        `how` are 'S-expression', 'XML', 'JSON', 'indented' accordingly, or
-        'AST', 'CST', 'default', in which case the value of the respective
-        configuration variable determines the serialization format.
-        (See module :py:mod:`DHParser.configuration`.)
+    def as_binary(self, include_pos: bool = True) -> bytes:
+        """Serializes the tree originating in `self` in DHParser's compact
+        binary format, which is much faster to write and to read back (with
+        :py:func:`parse_binary`) than any of the textual serializations.
+        If `self` is a :py:class:`RootNode`, the errors are serialized, too.
+
+        The binary format consists of a header (:py:data:`BINARY_TREE_MAGIC`
+        followed by a version and a flags-byte) and four sections, each
+        of which is preceded by its length in bytes as a varint:
+
+        1. the string-table: the utf-8-encoded, zero-separated names,
+           attribute-keys, attribute-values and error-messages,
+        2. the utf-8-encoded concatenation of the content of all leaf-nodes,
+        3. the structure: one record of varints per node in post-order, i.e.
+           (string-index << 3 | flags), the number of children (branch-nodes)
+           or of characters (leaf-nodes), optionally the position (zigzag-
+           encoded as difference to the last position) and the attributes.
+           flags are: 1 = branch-node, 2 = position, 4 = attributes,
+        4. only if bit 1 of the flags-byte is set, the errors.
+
+        Example::
+
+            >>> tree = parse_sxpr('(a (b "X") (c `(class "z") "Y"))').with_pos(0)
+            >>> data = tree.as_binary()
+            >>> data[:4]
+            b'DHPB'
+            >>> parse_binary(data).equals(tree)
+            True
         """
-        def exceeds_compact_threshold(node: Node, threshold: int) -> bool:
-            """Returns True if the S-expression-serialization of the tree
-            rooted in `node` would exceed a certain number of lines and
-            should therefore be rendered in a more compact form.
-            """
-            vsize = 0
-            for _ in node.select_if(lambda _: True, include_root=True):
-                vsize += 1
-                if vsize > threshold:
-                    return True
-            return False
+        root = cast(RootNode, self) if isinstance(self, RootNode) \
+            else None  # type: Optional[RootNode]
+        strings = dict()  # type: Dict[str, int]
+        texts = []  # type: List[str]
+        structure = bytearray()
+        put = structure.append
+
+        def index(s: str) -> int:
+            i = strings.get(s, -1)
+            if i < 0:
+                i = len(strings)
+                strings[s] = i
+            return i
+
+        def varint(out: bytearray, n: int):
+            while n >= 0x80:
+                out.append(n & 0x7F | 0x80)
+                n >>= 7
+            out.append(n)
+
+        error_node_ids = set(root.error_nodes.keys()) if root is not None and root.errors \
+            else set()  # type: Set[int]
+        node_index = dict()  # type: Dict[int, int]
+
+        # nodes in post-order, collected with an explicit stack
+        nodes = []  # type: List[Node]
+        stack = [(self, iter(self._children))]
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                if child._children:
+                    stack.append((child, iter(child._children)))
+                    break
+                nodes.append(child)
+            else:
+                stack.pop()
+                nodes.append(node)
+
+        last_pos = 0
+        for count, node in enumerate(nodes):
+            h = strings.get(node.name, -1)
+            if h < 0:
+                h = index(node.name)
+            h <<= 3
+            if node._children:
+                h |= 1
+                n = len(node._children)
+            else:
+                text = str(node._result)
+                texts.append(text)
+                n = len(text)
+            pos = node._pos
+            if include_pos and pos >= 0:  h |= 2
+            if node.has_attr():  h |= 4
+            if h < 0x80:  put(h)
+            else:  varint(structure, h)
+            if n < 0x80:  put(n)
+            else:  varint(structure, n)
+            if h & 2:
+                d = pos - last_pos
+                last_pos = pos
+                d = d << 1 if d >= 0 else (-d << 1) - 1
+                if d < 0x80:  put(d)
+                else:  varint(structure, d)
+            if h & 4:
+                attributes = node._attributes
+                varint(structure, len(attributes))
+                for k, v in attributes.items():
+                    varint(structure, index(k))
+                    varint(structure, index(str(v)))
+            if error_node_ids and id(node) in error_node_ids:
+                node_index[id(node)] = count
+
+        errors = bytearray()
+        if root is not None and root.errors:
+            error_node = {id(e): node_index.get(nid, -1)
+                          for nid, el in root.error_nodes.items() for e in el}
+
+            def encode_error(error: Error, node_nr: int):
+                for n in (error.code, error.pos, error.length, index(error.message),
+                          error.orig_pos + 1, error.line + 1, error.column + 1,
+                          error.end_line + 1, error.end_column + 1,
+                          index(error.orig_doc), node_nr + 1, len(error.related)):
+                    varint(errors, n)
+                for related in error.related:
+                    encode_error(related, -1)
+
+            varint(errors, len(root.errors))
+            for error in root.errors:
+                encode_error(error, error_node.get(id(error), -1))
+
+        table = '\x00'.join(strings.keys())
+        if table.count('\x00') != len(strings) - 1:
+            raise ValueError('Binary serialization of strings that contain the '
+                             'null-character is not supported!')
+        table = table.encode('utf-8')
+        text = ''.join(texts).encode('utf-8')
+        out = bytearray(BINARY_TREE_MAGIC)
+        out.append(BINARY_TREE_VERSION)
+        out.append(1 if errors else 0)
+        for section in (table, text, structure, errors):
+            if section is errors and not errors:  break
+            varint(out, len(section))
+            out.extend(section)
+        return bytes(out)
+
+    # serialization meta-method ###
+
+    @cython.locals(vsize=cython.int, threshold=cython.int)
+    def _exceeds_compact_threshold(self, threshold: int) -> bool:
+        """Returns True if the S-expression-serialization of the tree
+        rooted in `self` would exceed a certain number of lines and
+        should therefore be rendered in a more compact form.
+        """
+        vsize = 0
+        for _ in self.select_if(lambda _: True, include_root=True):
+            vsize += 1
+            if vsize > threshold:
+                return True
+        return False
 
+    @staticmethod
+    def _serialization_switch(how: str) -> str:
+        """Resolves 'AST', 'CST' and 'default' to the configured serialization
+        and returns the serialization name in lower case."""
         switch = how.lower()
         default = get_config_value('default_serialization').lower()
         if switch == 'ast':
@@ -2603,17 +3204,30 @@ class Node:  # (collections.abc.Sized): Base class omitted for cython-compatibil
             if not switch:  switch = default
         elif switch == 'default':
             switch = default
+        return switch
+
+    def serialize(self, how: str = 'default') -> Union[str, bytes]:
+        """
+        Serializes the tree originating in the node `self` either as
+        S-expression, XML, JSON, or in compact form. Possible values for
+        `how` are 'S-expression', 'XML', 'JSON', 'indented' accordingly, or
+        'AST', 'CST', 'default', in which case the value of the respective
+        configuration variable determines the serialization format.
+        (See module :py:mod:`DHParser.configuration`.) 'binary' yields
+        bytes instead of a string (see :py:meth:`Node.as_binary`).
+        """
+        switch = self._serialization_switch(how)
 
         # flatten_threshold = get_config_value('flatten_sxpr_threshold')
         compact_threshold = get_config_value('compact_sxpr_threshold')
 
         if switch in ('s-expression', 'sxpr'):
             return self.as_sxpr(flatten_threshold=get_config_value('flatten_sxpr_threshold'),
-                                compact=exceeds_compact_threshold(self, compact_threshold))
+                                compact=self._exceeds_compact_threshold(compact_threshold))
         elif switch[:4] == 'sxml':
             normal_form = int(switch[-1]) if len(switch) > 4 else 1
             return self.as_sxml(flatten_threshold=get_config_value('flatten_sxpr_threshold'),
-                                compact=exceeds_compact_threshold(self, compact_threshold),
+                                compact=self._exceeds_compact_threshold(compact_threshold),
                                 normal_form=normal_form)
         elif switch == 'xml':
             return self.as_xml(strict_mode=False)
@@ -2629,12 +3243,42 @@ class Node:  # (collections.abc.Sized): Base class omitted for cython-compatibil
             return self.as_ndst()
         elif switch == 'xast':
             return self.as_xast()
+        elif switch == 'binary':
+            return self.as_binary()
         else:
             s = how if how == switch else (how + '/' + switch)
             raise ValueError('Unknown serialization "%s". Allowed values are either: %s or : %s'
                              % (s, "ast, cst, default",
                                 ", ".join(ALLOWED_PRESET_VALUES['default_serialization'])))
 
+    def serialize_to(self, fp, how: str = 'default'):
+        """Writes the serialization of the tree to the file-like object ``fp``.
+        The output is the same as that of :py:meth:`Node.serialize`, but
+        S-expressions, XML and JSON are streamed to ``fp`` while traversing
+        the tree instead of being generated as one large string, first.
+        For the 'binary' serialization ``fp`` must have been opened in
+        binary mode.
+        """
+        switch = self._serialization_switch(how)
+        compact_threshold = get_config_value('compact_sxpr_threshold')
+        if switch in ('s-expression', 'sxpr'):
+            self.write_sxpr(fp, flatten_threshold=get_config_value('flatten_sxpr_threshold'),
+                            compact=self._exceeds_compact_threshold(compact_threshold))
+        elif switch[:4] == 'sxml':
+            normal_form = int(switch[-1]) if len(switch) > 4 else 1
+            assert 1 <= normal_form <= 2, "Presently, only sxml normal forms 1 and 2 are supported"
+            self.write_sxpr(fp, flatten_threshold=get_config_value('flatten_sxpr_threshold'),
+                            compact=self._exceeds_compact_threshold(compact_threshold),
+                            sxml=normal_form)
+        elif switch == 'xml':
+            self.write_xml(fp, strict_mode=False)
+        elif switch == 'json':
+            self.write_json(fp, indent=0)
+        elif switch in ('dict.json', 'jsondict'):
+            self.write_json(fp, indent=2, as_dict=True, include_pos=False)
+        else:
+            fp.write(self.serialize(how))
+
     # Export and import as Element-Tree ###
 
     def as_etree(self, ET=None, string_tags: AbstractSet[str] = LEAF_PTYPES,
@@ -2959,29 +3603,35 @@ class RootNode(Node):
                 (content[e_pos - self.pos:], '; '.join(e.message for e in errors))
         return self.content
 
-    def __deepcopy__(self, memodict={}):
-        old_node_ids = [id(nd) for nd in self.select_if(lambda n: True, include_root=True)]
+    def __deepcopy__(self, memodict=None):
+        if memodict is None:
+            memodict = {}
         duplicate = self.__class__(None)
+        memodict[id(self)] = duplicate
         if self._children:
+            # afterwards, memodict maps the ids of the original nodes to their copies
             duplicate._children = copy.deepcopy(self._children, memodict)
             duplicate._result = duplicate._children
         else:
             duplicate._children = tuple()
             duplicate._result = self._result
         duplicate._pos = self._pos
-        new_node_ids = [id(nd) for nd in duplicate.walk_tree(include_root=True)]
-        map_id = dict(zip(old_node_ids, new_node_ids))
+
+        def map_id(i: int) -> int:
+            nd = memodict.get(i, None)
+            return i if nd is None else id(nd)
+
         if self.has_attr():
             duplicate.attr.update(self._attributes)
             # duplicate._attributes = copy.deepcopy(self._attributes)  # this is blocked by cython
         duplicate.errors = copy.deepcopy(self.errors, memodict)
         duplicate._error_set = {error for error in duplicate.errors}
-        duplicate.error_nodes = {map_id.get(i, i): el[:] for i, el in self.error_nodes.items()}
-        duplicate.error_positions = {pos: {map_id.get(i, i) for i in s}
+        duplicate.error_nodes = {map_id(i): el[:] for i, el in self.error_nodes.items()}
+        duplicate.error_positions = {pos: {map_id(i) for i in s}
                                      for pos, s in self.error_positions.items()}
         duplicate.source = self.source
         duplicate.source_mapping = self.source_mapping
-        duplicate.lbreaks = copy.deepcopy(self.lbreaks, memodict)
+        duplicate.lbreaks = self.lbreaks[:]
         duplicate.error_flag = self.error_flag
 
         duplicate.inline_tags = self.inline_tags
@@ -3235,11 +3885,30 @@ class RootNode(Node):
                         if empty_tags is EMPTY_SET_SENTINEL else empty_tags),
             strict_mode=strict_mode, reflow_col=reflow_col, mapping=mapping)
 
-    def serialize(self, how: str = '') -> str:
+    def write_xml(self, fp, src: Optional[str] = None,
+                  indentation: int = 2,
+                  inline_tags: AbstractSet[str] = EMPTY_SET_SENTINEL,
+                  string_tags: AbstractSet[str] = EMPTY_SET_SENTINEL,
+                  empty_tags: AbstractSet[str] = EMPTY_SET_SENTINEL,
+                  strict_mode: bool=True, reflow_col: int = 0):
+        super().write_xml(
+            fp, src, indentation,
+            inline_tags=self.inline_tags if inline_tags is EMPTY_SET_SENTINEL else inline_tags,
+            string_tags=self.string_tags if string_tags is EMPTY_SET_SENTINEL else string_tags,
+            empty_tags=((self.empty_tags or AUTO_EMPTY_TAGS)
+                        if empty_tags is EMPTY_SET_SENTINEL else empty_tags),
+            strict_mode=strict_mode, reflow_col=reflow_col)
+
+    def serialize(self, how: str = '') -> Union[str, bytes]:
         if not how:
             how = self.serialization_type or 'default'
         return super().serialize(how)
 
+    def serialize_to(self, fp, how: str = ''):
+        if not how:
+            how = self.serialization_type or 'default'
+        super().serialize_to(fp, how)
+
 
 ## reflow-support #####################################################
 
@@ -3307,6 +3976,111 @@ RX_SXPR_NOTEXT = LazyRE(r'(?:(?!\)).)*', re.DOTALL)
 RX_SXPR_TEXT = {qtmark: LazyRE(qtmark + r'.*?' + qtmark, re.DOTALL)
                 for qtmark in ['"""', "'''", '"', "'"]}
 
+RX_SXPR_OPEN = LazyRE(r'\(\s*([?]?[\w.:-]+)\s*')
+RX_SXPR_ATTR = LazyRE(r'`\(([\w.:-]+)\s*(?:"([^"]*)"|(\d+))\s*\)\s*')
+RX_SXML_ATTR = LazyRE(r'\(([\w.:-]+)\s*"([^"]*)"\s*\)\s*')
+RX_SXPR_STRING = LazyRE(r'"""(.*?)"""\s*|\'\'\'(.*?)\'\'\'\s*|"(.*?)"\s*|\'(.*?)\'\s*', re.DOTALL)
+RX_SXPR_UNQUOTED = LazyRE(r'[^()"\'`]*')
+RX_SXPR_SPACE = LazyRE(r'\s*')
+
+
+def _parse_sxpr_fast(sxpr: str) -> Optional[Node]:
+    """Reads an S-expression in a single pass with an explicit stack. Only
+    the regular forms of S-expressions as produced by :py:meth:`Node.as_sxpr`
+    are supported. For anything else, None is returned, so that the caller
+    can fall back on the general (and slower) parser, which also takes
+    care of error reporting."""
+    open_match = RX_SXPR_OPEN.Pattern.match
+    attr_match = RX_SXPR_ATTR.Pattern.match
+    sxml_attr_match = RX_SXML_ATTR.Pattern.match
+    string_match = RX_SXPR_STRING.Pattern.match
+    space_match = RX_SXPR_SPACE.Pattern.match
+    stack = []  # type: List[Tuple[str, int, Optional[Dict[str, Any]], List[Node]]]
+    i = space_match(sxpr).end()
+    while True:
+        m = open_match(sxpr, i)
+        if not m:  return None
+        tagname = m.group(1)
+        i = m.end()
+        name, class_name = (tagname.split(':') + [''])[:2]
+        name = name or ':' + class_name
+        pos = -1
+        attributes = None  # type: Optional[Dict[str, Any]]
+        if sxpr.startswith('`(', i):  # DHParser-style attributes
+            attributes = dict()
+            while True:
+                m = attr_match(sxpr, i)
+                if not m:
+                    if sxpr.startswith('`(', i):  return None
+                    break
+                attr, value, number = m.groups()
+                if value is None:
+                    if attr != 'pos':  return None
+                    pos = int(number)
+                elif attr[:3] == 'err' and value.find('`') >= 0:
+                    return None
+                else:
+                    attributes[attr] = value
+                i = m.end()
+        elif sxpr.startswith('(@', i):  # SXML-style attributes
+            attributes = dict()
+            i = space_match(sxpr, i + 2).end()
+            while sxpr[i:i + 1] != ')':
+                m = sxml_attr_match(sxpr, i)
+                if not m:  return None
+                attr, value = m.groups()
+                if attr[:3] == 'pos':
+                    if attr != 'pos' or not value.isdigit():  return None
+                    pos = int(value)
+                elif attr[:3] == 'err' and value.find('`') >= 0:
+                    return None
+                else:
+                    attributes[attr] = value
+                i = m.end()
+            i = space_match(sxpr, i + 1).end()
+
+        if sxpr[i:i + 1] == '(':
+            stack.append((name, pos, attributes, []))
+            continue
+
+        parts = []
+        m = string_match(sxpr, i)
+        while m:
+            text = m.group(1)
+            if text is None:
+                text = m.group(2)
+                if text is None:
+                    text = m.group(3)
+                    if text is None:
+                        text = m.group(4)
+                elif text.find("'") >= 0:  return None
+            elif text.find('"') >= 0:  return None
+            parts.append(text)
+            i = m.end()
+            m = string_match(sxpr, i)
+        if sxpr[i:i + 1] != ')':
+            m = RX_SXPR_UNQUOTED.Pattern.match(sxpr, i)
+            i = m.end()
+            if sxpr[i:i + 1] != ')':  return None
+            parts.append(m.group(0))
+        node = Node(name, '\n'.join(parts))
+
+        while True:
+            i = space_match(sxpr, i + 1).end()
+            node._pos = pos
+            if attributes:
+                node.attr.update(attributes)
+            if not stack:
+                return node if i == len(sxpr) else None
+            stack[-1][3].append(node)
+            c = sxpr[i:i + 1]
+            if c == '(':
+                break
+            elif c != ')':
+                return None
+            name, pos, attributes, children = stack.pop()
+            node = Node(name, tuple(children))
+
 
 def parse_sxpr(sxpr: Union[str, StringView]) -> RootNode:
     """
@@ -3328,6 +4102,9 @@ def parse_sxpr(sxpr: Union[str, StringView]) -> RootNode:
     1
     """
     assert isinstance(sxpr, (str, StringView))
+    tree = _parse_sxpr_fast(str(sxpr))
+    if tree is not None:
+        return RootNode(tree)
     remaining = sxpr  # type: Union[str, StringView]
 
     @cython.locals(level=cython.int, k=cython.int)
@@ -3371,7 +4148,7 @@ def parse_sxpr(sxpr: Union[str, StringView]) -> RootNode:
         while sxpr[:L] == attr_start:
             i = sxpr.find('"')
             k = sxpr.find(')')
-            if k > i:
+            if k > i >= 0:
                 k = sxpr.find(')', sxpr.find('"', i + 1))
             if i < 0:
                 i = k + 1
@@ -3474,13 +4251,159 @@ RX_XML_SPECIAL_TAG = LazyRE(r'<(?![?!])')
 RX_XML_OPENING_TAG = LazyRE(r'<\s*(?P<tagname>[\w:.-]+)\s*')
 RX_XML_CLOSING_TAG = LazyRE(r'</\s*(?P<tagname>[\w:.-]+)\s*>')
 RX_XML_HEADER = LazyRE(r'<(?![?!])')
+RX_XML_TAG_END = LazyRE(r'''(?:[^>"']|"[^"]*"|'[^']*')*>''')
+
+
+def _parse_xml_expat(xml: str,
+                     string_tag: str,
+                     ignore_pos: bool,
+                     out_empty_tags: Set[str],
+                     strict_mode: bool) -> Optional[RootNode]:
+    """Expat-backend of :py:func:`parse_xml`. The tree is built from the
+    event-stream of the expat-parser from Python's standard library, which
+    does the tokenizing in C. Because the text in between tags is taken
+    verbatim from the source (and so are attributes that contain entities),
+    the resulting tree is the same as the one :py:func:`parse_xml` yields
+    with its own parser: entities are not resolved, whitespace-only text
+    that contains a linefeed is dropped, comments and processing
+    instructions are skipped.
+
+    Returns None, if the expat-parser is not available or if it rejects the
+    document, e.g. because it is not well-formed. In this case the caller
+    should fall back to the pure Python parser.
+    """
+    try:
+        from xml.parsers import expat
+    except ImportError:
+        return None
+
+    # Expat reports positions as byte-offsets. For pure ASCII-documents these
+    # are the same as the string-indices, otherwise the utf-8-encoded source
+    # is sliced and the slices are decoded.
+    data = xml.encode('utf-8')
+    ascii = xml.isascii()
+    if ascii:
+        source = xml  # type: Union[str, bytes]
+        gt, amp, comment_end, pi_end = '>', '&', '-->', '?>'
+        slash = '/'  # type: Union[str, int]
+    else:
+        source = data
+        gt, amp, comment_end, pi_end = b'>', b'&', b'-->', b'?>'
+        slash = ord('/')
+    tag_end_rx = re.compile(RX_XML_TAG_END.pattern if ascii
+                            else RX_XML_TAG_END.pattern.encode('ascii'))
+
+    parser = expat.ParserCreate('utf-8')
+    parser.UseForeignDTD(True)  # do not stumble over undefined entities like &nbsp;
+    stack = []  # type: List[Tuple[str, Dict[str, str], List[Node], bool]]
+    names = dict()  # type: Dict[str, str]
+    non_empty_tags: Set[str] = set()
+    dual_use_notified: Set[str] = set()
+    pos = 0
+    tree = None  # type: Optional[Node]
+
+    def get_pos_str() -> str:
+        return f'{parser.CurrentLineNumber}:{parser.CurrentColumnNumber + 1}'
+
+    def add_text(res: List[Node], end: int):
+        leaf = source[pos:end]
+        if leaf:
+            if not ascii:  leaf = leaf.decode('utf-8')
+            if leaf.find('\n') < 0 or not leaf.isspace():
+                res.append(Node(string_tag, leaf))
+
+    def start(tagname: str, attrs: Dict[str, str]):
+        nonlocal pos
+        i = parser.CurrentByteIndex
+        if stack:
+            add_text(stack[-1][2], i)
+        if attrs and any(v.find('>') >= 0 for v in attrs.values()):
+            k = tag_end_rx.match(source, i).end() - 1
+        else:
+            k = source.find(gt, i)
+        if attrs and source.find(amp, i, k) >= 0:
+            # keep entities in attribute values just like the pure Python parser does
+            tag = source[i:k] if ascii else source[i:k].decode('utf-8')
+            m = RX_XML_OPENING_TAG.match(tag)
+            attrs = {m['attr']: m['value'] for m in RX_XML_ATTRIBUTES.finditer(tag, m.end())}
+        solitary = source[k - 1] == slash
+        pos = k + 1
+        if solitary:
+            if tagname in non_empty_tags:
+                if strict_mode and tagname not in dual_use_notified:
+                    print(get_pos_str() +
+                        f' "{tagname}" is used as empty as well as non-empty element!'
+                        f' Avoid listing these tags in the empty_tags-parameter of the '
+                        f' Node.as_xml()-function or serialization will fail.')
+                    dual_use_notified.add(tagname)
+                non_empty_tags.remove(tagname)
+            out_empty_tags.add(tagname)
+        elif tagname in out_empty_tags:
+            if strict_mode and tagname not in dual_use_notified:
+                print(get_pos_str() +
+                    f' "{tagname}" is used as empty as well as non-empty element!'
+                    f' This can cause errors when re-serializing data as XML!')
+                dual_use_notified.add(tagname)
+        else:
+            non_empty_tags.add(tagname)
+        stack.append((tagname, attrs, [], solitary))
+
+    def end(_):
+        nonlocal pos, tree
+        tagname, attrs, res, solitary = stack.pop()
+        if not solitary:
+            i = parser.CurrentByteIndex
+            add_text(res, i)
+            pos = source.find(gt, i) + 1
+        if len(res) == 1 and res[0].name == string_tag:
+            result = res[0].result  # type: Union[Tuple[Node, ...], StringView, str]
+        else:
+            result = tuple(res)
+        name = names.get(tagname, None)
+        if name is None:
+            name, class_name = (tagname.split(":") + [''])[:2]
+            if name and not class_name:  name = restore_tag_name(name)
+            if class_name:  class_name = ':' + class_name
+            name = name + class_name
+            names[tagname] = name
+        node = Node(name, result)
+        if not ignore_pos and '_pos' in attrs:
+            node._pos = int(attrs['_pos'])
+            del attrs['_pos']
+        if attrs:
+            node.attr.update(attrs)
+        if stack:
+            stack[-1][2].append(node)
+        else:
+            tree = node
+
+    def skip(end_marker: Union[str, bytes]):
+        nonlocal pos
+        i = parser.CurrentByteIndex
+        if stack:
+            add_text(stack[-1][2], i)
+        k = source.find(end_marker, i)
+        pos = k + len(end_marker) if k >= 0 else len(source)
+
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CommentHandler = lambda _: skip(comment_end)
+    parser.ProcessingInstructionHandler = lambda _target, _data: skip(pi_end)
+    try:
+        parser.Parse(data, True)
+    except expat.ExpatError:
+        # anything after the root-element is ignored, like the Python-parser does
+        if tree is None:
+            return None
+    return RootNode(tree)
 
 
 def parse_xml(xml: Union[str, StringView],
               string_tag: str = TOKEN_PTYPE,
               ignore_pos: bool = False,
               out_empty_tags: AbstractSet[str] = EMPTY_SET_SENTINEL,
-              strict_mode: bool = True) -> RootNode:
+              strict_mode: bool = True,
+              backend: str = 'python') -> RootNode:
     """
     Generates a tree of nodes from a (Pseudo-)XML-source. This
     simplified XML-parser only parses the XML-content, processing
@@ -3506,21 +4429,37 @@ def parse_xml(xml: Union[str, StringView],
     :param strict_mode: If True, errors are raised if XML
         contains stylistic or interoperability errors, like using one
         and the same tag-name for empty and non-empty tags, for example.
+    :param backend: Either 'python' or 'expat'. With 'expat', the XML is
+        tokenized by the expat-parser from Python's standard library,
+        which is much faster for large documents. The resulting tree is
+        the same. Documents that expat rejects, because they are not
+        well-formed, are parsed with the Python-parser, nonetheless.
     """
     assert isinstance(xml, (str, StringView))
+    if out_empty_tags is EMPTY_SET_SENTINEL:
+        out_empty_tags = set()
+    if backend == 'expat':
+        empty_tags = set(out_empty_tags)
+        tree = _parse_xml_expat(str(xml), string_tag, ignore_pos, empty_tags, strict_mode)
+        if tree is not None:
+            out_empty_tags.update(empty_tags)
+            return tree
+    else:
+        assert backend == 'python', f'Unknown XML-parser backend "{backend}"'
+
     xml = StringView(str(xml))
     non_empty_tags: Set[str] = set()
     dual_use_notified: Set[str] = set()
-
-    if out_empty_tags is EMPTY_SET_SENTINEL:
-        out_empty_tags = set()
+    lbreaks = []  # type: List[int]
 
     def get_pos_str(substring: StringView) -> str:
         """Returns line:column indicating where the substring is located within
         the whole xml-string."""
-        nonlocal xml
+        nonlocal xml, lbreaks
         pos = len(xml) - len(substring)
-        l, c = line_col(linebreaks(xml), pos)
+        if not lbreaks:
+            lbreaks = linebreaks(xml)
+        l, c = line_col(lbreaks, pos)
         return f'{l}:{c}'
 
     def parse_attributes(s: StringView) -> Tuple[StringView, Dict[str, Any]]:
@@ -3531,7 +4470,8 @@ def parse_xml(xml: Union[str, StringView],
         attributes = dict()  # type: Dict[str, Any]
         eot = s.find('>')
         restart = 0
-        for match in s.finditer(RX_XML_ATTRIBUTES):
+        eos = s.find('<')  # do not search beyond the tag
+        for match in (s[:eos] if eos >= 0 else s).finditer(RX_XML_ATTRIBUTES):
             if s.index(match.start()) >= eot:
                 break
             d = match.groupdict()
@@ -3692,22 +4632,209 @@ class DHParser_JSONEncoder(json.JSONEncoder):
         return json.JSONEncoder.default(self, o)
 
 
+_JSON_STR = r'"([^"\\]*(?:\\.[^"\\]*)*)"'
+_JSON_TAIL = r'(?:\s*,\s*(-?\d+))?(?:\s*,\s*(\{(?:[^"}]|"[^"\\]*(?:\\.[^"\\]*)*")*\}))?\s*\]'
+RX_JSON_NODE = LazyRE(r'\s*(,)?\s*(?:\[\s*' + _JSON_STR + r'\s*,\s*(?:(\[)|' + _JSON_STR
+                      + _JSON_TAIL + r')|\]' + _JSON_TAIL + r')')
+RX_JSON_WHITESPACE = LazyRE(r'\s*')
+
+
+def _parse_json_list_flavor(json_str: str) -> RootNode:
+    """Reads a tree from list-flavored JSON (see :py:meth:`Node.to_json_obj`)
+    in a single pass, building the nodes directly from the token-stream
+    without generating a JSON-object of the tree, first. Each token is
+    either a complete leaf-node or the beginning or end of a branch-node.
+    Raises a ValueError if json_str is not a tree in list-flavored JSON
+    or not in the form that :py:meth:`Node.as_json` produces.
+    """
+    s = json_str
+    texts = []  # type: List[str]
+    stack = []  # type: List[Tuple[str, List[Node]]]  # name and children of open nodes
+    siblings = None  # type: Optional[List[Node]]  # children of the innermost open node
+    separated = False  # a comma is expected before the next node
+    i = 0
+    for m in RX_JSON_NODE.Pattern.finditer(s):
+        if m.start() != i:  raise ValueError
+        i = m.end()
+        comma, name, branch, text, pos, attributes, end_pos, end_attributes = m.groups()
+        if name is not None:
+            if (comma is not None) != separated:  raise ValueError
+            if name.find('\\') >= 0:  name = scanstring(s, m.start(2))[0]
+            if branch is not None:
+                siblings = []
+                stack.append((name, siblings))
+                separated = False
+                continue
+            if text.find('\\') >= 0:  text = scanstring(s, m.start(4))[0]
+            texts.append(text)
+            node = Node(name, text, True)
+        else:
+            if comma is not None or not stack:  raise ValueError
+            name, children = stack.pop()
+            node = Node(name, tuple(children))
+            pos, attributes = end_pos, end_attributes
+            siblings = stack[-1][1] if stack else None
+        if pos is not None:
+            node._pos = int(pos)
+        if attributes is not None:
+            node.attr.update(json.loads(attributes))
+        if siblings is None:
+            if RX_JSON_WHITESPACE.Pattern.match(s, i).end() != len(s):  raise ValueError
+            # the concatenated content of the leaves is the content of the tree
+            return RootNode(node, ''.join(texts))
+        siblings.append(node)
+        separated = True
+    raise ValueError
+
+
 def parse_json(json_str: str) -> RootNode:
     """
     Parses a JSON representation of a node-tree. Other than
     and parse_xml, this function does not convert any json-document into
     a node-tree, but only json-documents that represent a node-tree, e.g.,
     a json-document that has been produced by `Node.as_json()`!
+
+    List-flavored JSON is decoded in a single pass directly into the
+    node-tree without building the intermediary JSON-object-tree first.
     """
+    if json_str[:1] == '[' or json_str.lstrip()[:1] == '[':
+        try:
+            return _parse_json_list_flavor(json_str)
+        except ValueError:
+            pass  # let json.loads() report the error, if json_str is not valid JSON
     json_obj = json.loads(json_str, object_pairs_hook=lambda pairs: dict(pairs))
     return RootNode(Node.from_json_obj(json_obj))
 
 
-def deserialize(xml_sxpr_or_json: str) -> Optional[Node]:
+def _read_varint(data: bytes, i: int) -> Tuple[int, int]:
+    """Reads a varint from ``data`` at position ``i`` and returns the
+    value and the position after the varint."""
+    n = 0
+    shift = 0
+    while True:
+        b = data[i]
+        i += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, i
+        shift += 7
+
+
+def parse_binary(data: Union[bytes, bytearray, memoryview]) -> RootNode:
+    """Restores a tree from DHParser's binary format (see
+    :py:meth:`Node.as_binary`), including the positions and, if present,
+    the errors. Raises a ValueError if ``data`` is not a binary tree of
+    a supported version.
+    """
+    data = bytes(data)
+    if data[:4] != BINARY_TREE_MAGIC:
+        raise ValueError('Data is not a binary serialization of a tree!')
+    if data[4] != BINARY_TREE_VERSION:
+        raise ValueError(f'Version {data[4]} of the binary tree format is not supported!')
+    has_errors = data[5] & 1
+    i = 6
+    n, i = _read_varint(data, i)
+    strings = data[i:i + n].decode('utf-8').split('\x00')
+    i += n
+    n, i = _read_varint(data, i)
+    text = data[i:i + n].decode('utf-8')
+    i += n
+    n, i = _read_varint(data, i)
+    end = i + n
+
+    # the nodes are restored bottom-up: each branch-node takes its children from the stack
+    stack = []  # type: List[Node]
+    nodes = []  # type: List[Node]  # only needed for locating errors
+    push = stack.append
+    t = 0
+    pos = 0
+    while i < end:
+        # varints are decoded inline for the most frequent case of one or two bytes
+        h = data[i]
+        if h < 0x80:  i += 1
+        elif data[i + 1] < 0x80:
+            h = (h & 0x7F) | (data[i + 1] << 7)
+            i += 2
+        else:  h, i = _read_varint(data, i)
+        n = data[i]
+        if n < 0x80:  i += 1
+        elif data[i + 1] < 0x80:
+            n = (n & 0x7F) | (data[i + 1] << 7)
+            i += 2
+        else:  n, i = _read_varint(data, i)
+        if h & 1:
+            children = tuple(stack[-n:])
+            del stack[-n:]
+            node = Node(strings[h >> 3], children)
+        else:
+            node = Node(strings[h >> 3], text[t:t + n], True)
+            t += n
+        if h & 2:
+            d = data[i]
+            if d < 0x80:  i += 1
+            elif data[i + 1] < 0x80:
+                d = (d & 0x7F) | (data[i + 1] << 7)
+                i += 2
+            else:  d, i = _read_varint(data, i)
+            pos += -((d + 1) >> 1) if d & 1 else d >> 1
+            node._pos = pos
+        if h & 4:
+            n, i = _read_varint(data, i)
+            attributes = node.attr
+            for _ in range(n):
+                k, i = _read_varint(data, i)
+                v, i = _read_varint(data, i)
+                attributes[strings[k]] = strings[v]
+        push(node)
+        if has_errors:  nodes.append(node)
+    if len(stack) != 1:
+        raise ValueError('Corrupted binary serialization of a tree!')
+    # the concatenated content of the leaves is the content of the tree
+    root = RootNode(stack[0], text)
+
+    if has_errors:
+        nodes[-1] = root
+
+        def decode_error(i: int) -> Tuple[Error, int, int]:
+            values = []
+            for _ in range(12):
+                v, i = _read_varint(data, i)
+                values.append(v)
+            code, pos, length, msg, orig_pos, line, column, end_line, end_column, \
+                orig_doc, node_nr, n_related = values
+            related = []
+            for _ in range(n_related):
+                r, _, i = decode_error(i)
+                related.append(r)
+            error = Error(strings[msg], pos, ErrorCode(code), line - 1, column - 1, length,
+                          related, orig_pos - 1, strings[orig_doc])
+            error.end_line = end_line - 1
+            error.end_column = end_column - 1
+            return error, node_nr - 1, i
+
+        _, i = _read_varint(data, end)  # skip the length of the errors-section
+        n, i = _read_varint(data, i)
+        for _ in range(n):
+            error, node_nr, i = decode_error(i)
+            if node_nr >= 0:
+                node = nodes[node_nr]
+                root.error_nodes.setdefault(id(node), []).append(error)
+                if 0 <= node._pos <= error.pos <= node._pos + max(node.strlen(), 1):
+                    root.error_positions.setdefault(error.pos, set()).add(id(node))
+            root.errors.append(error)
+            root._error_set.add(error)
+            root.error_flag = max(root.error_flag, error.code)
+    return root
+
+
+def deserialize(xml_sxpr_or_json: Union[str, bytes]) -> Optional[Node]:
     """
     Parses either XML or S-expressions or a JSON representation of a
-    syntax-tree. Which of these is detected automatically.
+    syntax-tree or a tree in binary format. Which of these is detected
+    automatically.
     """
+    if isinstance(xml_sxpr_or_json, (bytes, bytearray, memoryview)):
+        return parse_binary(xml_sxpr_or_json)
     if RX_IS_XML.match(xml_sxpr_or_json):
         return parse_xml(xml_sxpr_or_json)
     elif RX_IS_SXPR.match(xml_sxpr_or_json):
@@ -3723,6 +4850,374 @@ def deserialize(xml_sxpr_or_json: str) -> Optional[Node]:
             raise ValueError('Snippet is neither S-expression nor XML: ' + snippet + ' ...')
 
 
+#######################################################################
+#
+# Memory-mapped tree-files
+#
+#######################################################################
+
+
+TREE_FILE_MAGIC = b'DHPL'
+TREE_FILE_VERSION = 1
+TREE_FILE_HEADER = '<4sB3xQQQ'  # magic, version, offsets of text-section, string-table, root
+TREE_FILE_BUFFER_SIZE = 1 << 20
+
+
+def write_tree_file(tree: Node, filename: str, include_pos: bool = True):
+    """Writes a tree to a tree-file that can be opened with
+    :py:func:`open_tree_file` for random access to (parts of) the tree
+    without reading the whole file.
+
+    A tree-file consists of a header, the records of the nodes in post-order,
+    the utf-8-encoded content of all leaves in document-order and a
+    zero-separated string-table of names, attribute-keys and -values. A
+    node-record consists of varints: (string-index << 3 | flags), where
+    flags are: 1 = branch-node, 2 = position, 4 = attributes, followed by
+    the position and the attributes if present, by the location of the
+    node's content in the text-section (byte-offset, byte-length and
+    length in characters) and, for branch-nodes, by the number of children
+    and the 8-byte file-offsets of the children's records.
+
+    :param tree: the tree to be stored
+    :param filename: the name of the tree-file
+    :param include_pos: if False, positions will not be stored
+    """
+    import shutil
+    import struct
+    import tempfile
+
+    strings = dict()  # type: Dict[str, int]
+
+    def index(s: str) -> int:
+        i = strings.get(s, -1)
+        if i < 0:
+            i = len(strings)
+            strings[s] = i
+        return i
+
+    def varint(out: bytearray, n: int):
+        while n >= 0x80:
+            out.append(n & 0x7F | 0x80)
+            n >>= 7
+        out.append(n)
+
+    header_size = struct.calcsize(TREE_FILE_HEADER)
+    with open(filename, 'wb') as f, tempfile.TemporaryFile() as text_file:
+        f.write(b'\x00' * header_size)
+        records = bytearray()
+        flushed = header_size
+        texts = bytearray()
+        text_bytes = 0
+        text_chars = 0
+
+        def record(node: Node, start: int, nbytes: int, nchars: int,
+                   children: List[int]) -> int:
+            """Writes the record of a node and returns its offset in the file."""
+            nonlocal records, flushed
+            offset = flushed + len(records)
+            h = index(node.name) << 3
+            if children:  h |= 1
+            if include_pos and node._pos >= 0:  h |= 2
+            if node.has_attr():  h |= 4
+            varint(records, h)
+            if h & 2:
+                varint(records, node._pos)
+            if h & 4:
+                varint(records, len(node._attributes))
+                for k, v in node._attributes.items():
+                    varint(records, index(k))
+                    varint(records, index(str(v)))
+            varint(records, start)
+            varint(records, nbytes)
+            varint(records, nchars)
+            if children:
+                varint(records, len(children))
+                records.extend(struct.pack(f'<{len(children)}Q', *children))
+            if len(records) >= TREE_FILE_BUFFER_SIZE:
+                f.write(records)
+                flushed += len(records)
+                records = bytearray()
+            return offset
+
+        def leaf(node: Node) -> int:
+            nonlocal texts, text_bytes, text_chars
+            text = str(node._result)
+            data = text.encode('utf-8')
+            texts.extend(data)
+            if len(texts) >= TREE_FILE_BUFFER_SIZE:
+                text_file.write(texts)
+                texts = bytearray()
+            start = text_bytes
+            text_bytes += len(data)
+            text_chars += len(text)
+            return record(node, start, len(data), len(text), [])
+
+        # post-order traversal with an explicit stack, frames are: (node, children-iterator,
+        # offsets of the children's records, text-counters when entering the node)
+        stack = [(tree, iter(tree._children), [], 0, 0)]
+        root_offset = 0
+        while stack:
+            node, children, offsets, b0, c0 = stack[-1]
+            for child in children:
+                if child._children:
+                    stack.append((child, iter(child._children), [], text_bytes, text_chars))
+                    break
+                offsets.append(leaf(child))
+            else:
+                stack.pop()
+                if node._children:
+                    offset = record(node, b0, text_bytes - b0, text_chars - c0, offsets)
+                else:
+                    offset = leaf(node)
+                if stack:
+                    stack[-1][2].append(offset)
+                else:
+                    root_offset = offset
+
+        f.write(records)
+        text_offset = flushed + len(records)
+        text_file.write(texts)
+        text_file.seek(0)
+        shutil.copyfileobj(text_file, f)
+        table = '\x00'.join(strings.keys())
+        if table.count('\x00') != len(strings) - 1:
+            raise ValueError('Tree-files cannot store strings that contain the null-character!')
+        f.write(table.encode('utf-8'))
+        f.seek(0)
+        f.write(struct.pack(TREE_FILE_HEADER, TREE_FILE_MAGIC, TREE_FILE_VERSION,
+                            text_offset, text_offset + text_bytes, root_offset))
+
+
+class _TreeFile:
+    """The memory-mapped data of a tree-file that is shared by all
+    :py:class:`LazyNode`-objects of the tree."""
+    __slots__ = ['mm', 'strings', 'text_offset']
+
+    def __init__(self, mm, strings: List[str], text_offset: int):
+        self.mm = mm
+        self.strings = strings
+        self.text_offset = text_offset
+
+    def node(self, offset: int) -> LazyNode:
+        """Creates a LazyNode from the record at ``offset`` in the file. Neither
+        the children nor the content of the node are read, yet."""
+        mm = self.mm
+        strings = self.strings
+        h, i = _read_varint(mm, offset)
+        node = LazyNode.__new__(LazyNode)
+        node.name = strings[h >> 3]
+        if h & 2:
+            node._pos, i = _read_varint(mm, i)
+        else:
+            node._pos = -1
+        if h & 4:
+            n, i = _read_varint(mm, i)
+            attributes = dict()
+            for _ in range(n):
+                k, i = _read_varint(mm, i)
+                v, i = _read_varint(mm, i)
+                attributes[strings[k]] = strings[v]
+            node._attributes = attributes
+        start, i = _read_varint(mm, i)
+        nbytes, i = _read_varint(mm, i)
+        nchars, i = _read_varint(mm, i)
+        node._text_span = (start, nbytes, nchars)
+        node._branch = bool(h & 1)
+        node._offset = i
+        node._file = self
+        node._lazy_result = None
+        return node
+
+    def text(self, start: int, nbytes: int) -> str:
+        start += self.text_offset
+        return self.mm[start:start + nbytes].decode('utf-8')
+
+    def close(self):
+        """Closes the memory-map of the file."""
+        self.mm.close()
+
+
+class LazyNode(Node):
+    """A read-only node of a tree stored in a tree-file (see
+    :py:func:`write_tree_file`), the children and the content of which are
+    read from the memory-mapped file only when they are accessed for the
+    first time, e.g. by ``children``, ``select()``, ``pick()``, etc.
+    ``content`` and ``strlen()`` are read from the file without reading
+    any descendants.
+
+    Trying to change the result of a LazyNode raises a TypeError. Use
+    :py:meth:`LazyNode.materialize` (or ``copy.deepcopy()``) to obtain
+    an ordinary copy of a subtree that can be changed.
+
+    :py:meth:`LazyNode.close` closes the tree-file. The root returned by
+    :py:func:`open_tree_file` can also be used as a context manager that
+    closes the file on exit. Nodes that have not been read before the
+    file has been closed cannot be accessed any more.
+    """
+    __slots__ = ['_file', '_offset', '_lazy_result', '_branch', '_text_span']
+
+    def __init__(self, name: str, result: ResultType, leafhint: bool = False) -> None:
+        raise TypeError('LazyNodes can only be created by open_tree_file()!')
+
+    def _load(self) -> Union[Tuple[Node, ...], str]:
+        tree_file = self._file
+        if self._branch:
+            import struct
+            n, i = _read_varint(tree_file.mm, self._offset)
+            result = tuple(tree_file.node(offset)
+                           for offset in struct.unpack_from(f'<{n}Q', tree_file.mm, i))
+        else:
+            result = tree_file.text(*self._text_span[:2])
+        self._lazy_result = result
+        return result
+
+    @property
+    def _result(self) -> Union[Tuple[Node, ...], str]:
+        result = self._lazy_result
+        return self._load() if result is None else result
+
+    @_result.setter
+    def _result(self, result: Union[Tuple[Node, ...], str]):
+        # Node-methods only assign the string-value of the content to _result
+        assert isinstance(result, str) and not self._branch
+        self._lazy_result = result
+
+    @property
+    def _children(self) -> Tuple[Node, ...]:
+        if self._branch:
+            result = self._lazy_result
+            return self._load() if result is None else result
+        return ()
+
+    @_children.setter
+    def _children(self, children: Tuple[Node, ...]):
+        raise TypeError('The children of a LazyNode cannot be changed!')
+
+    @property
+    def result(self) -> Union[Tuple[Node, ...], str]:
+        return self._result
+
+    @result.setter
+    def result(self, result: ResultType):
+        raise TypeError('LazyNode does not allow re-assignment of results.')
+
+    @property
+    def content(self) -> str:
+        if self._branch:
+            return self._file.text(*self._text_span[:2])
+        return self._result
+
+    def strlen(self) -> int:
+        return self._text_span[2]
+
+    def with_pos(self, pos: cython.int) -> Node:
+        if pos != self._pos:
+            raise NotImplementedError("Position values of LazyNodes cannot be changed!")
+        return self
+
+    def __deepcopy__(self, memo):
+        return self.materialize()
+
+    def __enter__(self) -> LazyNode:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Closes the tree-file, from which this node has been read."""
+        self._file.close()
+
+    def materialize(self) -> Node:
+        """Returns the subtree as a tree of ordinary nodes. This reads the
+        complete subtree from the tree-file."""
+        # explicit stack instead of recursion; frames: (node, children-iterator, copies)
+        stack = [(self, iter(self._children), [])]
+        while True:
+            node, children, copies = stack[-1]
+            for child in children:
+                if child._children:
+                    stack.append((child, iter(child._children), []))
+                    break
+                copies.append(Node(child.name, child._result, True))
+                copies[-1]._pos = child._pos
+                if child.has_attr():
+                    copies[-1].attr.update(child._attributes)
+            else:
+                stack.pop()
+                if node._children:
+                    duplicate = Node(node.name, tuple(copies), False)
+                else:
+                    duplicate = Node(node.name, node._result, True)
+                duplicate._pos = node._pos
+                if node.has_attr():
+                    duplicate.attr.update(node._attributes)
+                if not stack:
+                    return duplicate
+                stack[-1][2].append(duplicate)
+
+
+class _MaterializedRoot(Node):
+    """The root of a tree that has been read completely from a tree-file
+    (see :py:func:`open_tree_file`). It supports the same ``close()``-method
+    and context manager protocol as the root :py:class:`LazyNode`, which
+    do nothing, because the file has already been closed."""
+    __slots__ = ()
+
+    def __enter__(self) -> _MaterializedRoot:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    def close(self):
+        pass
+
+
+def open_tree_file(filename: str) -> Node:
+    """Opens a tree-file written by :py:func:`write_tree_file` and returns
+    the root of the tree as :py:class:`LazyNode`. The file is memory-mapped
+    and only those nodes are read that are accessed. Thus, a few subtrees of
+    very large trees can be queried with little memory.
+
+    The file remains open until it is closed with :py:meth:`LazyNode.close`,
+    or, if the root is used as a context manager, on exit::
+
+        with open_tree_file(filename) as root:
+            ...
+
+    LazyNodes rely on the attribute-access of the pure Python version of
+    this module. If it has been compiled with Cython, the whole tree is
+    read and returned as a tree of ordinary nodes and the file is closed
+    right away. The root can still be used as a context manager and be
+    "closed", which then does nothing.
+    """
+    import mmap
+    import struct
+    with open(filename, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        magic, version, text_offset, table_offset, root_offset = \
+            struct.unpack_from(TREE_FILE_HEADER, mm, 0)
+        if magic != TREE_FILE_MAGIC:
+            raise ValueError(f'"{filename}" is not a tree-file!')
+        if version != TREE_FILE_VERSION:
+            raise ValueError(f'Version {version} of tree-files is not supported!')
+        strings = mm[table_offset:].decode('utf-8').split('\x00')
+        root = _TreeFile(mm, strings, text_offset).node(root_offset)
+        if cython.compiled:
+            tree = root.materialize()
+            root = _MaterializedRoot(tree.name, tree._result, not tree._children)
+            root._pos = tree._pos
+            if tree.has_attr():
+                root.attr.update(tree.attr)
+            mm.close()
+    except BaseException:
+        mm.close()
+        raise
+    return root
+
+
 #######################################################################
 #
 # Attribute-handling
@@ -5094,6 +6589,31 @@ class NodeLocation(NamedTuple):
     __moddule__ = __name__  # required for cython/pickle compatibility
 
 
+class ContentMatch(NamedTuple):
+    """A match of a regular expression in the string-content of a content
+    mapping. Because the content may be searched in chunks, the positions
+    of the match-object ``match`` are relative to a chunk that starts at
+    position ``offset`` of the content. Use the methods ``start()``,
+    ``end()`` and ``span()`` to retrieve the positions within the content."""
+    match: re.Match
+    offset: int
+    __module__ = __name__  # required for cython/pickle compatibility
+
+    def start(self, group: Union[int, str] = 0) -> int:
+        pos = self.match.start(group)
+        return pos + self.offset if pos >= 0 else pos
+
+    def end(self, group: Union[int, str] = 0) -> int:
+        pos = self.match.end(group)
+        return pos + self.offset if pos >= 0 else pos
+
+    def span(self, group: Union[int, str] = 0) -> Tuple[int, int]:
+        return self.start(group), self.end(group)
+
+    def group(self, *groups):
+        return self.match.group(*groups)
+
+
 DEFAULT_START_INDEX_SENTINEL = -2 ** 30
 
 
@@ -5184,18 +6704,23 @@ class ContentMapping:
             self.divisibility = {'*': divisibility}
         self.chain_attr_name: str = chain_attr_name
         self.auto_cleanup = auto_cleanup
+        self._path_str_cache: Dict[int, str] = dict()
+        self._init_mapping()
 
-        content, pos_list, path_list = self._generate_mapping(origin)
+    def _init_mapping(self):
+        content, pos_list, path_list = self._generate_mapping(self.origin)
         self.content: str = content
         self._pos_list: List[int] = pos_list
         self._path_list: List[Path] = path_list
-        self._path_str_cache: Dict[int, str] = dict()
 
-    def _generate_mapping(self, origin, stump: Path = []) \
+    def _generate_mapping(self, origin, stump: Path = [],
+                          first_child: int = 0, stop_child: Optional[int] = None) \
             -> Tuple[str, List[int], List[Path]]:
         """Generates the string content, list of positions and list of paths
         for the given origin taking into account ``self.select_func`` and
-        ``self.ignore_func`` as constraints."""
+        ``self.ignore_func`` as constraints. If ``first_child`` or ``stop_child``
+        are given, only the paths running through the slice
+        ``origin.children[first_child:stop_child]`` will be generated."""
         pos = 0
         content_list = []
         path_list = []
@@ -5203,8 +6728,17 @@ class ContentMapping:
         select_func = (lambda pth: self.select_func(stump + pth)) if stump else self.select_func
         if self.ignore_func([origin]):
             return '', [], []
-        for path in origin.select_path_if(
-                select_func, include_root=True, skip_func=self.ignore_func):
+        if first_child > 0 or stop_child is not None:
+            ignore_func = self.ignore_func
+            paths = ([origin] + path
+                     for child in origin._children[first_child:stop_child]
+                     for path in child.select_path_if(
+                         lambda pth: select_func([origin] + pth), include_root=True,
+                         skip_func=lambda pth: ignore_func([origin] + pth)))
+        else:
+            paths = origin.select_path_if(
+                select_func, include_root=True, skip_func=self.ignore_func)
+        for path in paths:
             #  if self.ignore_func(path):  continue
             pos_list.append(pos)
             path_list.append(path)
@@ -5517,6 +7051,26 @@ class ContentMapping:
              reverse: bool = False) -> Union[NodeLocation, Tuple[None, int]]:
         return next(self.select(criterion, start_from, reverse), (None, -1))
 
+    def finditer(self, pattern: Union[str, RxPatternType], start_pos: int = 0,
+                 end_pos: Optional[int] = None) -> Iterator[ContentMatch]:
+        """Yields the matches of the regular expression ``pattern`` in the
+        string-content from ``start_pos`` up to ``end_pos`` (or the end of
+        the content, if ``end_pos`` is None) in the same way as Python's
+        ``re.finditer()``. Example::
+
+            >>> tree = parse_sxpr('(doc (p "Karl and Rosa") (p "met in Berlin."))')
+            >>> cm = ContentMapping(tree)
+            >>> [(m.group(), m.span()) for m in cm.finditer('Rosa|Berlin')]
+            [('Rosa', (9, 13)), ('Berlin', (20, 26))]
+            >>> print(pp_path(cm.get_path_and_offset(20)[0], 1, ', '))
+            doc, p "met in Berlin."
+        """
+        rx = re.compile(pattern) if isinstance(pattern, str) else pattern
+        if end_pos is None:
+            end_pos = len(self.content)
+        for match in rx.finditer(self.content, start_pos, end_pos):
+            yield ContentMatch(match, 0)
+
     @cython.locals(i=cython.int, start_pos=cython.int, end_pos=cython.int, offset=cython.int)
     def rebuild_mapping_slice(self, first_index: cython.int, last_index: cython.int):
         """Reconstructs a particular section of the context mapping after the
@@ -5614,28 +7168,20 @@ class ContentMapping:
         offsets = [offset + start_pos for offset in offsets]
         if stump:  paths = [stump + path for path in paths]
 
-        off_head = self._pos_list[:first_index]
         followup_offset = offsets[-1] + paths[-1][-1].strlen()
         if last_index < len(self._pos_list) - 1 and followup_offset != self._pos_list[last_index + 1]:
             shift = followup_offset - self._pos_list[last_index + 1]
-            off_tail = [offset + shift for offset in self._pos_list[last_index + 1:]]
-        else:
-            off_tail = self._pos_list[last_index + 1:]
-
-        path_head = self._path_list[:first_index]
-        path_tail = self._path_list[last_index + 1:]
+            self._pos_list[last_index + 1:] = \
+                [offset + shift for offset in self._pos_list[last_index + 1:]]
 
-        self.content = ''.join([self.content[:start_pos], content, self.content[end_pos:]])
+        # Adding markup does not change the content. In this case, there
+        # is no need to copy the (possibly very long) content-string.
+        if len(content) != end_pos - start_pos or content != self.content[start_pos:end_pos]:
+            self.content = ''.join([self.content[:start_pos], content, self.content[end_pos:]])
 
-        self._pos_list.clear()
-        self._pos_list.extend(off_head)
-        self._pos_list.extend(offsets)
-        self._pos_list.extend(off_tail)
-
-        self._path_list.clear()
-        self._path_list.extend(path_head)
-        self._path_list.extend(paths)
-        self._path_list.extend(path_tail)
+        # slice-assignment keeps the lists' identity and does not copy their head and tail
+        self._pos_list[first_index:last_index + 1] = offsets
+        self._path_list[first_index:last_index + 1] = paths
 
         self._path_str_cache = dict()  # clear path-string-cache
 
@@ -5881,6 +7427,210 @@ class ContentMapping:
         #     include_root=True), common_ancestor.as_sxpr()
         # return NodeLocation(common_ancestor, path_index)
 
+    def markup_many(self, spans: Iterable[Tuple]):
+        """Marks up many spans at once. Each span is a tuple
+        ``(start_pos, end_pos, name)`` or ``(start_pos, end_pos, name, attr_dict)``
+        with the same meaning as the parameters of :py:meth:`ContentMapping.markup`.
+
+        The spans are sorted by their starting position (and, for spans starting
+        at the same position, enclosing spans before enclosed spans) and then
+        marked up one after the other in one pass from left to right. Other
+        than calling :py:meth:`ContentMapping.markup` for each span, this
+        only updates the paths of a small window of the content mapping
+        around the span that is currently being marked up, and only those
+        paths that run through the changed parts of the tree. The complete
+        lists of paths and positions are rebuilt only once at the end.
+        Thus, the time for marking up a large number of spans grows linearly
+        with the number of spans rather than quadratically.
+
+        The mapping is kept up-to-date while marking up the spans, even if
+        ``auto_cleanup`` is False, because later spans may lie in parts of the
+        tree that have been changed by earlier ones.
+
+        :param spans: the spans to be marked up
+        :raises ValueError: if a span lies outside the content or if two
+            spans overlap without one containing the other.
+
+        Example::
+
+            >>> from DHParser.toolkit import printw
+            >>> tree = parse_sxpr('(doc (p "Karl and Rosa met in Berlin.") (p "Rosa stayed."))')
+            >>> cm = ContentMapping(tree)
+            >>> names = [(m.start(), m.end(), 'name')
+            ...          for m in re.finditer(r'Karl|Rosa', cm.content)]
+            >>> cm.markup_many(names + [(0, 13, 'group')])
+            >>> printw(tree.as_sxpr(flatten_threshold=-1))
+            (doc (p (group (name "Karl") (:Text " and ") (name "Rosa"))
+             (:Text " met in Berlin.")) (p (name "Rosa") (:Text " stayed.")))
+            >>> print(cm)
+            0 -> doc, p, group, name "Karl"
+            4 -> doc, p, group, :Text " and "
+            9 -> doc, p, group, name "Rosa"
+            13 -> doc, p, :Text " met in Berlin."
+            28 -> doc, p, name "Rosa"
+            32 -> doc, p, :Text " stayed."
+        """
+        L = len(self.content)
+        spans = sorted(spans, key=lambda span: (span[0], -span[1]))
+        stack = []
+        for span in spans:
+            start_pos, end_pos = span[0], span[1]
+            if not 0 <= start_pos <= end_pos <= L:
+                raise ValueError(f'Span {span} does not lie within the content '
+                                 f'of length {L}!')
+            while stack and stack[-1][1] <= start_pos:
+                stack.pop()
+            if stack and end_pos > stack[-1][1]:
+                raise ValueError(f'Span {span} overlaps with span {stack[-1]} '
+                                 f'without being contained in it!')
+            stack.append(span)
+        if not spans:
+            return
+
+        import bisect
+        src_pos, src_path = self._pos_list, self._path_list
+        out_pos: List[int] = []
+        out_path: List[Path] = []
+        # The window is a content mapping that shares all settings with this one,
+        # but only covers the short stretch of paths around the span that is
+        # currently being marked up. Paths to the left of the window have been
+        # moved to the out-lists, paths to its right (from source index
+        # wb + 1 onward) are still in the source-lists. Other than the latter,
+        # the window and the out-lists are always up-to-date.
+        window = ContentMapping.__new__(ContentMapping)
+        window.__dict__.update(self.__dict__)
+        window.auto_cleanup = False
+        window._pos_list, window._path_list = [], []
+        window._path_str_cache = dict()
+        w_pos, w_path = window._pos_list, window._path_list
+        wb = -1
+
+        def child_index(children: ChildrenType, child: Node) -> int:
+            try:
+                return children.index(child)
+            except ValueError:
+                return -1
+
+        def extend_right(hi: int, ancestor: Node, e: int, end_pos: int, whole: bool) \
+                -> Tuple[int, Optional[int]]:
+            """Extends the range of paths to be regenerated, which ends at index hi
+            of the window, to the right. Returns the new end-index and the index of
+            the first child of the ancestor that need not be regenerated."""
+            nonlocal wb
+            boundary = None
+            while True:
+                if hi + 1 == len(w_pos) and wb + 1 < len(src_pos):
+                    wb += 1
+                    w_pos.append(src_pos[wb])
+                    w_path.append(src_path[wb])
+                if hi + 1 == len(w_pos):
+                    return hi, None
+                pth = w_path[hi + 1]
+                if len(pth) <= e or pth[e] is not ancestor:
+                    return hi, None
+                if not whole:
+                    if boundary is None and w_pos[hi + 1] > end_pos:
+                        boundary = w_path[hi][e + 1]
+                    if boundary is not None and pth[e + 1] is not boundary:
+                        return hi, child_index(ancestor._children, pth[e + 1])
+                hi += 1
+
+        def extend_left(lo: int, ancestor: Node, e: int, start_pos: int, whole: bool) \
+                -> Tuple[int, int, int]:
+            """Extends the range of paths to be regenerated, which starts at index lo
+            of the window, to the left. Returns the new start-index, the index of
+            the first child of the ancestor to be regenerated and the number of
+            paths that have been moved from the out-lists to the window."""
+            shift = 0
+            boundary = None
+            while True:
+                if lo == 0 and out_pos:
+                    w_pos.insert(0, out_pos.pop())
+                    w_path.insert(0, out_path.pop())
+                    lo += 1
+                    shift += 1
+                if lo == 0:
+                    return lo, 0, shift
+                pth = w_path[lo - 1]
+                if len(pth) <= e or pth[e] is not ancestor:
+                    return lo, 0, shift
+                if not whole:
+                    if boundary is None and w_pos[lo - 1] + pth[-1].strlen() < start_pos:
+                        boundary = w_path[lo][e + 1]
+                    if boundary is not None and pth[e + 1] is not boundary:
+                        i = child_index(ancestor._children, pth[e + 1])
+                        return lo, (i + 1 if i >= 0 else -1), shift
+                lo -= 1
+
+        for span in spans:
+            start_pos, end_pos = span[0], span[1]
+            # extend the window so that it covers the span
+            k = bisect.bisect_right(src_pos, end_pos, wb + 1)
+            if k > wb + 1:
+                w_pos.extend(src_pos[wb + 1:k])
+                w_path.extend(src_path[wb + 1:k])
+                wb = k - 1
+            while out_pos and (not w_pos or w_pos[0] >= start_pos):
+                w_pos.insert(0, out_pos.pop())
+                w_path.insert(0, out_path.pop())
+            # move the paths before the span to the out-lists, except for
+            # the last one, which is needed for left-biased look-ups
+            k = bisect.bisect_left(w_pos, start_pos) - 1
+            if k > 0:
+                out_pos.extend(w_pos[:k])
+                out_path.extend(w_path[:k])
+                del w_pos[:k]
+                del w_path[:k]
+
+            a = window.get_path_index(start_pos, left_biased=True)
+            a2 = window.get_path_index(start_pos, left_biased=False)
+            b = window.get_path_index(end_pos, left_biased=False)
+            b2 = window.get_path_index(end_pos, left_biased=True)
+            paths_to_span = [(a2, w_path[a2]), (b2, w_path[b2]), (a, w_path[a]), (b, w_path[b])]
+
+            ancestor, _ = window.markup(*span)
+
+            # Update the paths running through the ancestor returned by markup().
+            # Only the children of the ancestor that contain the span or touch it
+            # are regenerated. Children before these are left untouched by markup()
+            # and so are children after these, because split_node() always keeps
+            # the left part of a node that is split.
+            for i, path in paths_to_span:
+                for e in range(len(path) - 1, -1, -1):
+                    if path[e] is ancestor:
+                        break
+                else:
+                    continue
+                break
+            else:
+                raise AssertionError(f'Node "{ancestor.name}" returned by markup() is '
+                                     f'not part of the paths leading to the span {span}!')
+            indices = [k for k, pth in paths_to_span if len(pth) > e and pth[e] is ancestor]
+            lo, hi = min(indices), max(indices)
+            whole = len(path) == e + 1  # the ancestor has been a leaf before markup()
+            hi, n = extend_right(hi, ancestor, e, end_pos, whole)
+            lo, m, shift = extend_left(lo, ancestor, e, start_pos, whole)
+            hi += shift
+            if m < 0 or (n is not None and n < 0):
+                # fall back on regenerating all paths running through the ancestor
+                hi, n = extend_right(hi, ancestor, e, end_pos, True)
+                lo, m, shift = extend_left(lo, ancestor, e, start_pos, True)
+                hi += shift
+
+            stump = path[:e]
+            _, offsets, paths = self._generate_mapping(ancestor, stump, m, n)
+            offset = w_pos[lo]
+            w_pos[lo:hi + 1] = [offset + pos for pos in offsets]
+            w_path[lo:hi + 1] = [stump + pth for pth in paths] if stump else paths
+
+        out_pos.extend(w_pos)
+        out_path.extend(w_path)
+        out_pos.extend(src_pos[wb + 1:])
+        out_path.extend(src_path[wb + 1:])
+        self._pos_list[:] = out_pos
+        self._path_list[:] = out_path
+        self._path_str_cache = dict()
+
 
 class LocalContentMapping(ContentMapping):
     """A context-mapping (see :py:class:`ContentMapping`) that does not span
@@ -5971,6 +7721,372 @@ class LocalContentMapping(ContentMapping):
         return super().markup(start_pos + self.pos_offset, end_pos + self.pos_offset, name,
                               *attr_dict, **attributes)
 
+    def markup_many(self, spans: Iterable[Tuple]):
+        super().markup_many([(span[0] + self.pos_offset, span[1] + self.pos_offset) + tuple(span[2:])
+                             for span in spans])
+        self.local_path_list, self.local_pos_list = \
+            self._gen_local_path_and_pos_list(self.first_index, self.last_index)
+
+
+def _chunked_finditer(rx: RxPatternType, pieces: Iterator[Tuple[int, str]],
+                      start_pos: int, end_pos: Optional[int],
+                      chunk_size: int, max_match_length: int) -> Iterator[ContentMatch]:
+    """Yields the matches of ``rx`` in a string that is passed piecewise as
+    an iterator over tuples (position, substring), starting with the piece
+    that contains the position ``start_pos - max_match_length``. Only about
+    ``chunk_size + 2 * max_match_length`` characters of the string are kept
+    in memory at any time. Matches that start less than ``max_match_length``
+    characters before the end of the currently read part of the string are
+    deferred until more of the string has been read. Thus, the result is the
+    same as that of ``rx.finditer()`` on the complete string as long as no
+    match, including its look-ahead and look-behind, is longer than
+    ``max_match_length``."""
+    context = max(max_match_length, 1)  # keeps "^", "\b" and look-behinds working
+    buffer = ''
+    buf_pos = -1  # the position of buffer[0] in the complete string
+    search_pos = start_pos
+    last_empty = -1  # the position of the last empty match that has been yielded
+    final = False
+    while not final:
+        parts = [buffer]
+        size = len(buffer)
+        while size - len(buffer) < chunk_size:
+            piece = next(pieces, None)
+            if piece is None:
+                final = True
+                break
+            if buf_pos < 0:
+                buf_pos = piece[0]
+            parts.append(piece[1])
+            size += len(piece[1])
+            if end_pos is not None and buf_pos + size >= end_pos:
+                final = True
+                break
+        buffer = ''.join(parts)
+        if buf_pos < 0:
+            buf_pos = 0
+        stop = len(buffer) if end_pos is None else min(len(buffer), end_pos - buf_pos)
+        safe = stop - max_match_length
+        for match in rx.finditer(buffer, search_pos - buf_pos, stop):
+            start, end = match.span()
+            if start >= safe and not final:
+                break
+            if start == end and buf_pos + start == last_empty:
+                continue  # has already been yielded in the last round
+            yield ContentMatch(match, buf_pos)
+            search_pos = buf_pos + end
+            last_empty = search_pos if start == end else -1
+        else:
+            search_pos = max(search_pos, buf_pos + safe)
+        cut = max(0, search_pos - buf_pos - context)
+        buffer = buffer[cut:]
+        buf_pos += cut
+
+
+class _ContentIndex(NamedTuple):
+    """A compact index of the selected leaves of a tree: ``nodes`` contains
+    the nodes that have been visited while generating the index in document
+    order and ``parents`` the index of the parent of each of these nodes
+    (-1 for the origin). ``leaves`` contains the indices of the selected
+    leaves in ``nodes`` and ``positions`` their positions in the content."""
+    nodes: List[Node]
+    parents: array
+    leaves: array
+    positions: array
+    __module__ = __name__  # required for cython/pickle compatibility
+
+
+class _PositionView:
+    """A read-only sequence of the positions of the leaves ``first`` up to
+    (but excluding) ``stop`` of a content-index relative to ``offset``."""
+    __slots__ = ('positions', 'first', 'stop', 'offset')
+
+    def __init__(self, positions: array, first: int, stop: int, offset: int):
+        self.positions = positions
+        self.first = first
+        self.stop = stop
+        self.offset = offset
+
+    def __len__(self) -> int:
+        return self.stop - self.first
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(self.stop - self.first))]
+        if i < 0:
+            i += self.stop - self.first
+        if not 0 <= i < self.stop - self.first:
+            raise IndexError(f'Position index {i} out of range!')
+        return self.positions[self.first + i] - self.offset
+
+
+class _PathView:
+    """A read-only sequence of the paths of the leaves ``first`` up to
+    (but excluding) ``stop`` of a content-index. The paths are reconstructed
+    from the parent-indices whenever they are accessed."""
+    __slots__ = ('index', 'first', 'stop')
+
+    def __init__(self, index: _ContentIndex, first: int, stop: int):
+        self.index = index
+        self.first = first
+        self.stop = stop
+
+    def __len__(self) -> int:
+        return self.stop - self.first
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(self.stop - self.first))]
+        if i < 0:
+            i += self.stop - self.first
+        if not 0 <= i < self.stop - self.first:
+            raise IndexError(f'Path index {i} out of range!')
+        nodes, parents = self.index.nodes, self.index.parents
+        k = self.index.leaves[self.first + i]
+        path = []
+        while k >= 0:
+            path.append(nodes[k])
+            k = parents[k]
+        path.reverse()
+        return path
+
+    def __iter__(self) -> Iterator[Path]:
+        for i in range(self.stop - self.first):
+            yield self[i]
+
+
+class LazyContentMapping(ContentMapping):
+    """A content-mapping (see :py:class:`ContentMapping`) that generates its
+    content, positions and paths only when they are needed and keeps them
+    in a compact form:
+
+    1. :py:meth:`LazyContentMapping.finditer` searches the content without
+       generating the content-string or the paths. The selected leaves are
+       read in chunks and only the chunk that is currently being searched is
+       kept in memory.
+
+    2. Positions and paths are stored in an index of arrays that contains
+       the positions of the leaves and, for every node of the tree, the index
+       of its parent-node. The paths in ``path_list`` are reconstructed from
+       this index whenever they are accessed. This requires a fraction of the
+       memory that the lists of positions and paths of a
+       :py:class:`ContentMapping` occupy.
+
+    3. :py:meth:`LazyContentMapping.segment` returns mappings of sections of
+       the content that share the index with the mapping of the whole tree.
+
+    Before the tree is changed with one of the methods
+    :py:meth:`ContentMapping.markup`, :py:meth:`ContentMapping.markup_many`,
+    :py:meth:`ContentMapping.insert_node` or
+    :py:meth:`ContentMapping.rebuild_mapping_slice`, the positions and paths
+    are converted to lists, so that the lazy content-mapping works like a
+    regular content-mapping from then on.
+
+    Example::
+
+        >>> tree = parse_sxpr('(doc (p "Karl and Rosa") (p (hi "met") (:Text " in Berlin.")))')
+        >>> cm = LazyContentMapping(tree)
+        >>> [m.span() for m in cm.finditer('Rosa|Berlin', chunk_size=4, max_match_length=6)]
+        [(9, 13), (20, 26)]
+        >>> print(pp_path(cm.get_path_and_offset(20)[0], 1, ', '))
+        doc, p, :Text " in Berlin."
+        >>> _ = cm.markup(9, 20, 'x')
+        >>> print(tree.as_sxpr(flatten_threshold=-1))
+        (doc (p (:Text "Karl and ") (x "Rosa")) (p (x (hi "met") (:Text " in ")) (:Text "Berlin.")))
+    """
+
+    def _init_mapping(self):
+        self._index: Optional[_ContentIndex] = None
+        self._first: int = 0
+        self._stop: int = -1
+        self.pos_offset: int = 0
+        self._segment: bool = False
+        self._content: Optional[str] = None
+        self._positions: Optional[List[int]] = None
+        self._paths: Optional[List[Path]] = None
+
+    def _traverse(self) -> Iterator[Tuple[Node, int, bool]]:
+        """Yields the nodes that are visited when generating the mapping in
+        document order as tuples (node, index of the parent-node in this
+        order, whether the node is a selected leaf)."""
+        origin = self.origin
+        # other than Node.select_path_if(), only one path-list is kept up to date
+        path = [origin]
+        select_func, ignore_func = self.select_func, self.ignore_func
+        if ignore_func(path):
+            return
+        yield origin, -1, select_func(path)
+        counter = 1
+        stack = [(0, iter(origin._children))]
+        while stack:
+            parent, children = stack[-1]
+            for child in children:
+                i = counter
+                counter += 1
+                path.append(child)
+                yield child, parent, select_func(path)
+                if child._children and not ignore_func(path):
+                    stack.append((i, iter(child._children)))
+                    break
+                path.pop()
+            else:
+                stack.pop()
+                path.pop()
+
+    def _get_index(self) -> _ContentIndex:
+        if self._index is None:
+            nodes: List[Node] = []
+            parents = array('l')
+            leaves = array('l')
+            positions = array('l')
+            pos = 0
+            for node, parent, selected in self._traverse():
+                if selected:
+                    leaves.append(len(nodes))
+                    positions.append(pos)
+                    pos += node.strlen()
+                nodes.append(node)
+                parents.append(parent)
+            self._index = _ContentIndex(nodes, parents, leaves, positions)
+            self._stop = len(leaves)
+        return self._index
+
+    def _pieces(self, from_pos: int) -> Iterator[Tuple[int, str]]:
+        """Yields the positions and contents of the selected leaves, starting
+        with the leaf that contains ``from_pos``."""
+        if self._index is None:
+            pos = 0
+            for node, _, selected in self._traverse():
+                if selected:
+                    content = node.content
+                    if pos + len(content) > from_pos or from_pos <= 0:
+                        yield pos, content
+                    pos += len(content)
+        else:
+            import bisect
+            nodes, _, leaves, positions = self._index
+            offset = self.pos_offset
+            k = bisect.bisect_right(positions, from_pos + offset, self._first, self._stop) - 1
+            for k in range(max(k, self._first), self._stop):
+                yield positions[k] - offset, nodes[leaves[k]].content
+
+    def _materialize(self):
+        """Converts positions and paths to lists before the tree is changed."""
+        if self._paths is None:
+            if self._segment:
+                raise ValueError('The segment of a LazyContentMapping cannot be used '
+                                 'to change the tree. Use the mapping of the whole tree '
+                                 'and add "pos_offset" to the positions in the segment!')
+            self.content  # must be generated before the tree is changed
+            self._positions = list(self._pos_list)
+            self._paths = list(self._path_list)
+            self._index = None
+
+    @property
+    def content(self) -> str:
+        if self._content is None:
+            if self._paths is None:
+                self._get_index()
+                self._content = ''.join(piece for _, piece in self._pieces(0))
+            else:
+                self._content = ''.join(path[-1].content for path in self._paths)
+        return self._content
+
+    @content.setter
+    def content(self, content: str):
+        self._content = content
+
+    @property
+    def _pos_list(self) -> Union[List[int], Sequence[int]]:
+        if self._positions is None:
+            index = self._get_index()
+            if self._first == 0 and self._stop == len(index.positions):
+                return index.positions
+            return _PositionView(index.positions, self._first, self._stop, self.pos_offset)
+        return self._positions
+
+    @property
+    def _path_list(self) -> Union[List[Path], Sequence[Path]]:
+        if self._paths is None:
+            return _PathView(self._get_index(), self._first, self._stop)
+        return self._paths
+
+    def finditer(self, pattern: Union[str, RxPatternType], start_pos: int = 0,
+                 end_pos: Optional[int] = None,
+                 chunk_size: int = 1 << 16,
+                 max_match_length: int = 1 << 12) -> Iterator[ContentMatch]:
+        """Yields the matches of the regular expression ``pattern`` in the
+        string-content from ``start_pos`` up to ``end_pos`` (or the end of
+        the content, if ``end_pos`` is None) like
+        :py:meth:`ContentMapping.finditer`. Unless the content-string has
+        already been generated, the content of the selected leaves is read
+        and searched in chunks of about ``chunk_size`` characters, keeping
+        ``max_match_length`` characters of the previous chunk, so that
+        matches can run across the boundaries of leaves and chunks.
+
+        :param max_match_length: The maximum length of a match including any
+            look-ahead or look-behind. Longer matches are found only if they
+            fit into a chunk.
+        """
+        rx = re.compile(pattern) if isinstance(pattern, str) else pattern
+        if self._content is not None:
+            yield from super().finditer(rx, start_pos, end_pos)
+        else:
+            pieces = self._pieces(start_pos - max(max_match_length, 1))
+            yield from _chunked_finditer(rx, pieces, start_pos, end_pos,
+                                         chunk_size, max_match_length)
+
+    def segment(self, start_pos: int, end_pos: int) -> LazyContentMapping:
+        """Returns a content-mapping of the selected leaves that overlap the
+        range from ``start_pos`` to ``end_pos``. The segment shares the
+        index of positions and paths with this mapping. The positions in
+        the segment are relative to the beginning of its first leaf, which
+        is stored in the ``pos_offset``-field of the segment. Segments
+        cannot be used to change the tree. Example::
+
+            >>> tree = parse_sxpr('(doc (p "Karl and Rosa") (p (hi "met") (:Text " in Berlin.")))')
+            >>> cm = LazyContentMapping(tree)
+            >>> segment = cm.segment(14, 18)
+            >>> print(segment)
+            0 -> doc, p, hi "met"
+            3 -> doc, p, :Text " in Berlin."
+            >>> segment.pos_offset
+            13
+            >>> [m.start() + segment.pos_offset for m in segment.finditer('Berlin')]
+            [20]
+        """
+        if self._paths is not None:
+            raise ValueError('Segments can only be taken from a LazyContentMapping '
+                             'as long as the tree has not been changed via the mapping!')
+        first = self.get_path_index(start_pos)
+        last = self.get_path_index(end_pos, left_biased=True) if end_pos > start_pos else first
+        segment = LazyContentMapping.__new__(LazyContentMapping)
+        segment.__dict__.update(self.__dict__)
+        segment._path_str_cache = dict()
+        segment._content = None
+        segment._segment = True
+        segment._first = self._first + first
+        segment._stop = self._first + last + 1
+        segment.pos_offset = self._index.positions[segment._first]
+        return segment
+
+    def rebuild_mapping_slice(self, first_index: int, last_index: int):
+        self._materialize()
+        super().rebuild_mapping_slice(first_index, last_index)
+
+    def insert_node(self, pos: int, node: Node, left_biased: bool=False) -> NodeLocation:
+        self._materialize()
+        return super().insert_node(pos, node, left_biased)
+
+    def markup(self, start_pos: int, end_pos: int, name: str,
+               *attr_dict, **attributes) -> NodeLocation:
+        self._materialize()
+        return super().markup(start_pos, end_pos, name, *attr_dict, **attributes)
+
+    def markup_many(self, spans: Iterable[Tuple]):
+        self._materialize()
+        super().markup_many(spans)
+
 
 class SerPart(IntEnum):
     OPENING_TAG = -1
@@ -5987,7 +8103,12 @@ class SerLocation(NamedTuple):
 
 
 class SerializationMapping:
-    """Maps serializations (e.g., XML, SXML, S-Expression) to paths. EXPERIMENTAL AND UNTESTED!!!"""
+    """Maps serializations (e.g., XML, SXML, S-Expression) to paths. EXPERIMENTAL AND UNTESTED!!!
+
+    The look-up tables are generated lazily on the first call of
+    :py:meth:`get_path` and stored in compact arrays, so that creating a
+    serialization mapping costs (almost) nothing as long as it is not queried.
+    """
 
     def __init__(self, tree: Node, serialization: str, raw_mapping: RawMappingType):
         assert serialization[0:1] in ('(', '<'), "XML- or S-Expression-serialization expected!"
@@ -5995,39 +8116,56 @@ class SerializationMapping:
         self.serialization = serialization
         self.ser_type = "XML" if serialization[0:1] == '<' else "S-Expression"
         self.raw_mapping = raw_mapping
-        self._cook()
+        self._node_list: List[Node] = []    # all nodes in document order
+        self._parents = array('l')          # index of the parent of each node or -1
+        self._node_pos = array('l')         # position of each node in the serialization
+        self._pos_list = array('l')         # positions where nodes begin and end, ascending
+        self._index_list = array('l')       # index of the node beginning or ending there
 
     def _cook(self):
-        self._path: Dict[Node, Path] = {}
-        self._node_list: List[Node] = []
-        self._pos_list: List[int] = []
-        self._node_pos: Dict[Node, int] = {}
-
-        def cook(path: Path, pos: int) -> int:
-            _begin = pos
-            node = path[-1]
-            self._node_list.append(node)
-            self._node_pos[node] = pos
-            self._pos_list.append(pos)
-            self._path[node] = path.copy()
-            pos += self.raw_mapping[node][0]  # add head-length to pos
-            if node.children:
-                for child in node.children:
-                    path.append(child)
-                    pos = cook(path, pos)
-                    path.pop()
+        node_list, parents, node_pos = self._node_list, self._parents, self._node_pos
+        pos_list, index_list = self._pos_list, self._index_list
+        raw_mapping = self.raw_mapping
+        stack = []
+        node, parent, pos = self.tree, -1, 0
+        while True:
+            i = len(node_list)
+            node_list.append(node)
+            parents.append(parent)
+            node_pos.append(pos)
+            pos_list.append(pos)
+            index_list.append(i)
+            head, size, tail = raw_mapping[node]
+            if node._children:
+                pos += head
+                stack.append((i, iter(node._children)))
             else:
-                pos += (cast(int, self.raw_mapping[node][1])
-                        - self.raw_mapping[node][0]
-                        - self.raw_mapping[node][2])
-            self._node_list.append(node)
-            self._pos_list.append(pos)
-            pos += self.raw_mapping[node][2]
-            assert _begin + cast(int, self.raw_mapping[node][1]) == pos, \
-                f'{_begin}, {pos}, {self.raw_mapping[node]}, {node.as_sxpr()}'
-            return pos
-
-        cook([self.tree], 0)
+                pos += cast(int, size) - tail
+                pos_list.append(pos)
+                index_list.append(i)
+                pos += tail
+            while stack:
+                parent, children = stack[-1]
+                node = next(children, None)
+                if node is not None:
+                    break
+                stack.pop()
+                pos_list.append(pos)
+                index_list.append(parent)
+                pos += raw_mapping[node_list[parent]][2]
+                assert node_pos[parent] + cast(int, raw_mapping[node_list[parent]][1]) == pos, \
+                    f'{node_pos[parent]}, {pos}, {raw_mapping[node_list[parent]]}, ' \
+                    f'{node_list[parent].as_sxpr()}'
+            else:
+                break
+
+    def _path(self, index: int) -> Path:
+        path = []
+        while index >= 0:
+            path.append(self._node_list[index])
+            index = self._parents[index]
+        path.reverse()
+        return path
 
     def get_path(self, pos: int, left_biased: bool = False) -> SerLocation:
         """Returns the path of the innermost node which covers the character
@@ -6042,6 +8180,8 @@ class SerializationMapping:
         errmsg = lambda i: f'Illegal position value {i}. Must be ' \
             f'0 <= position < length of serialization ({len(self.serialization)})!'
         if pos < 0:  raise IndexError(errmsg(pos))
+        if not self._node_list:
+            self._cook()
         import bisect
         try:
             index = bisect.bisect_right(self._pos_list, pos) - 1
@@ -6055,15 +8195,16 @@ class SerializationMapping:
                     index += 1
         except IndexError:
             raise IndexError(errmsg(pos))
-        node = self._node_list[index]
-        ser_pos = self._node_pos[node]
+        i = self._index_list[index]
+        node = self._node_list[i]
+        ser_pos = self._node_pos[i]
         offset = pos - ser_pos
         rm_node_1 = cast(int, self.raw_mapping[node][1])
         assert 0 <= offset <= rm_node_1
         part = -1 if offset < self.raw_mapping[node][0] else \
                 1 if offset >= rm_node_1 - self.raw_mapping[node][2] else \
                 0
-        return SerLocation(self._path[self._node_list[index]], ser_pos, offset, SerPart(part))
+        return SerLocation(self._path(i), ser_pos, offset, SerPart(part))
 
     def content_pos(self, node: Node,
                     ser_pos: int,
@@ -61,6 +61,7 @@ cdef class Grammar:
 #    cdef public object root_parser__  # do not uncomment this!!!
     cdef public object tree__
     cdef public object document__
+    cdef public object reentry_scanner__
     cdef public str text__
     cdef public object _reversed__
     cdef public int document_length__
@@ -31,7 +31,9 @@ for an example.
 
 from __future__ import annotations
 
+import bisect
 import functools
+import time
 from collections import defaultdict
 import copy
 from functools import lru_cache
@@ -50,6 +52,7 @@ from DHParser.error import Error, ErrorCode, MANDATORY_CONTINUATION, \
     MANDATORY_CONTINUATION_AT_EOF_NON_ROOT, CAPTURE_STACK_NOT_EMPTY_NON_ROOT_ONLY, \
     AUTOCAPTURED_SYMBOL_NOT_CLEARED_NON_ROOT, ERROR_WHILE_RECOVERING_FROM_ERROR, \
     ZERO_LENGTH_CAPTURE_POSSIBLE_WARNING, PARSER_STOPPED_ON_RETRY, ERROR, CANCELED, \
+    ERROR_BUDGET_EXHAUSTED, \
     INFINITE_LOOP_WARNING, REDUNDANT_PARSER_WARNING, PARSER_STOPPED_BEFORE_END_WARNING, \
     has_errors, is_error
 from DHParser.log import CallItem, HistoryRecord
@@ -299,59 +302,175 @@ ReentryPointAlgorithm: TypeAlias = Callable[[StringView, int, int], Tuple[int, i
 # A return value of (-1, x) means that no reentry point before the end of the document was found
 
 
-# @cython.returns(cython.int)
-# must not use: @functools.lru_cache(), because resume-function may contain
-# context-sensitive parsers!!!
-@cython.locals(upper_limit=cython.int, closest_match=cython.int, pos=cython.int)
-def reentry_point(rest: StringView,
-                  rules: ResumeList,
-                  comment_regex,
-                  search_window: int = -1,
-                  skip_node_name: str = "") -> Tuple[int, Node]:
+class ReentryScanner:
+    """A per-document helper for :py:func:`reentry_point` that speeds up the
+    search for reentry points in documents with many errors.
+
+    The comments of the document are scanned only once and incrementally, i.e.
+    only where the reentry-search has progressed, so that looking up the
+    comment that follows a reentry-point becomes a binary search. Furthermore,
+    the results of searching the document for string- or regular-expression-rules
+    are cached: A match that has been found when searching from location L0
+    is also the first match for any location between L0 and the beginning of
+    that match. (If this match lies inside a comment, the search continues
+    after the comment in both cases, which leads to the same reentry-point.)
+    Likewise, if a search did not yield any match up to the end of the
+    document, any search for the same rule from a later location will not
+    yield a match, either. Finally, because the search for a match that lies
+    outside a comment always continues at the end of the comment, the results
+    of these continuations are cached, too.
+
+    Because of this caching, the scanner searches the whole rest of the
+    document and afterwards discards matches that do not end within the
+    search window. Thus, a regular expression is never cut short at the
+    end of the search window as with :py:func:`reentry_point`.
+
+    Rules that are parsers or reentry-point-algorithms (i.e. callables) are
+    never cached, because they may be context-sensitive.
+
+    A ReentryScanner is bound to one document, passed as string ``text``. The
+    ``rest``-StringViews that are passed to :py:meth:`ReentryScanner.reentry`
+    must be tail-slices of this very document. ``Grammar`` creates a fresh
+    instance for every document that is parsed.
     """
-    Finds the point where parsing should resume after a ParserError has been caught.
-    The algorithm makes sure that this reentry-point does not lie inside a comment.
-    The re-entry point is always the point after the end of the match of the regular
-    expression defining the re-entry point. (Use lookahead if you want to define
-    the re-entry point by what follows rather than by what text precedes the point.)
-
-    REMARK: The algorithm assumes that any stretch of the document that matches
-    ``comment_regex`` is actually a comment. It is possible to define grammars,
-    where the use of comments is restricted to certain areas and that allow to
-    use constructs that look like comments (i.e. will be matched by ``comment_regex``)
-    but are none in other areas. For example::
 
-        my_string = "# This is not a comment"; foo()  # This is a comment bar()
-
-    Here the reentry-algorithm would overlook ``foo()`` and jump directly to ``bar()``.
-    However, since the reentry-algorithm only needs to be good enough to do its
-    work, this seems acceptable.
+    def __init__(self, text: str, comment_rx: RxPatternType):
+        self.text = text
+        self.comment_rx = comment_rx
+        self.comment_starts = []  # type: List[int]
+        self.comment_ends = []  # type: List[int]
+        self.comments_scanned = 0 if comment_rx.pattern != NEVER_MATCH_PATTERN \
+            else len(self.text) + 1
+        # (rule, search window) -> (search start, first match start, first match end,
+        #                           reentry point)
+        self.matches = dict()  # type: Dict[Tuple[Union[str, RxPatternType], int], Tuple[int, int, int, int]]
+        # (rule, search window) -> {restart after comment -> (match start, reentry point)}
+        self.restarts = dict()  # type: Dict[Tuple[Union[str, RxPatternType], int], Dict[int, Tuple[int, int]]]
+
+    @cython.locals(origin=cython.int, upto=cython.int, a=cython.int, b=cython.int)
+    def _scan_comments(self, origin: int, upto: int):
+        """Scans for comments until all comments that start after ``origin``
+        and before ``upto`` are known. Just like :py:func:`reentry_point`, the
+        scanner does not look for comments that start before the point of
+        failure, i.e. ``origin``, unless they have already been scanned before.
+        """
+        text = self.text
+        if self.comments_scanned < origin:
+            self.comments_scanned = origin
+        while self.comments_scanned < upto:
+            m = self.comment_rx.search(text, self.comments_scanned)
+            if not m:
+                self.comments_scanned = len(text) + 1
+                break
+            a, b = m.span()
+            if b > a:
+                self.comment_starts.append(a)
+                self.comment_ends.append(b)
+            self.comments_scanned = max(b, a + 1)
+
+    @cython.locals(origin=cython.int, x=cython.int, upto=cython.int, i=cython.int)
+    def next_comment(self, origin: int, x: int, upto: int) -> Tuple[int, int]:
+        """Returns the [start, end[ interval of the first comment that ends
+        after position ``x``. Comments that start later than ``upto`` may
+        be overlooked. Returns (-1, -2) if there is no such comment."""
+        self._scan_comments(origin, upto + 1)
+        i = bisect.bisect_right(self.comment_ends, x)
+        if i < len(self.comment_ends):
+            return self.comment_starts[i], self.comment_ends[i]
+        return -1, -2
 
-    :param rest:  The rest of the parsed text or, in other words, the point where
-        a ParserError was thrown
-    :param rules: A list of strings, regular expressions or search functions.
-        The rest of the text is searched for each of these. The closest match
-        is the point where parsing will be resumed
-    :param comment_regex: A regular expression object that matches comments
-    :param search_window: The maximum size of the search window for finding the
-        reentry-point. A value smaller than zero means that the complete remaining
-        text will be searched. A value of zero effectively turns of resuming after
-        error
-    :param skip_node_name: A name for the skip-node that is used to store that part
-        of the document that will be skipped before continuing with the parsing process.
-        f"_R{nr}__" will be added to the skip-node name, where "nr" is the nummer
-        of the skip-rule, of which there can be more than one for the same parser.
-    :return: A tuple of the integer index (counted from the beginning of rest!)
-        of the closest reentry point and a Node
-        capturing all text from ``rest`` up to this point or ``(-1, None)`` if no
-        reentry-point was found.
+    @cython.locals(start=cython.int, window=cython.int, origin=cython.int,
+                   first_k=cython.int, first_e=cython.int, k=cython.int, e=cython.int,
+                   length=cython.int, a=cython.int, b=cython.int)
+    def _search(self, rule, start: int, window: int) -> Tuple[int, int, int, int]:
+        """Searches for the first match of ``rule`` that does not lie inside a
+        comment. Returns start and end of the first match that has been found,
+        whether inside a comment or not, and start and end (absolute positions)
+        of the first match outside a comment or (-1, -1), if there was no
+        such match.
+
+        The check for comments follows the same rules as the one in
+        :py:func:`reentry_point`: For the first match only the end of the
+        match must not lie inside a comment, for any further match, neither
+        its start nor its end must lie inside the following comment.
+
+        Other than with :py:func:`reentry_point`, the search is not limited
+        by the search window, but a match that lies beyond the window is
+        not accepted. The window is not checked for the first match, because
+        it must be checked relative to the location of the caller.
+        """
+        text = self.text
+        origin = start
+        first_k, first_e = -1, -1
+        restarts = self.restarts.setdefault((rule, window), dict())
+        visited = []
+        while True:
+            if first_k >= 0:
+                if start in restarts:
+                    k, e = restarts[start]
+                    break
+                visited.append(start)
+            if isinstance(rule, str):
+                k = text.find(rule, start)
+                length = len(rule)
+            else:
+                m = rule.search(text, start)
+                if m:
+                    k, e = m.span()
+                    length = e - k
+                else:
+                    k = -1
+            if k < 0 or (first_k >= 0 and 0 <= window < k + length - start):
+                k, e = -1, -1
+                break
+            if first_k < 0:
+                first_k, first_e = k, k + length
+                a, b = self.next_comment(origin, k + length, k + length)
+            else:
+                a, b = self.next_comment(origin, k, k + length)
+            if (a < k < b) or (a < k + length < b):
+                start = b
+            else:
+                e = k + length
+                break
+        for start in visited:
+            restarts[start] = (k, e)
+        return first_k, first_e, k, e
+
+    @cython.locals(location=cython.int, window=cython.int, start=cython.int,
+                   first_k=cython.int, first_e=cython.int, k=cython.int, e=cython.int)
+    def reentry(self, rest: StringView, rule: Union[str, RxPatternType],
+                window: int) -> int:
+        """Returns the reentry-point for the string or regular expression
+        ``rule`` relative to the beginning of ``rest``, or -1 if there is
+        none within the search window. A negative ``window`` means that the
+        complete remaining text will be searched."""
+        location = len(self.text) - len(rest)
+        if window >= len(rest):
+            window = -1
+        key = (rule, window)
+        cached = self.matches.get(key, None)
+        if cached is not None and cached[0] <= location \
+                and (location <= cached[1] or cached[1] < 0):
+            start, first_k, first_e, e = cached
+        else:
+            first_k, first_e, k, e = self._search(rule, location, window)
+            self.matches[key] = (location, first_k, first_e, e)
+        if first_k < 0 or e < 0 or 0 <= window < first_e - location:
+            return -1
+        return e - location
+
+
+@cython.locals(upper_limit=cython.int, search_window=cython.int)
+def _search_reentry_rule(rest: StringView, rule: Union[str, RxPatternType, ReentryPointAlgorithm],
+                         comment_regex, search_window: int) -> int:
+    """Returns the reentry-point outside a comment for a single rule that is a
+    string, a regular expression or a reentry-point-algorithm, or the first
+    position after the end of ``rest`` ("upper limit"), if no reentry point
+    was found within the search window. See :py:func:`reentry_point`.
     """
     upper_limit = len(rest) + 1
-    closest_match = upper_limit
-    skip_node = None
-    comments = None  # type: Optional[Iterator]
-    if search_window < 0:
-        search_window = len(rest)
+    comments = rest.finditer(comment_regex)  # type: Optional[Iterator]
 
     @cython.locals(a=cython.int, b=cython.int)
     def next_comment() -> Tuple[int, int]:
@@ -417,10 +536,79 @@ def reentry_point(rest: StringView,
                 a, b = next_comment()
         return k + length if k >= 0 else upper_limit
 
+    if callable(rule):
+        return entry_point(algorithm_search, rule)
+    elif isinstance(rule, str):
+        return entry_point(str_search, rule)
+    else:
+        return entry_point(rx_search, rule)
+
+
+# @cython.returns(cython.int)
+# must not use: @functools.lru_cache(), because resume-function may contain
+# context-sensitive parsers!!!
+@cython.locals(upper_limit=cython.int, closest_match=cython.int, pos=cython.int)
+def reentry_point(rest: StringView,
+                  rules: ResumeList,
+                  comment_regex,
+                  search_window: Optional[int] = None,
+                  skip_node_name: str = "",
+                  scanner: Optional[ReentryScanner] = None) -> Tuple[int, Node]:
+    """
+    Finds the point where parsing should resume after a ParserError has been caught.
+    The algorithm makes sure that this reentry-point does not lie inside a comment.
+    The re-entry point is always the point after the end of the match of the regular
+    expression defining the re-entry point. (Use lookahead if you want to define
+    the re-entry point by what follows rather than by what text precedes the point.)
+
+    REMARK: The algorithm assumes that any stretch of the document that matches
+    ``comment_regex`` is actually a comment. It is possible to define grammars,
+    where the use of comments is restricted to certain areas and that allow to
+    use constructs that look like comments (i.e. will be matched by ``comment_regex``)
+    but are none in other areas. For example::
+
+        my_string = "# This is not a comment"; foo()  # This is a comment bar()
+
+    Here the reentry-algorithm would overlook ``foo()`` and jump directly to ``bar()``.
+    However, since the reentry-algorithm only needs to be good enough to do its
+    work, this seems acceptable.
+
+    :param rest:  The rest of the parsed text or, in other words, the point where
+        a ParserError was thrown
+    :param rules: A list of strings, regular expressions or search functions.
+        The rest of the text is searched for each of these. The closest match
+        is the point where parsing will be resumed
+    :param comment_regex: A regular expression object that matches comments
+    :param search_window: The maximum size of the search window for finding the
+        reentry-point. A value smaller than zero means that the complete remaining
+        text will be searched. A value of zero effectively turns of resuming after
+        error. If None, the configuration value ``reentry_search_window`` will
+        be used.
+    :param skip_node_name: A name for the skip-node that is used to store that part
+        of the document that will be skipped before continuing with the parsing process.
+        f"_R{nr}__" will be added to the skip-node name, where "nr" is the nummer
+        of the skip-rule, of which there can be more than one for the same parser.
+    :param scanner: A :py:class:`ReentryScanner` for the document of which
+        ``rest`` is a part. If given, the search for string- and regular-expression-
+        rules will be delegated to the scanner, which caches comment-locations
+        and search-results. The scanner's comment-regular expression takes
+        precedence over ``comment_regex``.
+    :return: A tuple of the integer index (counted from the beginning of rest!)
+        of the closest reentry point and a Node
+        capturing all text from ``rest`` up to this point or ``(-1, None)`` if no
+        reentry-point was found.
+    """
+    upper_limit = len(rest) + 1
+    closest_match = upper_limit
+    skip_node = None
+    if search_window is None:
+        search_window = get_config_value('reentry_search_window')
+    if search_window < 0:
+        search_window = len(rest)
+
     # find the closest match
     nr = 0
     for nr, rule in enumerate(rules, 1):
-        comments = rest.finditer(comment_regex)
         if isinstance(rule, Parser):
             parser = cast(Parser, rule)
             grammar = parser.grammar
@@ -443,13 +631,12 @@ def reentry_point(rest: StringView,
                     closest_match = pos
                     skip_node = _node
         else:
-            if callable(rule):
-                search_func = algorithm_search
-            elif isinstance(rule, str):
-                search_func = str_search
+            if scanner is not None and not callable(rule):
+                pos = scanner.reentry(rest, rule, search_window)
+                if pos < 0:
+                    pos = upper_limit
             else:
-                search_func = rx_search
-            pos = entry_point(search_func, rule)
+                pos = _search_reentry_rule(rest, rule, comment_regex, search_window)
             if pos < closest_match:
                 skip_node = None
                 closest_match = pos
@@ -671,14 +858,20 @@ class Parser:
     @cython.locals(next_location=cython.int, location=cython.int, gap=cython.int, i=cython.int)
     def _handle_parsing_error(self, pe: ParserError, location: cython.int) -> ParsingResult:
         grammar = self._grammar
+        if grammar.error_budget_exhausted__ is not None and self != grammar.start_parser__:
+            # let the error fall through to the root parser without any further ado
+            raise pe.new_PE(first_throw=False) if pe.first_throw else pe
         gap = pe.location - location
         cut = grammar.document__[location:location + gap]
-        rules = tuple(grammar.resume_rules__.get(self.symbol, []))
+        rules = tuple(grammar.resume_rules__.get(self.symbol, [])) \
+            if grammar.error_budget_exhausted__ is None else ()
         next_location = pe.location + pe.node_orig_len
         rest = grammar.document__[next_location:]
         i, skip_node = reentry_point(
             rest, rules, grammar.comment_rx__, grammar.reentry_search_window__,
-            f'{pe.parser.symbol}_resume')
+            f'{pe.parser.symbol}_resume', grammar.reentry_scanner__)
+        if i >= 0 and not grammar.book_resumption__(next_location):
+            i, skip_node = -1, Node(f'{pe.parser.symbol}_resume_R{len(rules)}__', '')
         if i >= 0 or self == grammar.start_parser__:
             # either a reentry point was found or the
             # error has fallen through to the first level
@@ -705,7 +898,7 @@ class Parser:
             # just fall through
             # TODO: Is this case still needed with module "trace"?
             raise pe.new_PE(first_throw=False)
-        elif grammar.tree__.errors[-1].code in \
+        elif grammar.tree__.errors and grammar.tree__.errors[-1].code in \
                 (MANDATORY_CONTINUATION_AT_EOF, MANDATORY_CONTINUATION_AT_EOF_NON_ROOT):
             # try to create tree as faithful as possible
             node = Node(self.node_name, pe.node).with_pos(location)
@@ -739,6 +932,11 @@ class Parser:
         """
         grammar = self._grammar
 
+        # count down to the next check of time- or call-limits or cancel-queries
+        grammar.cancel_interval__ -= 1
+        if grammar.cancel_interval__ < 0:
+            grammar.check_cancel__(location)
+
         try:
             # rollback variable changing operation if the parser backtracks to a position
             # before or at the location where the variable-changing operation occurred
@@ -1293,24 +1491,23 @@ class UninitializedError(Exception):
 
 
 class CancelError(Exception):
-    "An error that is raised, if parsing has been canceled by a cancel_query."
-    def __init__(self, location):
+    """An error that is raised, if parsing has been canceled by a cancel_query
+    or because a time- or call-limit has been exceeded. ``reason`` describes
+    the cause of the cancellation."""
+    def __init__(self, location, reason: str = ''):
         self.location = location
+        self.reason = reason
 
     def __str__(self):
-        return f'CancelError: {self.location}'
+        return f'CancelError: {self.location}' + (f' ({self.reason})' if self.reason else '')
 
 
-CANCEL_QUERY_INTERVAL = 10
+CANCEL_CHECK_INTERVAL = 1000  # parser-calls between checks of time-limit and cancel-query
 
 
+@deprecated("cancel_proxy() is deprecated and does nothing! The cancel-query is checked "
+            "by the parser-guard (see Grammar.set_cancel_query__()).")
 def cancel_proxy(self: Parser, location: cython.int) -> Tuple[Optional[Node], cython.int]:
-    grammar = self.grammar
-    grammar.cancel_interval__ -= 1
-    if grammar.cancel_interval__ < 0:
-        grammar.cancel_interval__ = CANCEL_QUERY_INTERVAL
-        if grammar.cancel_query__():
-            raise CancelError(location)
     return self._parse(location)
 
 
@@ -1624,6 +1821,18 @@ class Grammar:
     :ivar most_recent_error\__: The most recent parser error that has occurred
                 or ``None``. This can be read by tracers. See module :py:mod:`trace`
 
+    :ivar error_budget_exhausted\__: A tuple of the location and the reason
+                why the error budget has been exhausted or ``None``, if it has
+                not (yet) been exhausted. See :py:meth:`Grammar.book_error__`.
+
+    :ivar resumptions\__: The number of resumptions after errors so far.
+
+    :ivar region_errors\__: A dictionary that maps regions of the document
+                to the number of errors that occurred in that region.
+
+    :ivar suppressed_errors\__: The number of errors that have not been
+                recorded, because the error budget has been exhausted.
+
 
     Configuration parameters:
 
@@ -1637,7 +1846,17 @@ class Grammar:
 
     :ivar reentry_search_window\__: The number of following characters that the
                 parser considers when searching a reentry point when a syntax error
-                has been encountered. Default is 10.000 characters.
+                has been encountered. Default is 50.000 characters.
+
+    :ivar max_resumptions\__: The maximum number of resumptions after errors
+                before the error budget is exhausted. Default is -1, i.e. no limit.
+
+    :ivar max_errors_per_region\__: The maximum number of errors within a
+                region of ``error_region_size__`` characters before the error
+                budget is exhausted. Default is -1, i.e. no limit.
+
+    :ivar error_region_size\__: The size of a region for counting errors.
+                Default is 1.000 characters.
     """
     python_src__ = ''  # type: str
     root__ = get_parser_placeholder()   # type: Parser
@@ -1704,6 +1923,11 @@ class Grammar:
         duplicate.resume_notices__ = self.resume_notices__
         duplicate.max_parser_dropouts__ = self.max_parser_dropouts__
         duplicate.reentry_search_window__ = self.reentry_search_window__
+        duplicate.max_resumptions__ = self.max_resumptions__
+        duplicate.max_errors_per_region__ = self.max_errors_per_region__
+        duplicate.error_region_size__ = self.error_region_size__
+        duplicate.parser_time_limit__ = self.parser_time_limit__
+        duplicate.parser_call_limit__ = self.parser_call_limit__
         return duplicate
 
 
@@ -1760,10 +1984,17 @@ class Grammar:
         self.resume_notices__: bool = get_config_value('resume_notices')
         self.max_parser_dropouts__: int = get_config_value('max_parser_dropouts')
         self.reentry_search_window__: int = get_config_value('reentry_search_window')
+        self.max_resumptions__: int = get_config_value('max_resumptions')
+        self.max_errors_per_region__: int = get_config_value('max_errors_per_region')
+        self.error_region_size__: int = get_config_value('error_region_size')
+        self.parser_time_limit__: float = get_config_value('parser_time_limit')
+        self.parser_call_limit__: int = get_config_value('parser_call_limit')
         self.associated_symbol_cache__: Dict[Parser, Parser] = dict()
         self.cancel_query__: Optional[CancelQuery] = None
-        self.cancel_query_last__: Optional[CancelQuery] = None
-        self.cancel_interval__: int = CANCEL_QUERY_INTERVAL
+        self.cancel_interval__: int = INFINITE
+        self.cancel_slice__: int = INFINITE
+        self.parser_calls__: int = 0
+        self.deadline__: float = 0.0
         self._reset__()
 
         # prepare parsers in the class, first
@@ -1864,6 +2095,7 @@ class Grammar:
         self.tree__: RootNode = RootNode()
         self.text__: str = ''
         self.document__: StringView = EMPTY_STRING_VIEW
+        self.reentry_scanner__: Optional[ReentryScanner] = None
         self._reversed__: StringView = EMPTY_STRING_VIEW
         self.document_length__: int = 0
         self._document_lbreaks__: List[int] = []
@@ -1879,6 +2111,11 @@ class Grammar:
         # also needed for call stack tracing
         self.moving_forward__: bool = False
         self.most_recent_error__: Optional[ParserError] = None
+        # error budget
+        self.error_budget_exhausted__: Optional[Tuple[int, str]] = None
+        self.resumptions__: int = 0
+        self.region_errors__: Dict[int, int] = dict()
+        self.suppressed_errors__: int = 0
         # farthest fail error reporting
         self.ff_pos__: int = -1
         try:
@@ -2009,6 +2246,7 @@ class Grammar:
         self.text__ = document[1:] if document[0:1] in ('\ufeff', '\uffef') else document
         self.document__ = StringView(self.text__)
         self.document_length__ = len(self.document__)
+        self.reentry_scanner__ = ReentryScanner(self.text__, self.comment_rx__)
         self._document_lbreaks__ = linebreaks(self.text__) if self.history_tracking__ else []
         # done by reset: self.last_rb__loc__ = -2  # rollback location
         self.set_cancel_query__()
@@ -2037,16 +2275,21 @@ class Grammar:
         # copy to local variable, so break condition can be triggered manually
         max_parser_dropouts = self.max_parser_dropouts__
         location = 0
-        while location < L and len(stitches) < max_parser_dropouts:
+        while location < L and (len(stitches) < max_parser_dropouts
+                                or (self.error_budget_exhausted__ is not None
+                                    and max_parser_dropouts >= 0)):
+            start = location
             try:
                 result, location = parser(location)
             except ParserError as pe:
                 result, location = pe.node, L
                 for k in self.variables__:  del self.variables__[k]
             except CancelError as ce:
-                result = Node(EMPTY_NODE.name, '').with_pos(0)
+                result = self.partial_tree__(start)
+                reason = f' ({ce.reason})' if ce.reason else ''
                 self.tree__.new_error(
-                    result, f'Parsing was canceled at position: {ce.location} of {L}!', CANCELED)
+                    result, f'Parsing was canceled at position: {ce.location} of {L}{reason}!',
+                    CANCELED)
                 location = L
                 for k in self.variables__:  del self.variables__[k]
             if result is EMPTY_NODE:  # don't ever deal out the EMPTY_NODE singleton!
@@ -2068,6 +2311,14 @@ class Grammar:
                 rest = self.document__[location:]
                 fwd = rest.find("\n") + 1 or len(rest)
                 skip, location = rest[:fwd], location + fwd
+                if self.error_budget_exhausted__ is not None:
+                    # fast fallback, if the error budget has been exhausted: skip to
+                    # the next line and retry with the root parser without reporting
+                    if result is not None and (result.name != ZOMBIE_TAG or result.result):
+                        stitches.append(result)
+                    stitches.append(Node(ZOMBIE_TAG, skip).with_pos(tail_pos(stitches)))
+                    self.release_memo__()
+                    continue
                 if result is None or (result.name == ZOMBIE_TAG and len(result) == 0):
                     err_pos = self.ff_pos__
                     associated_symbol = self.associated_symbol__(self.ff_parser__)
@@ -2172,6 +2423,12 @@ class Grammar:
                 stitches.append(Node(ZOMBIE_TAG, self.document__[location:])\
                                 .with_pos(tail_pos(stitches)))
             result = Node(ZOMBIE_TAG, tuple(stitches)).with_pos(0)
+        if self.error_budget_exhausted__ is not None and result is not None:
+            err_pos, reason = self.error_budget_exhausted__
+            self.tree__.add_error(result, Error(
+                f'Error budget exhausted: {reason}! {self.suppressed_errors__} further '
+                f'error(s) have not been reported. After each error, parsing has been '
+                f'continued at the next line.', err_pos, ERROR_BUDGET_EXHAUSTED))
         if any(self.variables__.values()):
             # capture stack not empty will only be reported for root-parsers
             # to avoid false negatives when testing
@@ -2250,19 +2507,65 @@ class Grammar:
 
 
     def set_cancel_query__(self):
-        if self.cancel_query__ != self.cancel_query_last__:
-            for p in self.all_parsers__:
-                if isinstance(p, LeafParser):
-                    if self.cancel_query__ is None:
-                        p.set_proxy(None)
-                    elif p._parse_proxy == p._parse:
-                        p.set_proxy(cancel_proxy)
-                    else:
-                        assert p._parse_proxy.__name__ in ("cancel_proxy", "trace_history"), \
-                            f"DHParser-Error: Currently, cancel_query cannot be used in " \
-                            f"combination with {p._parse_proxy.__name__}."
-            self.cancel_query_last__ = self.cancel_query__
-        self.cancel_interval__ = CANCEL_QUERY_INTERVAL
+        """Prepares the checks of the cancel-query and of the time- and
+        call-limits for a new parsing run. These checks are made by the
+        parser-guard (see :py:meth:`Parser.__call__`) every
+        ``CANCEL_CHECK_INTERVAL`` parser-calls, so that the overhead for the
+        regular parsing process is reduced to decrementing a counter."""
+        self.parser_calls__ = 0
+        if self.parser_time_limit__ > 0:
+            self.deadline__ = time.perf_counter() + self.parser_time_limit__
+        else:
+            self.deadline__ = 0.0
+        self.cancel_slice__ = self.next_cancel_slice__()
+        self.cancel_interval__ = self.cancel_slice__
+
+    def next_cancel_slice__(self) -> int:
+        """Returns the number of parser-calls until the next check of the
+        cancel-query, the time- and the call-limit."""
+        if self.parser_call_limit__ >= 0:
+            return max(0, min(CANCEL_CHECK_INTERVAL,
+                              self.parser_call_limit__ - self.parser_calls__))
+        if self.cancel_query__ is not None or self.deadline__ > 0.0:
+            return CANCEL_CHECK_INTERVAL
+        return INFINITE
+
+    def check_cancel__(self, location: int):
+        """Checks whether the parser-call- or the time-limit have been exceeded
+        or whether the cancel-query demands canceling the parsing process and
+        raises a :py:class:`CancelError` if this is the case. This method is
+        called by the parser-guard, whenever the ``cancel_interval__``-counter
+        has run down."""
+        self.parser_calls__ += self.cancel_slice__ + 1
+        if 0 <= self.parser_call_limit__ < self.parser_calls__:
+            raise CancelError(location, f'limit of {self.parser_call_limit__} parser-calls exceeded')
+        if self.deadline__ > 0.0 and time.perf_counter() > self.deadline__:
+            raise CancelError(location, f'time-limit of {self.parser_time_limit__} seconds exceeded')
+        if self.cancel_query__ is not None and self.cancel_query__():
+            raise CancelError(location, 'canceled by cancel-query')
+        self.cancel_slice__ = self.next_cancel_slice__()
+        self.cancel_interval__ = self.cancel_slice__
+
+    def partial_tree__(self, location: int = 0) -> Node:
+        """Assembles a partial syntax-tree from the memoized results of the
+        named parsers after parsing has been canceled. Starting at
+        ``location``, the longest memoized match is picked repeatedly. The
+        unparsed rest of the document is added as a zombie-node."""
+        longest: Dict[int, Tuple[Node, int]] = {}
+        for p in self.all_parsers__:
+            if p.pname and isinstance(p.visited, dict):
+                for loc, (node, next_loc) in p.visited.items():
+                    if node is not None and next_loc > loc \
+                            and next_loc > longest.get(loc, (None, -1))[1]:
+                        longest[loc] = (node, next_loc)
+        start = location
+        parts = []
+        while location in longest:
+            node, location = longest[location]
+            parts.append(node)
+        if location < self.document_length__:
+            parts.append(Node(ZOMBIE_TAG, self.document__[location:]).with_pos(location))
+        return Node(ZOMBIE_TAG, tuple(parts)).with_pos(start)
 
 
     @property
@@ -2304,6 +2607,70 @@ class Grammar:
             else -2  # (self.document__.__len__() + 1)
         # print("POP", self.document__[location:location + 10].replace('\n', '\\n'), dict(self.variables__))
 
+    def exhaust_error_budget__(self, location: int, reason: str):
+        """
+        Marks the error budget as exhausted and releases all memoized
+        results. See :py:meth:`Grammar.book_error__`.
+        """
+        if self.error_budget_exhausted__ is None:
+            self.error_budget_exhausted__ = (location, reason)
+            self.release_memo__()
+
+
+    def release_memo__(self):
+        """Releases the memoized results of all parsers."""
+        for p in self.all_parsers__:
+            p.visited = dict()
+
+
+    def book_error__(self, location: int) -> bool:
+        """
+        Books an error at ``location`` against the error budget. Returns False,
+        if the error budget has been exhausted, in which case the error should
+        not be recorded.
+
+        The error budget protects against pathological inputs, where error
+        recovery leads to a cascade of errors. Once the budget has been
+        exhausted, no further errors are recorded and no further reentry
+        points are searched. Instead, errors fall through to the root parser
+        and the parser skips to the next line, from where it retries with
+        the root parser. The limits are configured with ``max_resumptions__``
+        and ``max_errors_per_region__``.
+        """
+        if self.error_budget_exhausted__ is not None:
+            self.suppressed_errors__ += 1
+            return False
+        if self.max_errors_per_region__ >= 0:
+            region = location // max(self.error_region_size__, 1)
+            count = self.region_errors__.get(region, 0) + 1
+            self.region_errors__[region] = count
+            if count > self.max_errors_per_region__:
+                self.exhaust_error_budget__(
+                    location, f'more than {self.max_errors_per_region__} errors '
+                              f'within {self.error_region_size__} characters')
+                self.suppressed_errors__ += 1
+                return False
+        return True
+
+
+    def book_resumption__(self, location: int) -> bool:
+        """
+        Books a resumption of the parsing process after an error at ``location``
+        against the error budget. Returns False, if the error budget has been
+        exhausted, in which case parsing must not be resumed at the reentry
+        point. See :py:meth:`Grammar.book_error__`.
+        """
+        if self.error_budget_exhausted__ is not None:
+            return False
+        if self.max_resumptions__ >= 0:
+            self.resumptions__ += 1
+            if self.resumptions__ > self.max_resumptions__:
+                self.exhaust_error_budget__(
+                    location, f'more than {self.max_resumptions__} resumptions after errors')
+                return False
+        return True
+
+
     def as_ebnf__(self) -> str:
         """
         Serializes the Grammar object as a grammar-description in the
@@ -4275,11 +4642,12 @@ class ErrorCatchingNary(NaryParser):
         """
         text_ = self.grammar.document__[location:]
         skip = tuple(self.grammar.skip_rules__.get(self.symbol, []))
-        if skip:
-            gr = self._grammar
+        gr = self._grammar
+        if skip and gr.error_budget_exhausted__ is None:
             reloc, zombie = reentry_point(text_, skip, gr.comment_rx__, gr.reentry_search_window__,
-                                          f'{self.symbol}_skip')
-            return reloc, zombie
+                                          f'{self.symbol}_skip', gr.reentry_scanner__)
+            if reloc < 0 or gr.book_resumption__(location):
+                return reloc, zombie
         return -1, Node(ZOMBIE_TAG, '')
 
     def mandatory_violation(self,
@@ -4356,7 +4724,8 @@ class ErrorCatchingNary(NaryParser):
                 error_code = MANDATORY_CONTINUATION_AT_EOF_NON_ROOT
         error = Error(msg, location, error_code,
                       length=max(self.grammar.ff_pos__ - location, 1))
-        grammar.tree__.add_error(err_node, error)
+        if grammar.book_error__(location):
+            grammar.tree__.add_error(err_node, error)
         if reloc >= 0:
             # signal error to tracer directly, because this error is not raised!
             grammar.most_recent_error__ = ParserError(
@@ -34,21 +34,24 @@ algorithmically.
 from __future__ import annotations
 
 import functools
+import os
 
 from functools import partial
 from typing import Set, Union, Any, Dict, List, Tuple, Iterable, Optional, Sequence, NamedTuple, \
-    Callable
+    Callable, AbstractSet
 
 from DHParser.compile import compile_source, process_tree, CompilerFactory
-from DHParser.configuration import get_config_value
+from DHParser.configuration import get_config_value, get_config_values, add_config_values
 from DHParser.error import Error, has_errors, is_fatal, FATAL, CANCELED
-from DHParser.nodetree import RootNode, Node
+from DHParser.nodetree import RootNode, Node, parse_binary
 from DHParser.parse import Grammar, ParserFactory, Parser
 from DHParser.preprocess import PreprocessorFactory, PreprocessorFunc, Tokenizer, \
     gen_find_include_func, preprocess_includes, make_preprocessor, chain_preprocessors, \
-    DeriveFileNameFunc, PreprocessorResult
+    DeriveFileNameFunc, PreprocessorResult, SourceMapFunc
+from DHParser.stringview import StringView
 from DHParser.toolkit import ThreadLocalSingletonFactory, deprecation_warning, deprecated, \
-    get_annotations, CancelQuery
+    get_annotations, CancelQuery, instantiate_executor, PickMultiCoreExecutor, ExecutorWrapper, \
+    load_if_file, is_filename, md5, fingerprint, source_code
 from DHParser.trace import resume_notices_on, set_tracer, trace_history
 from DHParser.transform import TransformerFunc, TransformerFactory, transformer, TransformationDict
 
@@ -62,6 +65,8 @@ __all__ = ('Junction',
            'PipeTree',
            'as_graph',
            'extract_data',
+           'root_fields',
+           'restore_tree',
            'run_pipeline',
            'full_pipeline',
            'PseudoJunction',
@@ -224,6 +229,66 @@ def extract_data(tree_or_data: Union[RootNode, Node, Any]) -> Any:
     return tree_or_data
 
 
+def _normalized_stage_name(name: str) -> str:
+    NAME = name.upper()
+    return NAME if NAME in ('AST', 'CST') else name
+
+
+_ROOT_FIELDS = ('source', 'source_mapping', 'lbreaks', 'inline_tags', 'string_tags',
+                'empty_tags', 'docname', 'stage', 'serialization_type')
+
+
+def root_fields(tree: RootNode, exclude: AbstractSet[str] = frozenset()) -> Dict[str, Any]:
+    """Returns the fields of a RootNode that are not covered by its
+    binary serialization (see :py:meth:`nodetree.Node.as_binary`), except
+    for those in ``exclude``. Use ``exclude={'source_mapping'}``, if the
+    fields are to be handed over to another process, but the source mapping,
+    which is not necessarily picklable, is not needed there."""
+    fields = {field: getattr(tree, field) for field in _ROOT_FIELDS if field not in exclude}
+    if tree.data is not tree and 'data' not in exclude:
+        fields['data'] = tree.data
+    return fields
+
+
+def restore_tree(data: bytes, fields: Dict[str, Any]) -> RootNode:
+    """Restores a RootNode from its binary serialization and the fields
+    returned by :py:func:`root_fields`."""
+    tree = parse_binary(data)
+    for field, value in fields.items():
+        setattr(tree, field, value)
+    return tree
+
+
+def _process_junction(factory: Union[CompilerFactory, TransformerFactory],
+                      tree: Union[RootNode, bytes],
+                      fields: Optional[Dict[str, Any]] = None,
+                      config: Optional[Dict[str, Any]] = None,
+                      cancel_query: Optional[CancelQuery] = None) \
+        -> Union[Tuple[RootNode, Any], Tuple[bytes, Dict[str, Any], bool, Any]]:
+    """Processes ``tree`` with the transformation that ``factory`` returns
+    for the calling thread or process. If ``tree`` is passed in DHParser's
+    binary format (together with the ``fields`` of the RootNode), the
+    processed tree is returned in the binary format, too, so that it can be
+    handed back from another process. ``config`` transfers configuration
+    values of the calling thread to the thread or process that runs this
+    function."""
+    if config:
+        add_config_values(config)
+    transformation = factory()
+    if cancel_query is not None:
+        if hasattr(transformation, 'cancel_query'):
+            transformation.cancel_query = cancel_query
+        elif hasattr(transformation, 'cancel_query__'):
+            transformation.cancel_query__ = cancel_query
+    if isinstance(tree, bytes):
+        tree = restore_tree(tree, fields)
+        result = process_tree(transformation, tree)
+        result_is_tree = result is tree
+        return tree.as_binary(), root_fields(tree), result_is_tree, \
+            None if result_is_tree else result
+    return tree, process_tree(transformation, tree)
+
+
 def run_pipeline(junctions: Set[Junction],
                  source_stages: Dict[str, RootNode],
                  target_stages: Set[str],
@@ -239,7 +304,16 @@ def run_pipeline(junctions: Set[Junction],
     essentially a function that transforms a tree from one particular stage
     (identified by its name) to another stage, again identified by its name.
 
-    TODO: Parallelize processing of junctions? Requires copying a lot ot tree-data!?
+    Junctions that do not depend on each other, e.g. several junctions that
+    start from the AST, are processed concurrently, if the configuration
+    value 'pipeline_parallelization' is set to 'multithreading' or
+    'multicore'. In the latter case, trees are handed over to a pool of
+    processes in DHParser's binary format, which preserves the errors, but
+    not any fields that a junction might have attached to the RootNode.
+    Cancellation via ``cancel_query`` is passed on to junctions that are
+    processed in the calling process or in a thread, while junctions that
+    are processed in another process can only be canceled after they
+    have finished.
     """
     import copy
 
@@ -282,9 +356,7 @@ def run_pipeline(junctions: Set[Junction],
             else:
                 raise AssertionError(error_msg)
 
-    def normalize_name(name: str) -> str:
-        NAME = name.upper()
-        return NAME if NAME in ('AST', 'CST') else name
+    normalize_name = _normalized_stage_name
 
     def normalize_junction(j: Junction):
         SRC = j[0].upper()
@@ -324,47 +396,363 @@ def run_pipeline(junctions: Set[Junction],
     steps.reverse()
     results: Dict[str, Any] = source_stages.copy()
     errata: Dict[str, List[Error]] = {s: source_stages[s].errors_sorted for s in source_stages}
-    cancel = False
-    for step in steps:
-        for junction in step:
-            t = junction[-1]
-            if t not in results:
-                s = junction[0]
-                tree = results[s] if s in disposables else copy.deepcopy(results[s])
-                if s not in target_stages:
-                    sources.remove(s)
-                    if sources.count(s) <= 1:
-                        disposables.add(s)
+
+    def source_tree(junction: Junction) -> Optional[RootNode]:
+        """Returns the tree of the junction's source-stage or a copy of it,
+        if the tree is needed by further junctions."""
+        s = junction[0]
+        tree = results[s] if s in disposables else copy.deepcopy(results[s])
+        if s not in target_stages:
+            sources.remove(s)
+            if sources.count(s) <= 1:
+                disposables.add(s)
+        if tree is not None:
+            if not isinstance(tree, RootNode):
+                raise ValueError(f'Object in stage "{s}" is not a tree (RootNode) '
+                                 f'but a {type(tree)} '
+                                 f'and, therefore, cannot be processed to {junction[-1]}')
+            verify_stage(tree.stage, junction, 0)
+        return tree
+
+    def store_result(junction: Junction, tree: Optional[RootNode], result: Any) -> bool:
+        """Stores the result of the junction and returns True, if processing
+        must be canceled."""
+        s, t = junction[0], junction[-1]
+        if tree is None:
+            results[t] = None
+            errata[t] = errata[s]
+            return False
+        results[t] = result
+        errata[t] = copy.copy(tree.errors_sorted)
+        if cancel_query is not None and cancel_query():
+            tree.new_error(tree, "Pipeline-processing canceled!", CANCELED)
+        if is_fatal(tree.error_flag):
+            return True
+        if tree.stage == s:  # tree stage hasn't been set by the processing function
+            tree.stage = junction[2]
+        else:
+            verify_stage(tree.stage, junction, 2)
+        return False
+
+    def process_concurrently(junctions: List[Junction]) -> bool:
+        """Processes independent junctions concurrently and returns True,
+        if processing must be canceled."""
+        import pickle
+        trees = [source_tree(junction) for junction in junctions]
+        config = get_config_values()
+        if mode == 'multicore':
+            pool = instantiate_executor(True, PickMultiCoreExecutor)
+        else:
+            import concurrent.futures
+            pool = instantiate_executor(True, concurrent.futures.ThreadPoolExecutor)
+        # thread-pools are wrapped, too, unless 'debug_parallel_execution' demands otherwise
+        remote = mode == 'multicore' and isinstance(pool, ExecutorWrapper)
+        try:
+            futures = []
+            local = []
+            for i, (junction, tree) in enumerate(zip(junctions, trees)):
                 if tree is None:
-                    results[t] = None
-                    errata[t] = errata[s]
+                    futures.append(None)
+                elif remote:
+                    fields = root_fields(tree)
+                    try:
+                        pickle.dumps((junction[1], fields))
+                    except (pickle.PicklingError, AttributeError, TypeError):
+                        futures.append(None)
+                        local.append(i)
+                        continue
+                    futures.append(pool.submit(_process_junction, junction[1],
+                                               tree.as_binary(), fields, config))
                 else:
-                    if not isinstance(tree, RootNode):
-                        raise ValueError(f'Object in stage "{s}" is not a tree (RootNode) '
-                                         f'but a {type(tree)} '
-                                         f'and, therefore, cannot be processed to {t}')
-                    verify_stage(tree.stage, junction, 0)
-                    transformation = junction[1]()
-                    if hasattr(transformation, 'cancel_query'):
-                        transformation.cancel_query = cancel_query
-                    elif hasattr(transformation, 'cancel_query__'):
-                        transformation.cancel_query__ = cancel_query
-                    results[t] = process_tree(transformation, tree)  # TODO: pass cancel query, here
-                    errata[t] = copy.copy(tree.errors_sorted)
-                    if cancel_query is not None and cancel_query():
-                        tree.new_error(tree, "Pipeline-processing canceled!", CANCELED)
-                    if is_fatal(tree.error_flag):
-                        cancel = True
-                        break
-                    if tree.stage == s:  # tree stage hasn't been set by the processing function
-                        tree.stage = junction[2]
-                    else:
-                        verify_stage(tree.stage, junction, 2)
+                    futures.append(pool.submit(_process_junction, junction[1], tree,
+                                               None, config, cancel_query))
+            outcomes = [None] * len(junctions)  # type: List[Any]
+            for i in local:
+                outcomes[i] = _process_junction(junctions[i][1], trees[i],
+                                                cancel_query=cancel_query)
+            for i, future in enumerate(futures):
+                if future is not None:
+                    outcomes[i] = future.result()
+        finally:
+            pool.shutdown(wait=True)
+        for junction, tree, outcome in zip(junctions, trees, outcomes):
+            if tree is None:
+                result = None
+            elif len(outcome) == 2:
+                tree, result = outcome
+            else:
+                data, fields, result_is_tree, result = outcome
+                tree = restore_tree(data, fields)
+                if result_is_tree:
+                    result = tree
+            if store_result(junction, tree, result):
+                return True
+        return False
+
+    mode = get_config_value('pipeline_parallelization')
+    cancel = False
+    for step in steps:
+        pending = [junction for junction in step if junction[-1] not in results]
+        while pending and not cancel:
+            if mode != 'off':
+                # junctions the source-stages of which are available are independent
+                # of each other and can be processed concurrently
+                ready = [junction for junction in pending if junction[0] in results]
+                if len(ready) > 1:
+                    pending = [junction for junction in pending if junction not in ready]
+                    cancel = process_concurrently(ready)
+                    continue
+            junction = pending.pop(0)
+            if junction[-1] not in results:
+                tree = source_tree(junction)
+                result = None
+                if tree is not None:
+                    _, result = _process_junction(junction[1], tree, cancel_query=cancel_query)
+                cancel = store_result(junction, tree, result)
         if cancel:
             break
     return {t: (extract_data(results[t]), errata[t]) for t in results.keys()}
 
 
+#######################################################################
+#
+# On-disk stage cache
+#
+#######################################################################
+
+# configuration values that do not affect the results of processing a document
+_CACHE_NEUTRAL_CONFIG = ('main_pid', 'syncfile_path', 'multicore_pool', 'debug_parallel_execution',
+                         '*_parallelization', 'batch_processing_*', 'pipeline_stage_cache',
+                         '*_serialization', '*_sxpr_threshold', 'log_*', 'echo_server_log',
+                         'server_*', 'max_rpc_size', 'jsonrpc_header', 'test_*',
+                         'deprecation_policy')
+
+
+def _code_modules(obj: Any) -> List[Any]:
+    """Returns the modules that contain the code of ``obj`` or of any of the
+    base classes of ``obj``, except for modules of DHParser itself, the
+    code of which is identified by DHParser's version-number."""
+    import inspect
+    import sys
+    while isinstance(obj, (partial, ThreadLocalSingletonFactory)):
+        obj = obj.func if isinstance(obj, partial) else obj.class_or_factory
+    if inspect.isclass(obj):
+        names = [cls.__module__ for cls in obj.__mro__]
+    elif inspect.isfunction(obj) or inspect.ismethod(obj):
+        names = [obj.__module__]
+    else:
+        names = [cls.__module__ for cls in type(obj).__mro__]
+    modules = []
+    for name in dict.fromkeys(names):
+        if name and name != 'builtins' and name.split('.')[0] != 'DHParser' \
+                and name in sys.modules:
+            modules.append(sys.modules[name])
+    return modules
+
+
+@functools.lru_cache(None)
+def _code_fingerprint(factory: Callable) -> str:
+    """Returns the md5-hash of the fingerprint (see :py:func:`toolkit.fingerprint`)
+    of the preprocessor, parser or tree-processing function that ``factory``
+    returns, of the source code of the modules that contain this function
+    (or its class and its base classes) and of the value of its
+    ``cache_version__``-attribute, if present. Thus, changes of base classes
+    or helper functions invalidate the cached stages, too, as far as their
+    source code is available. Otherwise, the ``cache_version__``-attribute
+    can be changed to invalidate the cache explicitly. Fingerprints are computed
+    once per process, because the code of a factory is not expected to
+    change while a batch is processed."""
+    obj = factory()
+    return md5(fingerprint(obj), str(getattr(obj, 'cache_version__', '')),
+               *(source_code(module) for module in _code_modules(obj)))
+
+
+def _config_fingerprint() -> str:
+    """Returns the md5-hash of the configuration values that may affect
+    the result of processing a document."""
+    import fnmatch
+    config = {key: value for key, value in get_config_values().items()
+              if not any(fnmatch.fnmatchcase(key, pattern) for pattern in _CACHE_NEUTRAL_CONFIG)}
+    return md5(fingerprint(config))
+
+
+def _stage_keys(cst_key: str, junctions: Iterable[Junction]) -> Dict[str, str]:
+    """Returns the cache keys of all stages that can be reached from the
+    concrete syntax-tree. The key of a stage is derived from the key of its
+    source-stage and the fingerprint of the junction, so that any change of
+    an upstream stage invalidates all downstream stages."""
+    t_to_j = {_normalized_stage_name(j.dst): j for j in junctions}
+    keys = {'CST': cst_key}
+    for target in t_to_j:
+        stage = target
+        path = []
+        while stage not in keys and stage in t_to_j and len(path) <= len(t_to_j):
+            path.append(stage)
+            stage = _normalized_stage_name(t_to_j[stage].src)
+        key = keys.get(stage, '')
+        for stage in reversed(path):
+            if key:
+                key = md5(key, _code_fingerprint(t_to_j[stage].factory), stage)
+            keys[stage] = key
+    return keys
+
+
+def _stage_path(cache_dir: str, key: str) -> str:
+    return os.path.join(cache_dir, key[:2], key + '.stage')
+
+
+def _store_stage(cache_dir: str, key: str, result: Any, errors: List[Error]):
+    """Writes the result of a processing stage and the errors to the cache.
+    Trees are stored in DHParser's binary format, any other data is pickled.
+    Results that cannot be pickled are not cached."""
+    import pickle
+    if isinstance(result, RootNode):
+        # source and source_mapping are restored from the document
+        fields = root_fields(result, exclude={'source', 'source_mapping'})
+        record = (result.as_binary(), fields, errors)
+    else:
+        record = (None, result, errors)
+    try:
+        data = pickle.dumps(record)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return
+    path = _stage_path(cache_dir, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.' + str(os.getpid()) + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _load_stage(cache_dir: str, key: str, source: Union[str, StringView],
+                source_mapping: SourceMapFunc) -> Optional[Tuple[Any, List[Error]]]:
+    """Reads the result of a processing stage and the errors from the cache.
+    Returns None, if the stage has not been cached or the cache-file is
+    not readable."""
+    import pickle
+    try:
+        with open(_stage_path(cache_dir, key), 'rb') as f:
+            data, fields_or_result, errors = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except (pickle.UnpicklingError, EOFError, ValueError, AttributeError, ImportError):
+        return None
+    if data is None:
+        return fields_or_result, errors
+    tree = restore_tree(data, fields_or_result)
+    tree.source = source
+    tree.source_mapping = source_mapping
+    return tree, errors
+
+
+def _cached_pipeline(cache_dir: str,
+                     source: str,
+                     preprocessor_factory: PreprocessorFactory,
+                     parser_factory: ParserFactory,
+                     junctions: Set[Junction],
+                     target_stages: Set[str],
+                     start_parser: Union[str, Parser],
+                     cancel_query: Optional[CancelQuery]) -> PipelineResult:
+    """Runs :py:func:`full_pipeline` with the on-disk stage cache in
+    ``cache_dir`` (see configuration value 'pipeline_stage_cache').
+
+    The source is always preprocessed, so that changes of included files
+    are noticed and the source mapping is available for cached trees. The
+    key of the concrete syntax-tree is derived from the preprocessed text,
+    the name of the source-file, the fingerprints of the preprocessor and
+    the parser, the start-parser, the configuration and the version of
+    DHParser. The concrete syntax-tree, all target-stages and all
+    intermediary stages are cached and returned, just like
+    :py:func:`run_pipeline` returns them. Stages with fatal errors or
+    that have been canceled are not cached.
+    """
+    from DHParser.versionnumber import __version__
+    try:
+        original_text = load_if_file(source)
+    except (FileNotFoundError, IOError):
+        original_text = None
+    preprocessor = preprocessor_factory()
+    if original_text is None:
+        prep = None
+        cst_key = ''
+    else:
+        source_name = source if is_filename(source) else ''
+        if hasattr(preprocessor, 'cancel_query'):  preprocessor.cancel_query = cancel_query
+        prep = preprocessor(original_text, source_name)
+        if has_errors(prep.errors, FATAL):
+            cst_key = ''
+        else:
+            cst_key = md5(__version__, _config_fingerprint(),
+                          _code_fingerprint(preprocessor_factory), _code_fingerprint(parser_factory),
+                          start_parser if isinstance(start_parser, str) else start_parser.pname,
+                          source_name, str(prep.preprocessed_text))
+    keys = _stage_keys(cst_key, junctions) if cst_key else {}
+
+    def load(stage: str) -> Optional[Tuple[Any, List[Error]]]:
+        key = keys.get(stage, '')
+        return _load_stage(cache_dir, key, original_text, prep.back_mapping) if key else None
+
+    def store(stage: str, result: Any, errors: List[Error]):
+        key = keys.get(stage, '')
+        if key and not has_errors(errors, FATAL) and all(e.code != CANCELED for e in errors):
+            _store_stage(cache_dir, key, result, errors)
+
+    # all stages from the concrete syntax-tree up to the target-stages, which
+    # are also returned by full_pipeline(), if the stage-cache is not used
+    t_to_j = {_normalized_stage_name(j.dst): j for j in junctions}
+    required = set()  # type: Set[str]
+    for t in {_normalized_stage_name(t) for t in target_stages}:
+        stage = t
+        while stage not in required:
+            required.add(stage)
+            if stage not in t_to_j:
+                break
+            stage = _normalized_stage_name(t_to_j[stage].src)
+
+    results = dict()  # type: PipelineResult
+    missing = set()  # type: Set[str]
+    for t in required:
+        cached = load(t)
+        if cached is None:
+            missing.add(t)
+        else:
+            results[t] = cached
+    if not missing:
+        return results
+
+    # the source-stages of missing stages must be available as trees
+    sources = dict()  # type: Dict[str, RootNode]
+    unresolved = missing
+    while unresolved:
+        upstream = {_normalized_stage_name(t_to_j[t].src) for t in unresolved if t in t_to_j}
+        unresolved = set()
+        for stage in upstream - missing:
+            if isinstance(results[stage][0], RootNode):
+                sources[stage] = results[stage][0]
+            else:
+                del results[stage]
+                unresolved.add(stage)
+        missing |= unresolved
+    parse = 'CST' in missing
+
+    if parse:
+        preprocessed = preprocessor if prep is None else (lambda text, name: prep)
+        cst, msgs, _ = compile_source(source, preprocessed, parser_factory(),
+                                      start_parser=start_parser, cancel_query=cancel_query)
+        if has_errors(msgs, FATAL):
+            return {ts: (cst, msgs) for ts in target_stages}
+        store('CST', cst, msgs)
+        sources[cst.stage] = cst
+        missing.discard('CST')
+    processed = run_pipeline(junctions, sources, missing, cancel_query=cancel_query)
+    for t in missing - sources.keys():
+        if t in processed:
+            store(t, *processed[t])
+    for t, result in results.items():
+        processed.setdefault(t, result)
+    return processed
+
+
 def full_pipeline(source: str,
                   preprocessor_factory: PreprocessorFactory,
                   parser_factory: ParserFactory,
@@ -380,7 +768,24 @@ def full_pipeline(source: str,
     first. And then it post-processes the source into the given target stages.
     Mind that if there are fatal errors earlier in the pipeline, some or all
     target stages might not be reached and thus not be included in the result.
+
+    If the configuration value 'pipeline_stage_cache' contains the name of a
+    directory, the concrete syntax-tree and the target-stages are cached in
+    this directory, so that in subsequent runs parsing and processing are
+    skipped as far as neither the document nor the code of the respective
+    stages nor any of the stages upstream have been changed. Changes of the
+    code are detected by comparing the source code of the modules that
+    contain the processing functions or classes and their base classes
+    (except for DHParser's own modules). If the source code is not
+    available or a stage depends on code elsewhere, the cached stages can
+    be invalidated by changing the value of the attribute ``cache_version__``
+    of the preprocessor, parser or processing function (or class).
     """
+    cache_dir = get_config_value('pipeline_stage_cache')
+    if cache_dir and not get_config_value('history_tracking'):
+        return _cached_pipeline(os.path.abspath(os.path.expanduser(cache_dir)), source,
+                                preprocessor_factory, parser_factory, junctions,
+                                target_stages, start_parser, cancel_query)
     cst, msgs, _ = compile_source(source, preprocessor_factory(), parser_factory(),
                                   start_parser=start_parser, cancel_query=cancel_query)
     if has_errors(msgs, FATAL):
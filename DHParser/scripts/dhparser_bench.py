@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+
+"""dhparser_bench.py - reproducible benchmarks for DHParser's processing stages
+
+Copyright 2026  by Eckhart Arnold (arnold@badw.de)
+                Bavarian Academy of Sciences and Humanities (badw.de)
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+implied.  See the License for the specific language governing
+permissions and limitations under the License.
+
+
+Runs the bundled grammars (EBNF, XML) and - if DHParser is run from
+its source-tree - the example-grammars (JSON, LaTeX, Arithmetic) on
+generated workloads of scalable size and measures parsing throughput,
+peak memory during parsing, AST-transformation time, compilation time
+and the time for each serialization offered by ``Node.serialize()``.
+
+The workloads are generated by a pseudo-random generator with a fixed
+seed, so that the same scale always yields the same documents. The
+results can be stored as JSON and compared with the results of
+earlier runs, e.g.::
+
+    dhparser_bench.py --scale 200 -o before.json
+    ... change some code ...
+    dhparser_bench.py --scale 200 -o after.json --compare before.json
+"""
+
+import argparse
+import copy
+import gc
+import importlib.util
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Optional, Tuple
+
+scriptdir = os.path.dirname(os.path.abspath(os.path.realpath(__file__)))
+dhparserdir = os.path.abspath(os.path.join(scriptdir, os.pardir, os.pardir))
+if dhparserdir not in sys.path:
+    sys.path.append(dhparserdir)
+
+from DHParser.configuration import get_config_value, set_config_value
+from DHParser.versionnumber import __version__
+
+
+SERIALIZATIONS = ('S-expression', 'SXML', 'XML', 'JSON', 'indented', 'ndst', 'xast')
+GRAMMARS = ('EBNF', 'XML', 'JSON', 'LaTeX', 'Arithmetic')
+SEED = 20260101
+
+
+#######################################################################
+#
+# workloads
+#
+#######################################################################
+
+WORDS = ('alpha', 'beta', 'gamma', 'delta', 'epsilon', 'zeta', 'eta', 'theta',
+         'iota', 'kappa', 'lambda', 'mu', 'nu', 'xi', 'omicron', 'pi', 'rho',
+         'sigma', 'tau', 'upsilon', 'phi', 'chi', 'psi', 'omega')
+
+
+def _words(rng: random.Random, n: int) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(n))
+
+
+def ebnf_workload(size: int) -> str:
+    """Generates an EBNF-grammar of approximately ``size`` bytes."""
+    rng = random.Random(SEED)
+    parts = ['@ whitespace = vertical\n@ literalws = right\n@ comment = /#.*/\n\n'
+             'document = { rule_0 }\n']
+    i = 0
+    length, counted = 0, 0
+    while length < size:
+        length += sum(len(p) for p in parts[counted:])
+        counted = len(parts)
+        alternatives = []
+        for _ in range(rng.randint(1, 4)):
+            items = []
+            for _ in range(rng.randint(1, 5)):
+                k = rng.randint(0, 3)
+                if k == 0:
+                    items.append(f'"{rng.choice(WORDS)}"')
+                elif k == 1:
+                    items.append(f'/{rng.choice(WORDS)}[0-9]*/~')
+                elif k == 2:
+                    items.append(f'[ rule_{i + 1} ]')
+                else:
+                    items.append(f'{{ "{rng.choice(WORDS)}" }}')
+            alternatives.append(' '.join(items))
+        parts.append(f'rule_{i} = ' + ' | '.join(alternatives)
+                     + f'  # {_words(rng, 3)}\n')
+        i += 1
+    parts.append(f'rule_{i} = "end"\n')
+    return ''.join(parts)
+
+
+def xml_workload(size: int) -> str:
+    """Generates an XML-document of approximately ``size`` bytes."""
+    rng = random.Random(SEED)
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n<corpus>\n']
+    n = 0
+    length, counted = 0, 0
+    while length < size:
+        length += sum(len(p) for p in parts[counted:])
+        counted = len(parts)
+        n += 1
+        parts.append(f'  <article id="a{n}" lang="{rng.choice(("de", "en", "la"))}">\n'
+                     f'    <title>{_words(rng, 4)}</title>\n')
+        for _ in range(rng.randint(1, 4)):
+            parts.append(f'    <p>{_words(rng, 6)} <em>{_words(rng, 2)}</em> '
+                         f'{_words(rng, 8)}<br/>{_words(rng, 3)} &amp; '
+                         f'<ref target="a{rng.randint(1, n)}">{rng.choice(WORDS)}</ref>.</p>\n')
+        parts.append('  </article>\n')
+    parts.append('</corpus>\n')
+    return ''.join(parts)
+
+
+def json_workload(size: int) -> str:
+    """Generates a JSON-document of approximately ``size`` bytes."""
+    rng = random.Random(SEED)
+    records = []
+    length = 0
+    while length < size:
+        record = json.dumps({
+            'id': len(records),
+            'name': _words(rng, 2),
+            'score': round(rng.uniform(-1000, 1000), 3),
+            'active': rng.choice((True, False)),
+            'tags': [rng.choice(WORDS) for _ in range(rng.randint(0, 4))],
+            'parent': rng.choice((None, rng.randint(0, len(records) + 1))),
+            'nested': {'text': _words(rng, 5), 'values': [rng.randint(0, 99) for _ in range(3)]}
+        }, indent=2)
+        records.append(record)
+        length += len(record) + 2
+    return '[' + ',\n'.join(records) + ']\n'
+
+
+def latex_workload(size: int) -> str:
+    """Generates a LaTeX-document of approximately ``size`` bytes."""
+    rng = random.Random(SEED)
+    parts = ['\\documentclass[12pt]{article}\n\\usepackage{csquotes}\n\n\\begin{document}\n\n'
+             f'{_words(rng, 12).capitalize()}.\n\n']
+    n = 0
+    length, counted = 0, 0
+    while length < size:
+        length += sum(len(p) for p in parts[counted:])
+        counted = len(parts)
+        n += 1
+        parts.append(f'\\section{{{_words(rng, 3).capitalize()}}}\n\n')
+        for _ in range(rng.randint(1, 3)):
+            parts.append(f'{_words(rng, 10).capitalize()} \\emph{{{_words(rng, 2)}}} '
+                         f'{_words(rng, 7)}\\footnote{{{_words(rng, 5).capitalize()}.}} '
+                         f'{_words(rng, 9)}.\n\n')
+        if n % 3 == 0:
+            parts.append('\\begin{itemize}\n')
+            for _ in range(rng.randint(1, 4)):
+                parts.append(f'\\item {_words(rng, 6)}\n')
+            parts.append('\\end{itemize}\n\n')
+    parts.append('\\end{document}\n')
+    return ''.join(parts)
+
+
+def arithmetic_workload(size: int) -> str:
+    """Generates an arithmetic expression of approximately ``size`` bytes."""
+    rng = random.Random(SEED)
+
+    def expression(depth: int) -> str:
+        terms = []
+        for _ in range(rng.randint(1, 4)):
+            if depth > 0 and rng.random() < 0.3:
+                factor = '(' + expression(depth - 1) + ')'
+            else:
+                factor = rng.choice((str(rng.randint(0, 999)), rng.choice('abcxyz'),
+                                     f'{rng.randint(1, 99)}.{rng.randint(0, 99)}'))
+            terms.append(factor)
+        return rng.choice((' * ', ' / ')).join(terms)
+
+    parts = [expression(3)]
+    length = len(parts[0])
+    while length < size:
+        part = expression(3)
+        parts.append(rng.choice((' + ', ' - ')) + part)
+        length += len(part) + 3
+    return ''.join(parts)
+
+
+#######################################################################
+#
+# processing stages
+#
+#######################################################################
+
+class Stages:
+    """Factory functions for the processing stages of a grammar."""
+    def __init__(self, name: str, workload: Callable[[int], str],
+                 preprocessor: Optional[Callable], grammar: Callable,
+                 transformer: Callable, compiler: Callable):
+        self.name = name
+        self.workload = workload
+        self.preprocessor = preprocessor
+        self.grammar = grammar
+        self.transformer = transformer
+        self.compiler = compiler
+
+
+def load_example(name: str) -> Optional[Any]:
+    """Loads the parser-module of an example-grammar from the source-tree.
+    Returns None, if the example cannot be found (e.g. because DHParser
+    has been installed as package)."""
+    path = os.path.join(dhparserdir, 'examples', name, name + 'Parser.py')
+    if not os.path.exists(path):
+        return None
+    spec = importlib.util.spec_from_file_location(name + 'Parser', path)
+    module = importlib.util.module_from_spec(spec)
+    sys.path.insert(0, os.path.dirname(path))
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.pop(0)
+    return module
+
+
+def get_stages(name: str) -> Optional[Stages]:
+    """Returns the processing stages for the grammar ``name`` or None,
+    if the grammar is not available."""
+    if name == 'EBNF':
+        from DHParser import ebnf
+        return Stages(name, ebnf_workload, ebnf.get_ebnf_preprocessor,
+                      ebnf.get_ebnf_grammar, ebnf.get_ebnf_transformer,
+                      ebnf.get_ebnf_compiler)
+    elif name == 'XML':
+        from DHParser.parsers import XMLParser
+        return Stages(name, xml_workload, XMLParser.get_preprocessor,
+                      XMLParser.get_grammar, XMLParser.get_transformer,
+                      XMLParser.get_compiler)
+    workload = {'JSON': json_workload, 'LaTeX': latex_workload,
+                'Arithmetic': arithmetic_workload}[name]
+    module = load_example({'JSON': 'json'}.get(name, name))
+    if module is None:
+        return None
+    preprocessor = getattr(module, 'get_preprocessor', None)
+    if preprocessor is None and hasattr(module, 'preprocessing'):
+        preprocessor = module.preprocessing.factory
+    return Stages(name, workload, preprocessor, module.get_grammar, module.get_transformer, module.get_compiler)
+
+
+#######################################################################
+#
+# measuring
+#
+#######################################################################
+
+def best_of(func: Callable[[], Any], repeat: int,
+            setup: Callable[[], Any] = lambda: None) -> Tuple[float, Any]:
+    """Calls ``func`` with the result of ``setup`` ``repeat`` times and
+    returns the shortest time and the result of the last call. The
+    garbage collector is turned off while ``func`` is running."""
+    best = float('inf')
+    result = None
+    for _ in range(max(repeat, 1)):
+        arg = setup()
+        gc.collect()
+        gc.disable()
+        try:
+            t = time.perf_counter()
+            result = func(arg) if arg is not None else func()
+            t = time.perf_counter() - t
+        finally:
+            gc.enable()
+        best = min(best, t)
+    return best, result
+
+
+def peak_memory(func: Callable[[], Any]) -> int:
+    """Returns the peak memory in bytes allocated while running ``func``."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def benchmark(stages: Stages, size: int, repeat: int, memory: bool = True,
+              serializations=SERIALIZATIONS) -> Dict[str, Any]:
+    """Runs all benchmarks for one grammar and one workload-size and
+    returns the results as a dictionary."""
+    source = stages.workload(size)
+    if stages.preprocessor is not None:
+        source = str(stages.preprocessor()(source, 'benchmark').preprocessed_text)
+    nbytes = len(source.encode('utf-8'))
+    parser = stages.grammar()
+    parse_time, cst = best_of(lambda: parser(source), repeat)
+    errors = [str(e) for e in cst.errors if e.code >= 1000]
+    result = {'grammar': stages.name, 'size': nbytes, 'nodes': sum(1 for _ in cst.select_if(
+              lambda _: True, include_root=True)),
+              'errors': len(errors),
+              'parse': parse_time, 'parse_MBps': nbytes / 1e6 / parse_time}
+    if memory:
+        result['parse_peak_memory'] = peak_memory(lambda: parser(source))
+
+    transformer = stages.transformer()
+    result['transform'], ast = best_of(transformer, repeat, lambda: copy.deepcopy(cst))
+    result['ast_nodes'] = sum(1 for _ in ast.select_if(lambda _: True, include_root=True))
+
+    compiler = stages.compiler()
+    try:
+        result['compile'], _ = best_of(compiler, repeat, lambda: copy.deepcopy(ast))
+    except Exception as e:
+        result['compile'] = None
+        result['compile_error'] = f'{e.__class__.__name__}: {e}'
+
+    serialization_times = {}
+    for how in serializations:
+        t, output = best_of(lambda: ast.serialize(how), repeat)
+        serialization_times[how] = {'time': t, 'size': len(output)}
+    result['serialize'] = serialization_times
+    if errors:
+        result['first_error'] = errors[0]
+    return result
+
+
+def git_revision() -> str:
+    """Returns the git-revision of the DHParser source-tree, if available."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=dhparserdir,
+                              capture_output=True, text=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ''
+
+
+def run_benchmarks(grammars=GRAMMARS, scales=(100,), repeat: int = 3,
+                   memory: bool = True, verbose: bool = True) -> Dict[str, Any]:
+    """Runs the benchmarks for the given grammars and scales (in kilobytes
+    of generated source-text) and returns a JSON-serializable dictionary
+    with meta-data and results."""
+    report = {'dhparser_version': __version__,
+              'git_revision': git_revision(),
+              'python': f'{platform.python_implementation()} {platform.python_version()}',
+              'platform': platform.platform(),
+              'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+              'repeat': repeat,
+              'results': []}
+    save = get_config_value('history_tracking'), get_config_value('resume_notices')
+    set_config_value('history_tracking', False)
+    set_config_value('resume_notices', False)
+    try:
+        for name in grammars:
+            stages = get_stages(name)
+            if stages is None:
+                if verbose:  print(f'{name}: skipped (example-grammar not found)')
+                continue
+            for scale in scales:
+                result = benchmark(stages, scale * 1000, repeat, memory)
+                report['results'].append(result)
+                if verbose:  print(format_result(result))
+    finally:
+        set_config_value('history_tracking', save[0])
+        set_config_value('resume_notices', save[1])
+    return report
+
+
+#######################################################################
+#
+# reporting
+#
+#######################################################################
+
+def format_result(result: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> str:
+    """Formats a single benchmark result as a line of text. If a baseline
+    result is given, relative changes are added in brackets."""
+    def fmt(key: str, value: Optional[float], base: Optional[float], unit: str = 's',
+            higher_is_better: bool = False) -> str:
+        if value is None:
+            return f'{key}: n/a'
+        s = f'{key}: {value:.4f}{unit}' if unit == 's' else f'{key}: {value:.2f}{unit}'
+        if base:
+            change = (value - base) / base * 100
+            if higher_is_better:  change = -change
+            s += f' ({change:+.1f}%)'
+        return s
+
+    b = baseline or {}
+    items = [f"{result['grammar']:<10} {result['size'] / 1000:>8.1f} kB",
+             fmt('parse', result['parse_MBps'], b.get('parse_MBps'), ' MB/s', True)]
+    if 'parse_peak_memory' in result:
+        items.append(fmt('peak', result['parse_peak_memory'] / 1e6,
+                         (b.get('parse_peak_memory') or 0) / 1e6, ' MB'))
+    items.append(fmt('AST', result['transform'], b.get('transform')))
+    items.append(fmt('compile', result['compile'], b.get('compile')))
+    for how, data in result['serialize'].items():
+        items.append(fmt(how, data['time'], b.get('serialize', {}).get(how, {}).get('time')))
+    if result['errors']:
+        items.append(f"!{result['errors']} errors")
+    return ', '.join(items)
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any]) -> str:
+    """Compares the results of two benchmark runs. Results are matched
+    by grammar-name and workload-size."""
+    base = {(r['grammar'], r['size']): r for r in baseline['results']}
+    lines = [f"Comparison with {baseline.get('git_revision') or 'baseline'} "
+             f"({baseline.get('timestamp', '?')}), changes in brackets, "
+             f"negative values mean faster or smaller:"]
+    for result in report['results']:
+        lines.append(format_result(result, base.get((result['grammar'], result['size']))))
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmarks parsing, AST-transformation, compilation and '
+                    'serialization with generated workloads of scalable size.')
+    parser.add_argument('-g', '--grammars', nargs='+', default=list(GRAMMARS),
+                        choices=GRAMMARS, help='The grammars to benchmark')
+    parser.add_argument('-s', '--scale', nargs='+', type=int, default=[100],
+                        help='Size(s) of the generated workloads in kilobytes')
+    parser.add_argument('-r', '--repeat', type=int, default=3,
+                        help='Number of repetitions, the best time is reported')
+    parser.add_argument('-o', '--output', type=str, default='',
+                        help='Write results as JSON to this file')
+    parser.add_argument('-c', '--compare', type=str, default='',
+                        help='Compare results with those from an earlier run')
+    parser.add_argument('--nomemory', action='store_true',
+                        help='Do not measure peak memory consumption')
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+    report = run_benchmarks(args.grammars, args.scale, args.repeat,
+                            not args.nomemory, verbose=baseline is None)
+    if baseline is not None:
+        print(compare(report, baseline))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f'Results written to: {args.output}')
+
+
+if __name__ == "__main__":
+    main()
@@ -83,6 +83,11 @@ if __name__ == '__main__':
                         help='Run tests in a single thread (recommended only for debugging)')
     parser.add_argument('-p', '--history', action='store_const', const='history',
                         help="Detailed logs for of the parsing-history for all tests.")
+    parser.add_argument('-c', '--cache', action='store_const', const='cache',
+                        help='Cache the results of successful tests and skip them in '
+                             'later runs, unless the grammar or the tests have changed.')
+    parser.add_argument('-f', '--force', action='store_const', const='force',
+                        help='Rerun all tests, even if their results have been cached.')
     parser.add_argument('-n', '--nohistory', action='store_const', const='nohistory',
                         help="Deprecated argument")
     parser.add_argument('-d', '--debug', action='store_const', const='debug',
@@ -106,6 +111,9 @@ if __name__ == '__main__':
         print('Tests will be run in a single-thread, because test-multiprocessing '
               'has been turned off in configuration file.')
     set_preset_value('history_tracking', args.history)
+    if args.cache and not get_config_value('test_result_cache'):
+        set_preset_value('test_result_cache', '.test_cache')
+    set_preset_value('test_force_rerun', bool(args.force))
     finalize_presets()
 
     if args.scripts:
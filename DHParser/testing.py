@@ -58,7 +58,8 @@ from DHParser.preprocess import nil_preprocessor_factory
 from DHParser.trace import set_tracer, trace_history
 from DHParser.transform import traverse, remove_children
 from DHParser.toolkit import load_if_file, re, instantiate_executor, TypeAlias, \
-    PickMultiCoreExecutor
+    PickMultiCoreExecutor, md5, fingerprint
+from DHParser.versionnumber import __version__
 
 
 __all__ = ('UNIT_STAGES',
@@ -71,6 +72,9 @@ __all__ = ('UNIT_STAGES',
            'get_report',
            'TEST_ARTIFACT',
            'POSSIBLE_ARTIFACTS',
+           'fingerprint',
+           'load_result_cache',
+           'save_result_cache',
            'grammar_unit',
            'unique_name',
            'grammar_suite',
@@ -481,10 +485,12 @@ def get_report(test_unit, serializations: Dict[str, List[str]] = dict()) -> str:
             cst = tests.get('__CST__', {}).get(test_name, None)
             if cst and (not ast or str(test_name).endswith('*')):
                 report.append('\n### CST\n')
-                report.append(indent(cst.serialize(srl.get('CST', 'CST'))))
+                report.append(indent(cst if isinstance(cst, str)
+                                     else cst.serialize(srl.get('CST', 'CST'))))
             if ast:
                 report.append('\n### AST\n')
-                report.append(indent(ast.serialize(srl.get('AST', 'AST'))))
+                report.append(indent(ast if isinstance(ast, str)
+                                     else ast.serialize(srl.get('AST', 'AST'))))
 
             compilation_stages = [key for key in tests
                                   if key[:2] + key[-2:] == '____' and key not in
@@ -540,6 +546,37 @@ def md_codeblock(code: str) -> str:
         return '\n\n\t' + '\n\t'.join(lines)
 
 
+########################################################################
+#
+# test-result cache
+#
+########################################################################
+
+
+def load_result_cache(cache_path: str) -> Dict[str, Dict[str, str]]:
+    """Loads a test-result cache from ``cache_path``. Returns an empty
+    dictionary if the cache file does not exist or is not readable."""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if isinstance(cache, dict):
+            return cache
+    except (FileNotFoundError, ValueError):
+        pass
+    return {}
+
+
+def save_result_cache(cache_path: str, cache: Dict[str, Dict[str, str]]):
+    """Writes the test-result cache to ``cache_path``. The file is replaced
+    atomically, so that an interrupted test-run cannot leave a corrupted
+    cache behind."""
+    os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+    tmp_path = cache_path + '.' + str(os.getpid()) + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, cache_path)
+
+
 def grammar_unit(test_unit, parser_factory, transformer_factory, report='REPORT', verbose=False,
                  junctions=set(), show=set(), serializations: Dict[str, List[str]] = dict(),
                  preprocessor_factory=nil_preprocessor_factory):
@@ -563,6 +600,13 @@ def grammar_unit(test_unit, parser_factory, transformer_factory, report='REPORT'
     :param preprocessor_factory: The preprocessor factory. This will be ignored of the
         configuration variable test_skip_preprocessor is set to True. Beware that in this
         case, all source snippets must already have been preprocessed.
+
+    If the configuration variable ``test_result_cache`` contains a directory name
+    and the test-unit has been passed as a file name, the results of successful
+    tests are cached in this directory. Tests are skipped in subsequent runs, unless
+    the test-code, the expected results, the grammar, the transformation-table or
+    any of the further processing stages have changed. Set the configuration
+    variable ``test_force_rerun`` to True in order to rerun all tests, regardless.
     """
     assert isinstance(report, str)
     assert isinstance(junctions, Set) and all(isinstance(e[0], str) and isinstance(e[2], str)
@@ -595,8 +639,12 @@ def grammar_unit(test_unit, parser_factory, transformer_factory, report='REPORT'
         except KeyError:
             return ""
 
+    cache_path = ''
     if isinstance(test_unit, str):
-        _, unit_name = os.path.split(os.path.splitext(test_unit)[0])
+        unit_dir, unit_name = os.path.split(os.path.splitext(test_unit)[0])
+        cache_dir = get_config_value('test_result_cache')
+        if cache_dir and not get_config_value('history_tracking'):
+            cache_path = os.path.join(unit_dir, cache_dir, unit_name + '.json')
         test_unit = unit_from_file(test_unit, UNIT_STAGES | {j[2] for j in junctions})
     else:
         unit_name = 'unit_test_' + str(id(test_unit))
@@ -612,6 +660,43 @@ def grammar_unit(test_unit, parser_factory, transformer_factory, report='REPORT'
     parser = parser_factory()
     transform = transformer_factory()
 
+    cache: Dict[str, Dict[str, str]] = dict()
+    new_cache: Dict[str, Dict[str, str]] = dict()
+    cache_hits, cache_misses = 0, 0
+    unit_fingerprint = ''
+    if cache_path:
+        if not get_config_value('test_force_rerun'):
+            cache = load_result_cache(cache_path)
+        unit_fingerprint = md5(__version__, fingerprint((
+            parser, transform, preprocessor, junctions, sorted(show), serializations,
+            test_unit.get('config__', {}), report,
+            get_config_value('test_suppress_lookahead_failures'),
+            get_config_value('test_skip_preprocessor'))))
+    srl = {k: v[0] for k, v in serializations.items()}
+
+    def cache_key(tests, parser_name, test_type, test_name, test_code) -> str:
+        expected = {stage: fingerprint(tests[stage][test_name]) for stage in tests
+                    if stage not in ('match', 'fail') and test_name in tests[stage]}
+        return md5(unit_fingerprint, parser_name, test_type, test_name, test_code,
+                   fingerprint(expected))
+
+    def cached_results(tests, test_name) -> Dict[str, str]:
+        """Returns the serialized results of a successful test as far as
+        they are needed for the test-report."""
+        results = dict()
+        if report:
+            for key, value in tests.items():
+                if key[:2] + key[-2:] == '____' and key != '__err__' and test_name in value \
+                        and (key != '__CST__' or test_name not in tests.get('__AST__', {})
+                             or str(test_name).endswith('*')):
+                    result = value[test_name]
+                    if isinstance(result, Node):
+                        stage = key.strip('_')
+                        default = stage if stage in ('AST', 'CST') else srl.get('*', 'default')
+                        result = result.serialize(srl.get(stage, default))
+                    results[key] = str(result)
+        return results
+
     def has_lookahead(parser_name: str) -> bool:
         """Returns True if the parser or any of its descendant parsers is a
         Lookahead parser."""
@@ -754,6 +839,17 @@ def grammar_unit(test_unit, parser_factory, transformer_factory, report='REPORT'
         # run match tests
 
         for test_name, test_code in tests.get('match', dict()).items():
+            if cache_path:
+                key = cache_key(tests, parser_name, 'match', test_name, test_code)
+                if key in cache:
+                    cache_hits += 1
+                    new_cache[key] = cache[key]
+                    for stage, result in cache[key].items():
+                        tests.setdefault(stage, {})[test_name] = result
+                    if verbose:
+                        write('    match-test "' + test_name + '" ... OK (cached)')
+                    continue
+                cache_misses += 1
             errflag = len(errata)
             err: Optional[Error] = None
             errors: List[Error] = []
@@ -921,6 +1017,8 @@ def grammar_unit(test_unit, parser_factory, transformer_factory, report='REPORT'
                     tests.setdefault('__err__', {})[test_name] = errata[-1]
                 if is_logging():
                     log_history(parser_name, test_code, clean_test_name, 'match', track_history)
+            elif cache_path:
+                new_cache[key] = cached_results(tests, test_name)
 
         if verbose and 'fail' in tests:
             write('  Fail-Tests for parser "' + parser_name + '"')
@@ -928,6 +1026,17 @@ def grammar_unit(test_unit, parser_factory, transformer_factory, report='REPORT'
         # run fail tests
 
         for test_name, test_code in tests.get('fail', dict()).items():
+            if cache_path:
+                key = cache_key(tests, parser_name, 'fail', test_name, test_code)
+                if key in cache:
+                    cache_hits += 1
+                    new_cache[key] = cache[key]
+                    for stage, result in cache[key].items():
+                        tests.setdefault(stage, {})[test_name] = result
+                    if verbose:
+                        write('    fail-test  "' + test_name + '" ... OK (cached)')
+                    continue
+                cache_misses += 1
             errflag = len(errata)
             try:
                 cst = parser(test_code, parser_name, complete_match=True)
@@ -967,12 +1076,19 @@ def grammar_unit(test_unit, parser_factory, transformer_factory, report='REPORT'
             if verbose:
                 infostr = '    fail-test  "' + test_name + '" ... '
                 write(infostr + ("OK" if len(errata) == errflag else "FAIL"))
+            if cache_path and len(errata) == errflag:
+                new_cache[key] = {'__msg__': tests['__msg__'][test_name]} \
+                    if report and test_name in tests.get('__msg__', {}) else {}
 
         if track_history and not config_history_tracking:
             set_tracer(parser[parser_name].descendants(), None)
             parser.history_tracking__ = False
         parser.resume_notices__ = config_resume_notices
 
+    if cache_path:
+        save_result_cache(cache_path, new_cache)
+        write(f'Test-result cache for "{unit_name}": {cache_hits} hits, {cache_misses} misses')
+
     # write test-report
     if report:
         test_report = get_report(test_unit, serializations)
@@ -129,6 +129,8 @@ __all__ = ('re',
            'load_if_file',
            'is_python_code',
            'md5',
+           'source_code',
+           'fingerprint',
            'expand_table',
            'compile_python_object',
            'smart_list',
@@ -531,31 +533,31 @@ class LazyRE:
     @property
     def Pattern(self):
         if self.rx is None:
-            self.rx = re.compile(self.regexp)
+            self.rx = re.compile(self.regexp, self.re_flags)
         return self.rx
 
     @property
     def pattern(self):
         if self.rx is None:
-            self.rx = re.compile(self.regexp)
+            self.rx = re.compile(self.regexp, self.re_flags)
         return self.rx.pattern
 
     @property
     def flags(self):
         if self.rx is None:
-            self.rx = re.compile(self.regexp)
+            self.rx = re.compile(self.regexp, self.re_flags)
         return self.rx.flags
 
     @property
     def groups(self):
         if self.rx is None:
-            self.rx = re.compile(self.regexp)
+            self.rx = re.compile(self.regexp, self.re_flags)
         return self.rx.groups
 
     @property
     def groupindex(self):
         if self.rx is None:
-            self.rx = re.compile(self.regexp)
+            self.rx = re.compile(self.regexp, self.re_flags)
         return self.rx.groupindex
 
     def search(self, *args, **kwargs):
@@ -1311,6 +1313,81 @@ def md5(*txt):
     return md5_hash.hexdigest()
 
 
+@functools.lru_cache(None)
+def source_code(obj) -> str:
+    """Returns the source code of a class or function or the empty string,
+    if it is not available. Results are cached, because looking up the
+    source of a class requires parsing the whole module."""
+    import inspect
+    try:
+        return inspect.getsource(obj)
+    except (OSError, TypeError):
+        return ''
+
+
+def fingerprint(obj, _seen: Optional[Set] = None) -> str:
+    """Returns a string that identifies the code and data of ``obj`` well
+    enough to notice when it has been changed between two runs, e.g. of
+    the same test-suite or processing pipeline. For classes and functions, the source code is used, if
+    available, for containers and partial functions the fingerprints
+    of their components, for any other object the fingerprint of its
+    class. Fingerprints are meant to be hashed, not to be read.
+
+    >>> fingerprint({'b': [1, 2], 'a': frozenset({'y', 'x'})})
+    "{'a':{'x','y'},'b':[1,2]}"
+    """
+    import inspect
+    if _seen is None:
+        _seen = set()
+    if isinstance(obj, (str, int, float, bool, type(None), bytes)):
+        return repr(obj)
+    if id(obj) in _seen:
+        return '...'
+    _seen = _seen | {id(obj)}
+    if isinstance(obj, dict):
+        if any(isinstance(k, tuple) or (isinstance(k, str)
+               and (k.find(',') >= 0 or k in ('~', '__cache__'))) for k in obj):
+            # normalize transformation-tables, which are expanded in place by traverse()
+            obj = {(':Whitespace' if k == '~' else k): v for k, v in expand_table(obj).items()
+                   if k != '__cache__'}
+        obj = {k: ([v] if callable(v) else v) for k, v in obj.items()}
+        return '{' + ','.join(sorted(fingerprint(k, _seen) + ':' + fingerprint(v, _seen)
+                                     for k, v in obj.items())) + '}'
+    if isinstance(obj, (list, tuple)):
+        return '[' + ','.join(fingerprint(item, _seen) for item in obj) + ']'
+    if isinstance(obj, (set, frozenset)):
+        return '{' + ','.join(sorted(fingerprint(item, _seen) for item in obj)) + '}'
+    if not isinstance(obj, type) and hasattr(obj, 'as_sxpr'):  # nodes of DHParser.nodetree
+        return obj.as_sxpr(flatten_threshold=0)
+    if isinstance(obj, re.Pattern):
+        return 're.compile(' + repr(obj.pattern) + ',' + str(obj.flags) + ')'
+    if isinstance(obj, functools.partial):
+        return 'partial(' + fingerprint(obj.func, _seen) + fingerprint(obj.args, _seen) \
+            + fingerprint(obj.keywords, _seen) + ')'
+    if isinstance(obj, (staticmethod, classmethod)):
+        return fingerprint(obj.__func__, _seen)
+    if isinstance(obj, ThreadLocalSingletonFactory):
+        return fingerprint(obj.class_or_factory, _seen)
+    if inspect.isclass(obj) or inspect.isfunction(obj) or inspect.ismethod(obj):
+        src = source_code(obj) \
+            or getattr(obj, 'python_src__', '') or getattr(obj, 'source_hash__', '') \
+            or getattr(obj, '__module__', '') + '.' + getattr(obj, '__qualname__', '')
+        code = getattr(obj, '__code__', None)
+        if code is not None:
+            src += code.co_code.hex() + fingerprint(code.co_consts, _seen)
+        closure = getattr(obj, '__closure__', None) or ()
+        cells = []
+        for cell in closure:
+            try:
+                cells.append(fingerprint(cell.cell_contents, _seen))
+            except ValueError:  # empty cell
+                pass
+        return src + '(' + ','.join(cells) + ')' if cells else src
+    if callable(obj) and hasattr(obj, '__qualname__'):  # builtins
+        return getattr(obj, '__module__', '') + '.' + obj.__qualname__
+    return fingerprint(obj.__class__, _seen)
+
+
 def compile_python_object(python_src: str, catch_obj="DSLGrammar") -> Any:
     """
     Compiles the python source code and returns the (first) object
@@ -29,21 +29,29 @@ for CST -> AST transformations.
 from __future__ import annotations
 
 import collections.abc
+import functools
 from functools import partial, singledispatch, reduce
 import operator
-from typing import AbstractSet, Callable, cast, Container, Dict, \
-    Tuple, List, Sequence, Union, Optional
+import pickle
+import weakref
+from typing import AbstractSet, Any, Callable, cast, Container, Dict, \
+    Tuple, List, Sequence, Union, Optional, TYPE_CHECKING
 
 try:
     import cython
 except ImportError:
     import DHParser.externallibs.shadow_cython as cython
 
+from DHParser.configuration import get_config_value, get_config_values, add_config_values
 from DHParser.error import ErrorCode, AST_TRANSFORM_CRASH, ERROR
 from DHParser.nodetree import Node, WHITESPACE_PTYPE, TOKEN_PTYPE, LEAF_PTYPES, PLACEHOLDER, \
-    RootNode, parse_sxpr, flatten_sxpr, Path, pp_path
+    RootNode, parse_sxpr, parse_binary, flatten_sxpr, Path, pp_path
 from DHParser.toolkit import issubtype, isgenerictype, expand_table, smart_list, re, \
-    deprecation_warning, TypeAlias, ByteString
+    deprecation_warning, TypeAlias, ByteString, instantiate_executor, PickMultiCoreExecutor, \
+    ExecutorWrapper, cpu_count
+
+if TYPE_CHECKING:
+    from DHParser.parse import Grammar, Parser
 
 
 __all__ = ('TransformationDict',
@@ -61,7 +69,11 @@ __all__ = ('TransformationDict',
            'BLOCK_ANONYMOUS_LEAVES',
            'BLOCK_CHILDREN',
            'traverse',
+           'compile_transformations',
+           'LOCAL_TRANSFORMATIONS',
+           'fuse_transformations',
            'transformer',
+           'traverse_subtrees_in_parallel',
            'merge_treetops',
            'always',
            'never',
@@ -122,6 +134,7 @@ __all__ = ('TransformationDict',
            'has_child',
            'has_children',
            'has_sibling',
+           'batch_condition',
            'lstrip',
            'rstrip',
            'strip',
@@ -262,6 +275,7 @@ def transformation_factory(t1=None, t2=None, t3=None, t4=None, t5=None):
             "No type information on second parameter found! Please, use type " \
             "annotation or provide the type information via transformer-decorator."
         f = singledispatch(f)
+        f._transformation_factory = True  # see _undispatched()
         p1type = real_type(params[0].annotation)
         if t1 is None:
             t1 = type_guard(p1type)
@@ -342,6 +356,316 @@ BLOCK_LEAVES = BlockLeaves()
 BLOCK_ANONYMOUS_LEAVES = BlockAnonymousLeaves()
 
 
+def _transformation_error(path: Path, call: Callable, e: Exception):
+    """Raises an AssertionError that reports the exception ``e`` that
+    occurred when transforming ``path`` with ``call``."""
+    if isinstance(path[0], RootNode) and path[0].docname:
+        raise AssertionError(
+            f'An exepction occured when transforming {pp_path(path, (1, 20))}\n'
+            f'in document "{path[0].docname}"\nwith {str(call)}:\n'
+            f'{e.__class__.__name__}: {e}')
+    else:
+        raise AssertionError(
+            f'An exception occurred when transforming {pp_path(path, (1, 20))}\n'
+            f'with\n{str(call)}:\n{e.__class__.__name__}: {e}')
+
+
+def _undispatched(call: Callable) -> Callable:
+    """Returns the function that a transformation or condition created with
+    :py:func:`transformation_factory` dispatches to when called with a path.
+    Transformations or conditions that are passed as arguments to the
+    transformation are replaced in the same way."""
+    if isinstance(call, partial):
+        func = _undispatched(call.func)
+        keywords = {key: _undispatched_argument(value) for key, value in call.keywords.items()}
+        if func is call.func and all(keywords[key] is value
+                                     for key, value in call.keywords.items()):
+            return call
+        return partial(func, *call.args, **keywords)
+    if getattr(call, '_transformation_factory', False):
+        return call.dispatch(list)
+    return call
+
+
+def _undispatched_argument(argument: Any) -> Any:
+    if isinstance(argument, (tuple, set, frozenset)):
+        arguments = [_undispatched_argument(arg) for arg in argument]
+        if any(a is not b for a, b in zip(arguments, argument)):
+            return type(argument)(arguments)
+        return argument
+    return _undispatched(argument) if callable(argument) else argument
+
+
+def _inlined(call: Callable, suffix: str, namespace: Dict[str, Any],
+             nested: bool = False) -> List[str]:
+    """Returns the lines of code (without indentation) that apply the
+    transformation ``call`` to ``path``. Constants or functions referred to by
+    the code are added to ``namespace`` with names ending in ``suffix``. Inside
+    conditional transformations (``nested == True``), transformations that
+    are called as is are guarded against returning a value."""
+    arguments = call.keywords if isinstance(call, partial) and not call.args else None
+    func = call.func if arguments is not None else None
+    if call is replace_by_single_child or call is reduce_single_child:
+        helper = '_replace_by' if call is replace_by_single_child else '_reduce_child'
+        return ['node = path[-1]',
+                'if len(node._children) == 1:',
+                f'    {helper}(node, node._children[0], path[0])']
+    keep, lines = '', []
+    if func is remove_tokens and set(arguments) <= {'tokens'}:
+        tokens = arguments.get('tokens', frozenset())
+        namespace[f'tokens{suffix}'] = tokens
+        keep = f'c.name != TOKEN_PTYPE or c.content not in tokens{suffix}' if tokens \
+            else 'c.name != TOKEN_PTYPE'
+    elif func is remove_children and set(arguments) == {'names'}:
+        namespace[f'names{suffix}'] = arguments['names']
+        keep = f'c.name not in names{suffix}'
+    elif func in (remove_children_if, keep_children_if) and set(arguments) == {'condition'}:
+        predicate = _predicate(arguments['condition'], suffix, namespace)
+        if predicate is not None:
+            lines, expression = predicate
+            keep = f'not ({expression})' if func is remove_children_if else expression
+        elif func is remove_children_if:
+            namespace[f'condition{suffix}'] = _undispatched(arguments['condition'])
+            keep = f'not condition{suffix}(path + [c])'
+    if keep:
+        return ['node = path[-1]',
+                'if node._children:'] \
+            + ['    ' + line for line in lines] \
+            + [f'    node._set_result(tuple(c for c in node._children if {keep}))']
+    if call is flatten or (func is flatten and set(arguments) <= {'condition', 'recursive'}):
+        condition = is_anonymous if call is flatten else arguments.get('condition', is_anonymous)
+        predicate = _predicate(condition, suffix, namespace)
+        if predicate is not None:
+            lines, expression = predicate
+            recursive = True if call is flatten else arguments.get('recursive', True)
+            namespace['_flatten'] = _undispatched(flatten)
+            namespace[f'condition{suffix}'] = condition
+            return ['node = path[-1]',
+                    'if node._children:'] \
+                + ['    ' + line for line in lines] \
+                + ['    new_result = []',
+                   '    path.append(PLACEHOLDER)',
+                   '    for c in node._children:',
+                   '        path[-1] = c',
+                   f'        if c._children and {expression}:',
+                   f'            {f"_flatten(path, condition{suffix}, True)" if recursive else "pass"}',
+                   '            new_result.extend(c._children)',
+                   '            update_attr(node, (c,), path[0])',
+                   '        else:',
+                   '            new_result.append(c)',
+                   '    path.pop()',
+                   '    node._set_result(tuple(new_result))']
+    branches = {apply_if: ('transformation',),
+                apply_unless: ('transformation',),
+                apply_ifelse: ('if_transformation', 'else_transformation')}.get(func, ())
+    if branches and set(arguments) == {'condition', *branches} \
+            and all(callable(arguments[b]) or isinstance(arguments[b], tuple) for b in branches):
+        namespace[f'condition{suffix}'] = _undispatched(arguments['condition'])
+        negation = 'not ' if func is apply_unless else ''
+        lines = [f'if {negation}condition_guard(condition{suffix}(path)):']
+        for k, branch in enumerate(branches):
+            if k > 0:
+                lines.append('else:')
+            transformations = arguments[branch]
+            if callable(transformations):
+                transformations = (transformations,)
+            for n, transformation in enumerate(transformations):
+                lines.extend('    ' + line for line in _inlined(
+                    transformation, f'{suffix}_{k}_{n}', namespace, True))
+            if not transformations:
+                lines.append('    pass')
+        return lines
+    namespace[f'call{suffix}'] = _undispatched(call)
+    return [f'transformation_guard(call{suffix}(path))' if nested else f'call{suffix}(path)']
+
+
+@functools.lru_cache(maxsize=1024)
+def _compiled_source(source: str):
+    # Transformation-tables are often copied before use. Because the source
+    # code only depends on the kinds of transformations, it needs to be
+    # compiled only once.
+    return compile(source, '<transformations>', 'exec')
+
+
+def compile_transformations(sequence: Sequence[Callable]) -> Callable[[Path], None]:
+    """Compiles a sequence of transformations into a single function that
+    applies the transformations to a path one after the other, just like
+    :py:func:`traverse` does with the transformations that have been
+    registered for a node in the transformation-table. Frequently used
+    transformations, like replace_by_single_child(), reduce_single_child(),
+    remove_tokens(), remove_children() and flatten() are inlined. Other
+    transformations that have been created with the help of
+    :py:func:`transformation_factory` are called without the detour via
+    ``functools.singledispatch``. The conditions of remove_children_if(),
+    keep_children_if() and flatten() are inlined, too, if possible (see
+    :py:func:`batch_condition`). As with :py:func:`traverse`, exceptions
+    are reported as AssertionError with the transformation and the path
+    where it has occurred. Example::
+
+        >>> tree = parse_sxpr('(expr (:Series (term (factor "4")) (:Text "+")) (term "5"))')
+        >>> transformations = compile_transformations(
+        ...     [flatten, remove_tokens('+'), remove_children('nothing')])
+        >>> transformations([tree])
+        >>> print(tree.as_sxpr())
+        (expr (term (factor "4")) (term "5"))
+        >>> term = tree[0]
+        >>> compile_transformations([replace_by_single_child])([tree, term])
+        >>> print(tree.as_sxpr())
+        (expr (factor "4") (term "5"))
+    """
+    namespace = {'sequence': tuple(sequence),
+                 '_transformation_error': _transformation_error,
+                 '_replace_by': _replace_by,
+                 '_reduce_child': _reduce_child,
+                 'update_attr': update_attr,
+                 'condition_guard': condition_guard,
+                 'transformation_guard': transformation_guard,
+                 'PLACEHOLDER': PLACEHOLDER,
+                 'TOKEN_PTYPE': TOKEN_PTYPE}
+    lines = ['def transformations(path):',
+             '    i = 0',
+             '    try:']
+    for i, call in enumerate(sequence):
+        if i > 0:
+            lines.append(f'        i = {i}')
+        lines.extend('        ' + line for line in _inlined(call, str(i), namespace))
+    if not sequence:
+        lines.append('        pass')
+    lines.extend(['    except Exception as e:',
+                  '        _transformation_error(path, sequence[i], e)'])
+    exec(_compiled_source('\n'.join(lines)), namespace)
+    return namespace['transformations']
+
+
+def _expanded_table(transformation_table: TransformationTableType) -> TransformationTableType:
+    """Expands the ``transformation_table`` in place, so that all keys are
+    single node-names and all values are lists, and adds an (empty)
+    cache for the filters and transformations per node-name, which is
+    divided by the value of the configuration value
+    'compile_transformations'. Returns the expanded table. Tables that have already been expanded are returned as is.
+    """
+    # Is this optimization really needed?
+    if '__cache__' in transformation_table:
+        # assume that processing table has already been expanded
+        return transformation_table
+    # normalize transformation_table entries by turning single values
+    # into lists with a single value
+    table = {name: call if name == '__subtree_local__'
+                  else cast(Sequence[Callable], smart_list(call))
+             for name, call in list(transformation_table.items())}
+    table = expand_table(table)
+    # substitute key for insignificant whitespace
+    assert '+' not in table, 'Symbol "+" in processing table is obsolete, use "<" instead'
+    if '~' in table:
+        if ':Whitespace' in table:
+            raise AssertionError(
+                '"~" is a synonym for ":Whitespace" in the processing table. '
+                'To avoid confusion, choose either of the two, but do not use '
+                'both at the same time!')
+        whitespace_transformation = table['~']
+        del table['~']
+        table[':Whitespace'] = whitespace_transformation
+    # cache expanded table
+    table.setdefault('__cache__', cast(TransformationDict, dict()))
+    # change processing table in place, so its already expanded and cache filled next time
+    transformation_table.clear()
+    transformation_table.update(table)
+    return transformation_table
+
+
+def _traversal(table: TransformationTableType, key_func: KeyFunc) \
+        -> Tuple[Callable[[str], Tuple[List[Filter], Optional[Callable[[Path], None]]]],
+                 Callable[[Path], None]]:
+    """Returns the functions ``lookup(key)``, which yields the filters and
+    the (compiled) transformations for a key, and ``traverse_path(path)``,
+    which transforms the subtree of the last node in the path, for the
+    expanded ``table``. See :py:func:`traverse`."""
+    compiled = get_config_value('compile_transformations')
+    # compiled and uncompiled transformations are cached separately, so that
+    # switching 'compile_transformations' takes effect on tables used before
+    cache = cast(TransformationDict, table['__cache__']).setdefault(compiled, dict())
+
+    def split_filter(callables: Sequence[Callable]) -> Tuple[List[Filter], List[Callable]]:
+        i = 0
+        filter = []
+        for callable in callables:
+            if isinstance(callable, Filter):
+                filter.append(callable)
+                i += 1
+            else:  break
+        callables = list(callables[i:])
+        assert not any(isinstance(callable, Filter) for callable in callables)
+        return filter, callables
+
+    def lookup(key) -> Tuple[List[Filter], List[Callable]]:
+        filters, pre = split_filter(table.get('<', []))
+        assert BLOCK_CHILDREN not in filters
+        more_filters, main = split_filter(table.get(key, table.get('*', [])))
+        post = table.get('>', [])
+        assert not any(isinstance(callable, Filter) for callable in post)
+        sequence = pre + main + post
+        all_filters = filters + more_filters
+        if BLOCK_CHILDREN in all_filters:
+            all_filters = [BLOCK_CHILDREN]
+        if not sequence:
+            transformations = None
+        elif compiled:
+            transformations = compile_transformations(sequence)
+        else:
+            transformations = partial(apply, sequence)
+        cache[key] = (all_filters, transformations)
+        return all_filters, transformations
+
+    def apply(sequence, path):
+        for call in sequence:
+            try:
+                call(path)
+            except Exception as e:
+                _transformation_error(path, call, e)
+
+    def traverse_iteratively(path):
+        # The tree is traversed depth first with an explicit stack of
+        # (children-iterator, transformations)-tuples that runs parallel to the
+        # path, so that deeply nested trees do not exceed the recursion limit.
+        # The transformations registered for a node are called after all of its
+        # children have been processed.
+        node = path[-1]
+        try:
+            filters, transformations = cache[key_func(node)]
+        except KeyError:
+            filters, transformations = lookup(key_func(node))
+        children = node._children
+        for filter in filters:
+            children = filter(children)
+        stack = [(iter(children or ()), transformations)]
+        while stack:
+            children, transformations = stack[-1]
+            for node in children:
+                path.append(node)
+                key = key_func(node)
+                try:
+                    filters, node_transformations = cache[key]
+                except KeyError:
+                    filters, node_transformations = lookup(key)
+                grandchildren = node._children
+                for filter in filters:
+                    grandchildren = filter(grandchildren)
+                if grandchildren:
+                    stack.append((iter(grandchildren), node_transformations))
+                    break
+                if node_transformations:
+                    node_transformations(path)
+                path.pop()
+            else:
+                stack.pop()
+                if transformations:
+                    transformations(path)
+                if stack:
+                    path.pop()
+
+    return lookup, traverse_iteratively
+
+
 def traverse(tree: Node,
              transformation_table: TransformationTableType,
              key_func: KeyFunc = key_node_name) -> Node:
@@ -364,6 +688,13 @@ def traverse(tree: Node,
       function appears in the table
     - '>': always called (after any other processing function)
 
+    Furthermore, the keys '<<<' and '>>>' mark transformations that are
+    called once with the root-node before and after the traversal. A table
+    can declare with the entry ``'__subtree_local__': True`` that the
+    children of the root-node can be transformed independently of each
+    other, which allows :py:func:`transformer` to transform them in
+    parallel (see :py:func:`traverse_subtrees_in_parallel`).
+
     :param tree: The root-node of the syntax tree to be traversed
     :param transformation_table: A mapping node key -> sequence of functions
             that will be applied to matching nodes in order. This dictionary
@@ -383,95 +714,12 @@ def traverse(tree: Node,
 
     """
 
-    # Is this optimization really needed?
-    if '__cache__' in transformation_table:
-        # assume that processing table has already been expanded
-        table = transformation_table               # type: TransformationTableType
-        cache = cast(TransformationDict, transformation_table['__cache__'])  # type: TransformationDict
-    else:
-        # normalize transformation_table entries by turning single values
-        # into lists with a single value
-        table = {name: cast(Sequence[Callable], smart_list(call))
-                 for name, call in list(transformation_table.items())}
-        table = expand_table(table)
-        # substitute key for insignificant whitespace
-        assert '+' not in table, 'Symbol "+" in processing table is obsolete, use "<" instead'
-        if '~' in table:
-            if ':Whitespace' in table:
-                raise AssertionError(
-                    '"~" is a synonym for ":Whitespace" in the processing table. '
-                    'To avoid confusion, choose either of the two, but do not use '
-                    'both at the same time!')
-            whitespace_transformation = table['~']
-            del table['~']
-            table[':Whitespace'] = whitespace_transformation
-        # cache expanded table
-        cache = cast(TransformationDict,
-                     table.setdefault('__cache__', cast(TransformationDict, dict())))
-        # change processing table in place, so its already expanded and cache filled next time
-        transformation_table.clear()
-        transformation_table.update(table)
-
-    def split_filter(callables: Sequence[Callable]) -> Tuple[List[Filter], List[Callable]]:
-        i = 0
-        filter = []
-        for callable in callables:
-            if isinstance(callable, Filter):
-                filter.append(callable)
-                i += 1
-            else:  break
-        callables = list(callables[i:])
-        assert not any(isinstance(callable, Filter) for callable in callables)
-        return filter, callables
-
-    def traverse_recursive(path):
-        nonlocal cache
-        node = path[-1]
-
-        key = key_func(node)
-        try:
-            filters, sequence = cache[key]
-        except KeyError:
-            filters, pre = split_filter(table.get('<', []))
-            assert BLOCK_CHILDREN not in filters
-            more_filters, main = split_filter(table.get(key, table.get('*', [])))
-            post = table.get('>', [])
-            assert not any(isinstance(callable, Filter) for callable in post)
-            sequence = pre + main + post
-            all_filters = filters + more_filters
-            if BLOCK_CHILDREN in all_filters:
-                all_filters = [BLOCK_CHILDREN]
-            cache[key] = (all_filters, sequence)
-
-        children = node._children
-        for filter in filters:
-            children = filter(children)
-        if children:
-            path.append(PLACEHOLDER)
-            for child in children:
-                path[-1] = child
-                traverse_recursive(path)  # depth first
-            path.pop()
-
-        for call in sequence:
-            try:
-                call(path)
-            except Exception as ae:
-                if isinstance(path[0], RootNode) and path[0].docname:
-                    raise AssertionError(
-                        f'An exepction occured when transforming {pp_path(path, (1, 20))}\n'
-                        f'in document "{path[0].docname}"\nwith {str(call)}:\n'
-                        f'{ae.__class__.__name__}: {ae}')
-                else:
-                    raise AssertionError(
-                        f'An exception occurred when transforming {pp_path(path, (1, 20))}\n'
-                        f'with\n{str(call)}:\n{ae.__class__.__name__}: {ae}')
-
+    table = _expanded_table(transformation_table)
+    _, traverse_iteratively = _traversal(table, key_func)
     for call in table.get('<<<', []):  call([tree])
-    traverse_recursive([tree])
+    traverse_iteratively([tree])
     for call in table.get('>>>', []):  call([tree])
     return tree
-    # assert transformation_table['__cache__']
 
 
 def transformer(tree: RootNode,
@@ -502,13 +750,137 @@ def transformer(tree: RootNode,
     assert isinstance(tree, RootNode)
     if src_stage and tree.stage and tree.stage.lower() != src_stage.lower():
         raise ValueError(f'Tree in stage "{src_stage}" expected, but "{tree.stage}" found!')
-    tree = traverse(tree, transformation_table, key_func=key_func)
+    if get_config_value('transformation_parallelization') != 'multicore' \
+            or transformation_table.get('__subtree_local__') is not True \
+            or not traverse_subtrees_in_parallel(tree, transformation_table, key_func):
+        tree = traverse(tree, transformation_table, key_func=key_func)
     if not isinstance(tree, RootNode):
         tree = RootNode(tree)
     tree.stage = dst_stage
     return tree
 
 
+def _traverse_subtrees(data: bytes,
+                       transformation_table: TransformationTableType,
+                       key_func: KeyFunc,
+                       config: Optional[Dict[str, Any]] = None) -> bytes:
+    """Transforms the children of the tree that has been passed in
+    DHParser's binary format and returns the transformed tree in the same
+    format. The root of this tree is not transformed. ``config`` transfers
+    configuration values of the calling process."""
+    if config:
+        add_config_values(config)
+    chunk = parse_binary(data)
+    # positions are absolute and cannot be located in the chunk's content, so
+    # that the source locations of new errors are added by the calling process
+    chunk.source, chunk.lbreaks = '', []
+    _, traverse_path = _traversal(_expanded_table(transformation_table), key_func)
+    for child in chunk._children:
+        traverse_path([chunk, child])
+    return chunk.as_binary()
+
+
+def traverse_subtrees_in_parallel(tree: RootNode,
+                                  transformation_table: TransformationTableType,
+                                  key_func: KeyFunc = key_node_name) -> bool:
+    """Does the same as :py:func:`traverse`, but hands the children of the
+    root-node in chunks to a pool of processes. The chunks are passed in
+    DHParser's binary format (see :py:meth:`Node.as_binary`) together with
+    the errors that have been attached to their nodes, and the transformed
+    chunks are spliced back into the tree, while their errors are added to
+    the root-node. The "<<<"- and ">>>"-transformations and the
+    transformations of the root-node itself are run in the calling process.
+
+    This yields the same result as traverse() only if the transformation
+    of each child of the root-node neither depends on nor changes anything
+    outside the child's subtree, including any state that might have been
+    set up by the "<<<"-transformations. Transformation tables declare
+    themselves as "subtree-local" in this sense with the special entry
+    ``'__subtree_local__': True``. (This function, however, does not check
+    this entry.)
+
+    Returns False without touching the tree, if the tree cannot be processed
+    in parallel, because it has less than two children, because the
+    root-node's entry in the table contains filters, because the table
+    cannot be pickled or because parallel execution has been switched off
+    (see configuration value "debug_parallel_execution"). Returns True after
+    the tree has been transformed, otherwise.
+    """
+    table = _expanded_table(transformation_table)
+    lookup, _ = _traversal(table, key_func)
+    filters, transformations = lookup(key_func(tree))
+    children = tree._children
+    if filters or len(children) < 2:
+        return False
+    shippable = {key: value for key, value in table.items() if key != '__cache__'}
+    try:
+        pickle.dumps((shippable, key_func))
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return False
+    pool = instantiate_executor(True, PickMultiCoreExecutor)
+    if not isinstance(pool, ExecutorWrapper):  # i.e. threads or a single thread
+        pool.shutdown(wait=False)
+        return False
+
+    for call in table.get('<<<', []):  call([tree])
+    # split the children into contiguous chunks with the same number of children
+    n = min(len(children), cpu_count() * 4)
+    k, r = divmod(len(children), n)
+    bounds = [i * k + min(i, r) for i in range(n + 1)]
+    runs = [children[bounds[i]:bounds[i + 1]] for i in range(n)]
+
+    config = get_config_values()
+    error_nodes = tree.error_nodes
+    shipped_nodes = []  # type: List[Node]
+    try:
+        futures = []
+        for run in runs:
+            chunk = RootNode()
+            chunk.name = tree.name
+            chunk._set_result(run)
+            chunk._pos = run[0]._pos
+            if error_nodes:
+                for node in chunk.select_if(lambda nd: id(nd) in error_nodes):
+                    for error in error_nodes[id(node)]:
+                        chunk.add_error(node, error)
+                    shipped_nodes.append(node)
+            futures.append(pool.submit(_traverse_subtrees, chunk.as_binary(),
+                                       shippable, key_func, config))
+        chunks = [parse_binary(future.result()) for future in futures]
+    finally:
+        pool.shutdown(wait=True)
+
+    # The errors of the shipped nodes are replaced by the errors of the
+    # transformed chunks only after all chunks have been transformed, so
+    # that the tree keeps its errors, if a transformation fails.
+    if shipped_nodes:
+        shipped_errors = set()
+        for node in shipped_nodes:
+            shipped_errors.update(error_nodes.pop(id(node)))
+            for ids in tree.error_positions.values():
+                ids.discard(id(node))
+        tree.errors = [error for error in tree.errors if error not in shipped_errors]
+        tree._error_set -= shipped_errors
+    result = []
+    for chunk in chunks:
+        result.extend(chunk._children)
+        if chunk.errors:
+            located = {id(error): node
+                       for node in chunk.select_if(lambda nd: id(nd) in chunk.error_nodes,
+                                                   include_root=True)
+                       for error in chunk.error_nodes[id(node)]}
+            for error in chunk.errors:
+                # errors of nodes that have been removed are attached to the root
+                node = located.get(id(error), chunk)
+                tree.add_error(tree if node is chunk else node, error)
+    tree._set_result(tuple(result))
+
+    if transformations:
+        transformations([tree])
+    for call in table.get('>>>', []):  call([tree])
+    return True
+
+
 #######################################################################
 #
 # specialized full tree transformations
@@ -903,6 +1275,188 @@ def has_sibling(path: Path, name_set: AbstractSet[str]):
     return False
 
 
+#######################################################################
+#
+# batched evaluation of conditions for all children of a node
+# ---------------------------------------------------------------------
+#
+# Transformations like remove_children_if(), flatten() or
+# merge_adjacent() evaluate their condition for each child of a node.
+# Called with a path, a condition requires the path of the child,
+# which must be built first. For the most common conditions this can
+# be avoided by evaluating them for all children in one pass with
+# the help of generated code, which picks the node-names, contents or
+# ancestors to be checked directly from the children and the path of
+# their parent. (The conditions must be evaluated anew for each node,
+# because the children of a node are changed by the transformations
+# of the children, before the node itself is transformed.)
+#
+#######################################################################
+
+
+def _predicate(condition: CondFunc, suffix: str, namespace: Dict[str, Any]) \
+        -> Optional[Tuple[List[str], str]]:
+    """Returns the lines of code that must be executed once for the
+    parent of the nodes to be checked, before these are checked, and an
+    expression that evaluates ``condition`` for a node ``c``. The code
+    may refer to the path of the parent as ``path``, the expression must
+    not. If ``condition`` cannot be evaluated in this way, None is
+    returned. Constants referred to by the code are added to
+    ``namespace`` with names ending in ``suffix``."""
+    anonymous = '(not c.name or c.name[0] == ":")'
+    if condition is is_anonymous:
+        return [], anonymous
+    elif condition is is_named:
+        return [], f'not {anonymous}'
+    elif condition is is_anonymous_leaf:
+        return [], f'(not c._children and {anonymous})'
+    elif condition is is_empty:
+        return [], 'not c.result'
+    elif condition is has_children:
+        return [], 'bool(c._children)'
+    elif condition is always or condition is never:
+        return [], str(condition is always)
+    elif condition is is_single_child:
+        return [f'single{suffix} = len(path[-1]._children) == 1'], f'single{suffix}'
+    elif condition is contains_only_whitespace:
+        namespace['RX_WHITESPACE'] = RX_WHITESPACE
+        return [], 'RX_WHITESPACE.match(c.content) is not None'
+    elif condition is is_token:
+        namespace['TOKEN_PTYPE'] = TOKEN_PTYPE
+        return [], 'c.name == TOKEN_PTYPE'
+    if not isinstance(condition, partial) or condition.args:
+        return None
+    func, arguments = condition.func, condition.keywords
+    if func is is_one_of or func is not_one_of:
+        if set(arguments) == {'name_set'}:
+            namespace[f'names{suffix}'] = arguments['name_set']
+            return [], f'c.name {"in" if func is is_one_of else "not in"} names{suffix}'
+    elif func is is_a or func is not_a:
+        if set(arguments) == {'name'}:
+            namespace[f'name{suffix}'] = arguments['name']
+            return [], f'c.name {"==" if func is is_a else "!="} name{suffix}'
+    elif func is is_token:
+        if set(arguments) <= {'tokens'}:
+            namespace['TOKEN_PTYPE'] = TOKEN_PTYPE
+            tokens = arguments.get('tokens', frozenset())
+            if not tokens:
+                return [], 'c.name == TOKEN_PTYPE'
+            namespace[f'tokens{suffix}'] = tokens
+            return [], f'(c.name == TOKEN_PTYPE and c.content in tokens{suffix})'
+    elif func is name_matches or func is content_matches:
+        if set(arguments) == {'regexp'}:
+            regexp = arguments['regexp']
+            if not regexp.endswith('$'):
+                regexp = f"(?:{regexp})$"
+            namespace[f'rx{suffix}'] = re.compile(regexp)
+            field = 'name' if func is name_matches else 'content'
+            return [], f'rx{suffix}.match(c.{field}) is not None'
+    elif func is has_content:
+        if set(arguments) == {'content'}:
+            namespace[f'content{suffix}'] = arguments['content']
+            return [], f'c.content == content{suffix}'
+    elif func is has_parent:
+        if set(arguments) == {'name_set'}:
+            namespace[f'names{suffix}'] = arguments['name_set']
+            return [f'parent{suffix} = path[-1].name in names{suffix}'], f'parent{suffix}'
+    elif func is has_ancestor:
+        if set(arguments) <= {'name_set', 'generations', 'until'} and 'name_set' in arguments \
+                and not arguments.get('until', None):
+            namespace[f'names{suffix}'] = arguments['name_set']
+            generations = arguments.get('generations', -1)
+            if generations <= 0:
+                # has_ancestor() also checks the last node in the path, if
+                # the number of generations is not limited
+                return [f'ancestor{suffix} = any(nd.name in names{suffix} for nd in path)'], \
+                    f'(ancestor{suffix} or c.name in names{suffix})'
+            return [f'ancestor{suffix} = any(nd.name in names{suffix} '
+                    f'for nd in path[-{generations}:])'], f'ancestor{suffix}'
+    elif func is neg:
+        if set(arguments) == {'bool_func'}:
+            predicate = _predicate(arguments['bool_func'], suffix + 'p', namespace)
+            if predicate is not None:
+                lines, expression = predicate
+                return lines, f'not ({expression})'
+    elif func is any_of or func is all_of:
+        if set(arguments) == {'bool_func_set'} and arguments['bool_func_set']:
+            lines, expressions = [], []
+            for k, bool_func in enumerate(arguments['bool_func_set']):
+                predicate = _predicate(bool_func, f'{suffix}p{k}', namespace)
+                if predicate is None:
+                    return None
+                lines.extend(predicate[0])
+                expressions.append(predicate[1])
+            connective = ' or ' if func is any_of else ' and '
+            return lines, '(' + connective.join(expressions) + ')'
+    return None
+
+
+def _condition_key(condition: Any) -> Any:
+    """Returns a hashable key that is the same for equivalent conditions,
+    even if these are distinct partial-objects."""
+    if isinstance(condition, partial):
+        return (partial, _condition_key(condition.func), _condition_key(condition.args),
+                tuple((key, _condition_key(value))
+                      for key, value in sorted(condition.keywords.items())))
+    elif isinstance(condition, (set, frozenset)):
+        return frozenset(_condition_key(item) for item in condition)
+    elif isinstance(condition, (tuple, list)):
+        return tuple(_condition_key(item) for item in condition)
+    return condition
+
+
+_batch_cache = dict()  # type: Dict[Any, Optional[Callable[[Path, Sequence[Node]], List[bool]]]]
+_batch_cache_by_condition = weakref.WeakKeyDictionary()  # type: weakref.WeakKeyDictionary
+
+
+def batch_condition(condition: CondFunc) \
+        -> Optional[Callable[[Path, Sequence[Node]], List[bool]]]:
+    """Returns a function ``evaluate(path, children)`` that evaluates the
+    ``condition`` for all ``children`` of the last node of ``path`` in a
+    single pass and returns a list of booleans, i.e. the results for each
+    child. This is faster than calling ``condition(path + [child])`` for
+    each child. If ``condition`` is not one of the conditions defined in
+    this module (or a combination of these with :py:func:`neg`,
+    :py:func:`any_of` or :py:func:`all_of`), None is returned. Example::
+
+        >>> tree = parse_sxpr('(A (:Text "+") (B "1") (:Whitespace " ") (:Text "-"))')
+        >>> evaluate = batch_condition(any_of(is_token('+', '-'), contains_only_whitespace))
+        >>> evaluate([tree], tree.children)
+        [True, False, True, True]
+        >>> print(batch_condition(lambda path: len(path) > 2))
+        None
+    """
+    try:
+        return _batch_cache_by_condition[condition]
+    except (KeyError, TypeError):
+        pass
+    try:
+        key = _condition_key(condition)
+        evaluate = _batch_cache[key]
+    except KeyError:
+        namespace = dict()  # type: Dict[str, Any]
+        predicate = _predicate(condition, '', namespace)
+        if predicate is None:
+            evaluate = None
+        else:
+            lines, expression = predicate
+            source = '\n'.join(['def evaluate(path, children):']
+                               + ['    ' + line for line in lines]
+                               + [f'    return [{expression} for c in children]'])
+            exec(_compiled_source(source), namespace)
+            evaluate = namespace['evaluate']
+        if len(_batch_cache) >= 1024:
+            _batch_cache.clear()
+        _batch_cache[key] = evaluate
+    except TypeError:  # unhashable condition
+        return None
+    try:
+        _batch_cache_by_condition[condition] = evaluate
+    except TypeError:  # condition does not support weak references
+        pass
+    return evaluate
+
+
 #######################################################################
 #
 # utility functions
@@ -1162,11 +1716,13 @@ def flatten(path: Path, condition: CondFunc = is_anonymous, recursive: bool = Tr
 
     node = path[-1]
     if node._children:
+        evaluate = batch_condition(condition)
+        flags = evaluate(path, node._children) if evaluate else None
         new_result = []     # type: List[Node]
         path.append(PLACEHOLDER)
-        for child in node._children:
+        for i, child in enumerate(node._children):
             path[-1] = child
-            if child._children and condition(path):
+            if child._children and (flags[i] if flags is not None else condition(path)):
                 if recursive:
                     flatten(path, condition, recursive)
                 new_result.extend(child._children)
@@ -1401,15 +1957,18 @@ def merge_adjacent(path: Path,
     node = path[-1]
     children = node._children
     if children:
+        evaluate = batch_condition(condition)
+        flags = evaluate(path, children) if evaluate \
+            else [condition(path + [child]) for child in children]
         new_result = []
         i = 0
         L = len(children)
         while i < L:
-            if condition(path + [children[i]]):
+            if flags[i]:
                 # initial = () if children[i]._children else ''
                 k = i
                 i += 1
-                while i < L and condition(path + [children[i]]):
+                while i < L and flags[i]:
                     i += 1
                 if i > k:
                     adjacent = children[k:i]
@@ -1788,7 +2347,12 @@ def keep_children_if(path: Path, condition: CondFunc):
     """Removes all children for which `condition()` returns `True`."""
     node = path[-1]
     if node._children:
-        node._set_result(tuple(c for c in node._children if condition(path + [c])))
+        evaluate = batch_condition(condition)
+        if evaluate:
+            node._set_result(tuple(c for c, flag in zip(node._children,
+                                                        evaluate(path, node._children)) if flag))
+        else:
+            node._set_result(tuple(c for c in node._children if condition(path + [c])))
 
 
 @transformation_factory(collections.abc.Set)
@@ -1796,13 +2360,18 @@ def keep_tokens(path: Path, tokens: AbstractSet[str] = frozenset()):
     """Removes any among a particular set of tokens from the immediate
     descendants of a node. If ``tokens`` is the empty set, all tokens
     are removed."""
-    keep_children_if(path, partial(is_token, tokens=tokens))
+    node = path[-1]
+    if node._children:
+        node._set_result(tuple(c for c in node._children if c.name == TOKEN_PTYPE
+                               and (not tokens or c.content in tokens)))
 
 
 @transformation_factory(collections.abc.Set)
 def keep_nodes(path: Path, names: AbstractSet[str]):
     """Removes children by tag name."""
-    keep_children_if(path, partial(is_one_of, name_set=names))
+    node = path[-1]
+    if node._children:
+        node._set_result(tuple(c for c in node._children if c.name in names))
 
 
 @transformation_factory
@@ -1816,13 +2385,18 @@ def remove_children_if(path: Path, condition: CondFunc):
     """Removes all children for which `condition()` returns `True`."""
     node = path[-1]
     if node._children:
-        node._set_result(tuple(c for c in node._children if not condition(path + [c])))
+        evaluate = batch_condition(condition)
+        if evaluate:
+            node._set_result(tuple(c for c, flag in zip(node._children,
+                                                        evaluate(path, node._children)) if not flag))
+        else:
+            node._set_result(tuple(c for c in node._children if not condition(path + [c])))
 
 
 remove_whitespace = remove_children_if(is_one_of(WHITESPACE_PTYPE))
 remove_empty = remove_children_if(is_empty)
-remove_anonymous_empty = remove_children_if(lambda trl: is_empty(trl) and is_anonymous(trl))
-remove_anonymous_tokens = remove_children_if(lambda trl: is_token(trl) and is_anonymous(trl))
+remove_anonymous_empty = remove_children_if(all_of(is_empty, is_anonymous))
+remove_anonymous_tokens = remove_children_if(all_of(is_token, is_anonymous))
 remove_infix_operator = keep_children(slice(0, None, 2))
 # remove_single_child = apply_if(keep_children(slice(0)), lambda trl: len(trl[-1].children) == 1)
 
@@ -1877,13 +2451,18 @@ def remove_tokens(path: Path, tokens: AbstractSet[str] = frozenset()):
     """Removes any among a particular set of tokens from the immediate
     descendants of a node. If ``tokens`` is the empty set, all tokens
     are removed."""
-    remove_children_if(path, partial(is_token, tokens=tokens))
+    node = path[-1]
+    if node._children:
+        node._set_result(tuple(c for c in node._children if c.name != TOKEN_PTYPE
+                               or (tokens and c.content not in tokens)))
 
 
 @transformation_factory(collections.abc.Set)
 def remove_children(path: Path, names: AbstractSet[str]):
     """Removes children by tag name."""
-    remove_children_if(path, partial(is_one_of, name_set=names))
+    node = path[-1]
+    if node._children:
+        node._set_result(tuple(c for c in node._children if c.name not in names))
 
 
 @transformation_factory
@@ -2184,3 +2763,229 @@ def peek(path: Path):
     """For debugging: Prints the last node in the path as S-expression."""
     print(path[-1].as_sxpr(compact=True))
 
+
+
+#######################################################################
+#
+# fusing transformations with the parsing process
+#
+#######################################################################
+
+
+LOCAL_TRANSFORMATIONS = frozenset({
+    replace_by_single_child, reduce_single_child, replace_or_reduce, change_name,
+    flatten, collapse, lstrip, rstrip, strip, keep_children, keep_children_if,
+    keep_tokens, keep_nodes, keep_content, remove_children_if, remove_children,
+    remove_tokens, remove_content, remove_brackets, normalize_whitespace,
+    add_attributes, del_attributes, apply_if, apply_unless, apply_ifelse,
+    remove_whitespace, remove_empty, remove_anonymous_empty,
+    remove_anonymous_tokens, remove_infix_operator,
+    always, never, neg, any_of, all_of, is_named, is_anonymous, is_anonymous_leaf,
+    contains_only_whitespace, is_empty, is_token, is_one_of, not_one_of,
+    name_matches, content_matches, has_content, has_attr, has_children, has_child})
+
+
+def _is_local(call: Any) -> bool:
+    """Returns True, if ``call`` is a transformation or condition from
+    LOCAL_TRANSFORMATIONS, the arguments of which are local as well."""
+    if isinstance(call, (list, tuple, set, frozenset)):
+        return all(_is_local(c) for c in call)
+    if not callable(call):
+        return True
+    if call in LOCAL_TRANSFORMATIONS:
+        return True
+    if isinstance(call, partial):
+        return call.func in LOCAL_TRANSFORMATIONS \
+            and all(_is_local(arg) for arg in call.args) \
+            and all(_is_local(arg) for arg in call.keywords.values())
+    return False
+
+
+def _new_names(sequence: Sequence[Callable]) -> List[str]:
+    """Returns the names that ``change_name()``-transformations in
+    ``sequence`` (including nested ones) assign to a node."""
+    names = []
+    for call in sequence:
+        if isinstance(call, partial):
+            if call.func is change_name:
+                names.append(call.keywords.get('name', call.args[0] if call.args else ''))
+            for arg in tuple(call.args) + tuple(call.keywords.values()):
+                names.extend(_new_names(arg if isinstance(arg, tuple) else (arg,)))
+    return names
+
+
+class _TransformedNodes(Filter):
+    """Keeps track of the nodes that have already been transformed while
+    parsing (see :py:func:`fuse_transformations`) and filters them out of
+    the children of a node, so that traverse() leaves them alone."""
+    def __init__(self, untransformed: Callable[[str], bool]):
+        self.untransformed = untransformed
+        self.tree = None  # type: Optional[RootNode]
+        self.nodes = dict()  # type: Dict[int, Node]
+
+    def __call__(self, children: Tuple[Node, ...]) -> Tuple[Node, ...]:
+        nodes = self.nodes
+        return tuple(child for child in children if id(child) not in nodes) \
+            if nodes else children
+
+    def record(self, node: Node, tree: RootNode):
+        """Records the transformed ``node``. The nodes recorded for
+        previously parsed documents are dropped."""
+        if tree is not self.tree:
+            self.tree = tree
+            self.nodes = dict()
+        # the nodes are kept alive, so that their ids cannot be reused
+        self.nodes[id(node)] = node
+
+    def complete(self, node: Node) -> bool:
+        """Returns True, if all named nodes within ``node`` have been
+        transformed, and the anonymous nodes in between do not need to be
+        transformed. This is not the case for nodes that have been generated
+        during error-recovery."""
+        nodes = self.nodes
+        stack = [node]
+        while stack:
+            for child in stack.pop()._children:
+                if id(child) not in nodes:
+                    if child.name[:1] != ':' or not self.untransformed(child.name):
+                        return False
+                    if child._children:
+                        stack.append(child)
+        return True
+
+    def release(self, path: Path):
+        """Drops the recorded nodes. Called after traverse() has finished."""
+        self.tree = None
+        self.nodes = dict()
+
+
+def _fused_parse(parse_func: Callable, name: str, transformations: Optional[Callable],
+                 transformed: _TransformedNodes) -> Callable:
+    """Returns a parsing proxy that applies ``transformations`` to the
+    nodes named ``name`` that have been returned by ``parse_func`` and
+    records them as transformed in ``transformed``. Nodes that contain
+    untransformed nodes and the node returned by the start parser, which
+    becomes the root of the tree, are left to traverse()."""
+    def fused_transformations(self, location: int):
+        node, next_location = parse_func(location)
+        if node is not None and node.name == name:
+            grammar = self._grammar
+            if self is not grammar.start_parser__ and transformed.complete(node):
+                node._pos = location
+                if transformations:
+                    transformations([grammar.tree__, node])
+                transformed.record(node, grammar.tree__)
+        return node, next_location
+    return fused_transformations
+
+
+def fuse_transformations(grammar: Grammar, transformation_table: TransformationTableType) \
+        -> TransformationTableType:
+    """Installs those transformations of the ``transformation_table`` in
+    the ``grammar`` that can already be applied by the parser when it
+    returns a node, so that the concrete syntax tree is reduced to the
+    abstract syntax tree while parsing. Returns the transformation table
+    with the remaining transformations, which must then be passed to
+    :py:func:`traverse` or :py:func:`transformer` instead of the
+    original table.
+
+    A node can be transformed while parsing, if it has been named by a
+    (non-disposable) parser, if all of its transformations are local, i.e.
+    from LOCAL_TRANSFORMATIONS and with local conditions only, and if the
+    same holds for all named nodes that the parser can produce within this
+    node, while the nodes of the disposable parsers within this node must
+    not have any transformations at all (including those registered for
+    the keys "<", ">" and "*"). Then the transformations yield the same
+    result as if they had been applied by traverse(). The remaining
+    transformation table filters out the nodes that have been transformed
+    while parsing, so that traverse() only needs to visit the (usually
+    small) top part of the tree. If the table contains filters other than
+    BLOCK_ANONYMOUS_LEAVES, or if the grammar tracks the parsing history,
+    no transformations are installed and the table is returned unchanged.
+
+    Nodes that are generated during error-recovery (see
+    :py:meth:`Parser._handle_parsing_error`) bypass the installed
+    transformations. These nodes, the nodes that contain them and the
+    root-node are not transformed while parsing but by traverse() with the
+    remaining table. Because the remaining table refers to the nodes of
+    the last parsed document, it cannot be used for transforming the
+    children of the root-node in parallel. The installed transformations
+    remain in place for all further calls of the grammar object, but they
+    are not copied along with it. Example::
+
+        >>> from DHParser.dsl import create_parser
+        >>> grammar = create_parser('''
+        ...     doc = ~ { item } EOF
+        ...     item = "(" value ")" ~
+        ...     value = /\\\\d+/
+        ...     EOF = !/./''')
+        >>> table = {'item': [remove_tokens('(', ')'), remove_whitespace, reduce_single_child],
+        ...          'value, EOF': [], '*': []}
+        >>> remaining = fuse_transformations(grammar, table)
+        >>> tree = grammar('(1) (2)')
+        >>> print(tree.as_sxpr())
+        (doc (item "1") (item "2") (EOF))
+        >>> print(traverse(tree, remaining).as_sxpr())
+        (doc (item "1") (item "2") (EOF))
+    """
+    table = {name: sequence for name, sequence
+             in _expanded_table(dict(transformation_table)).items() if name != '__cache__'}
+    if grammar.history_tracking__ or any(
+            isinstance(call, Filter) and call is not BLOCK_ANONYMOUS_LEAVES
+            for name, sequence in table.items() if name != '__subtree_local__'
+            for call in sequence):
+        return transformation_table
+    special = {'<', '>', '*', '<<<', '>>>'}
+
+    def sequence_of(name: str) -> List[Callable]:
+        return [call for call in list(table.get('<', [])) + list(table.get(name, table.get('*', [])))
+                + list(table.get('>', [])) if not isinstance(call, Filter)]
+
+    producers = {}  # type: Dict[str, List[Parser]]
+    for parser in grammar.all_parsers__:
+        if parser.pname and parser.ptype != ':Forward' and parser.node_name[:1] != ':' \
+                and parser.node_name not in special:
+            producers.setdefault(parser.node_name, []).append(parser)
+    local = {name for name in producers if _is_local(sequence_of(name))}
+
+    def closed(name: str) -> bool:
+        for parser in producers[name]:
+            for descendant in parser.descendants():
+                node_name = descendant.node_name
+                if descendant.ptype == ':Forward' or not node_name:
+                    continue
+                if node_name[:1] == ':':
+                    if sequence_of(node_name):
+                        return False
+                elif node_name not in local:
+                    return False
+        return True
+
+    fused = {name for name in local if closed(name)}
+    # names assigned by change_name() must not lead to a second transformation
+    fused = {name for name in fused
+             if all(new_name in fused or not sequence_of(new_name)
+                    for new_name in _new_names(sequence_of(name)))}
+    if not fused:
+        return transformation_table
+    untransformed = dict()  # type: Dict[str, bool]
+
+    def no_transformations(name: str) -> bool:
+        try:
+            return untransformed[name]
+        except KeyError:
+            untransformed[name] = not sequence_of(name)
+            return untransformed[name]
+
+    transformed = _TransformedNodes(no_transformations)
+    for name in fused:
+        sequence = sequence_of(name)
+        transformations = compile_transformations(sequence) if sequence else None
+        for parser in producers[name]:
+            parser.set_proxy(_fused_parse(parser._parse_proxy, name, transformations,
+                                          transformed))
+    remaining = {name: sequence for name, sequence in table.items()
+                 if name != '__subtree_local__'}
+    remaining['<'] = [transformed] + list(table.get('<', []))
+    remaining['>>>'] = list(table.get('>>>', [])) + [transformed.release]
+    return remaining
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+"""profile_compiler_dispatch.py - benchmark of the dispatch of compilation
+methods by DHParser.compile.Compiler
+
+Usage: python profile_compiler_dispatch.py [REPETITIONS]
+
+The benchmark compiles the abstract syntax trees of all EBNF-grammars
+in the examples-directory with the EBNFCompiler, once with the fast
+dispatch of compilation methods and once with a (never triggered)
+cancel-query, which forces the compiler to take the fully checked path
+for every node. Because the EBNFCompiler spends most of its time within
+the compilation methods, the same is repeated with a compiler that has
+the same compilation methods as the EBNFCompiler, all of which merely
+visit the child nodes. Parsing and AST-transformation are not included
+in the measured times. By default, each grammar is compiled 10 times.
+
+Copyright 2026 Bavarian Academy of Sciences and Humanities
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import copy
+import glob
+import os
+import re
+import sys
+import time
+
+scriptpath = os.path.dirname(__file__) or '.'
+sys.path.append(os.path.abspath(os.path.join(scriptpath, '..')))
+
+from DHParser.compile import Compiler
+from DHParser.error import has_errors
+from DHParser.ebnf import get_ebnf_preprocessor, get_ebnf_grammar, \
+    get_ebnf_transformer, get_ebnf_compiler, EBNFCompiler
+
+
+class VisitingCompiler(Compiler):
+    """A compiler with the same compilation methods as the EBNFCompiler,
+    which do nothing but visit the children of a node."""
+    def visit(self, node):
+        return self.fallback_compiler(node)
+
+
+for method_name in dir(EBNFCompiler):
+    if method_name.startswith('on_'):
+        setattr(VisitingCompiler, method_name, VisitingCompiler.visit)
+
+
+def load_asts():
+    asts = []
+    for path in sorted(glob.glob(os.path.join(scriptpath, '..', 'examples', '**', '*.ebnf'),
+                                 recursive=True)):
+        with open(path, 'r', encoding='utf-8') as f:
+            source = f.read()
+        preprocessed = get_ebnf_preprocessor()(source, path)
+        ast = get_ebnf_grammar(source)(preprocessed.preprocessed_text)
+        get_ebnf_transformer()(ast)
+        if not has_errors(ast.errors):
+            name = re.sub(r'\W', '_', os.path.splitext(os.path.basename(path))[0])
+            asts.append((name, source, ast))
+    return asts
+
+
+def benchmark(repetitions: int):
+    asts = load_asts()
+    nodes = sum(sum(1 for _ in ast.select_if(lambda nd: True, include_root=True))
+                for _, _, ast in asts)
+    print(f'{len(asts)} grammars with {nodes} AST-nodes, {repetitions} repetitions')
+    visiting_compiler = VisitingCompiler()
+    for compiler_name, get_compiler in (
+            ('EBNFCompiler', get_ebnf_compiler),
+            ('VisitingCompiler', lambda grammar, source: visiting_compiler)):
+        results = []
+        for name, cancel_query in (('fast dispatch', None),
+                                   ('checked dispatch', lambda: False)):
+            trees = [(grammar, source, copy.deepcopy(ast))
+                     for _ in range(repetitions) for grammar, source, ast in asts]
+            outputs = []
+            t = time.perf_counter()
+            for grammar, source, ast in trees:
+                outputs.append(get_compiler(grammar, source)(ast, cancel_query=cancel_query))
+            t = time.perf_counter() - t
+            print(f'{compiler_name}, {name}: {t:.2f}s')
+            results.append([str(output) for output in outputs])
+        assert results[0] == results[1], "results differ!"
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+"""profile_content_mapping.py - benchmark of the memory consumption of
+content mappings of large documents
+
+Usage: python profile_content_mapping.py [MEGABYTES]
+
+The benchmark multiplies profiling/data/inferus.ausgabe.xml until the
+string-content of the document reaches the given size (default: 10 MB)
+and compares the memory and time needed for generating a
+DHParser.nodetree.ContentMapping and searching it for a regular expression
+with the memory and time needed for searching a LazyContentMapping, which
+reads the content in chunks, and for generating the compact index of
+positions and paths of a LazyContentMapping.
+
+Copyright 2026 Bavarian Academy of Sciences and Humanities
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import copy
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+scriptpath = os.path.dirname(__file__) or '.'
+sys.path.append(os.path.abspath(os.path.join(scriptpath, '..')))
+
+from DHParser.nodetree import parse_xml, ContentMapping, LazyContentMapping
+
+
+PATTERN = r'[Ii]nfer\w*'
+
+
+def indexed_mapping(document) -> LazyContentMapping:
+    mapping = LazyContentMapping(document)
+    mapping.pos_list  # generates the index
+    return mapping
+
+
+def measure(name: str, task):
+    """Runs the task twice, once for timing and once for measuring the
+    memory, because tracing memory allocations slows Python down."""
+    gc.collect()
+    t = time.perf_counter()
+    task()
+    t = time.perf_counter() - t
+    gc.collect()
+    tracemalloc.start()
+    result = task()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'{name}: {t:.2f}s, retained: {current / 2**20:.1f} MB, '
+          f'peak: {peak / 2**20:.1f} MB')
+    return result
+
+
+def benchmark(megabytes: float):
+    with open(os.path.join(scriptpath, 'data', 'inferus.ausgabe.xml')) as f:
+        document = parse_xml(f.read(), strict_mode=False)
+    copies = int(megabytes * 2**20 / document.strlen()) + 1
+    document.result = sum((copy.deepcopy(document.children) for _ in range(copies)), ())
+    print(f'document with {document.strlen() / 2**20:.1f} MB of content')
+
+    cm = measure('ContentMapping()', lambda: ContentMapping(document))
+    matches = measure('ContentMapping.finditer()',
+                      lambda: [m.span() for m in cm.finditer(PATTERN)])
+    del cm
+    lazy = measure('LazyContentMapping()', lambda: LazyContentMapping(document))
+    lazy_matches = measure('LazyContentMapping.finditer()',
+                           lambda: [m.span() for m in lazy.finditer(PATTERN)])
+    assert lazy_matches == matches, "results differ!"
+    lazy = measure('LazyContentMapping index', lambda: indexed_mapping(document))
+    assert [m.span() for m in lazy.finditer(PATTERN)] == matches, "results differ!"
+
+
+if __name__ == "__main__":
+    benchmark(float(sys.argv[1]) if len(sys.argv) > 1 else 10)
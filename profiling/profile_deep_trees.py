@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+"""profile_deep_trees.py - benchmark of tree-traversals on very deeply
+nested trees.
+
+Usage: python profile_deep_trees.py [DEPTH]
+
+Builds a right-recursive tree, i.e. a long list that is represented as
+nested pairs, as it results from right-recursive grammars, with a depth
+of DEPTH (default: 100.000) nodes and times the core traversals of
+DHParser.nodetree, DHParser.transform and DHParser.compile on this tree.
+None of these traversals require raising Python's recursion limit.
+
+Copyright 2026 Bavarian Academy of Sciences and Humanities
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import copy
+import io
+import os
+import sys
+import time
+
+scriptpath = os.path.dirname(__file__) or '.'
+sys.path.append(os.path.abspath(os.path.join(scriptpath, '..')))
+
+from DHParser.compile import Compiler
+from DHParser.nodetree import Node, RootNode
+from DHParser.transform import traverse
+
+
+def deep_tree(depth: int) -> RootNode:
+    """Returns a tree of nested "list"-nodes, each of which contains an
+    "item" and the rest of the list."""
+    node = Node('item', str(depth))
+    for i in range(depth - 1, 0, -1):
+        node = Node('list', (Node('item', str(i)), node))
+    return RootNode(node)
+
+
+def benchmark(depth: int):
+    tree = deep_tree(depth)
+    print(f'Tree of depth {depth}, recursion limit: {sys.getrecursionlimit()}')
+
+    def timed(name, func):
+        t = time.perf_counter()
+        func()
+        print(f'{name:<24} {time.perf_counter() - t:.3f}s')
+
+    timed('walk_tree()', lambda: sum(1 for _ in tree.walk_tree()))
+    timed('select_if()', lambda: sum(1 for _ in tree.select_if(lambda nd: nd.name == 'item')))
+    timed('content', lambda: tree.content)
+    timed('strlen()', lambda: tree.strlen())
+    timed('with_pos()', lambda: tree.with_pos(0))
+    timed('copy.deepcopy()', lambda: copy.deepcopy(tree))
+    # without indentation, because indenting makes the size of the
+    # serialization grow quadratically with the depth of the tree
+    timed('as_sxpr()', lambda: tree.as_sxpr(indentation=0, flatten_threshold=0))
+    timed('as_xml()', lambda: tree.as_xml(indentation=0))
+    timed('write_xml()', lambda: tree.write_xml(io.StringIO(), indentation=0))
+    timed('to_json_obj()', lambda: tree.to_json_obj())
+    timed('write_json()', lambda: tree.write_json(io.StringIO(), indent=None))
+    timed('traverse()', lambda: traverse(tree, {'item': lambda path: None}))
+    timed('Compiler.compile()', lambda: Compiler()(copy.deepcopy(tree)))
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
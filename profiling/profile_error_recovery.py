@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+"""profile_error_recovery.py - benchmark of the search for reentry points
+after syntax errors in documents with thousands of errors.
+
+Usage: python profile_error_recovery.py [NUMBER_OF_BLOCKS] [SEARCH_WINDOW]
+
+The benchmark parses the same document twice, once with and once without
+the reentry-scanner that Grammar-objects use for caching comment locations
+and search results (see DHParser.parse.ReentryScanner). It reports the time
+spent for parsing and, separately, the time spent for searching reentry
+points and checks that the errors are the same in both cases.
+
+Copyright 2026 Bavarian Academy of Sciences and Humanities
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import gc
+import os
+import sys
+import time
+
+scriptpath = os.path.dirname(__file__) or '.'
+sys.path.append(os.path.abspath(os.path.join(scriptpath, '..')))
+
+import DHParser.parse
+from DHParser.configuration import set_config_value
+from DHParser.dsl import create_parser
+
+
+GRAMMAR = r'''
+@ whitespace = vertical
+@ literalws = right
+@ comment = /#[^\n]*/
+@ statement_resume = /;/, /(?=\})/, /@@END@@/
+@ block_resume = /\}/
+document = { ~ (block | statement) } ~
+block = "{" { ~ statement } ~ §"}"
+statement = word §"=" value ";"
+word = /[a-z]+/~
+value = /[0-9]+/~
+'''
+
+
+def error_document(blocks: int, statements: int = 100) -> str:
+    """Returns a document with ``blocks`` blocks of ``statements`` statements
+    each, of which every second contains a syntax error. Each statement is
+    followed by a comment-line that contains all of the resume-markers."""
+    parts = []
+    for i in range(blocks):
+        parts.append('{\n')
+        for k in range(statements):
+            parts.append('a = 1;\n' if k % 2 else 'b 2;\n')
+            parts.append('# comment; with } braces and @@END@@ markers\n')
+        parts.append('}\n')
+    return ''.join(parts)
+
+
+def benchmark(blocks: int):
+    parser = create_parser(GRAMMAR)
+    document = error_document(blocks)
+    reentry_time = [0.0]
+    reentry_point = DHParser.parse.reentry_point
+
+    def timed_reentry_point(*args):
+        t = time.perf_counter()
+        result = reentry_point(*args)
+        reentry_time[0] += time.perf_counter() - t
+        return result
+
+    DHParser.parse.reentry_point = timed_reentry_point
+    ReentryScanner = DHParser.parse.ReentryScanner
+    errors = None
+    gc.disable()
+    try:
+        for scanner in (True, False):
+            if not scanner:
+                DHParser.parse.ReentryScanner = lambda text, comment_rx: None
+            reentry_time[0] = 0.0
+            t = time.perf_counter()
+            tree = parser(document)
+            t = time.perf_counter() - t
+            DHParser.parse.ReentryScanner = ReentryScanner
+            print(f'{"with" if scanner else "without"} reentry-scanner: '
+                  f'{len(document)} chars, {len(tree.errors)} errors, parsing: {t:.3f}s, '
+                  f'reentry-search: {reentry_time[0]:.3f}s')
+            locations = [(e.pos, e.code) for e in tree.errors]
+            assert errors is None or errors == locations, "results differ!"
+            errors = locations
+            del tree
+            gc.collect()
+    finally:
+        gc.enable()
+        DHParser.parse.reentry_point = reentry_point
+        DHParser.parse.ReentryScanner = ReentryScanner
+
+
+if __name__ == "__main__":
+    blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    if len(sys.argv) > 2:
+        set_config_value('reentry_search_window', int(sys.argv[2]))
+    benchmark(blocks)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+"""profile_fused_transformation.py - benchmark of applying the AST-
+transformations while parsing
+
+Usage: python profile_fused_transformation.py [NUMBER_OF_MEMBERS]
+
+The benchmark parses and transforms a generated json-document with the
+json-example-grammar (see examples/json), once by parsing the document
+and traversing the concrete syntax tree afterwards and once with the
+transformations fused into the parser by
+DHParser.transform.fuse_transformations(). It reports time and peak
+memory of both variants and checks that the abstract syntax trees are the same.
+
+Copyright 2026 Bavarian Academy of Sciences and Humanities
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import copy
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+scriptpath = os.path.dirname(__file__) or '.'
+sys.path.append(os.path.abspath(os.path.join(scriptpath, '..')))
+sys.path.append(os.path.abspath(os.path.join(scriptpath, '..', 'examples', 'json')))
+
+from DHParser.transform import fuse_transformations, traverse
+from jsonParser import get_grammar, json_AST_transformation_table
+
+
+def json_document(members: int) -> str:
+    return '{' + ', '.join(f'"key{i}": [{i}, -{i}.5e3, "value\\n{i}", {{"flag": true}}]'
+                           for i in range(members)) + '}'
+
+
+def parse_and_transform(document: str, fused: bool):
+    grammar = copy.deepcopy(get_grammar())
+    table = json_AST_transformation_table.copy()
+    if fused:
+        table = fuse_transformations(grammar, table)
+    t = time.perf_counter()
+    tree = grammar(document)
+    t_parse = time.perf_counter() - t
+    tree = traverse(tree, table)
+    return tree, t_parse, time.perf_counter() - t - t_parse
+
+
+def benchmark(members: int):
+    document = json_document(members)
+    results = []
+    for fused in (False, True):
+        gc.collect()
+        tree, t_parse, t_traverse = parse_and_transform(document, fused)
+        del tree
+        gc.collect()
+        tracemalloc.start()
+        tree = parse_and_transform(document, fused)[0]
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f'{"fused" if fused else "separate"}: {len(document)} chars, '
+              f'parsing: {t_parse:.2f}s, traversal: {t_traverse:.2f}s, '
+              f'total: {t_parse + t_traverse:.2f}s, peak memory: {peak / 2**20:.1f} MB')
+        results.append(tree)
+    assert results[0].equals(results[1]), "results differ!"
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
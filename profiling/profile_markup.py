@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+"""profile_markup.py - benchmark of adding many markup-nodes to a document
+with DHParser.nodetree.ContentMapping
+
+Usage: python profile_markup.py [NUMBER_OF_SPANS ...]
+
+The benchmark marks up every word of (a multiplied copy of)
+profiling/data/inferus.ausgabe.xml, once by calling ContentMapping.markup()
+for each span and once with a single call of ContentMapping.markup_many(),
+and checks that the resulting trees are the same. By default, 10.000 and
+100.000 spans are marked up.
+
+Copyright 2026 Bavarian Academy of Sciences and Humanities
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import copy
+import os
+import re
+import sys
+import time
+
+scriptpath = os.path.dirname(__file__) or '.'
+sys.path.append(os.path.abspath(os.path.join(scriptpath, '..')))
+
+from DHParser.nodetree import parse_xml, ContentMapping
+
+
+def benchmark(number_of_spans: int):
+    with open(os.path.join(scriptpath, 'data', 'inferus.ausgabe.xml')) as f:
+        document = parse_xml(f.read(), strict_mode=False)
+    words = len(re.findall(r'\w+', document.content))
+    copies = number_of_spans // words + 1
+    document.result = sum((copy.deepcopy(document.children) for _ in range(copies)), ())
+    spans = [(m.start(), m.end(), 'w')
+             for m in re.finditer(r'\w+', document.content)][:number_of_spans]
+    results = []
+    for name in ('markup()', 'markup_many()'):
+        tree = copy.deepcopy(document)
+        cm = ContentMapping(tree)
+        t = time.perf_counter()
+        if name == 'markup()':
+            for span in spans:
+                cm.markup(*span)
+        else:
+            cm.markup_many(spans)
+        t = time.perf_counter() - t
+        print(f'{name}: {len(spans)} spans in {len(cm.content)} chars: {t:.2f}s')
+        results.append(tree)
+    assert results[0].equals(results[1]), "results differ!"
+
+
+if __name__ == "__main__":
+    for n in ([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]):
+        benchmark(n)
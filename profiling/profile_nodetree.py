@@ -19,13 +19,15 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import copy
 import os
 import sys
 
 scriptpath = os.path.dirname(__file__) or '.'
 sys.path.append(os.path.abspath(os.path.join(scriptpath, '..')))
 
-from DHParser.nodetree import parse_xml
+from DHParser.nodetree import parse_xml, parse_json, parse_binary, write_tree_file, \
+    open_tree_file, SerializationMapping
 from DHParser.toolkit import json_dumps
 
 def cpu_profile(func, repetitions=1):
@@ -74,6 +76,191 @@ def profile_serializing():
     cpu_profile(lambda :json_dumps(tree.to_json_obj()), 100)
 
 
+def benchmark_streaming(repetitions=10):
+    """Compares time and peak memory of serializing a tree to a file as
+    one string (``as_xml()`` etc.) and with the streaming serializers
+    (``write_xml()`` etc.)."""
+    import tempfile
+    import time
+    import tracemalloc
+    with open(os.path.join(scriptpath, 'data', 'inferus.ausgabe.xml')) as f:
+        data = f.read()
+    tree = parse_xml(data)
+    tree.result = tuple(copy.deepcopy(tree.children) for _ in range(20))
+    tree.result = sum(tree.result, ())
+    with tempfile.TemporaryFile('w', encoding='utf-8') as f:
+        for name, as_string, write in (
+                ('XML', lambda: f.write(tree.as_xml()), lambda: tree.write_xml(f)),
+                ('S-Expression', lambda: f.write(tree.as_sxpr(flatten_threshold=0)),
+                 lambda: tree.write_sxpr(f, flatten_threshold=0)),
+                ('json', lambda: f.write(tree.as_json(indent=None)),
+                 lambda: tree.write_json(f, indent=None))):
+            for kind, func in (('as string', as_string), ('streamed', write)):
+                f.seek(0)
+                t = time.perf_counter()
+                for _ in range(repetitions):
+                    func()
+                t = time.perf_counter() - t
+                tracemalloc.start()
+                func()
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                print(f'{name} {kind}: {t / repetitions:.3f}s, peak memory {peak / 2**20:.1f} MB')
+
+
+def benchmark_binary(repetitions=10):
+    """Compares size and round-trip time of the binary format
+    (``as_binary()``/``parse_binary()``) with those of JSON
+    (``as_json()``/``parse_json()``) for a document-tree and for the
+    concrete syntax-tree of an EBNF-grammar with many small nodes."""
+    import time
+    from DHParser.ebnf import get_ebnf_grammar
+    with open(os.path.join(scriptpath, 'data', 'inferus.ausgabe.xml')) as f:
+        xml_tree = parse_xml(f.read()).with_pos(0)
+    with open(os.path.join(scriptpath, 'data', 'MLW.ebnf')) as f:
+        cst = get_ebnf_grammar()(f.read())
+    for name, tree in (('XML-document', xml_tree), ('EBNF-CST', cst)):
+        for kind, serialize, deserialize in (
+                ('json', lambda: tree.as_json(indent=None), parse_json),
+                ('binary', tree.as_binary, parse_binary)):
+            t = time.perf_counter()
+            for _ in range(repetitions):
+                data = serialize()
+            t1 = time.perf_counter()
+            for _ in range(repetitions):
+                deserialize(data)
+            t2 = time.perf_counter()
+            print(f'{name} {kind}: {len(data)} bytes, serializing {(t1 - t) / repetitions:.4f}s, '
+                  f'deserializing {(t2 - t1) / repetitions:.4f}s')
+
+
+def benchmark_json(repetitions=10):
+    """Compares the single-pass JSON-encoder and -decoder of ``as_json()``
+    and ``parse_json()`` with the detour over the intermediary
+    object-tree of ``to_json_obj()``/``from_json_obj()``."""
+    import json
+    import time
+    from DHParser.ebnf import get_ebnf_grammar
+    from DHParser.nodetree import Node, RootNode
+    with open(os.path.join(scriptpath, 'data', 'inferus.ausgabe.xml')) as f:
+        xml_tree = parse_xml(f.read()).with_pos(0)
+    with open(os.path.join(scriptpath, 'data', 'MLW.ebnf')) as f:
+        cst = get_ebnf_grammar()(f.read())
+    for name, tree in (('XML-document', xml_tree), ('EBNF-CST', cst)):
+        for indent in (None, 2):
+            data = tree.as_json(indent=indent)
+            for kind, serialize, deserialize in (
+                    ('single-pass', lambda: tree.as_json(indent=indent), parse_json),
+                    ('json-objects', lambda: json.dumps(tree.to_json_obj(), indent=indent),
+                     lambda d: RootNode(Node.from_json_obj(json.loads(d))))):
+                t = time.perf_counter()
+                for _ in range(repetitions):
+                    serialize()
+                t1 = time.perf_counter()
+                for _ in range(repetitions):
+                    deserialize(data)
+                t2 = time.perf_counter()
+                print(f'{name} {kind} (indent={indent}): '
+                      f'serializing {(t1 - t) / repetitions:.4f}s, '
+                      f'deserializing {(t2 - t1) / repetitions:.4f}s')
+
+
+def benchmark_reflow(repetitions=5):
+    """Measures the time for serializing a document-tree as XML with and
+    without reflowing the content of inlined elements in the manner of
+    DHParser/scripts/XMLreflow.py."""
+    import time
+    with open(os.path.join(scriptpath, 'data', 'inferus.ausgabe.xml')) as f:
+        tree = parse_xml(f.read(), strict_mode=False)
+    tree.result = sum((copy.deepcopy(tree.children) for _ in range(5)), ())
+    inline_tags = {'Beleg', 'BelegText', 'Bedeutungsangabe', 'Zusatz'}
+    for name, kwargs in (('plain', {}),
+                         ('reflow', {'inline_tags': inline_tags, 'reflow_col': 100}),
+                         ('reflow of string-tags', {'reflow_col': 100})):
+        trees = [copy.deepcopy(tree) for _ in range(repetitions)]
+        t = time.perf_counter()
+        for tr in trees:
+            tr.as_xml(strict_mode=False, **kwargs)
+        t = time.perf_counter() - t
+        print(f'as_xml() {name}: {t / repetitions:.4f}s')
+
+
+def benchmark_tree_file(copies=100):
+    """Compares time and peak memory of picking a single node from a large
+    tree stored in a memory-mapped tree-file (``open_tree_file()``) with
+    reading the whole tree from JSON or the binary format first."""
+    import tempfile
+    import time
+    import tracemalloc
+    with open(os.path.join(scriptpath, 'data', 'inferus.ausgabe.xml')) as f:
+        tree = parse_xml(f.read())
+    tree.result = sum((copy.deepcopy(tree.children) for _ in range(copies)), ())
+    tree.with_pos(0)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tree_file = os.path.join(tmpdir, 'tree.dhpl')
+        t = time.perf_counter()
+        write_tree_file(tree, tree_file)
+        print(f'writing tree-file: {time.perf_counter() - t:.3f}s, '
+              f'{os.path.getsize(tree_file) / 2**20:.1f} MB')
+        json_data = tree.as_json(indent=None)
+        binary_data = tree.as_binary()
+        del tree
+        for name, load in (('json', lambda: parse_json(json_data)),
+                           ('binary', lambda: parse_binary(binary_data)),
+                           ('tree-file', lambda: open_tree_file(tree_file))):
+            t = time.perf_counter()
+            content = load().pick('ArtikelVerfasser', reverse=True).content
+            t = time.perf_counter() - t
+            tracemalloc.start()
+            last = load().pick('ArtikelVerfasser', reverse=True)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f'{name}: picking the last "ArtikelVerfasser" ({content.strip()}): '
+                  f'{t:.3f}s, peak memory {peak / 2**20:.1f} MB')
+            del last
+
+
+def benchmark_mapping(copies=10, queries=1000):
+    """Measures time and peak memory of creating a serialization-mapping
+    for a large document and of querying it."""
+    import random
+    import time
+    import tracemalloc
+    with open(os.path.join(scriptpath, 'data', 'inferus.ausgabe.xml')) as f:
+        tree = parse_xml(f.read(), strict_mode=False)
+    tree.result = sum((copy.deepcopy(tree.children) for _ in range(copies)), ())
+    raw_mapping = {}
+    t = time.perf_counter()
+    xml = tree.as_xml(inline_tags={tree.name}, strict_mode=False, mapping=raw_mapping)
+    print(f'as_xml() with mapping ({len(xml)} chars): {time.perf_counter() - t:.3f}s')
+    tracemalloc.start()
+    t = time.perf_counter()
+    sm = SerializationMapping(tree, xml, raw_mapping)
+    t1 = time.perf_counter()
+    sm.get_path(len(xml) // 2)
+    t2 = time.perf_counter()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    for pos in random.sample(range(len(xml)), queries):
+        sm.get_path(pos)
+    t3 = time.perf_counter()
+    print(f'SerializationMapping(): {t1 - t:.3f}s, first query: {t2 - t1:.3f}s, '
+          f'peak memory: {peak / 2**20:.1f} MB, {queries} further queries: {t3 - t2:.3f}s')
+
+
 if __name__ == "__main__":
-    profile_serializing()
+    if len(sys.argv) > 1 and sys.argv[1] == '--streaming':
+        benchmark_streaming()
+    elif len(sys.argv) > 1 and sys.argv[1] == '--binary':
+        benchmark_binary()
+    elif len(sys.argv) > 1 and sys.argv[1] == '--json':
+        benchmark_json()
+    elif len(sys.argv) > 1 and sys.argv[1] == '--reflow':
+        benchmark_reflow()
+    elif len(sys.argv) > 1 and sys.argv[1] == '--treefile':
+        benchmark_tree_file()
+    elif len(sys.argv) > 1 and sys.argv[1] == '--mapping':
+        benchmark_mapping()
+    else:
+        profile_serializing()
 
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+"""profile_parallel_serialization.py - benchmark of writing a large tree
+in several serializations one after the other or in parallel.
+
+Usage: python profile_parallel_serialization.py [COPIES]
+
+The benchmark writes a document-tree that consists of COPIES copies of
+profiling/data/inferus.ausgabe.xml as S-expression, XML, JSON and
+indented tree with dsl.write_serializations() for each of the possible
+values of the configuration variable 'serialization_parallelization'
+and checks that the written files are the same.
+
+Copyright 2026 Bavarian Academy of Sciences and Humanities
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import copy
+import os
+import sys
+import tempfile
+import time
+
+scriptpath = os.path.dirname(__file__) or '.'
+sys.path.append(os.path.abspath(os.path.join(scriptpath, '..')))
+
+from DHParser.configuration import set_config_value
+from DHParser.dsl import write_serializations
+from DHParser.nodetree import parse_xml
+
+
+FORMATS = ('sxpr', 'xml', 'json', 'tree')
+
+
+def benchmark(copies: int):
+    with open(os.path.join(scriptpath, 'data', 'inferus.ausgabe.xml')) as f:
+        tree = parse_xml(f.read())
+    tree.result = sum((copy.deepcopy(tree.children) for _ in range(copies)), ())
+    tree.with_pos(0)
+    contents = None
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for mode in ('off', 'multithreading', 'multicore'):
+            set_config_value('serialization_parallelization', mode)
+            jobs = [(tree, how, os.path.join(tmpdir, f'{mode}.{how}')) for how in FORMATS]
+            t = time.perf_counter()
+            write_serializations(jobs)
+            t = time.perf_counter() - t
+            print(f'{mode}: {t:.3f}s')
+            written = []
+            for how in FORMATS:
+                with open(os.path.join(tmpdir, f'{mode}.{how}'), 'r', encoding='utf-8') as f:
+                    written.append(f.read())
+            assert contents is None or contents == written, "results differ!"
+            contents = written
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
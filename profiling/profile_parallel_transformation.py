@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+"""profile_parallel_transformation.py - benchmark of transforming the
+children of the root-node in parallel
+
+Usage: python profile_parallel_transformation.py [NUMBER_OF_RECORDS]
+
+The benchmark transforms the concrete syntax tree of a generated document
+that consists of many records, once with DHParser.transform.traverse() and
+once with DHParser.transform.traverse_subtrees_in_parallel(), which hands
+the records over to a pool of processes, and checks that the results are
+the same. Parallel transformation can only pay off, if several cpu-cores
+are available and if the transformation of a record takes considerably
+longer than its conversion to and from DHParser's binary format.
+
+Copyright 2026 Bavarian Academy of Sciences and Humanities
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import copy
+import os
+import sys
+import time
+
+scriptpath = os.path.dirname(__file__) or '.'
+sys.path.append(os.path.abspath(os.path.join(scriptpath, '..')))
+
+from DHParser.dsl import create_parser
+from DHParser.toolkit import cpu_count
+from DHParser.transform import traverse, traverse_subtrees_in_parallel, flatten, \
+    reduce_single_child, remove_tokens, collapse, merge_adjacent, is_one_of
+
+
+GRAMMAR = r'''@ drop = whitespace
+@ literalws = right
+document = ~ { record } EOF
+record = "[" field { "," field } "]"
+field = name ":" value
+name = /\w+/~
+value = number | text
+number = /\d+/~
+text = /[^,\]]+/
+EOF = !/./
+'''
+
+TABLE = {'__subtree_local__': True,
+         'record': [flatten, remove_tokens('[', ',', ']')],
+         'field': [remove_tokens(':'), reduce_single_child],
+         'value': [reduce_single_child],
+         'text': [merge_adjacent(is_one_of('text'), 'text'), collapse],
+         'name, number': [reduce_single_child]}
+
+
+def benchmark(records: int):
+    document = ''.join(f'[id: {i}, title: Record number {i}, year: {1900 + i % 100}, '
+                       f'place: Munich]\n' for i in range(records))
+    cst = create_parser(GRAMMAR)(document)
+    results = []
+    for name, transform in (('traverse()', traverse),
+                            ('traverse_subtrees_in_parallel()', traverse_subtrees_in_parallel)):
+        tree = copy.deepcopy(cst)
+        t = time.perf_counter()
+        transform(tree, TABLE.copy())
+        t = time.perf_counter() - t
+        print(f'{name}: {records} records, {cpu_count()} cpus: {t:.2f}s')
+        results.append(tree)
+    assert results[0].equals(results[1]), "results differ!"
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+"""profile_pipeline_copies.py - benchmark of a processing pipeline with
+three target stages that are derived from one and the same AST
+
+Usage: python profile_pipeline_copies.py [MULTIPLIER]
+
+Because tree-processing functions usually change the tree in place,
+DHParser.pipeline.run_pipeline() must pass a copy of the AST to all but
+the last of the junctions that start from the AST. The benchmark reports
+the time for running the pipeline and, separately, the time for copying
+the AST (a multiplied copy of profiling/data/inferus.ausgabe.xml) and
+checks that the AST has not been changed by the pipeline.
+
+Copyright 2026 Bavarian Academy of Sciences and Humanities
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import copy
+import os
+import sys
+import time
+
+scriptpath = os.path.dirname(__file__) or '.'
+sys.path.append(os.path.abspath(os.path.join(scriptpath, '..')))
+
+from DHParser.nodetree import parse_xml, RootNode
+from DHParser.pipeline import create_junction, run_pipeline
+
+
+def strip_attributes(tree: RootNode) -> RootNode:
+    for node in tree.select_if(lambda nd: nd.has_attr(), include_root=True):
+        node.attr = {}
+    return tree
+
+
+def upper_case(tree: RootNode) -> RootNode:
+    for node in tree.select_if(lambda nd: not nd._children, include_root=True):
+        node.result = node.result.upper()
+    return tree
+
+
+def count_words(tree: RootNode) -> int:
+    return len(tree.content.split())
+
+
+JUNCTIONS = {create_junction(lambda: strip_attributes, 'AST', 'stripped'),
+             create_junction(lambda: upper_case, 'AST', 'upper'),
+             create_junction(lambda: count_words, 'AST', 'words')}
+
+
+def benchmark(multiplier: int):
+    with open(os.path.join(scriptpath, 'data', 'inferus.ausgabe.xml')) as f:
+        document = parse_xml(f.read(), strict_mode=False)
+    document.result = sum((copy.deepcopy(document.children)
+                           for _ in range(multiplier)), ())
+    ast = RootNode(document, document.content)
+    ast.stage = 'AST'
+    reference = copy.deepcopy(ast)
+    size = sum(1 for _ in ast.select_if(lambda nd: True, include_root=True))
+
+    t = time.perf_counter()
+    for _ in range(3):
+        copy.deepcopy(ast)
+    t = time.perf_counter() - t
+    print(f'copying an AST with {size} nodes three times: {t:.3f}s')
+
+    t = time.perf_counter()
+    results = run_pipeline(JUNCTIONS, {'AST': ast}, {'AST', 'stripped', 'upper', 'words'})
+    t = time.perf_counter() - t
+    print(f'pipeline with three targets derived from the AST: {t:.3f}s')
+    assert results['AST'][0].equals(reference), "AST has been changed!"
+    assert results['words'][0] == count_words(reference)
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+"""profile_stage_cache.py - benchmark of processing a batch of documents
+with and without the on-disk stage cache of DHParser.pipeline
+
+Usage: python profile_stage_cache.py [NUMBER_OF_DOCUMENTS] [MEMBERS_PER_DOCUMENT]
+
+The benchmark processes a batch of json-documents with the json-example
+(examples/json) from the source to the AST and the compiled data, first
+without the stage cache (see configuration value 'pipeline_stage_cache'),
+then with an empty cache, then with a filled cache and finally with a
+filled cache after a change of the compiler, in which case only the
+compilation-stage must be recomputed. It checks that the results are
+the same in all cases.
+
+Copyright 2026 Bavarian Academy of Sciences and Humanities
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+scriptpath = os.path.dirname(__file__) or '.'
+sys.path.append(os.path.abspath(os.path.join(scriptpath, '..')))
+sys.path.append(os.path.abspath(os.path.join(scriptpath, '..', 'examples', 'json')))
+
+from DHParser.configuration import set_config_value
+from DHParser.pipeline import full_pipeline, Junction
+from DHParser.toolkit import ThreadLocalSingletonFactory
+from jsonParser import preprocessor_factory, parsing, jsonTransformer, jsonCompiler
+
+
+class ChangedCompiler(jsonCompiler):
+    def on_string(self, node):
+        return super().on_string(node)
+
+
+def junctions(compiler):
+    return {Junction('CST', ThreadLocalSingletonFactory(jsonTransformer), 'AST'),
+            Junction('AST', ThreadLocalSingletonFactory(compiler), 'json')}
+
+
+def json_document(n: int, members: int) -> str:
+    return '{' + ', '.join(f'"key{i}": [{i}, -{i}.5e3, "value {n}", {{"flag": true}}]'
+                           for i in range(members)) + '}'
+
+
+def benchmark(documents: int, members: int):
+    sources = [json_document(n, members) for n in range(documents)]
+    cache_dir = tempfile.mkdtemp()
+    expected = None
+    try:
+        for label, cache, compiler in (('without cache', '', jsonCompiler),
+                                       ('empty cache', cache_dir, jsonCompiler),
+                                       ('filled cache', cache_dir, jsonCompiler),
+                                       ('changed compiler', cache_dir, ChangedCompiler)):
+            set_config_value('pipeline_stage_cache', cache)
+            t = time.perf_counter()
+            results = [full_pipeline(source, preprocessor_factory, parsing.factory,
+                                     junctions(compiler), {'AST', 'json'})
+                       for source in sources]
+            t = time.perf_counter() - t
+            print(f'{label}: {documents} documents, {sum(len(s) for s in sources)} chars: {t:.2f}s')
+            results = [(r['AST'][0].as_sxpr(), r['json'][0]) for r in results]
+            assert expected is None or results == expected, "results differ!"
+            expected = results
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 100,
+              int(sys.argv[2]) if len(sys.argv) > 2 else 200)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+"""profile_sxpr_parsing.py - benchmark of reading S-expressions with
+DHParser.nodetree.parse_sxpr()
+
+Usage: python profile_sxpr_parsing.py [REPETITIONS]
+
+The benchmark reads all S-expressions contained in the grammar-tests
+under examples/*/tests_grammar as well as the serialized concrete
+document-tree of profiling/data/inferus.ausgabe.xml, once with the single-pass reader
+and once with the general S-expression parser only, and checks that the
+results are the same.
+
+Copyright 2026 Bavarian Academy of Sciences and Humanities
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import glob
+import os
+import sys
+import time
+
+scriptpath = os.path.dirname(__file__) or '.'
+sys.path.append(os.path.abspath(os.path.join(scriptpath, '..')))
+
+import DHParser.nodetree
+from DHParser.nodetree import parse_sxpr, parse_xml
+from DHParser.testing import unit_from_file
+
+
+def collect_sxprs() -> list:
+    """Returns all S-expressions from the grammar-tests of the examples."""
+    sxprs = []
+    pattern = os.path.join(scriptpath, '..', 'examples', '*', 'tests_grammar', '*.ini')
+    for filename in glob.glob(pattern):
+        try:
+            unit = unit_from_file(filename)
+        except (ValueError, KeyError, IndexError):
+            continue
+        for tests in unit.values():
+            for cases in tests.values():
+                if isinstance(cases, dict):
+                    for case in cases.values():
+                        if isinstance(case, str) and case.lstrip()[:1] == '(':
+                            try:
+                                parse_sxpr(case)
+                                sxprs.append(case)
+                            except (ValueError, AssertionError, IndexError):
+                                pass
+    return sxprs
+
+
+def benchmark(repetitions: int):
+    sxprs = collect_sxprs()
+    with open(os.path.join(scriptpath, 'data', 'inferus.ausgabe.xml'), 'r', encoding='utf-8') as f:
+        doc_sxpr = parse_xml(f.read()).with_pos(0).as_sxpr(src='')
+    parse_sxpr_fast = DHParser.nodetree._parse_sxpr_fast
+    results = None
+    try:
+        for reader in ('single-pass reader', 'general parser'):
+            if reader == 'general parser':
+                DHParser.nodetree._parse_sxpr_fast = lambda sxpr: None
+            t = time.perf_counter()
+            for _ in range(repetitions):
+                trees = [parse_sxpr(sxpr) for sxpr in sxprs]
+            t1 = time.perf_counter()
+            doc = parse_sxpr(doc_sxpr)
+            t2 = time.perf_counter()
+            print(f'{reader}: {len(sxprs)} S-expressions from grammar-tests: '
+                  f'{(t1 - t) / repetitions * 1000:.2f}ms, XML-document ({len(doc_sxpr)} chars): '
+                  f'{(t2 - t1) * 1000:.2f}ms')
+            serialized = [tree.as_sxpr(src='') for tree in trees + [doc]]
+            assert results is None or results == serialized, "results differ!"
+            results = serialized
+    finally:
+        DHParser.nodetree._parse_sxpr_fast = parse_sxpr_fast
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+"""profile_transform_conditions.py - benchmark of the batched evaluation
+of conditions by remove_children_if(), flatten() and merge_adjacent()
+
+Usage: python profile_transform_conditions.py [REPETITIONS]
+
+The benchmark transforms the concrete syntax-tree of profiling/data/MLW.ebnf
+with a transformation-table that applies remove_children_if(), flatten()
+and merge_adjacent() with different conditions to every node, once with
+the conditions as they are, which are evaluated for all children of a node
+in one pass (see DHParser.transform.batch_condition()), and once with the
+same conditions wrapped in lambda-functions, which must be evaluated for
+the path of each child, one after the other. Both variants are measured
+with uncompiled and with compiled transformation-tables, and the
+resulting trees are checked to be the same. By default, the transformation
+is repeated 10 times.
+
+Copyright 2026 Bavarian Academy of Sciences and Humanities
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import copy
+import os
+import sys
+import time
+
+scriptpath = os.path.dirname(__file__) or '.'
+sys.path.append(os.path.abspath(os.path.join(scriptpath, '..')))
+
+from DHParser.configuration import set_config_value
+from DHParser.ebnf import get_ebnf_grammar
+from DHParser.transform import traverse, remove_children_if, flatten, merge_adjacent, \
+    all_of, any_of, neg, is_anonymous, is_anonymous_leaf, is_token, is_one_of, \
+    contains_only_whitespace, has_ancestor
+
+
+CONDITIONS = (all_of(is_anonymous_leaf, contains_only_whitespace),
+              any_of(is_token('(', ')', '[', ']', '{', '}'),
+                     all_of(is_token('|'), has_ancestor({'expression'}))),
+              all_of(is_anonymous, neg(is_one_of(':Whitespace', ':Comment'))),
+              is_anonymous_leaf)
+
+
+def transformation_table(wrap: bool):
+    if wrap:
+        conditions = [lambda path, condition=condition: condition(path)
+                      for condition in CONDITIONS]
+    else:
+        conditions = CONDITIONS
+    return {'*': [remove_children_if(conditions[0]),
+                  remove_children_if(conditions[1]),
+                  flatten(conditions[2]),
+                  merge_adjacent(conditions[3])]}
+
+
+def benchmark(repetitions: int):
+    with open(os.path.join(scriptpath, 'data', 'MLW.ebnf'), encoding='utf-8') as f:
+        cst = get_ebnf_grammar()(f.read())
+    results = []
+    for compiled in (False, True):
+        set_config_value('compile_transformations', compiled)
+        for wrap in (True, False):
+            table = transformation_table(wrap)
+            trees = [copy.deepcopy(cst) for _ in range(repetitions)]
+            t = time.perf_counter()
+            for tree in trees:
+                traverse(tree, table.copy())
+            t = time.perf_counter() - t
+            print(f'{"compiled" if compiled else "uncompiled"}, '
+                  f'{"path per child" if wrap else "batched"}: {t:.2f}s')
+            results.append(trees[0])
+    assert all(tree.equals(results[0]) for tree in results[1:]), "results differ!"
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
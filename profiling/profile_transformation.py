@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+"""profile_transformation.py - benchmark of the AST-transformation with
+compiled and with uncompiled transformation-tables
+
+Usage: python profile_transformation.py [REPETITIONS]
+
+The benchmark transforms the concrete syntax-trees of profiling/data/MLW.ebnf
+(with the EBNF-transformation-table) and of the LaTeX-documents in
+examples/LaTeX/testdata (with the transformation-table of the LaTeX-example)
+into abstract syntax-trees, once with and once without compiling the
+sequences of transformations of the transformation-tables (see
+DHParser.transform.compile_transformations()), and checks that the
+resulting trees are the same.
+
+Copyright 2026 Bavarian Academy of Sciences and Humanities
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import copy
+import os
+import sys
+import time
+
+scriptpath = os.path.dirname(__file__) or '.'
+sys.path.append(os.path.abspath(os.path.join(scriptpath, '..')))
+sys.path.append(os.path.abspath(os.path.join(scriptpath, '..', 'examples', 'LaTeX')))
+
+from DHParser.configuration import set_config_value
+from DHParser.ebnf import get_ebnf_grammar, EBNF_AST_transformation_table
+from DHParser.transform import traverse
+
+
+def benchmark(name: str, csts, table, repetitions: int):
+    results = []
+    for compiled in (False, True):
+        set_config_value('compile_transformations', compiled)
+        trees = [copy.deepcopy(cst) for cst in csts for _ in range(repetitions)]
+        t = time.perf_counter()
+        for tree in trees:
+            traverse(tree, table.copy())
+        t = time.perf_counter() - t
+        print(f'{name}, {"compiled" if compiled else "uncompiled"}: {t:.2f}s')
+        results.append(trees)
+    assert all(a.equals(b) for a, b in zip(*results)), "results differ!"
+
+
+def benchmark_ebnf(repetitions: int):
+    with open(os.path.join(scriptpath, 'data', 'MLW.ebnf'), encoding='utf-8') as f:
+        cst = get_ebnf_grammar()(f.read())
+    benchmark('EBNF', [cst], EBNF_AST_transformation_table, repetitions)
+
+
+def benchmark_latex(repetitions: int):
+    from LaTeXParser import get_grammar, get_preprocessor, LaTeX_AST_transformation_table
+    testdata = os.path.join(scriptpath, '..', 'examples', 'LaTeX', 'testdata')
+    csts = []
+    for name in ('testdoc1.tex', 'testdoc2.tex', 'testdoc3.tex'):
+        with open(os.path.join(testdata, name), encoding='utf-8') as f:
+            text = get_preprocessor()(f.read(), name).preprocessed_text
+        csts.append(get_grammar()(text))
+    benchmark('LaTeX', csts, LaTeX_AST_transformation_table, repetitions)
+
+
+if __name__ == "__main__":
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    benchmark_ebnf(repetitions)
+    benchmark_latex(repetitions)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+"""profile_xml_parsing.py - benchmark of the backends of
+DHParser.nodetree.parse_xml() on the XML-files in profiling/data.
+
+Usage: python profile_xml_parsing.py [XML-FILE ...]
+
+For each file the benchmark parses the document with the pure Python
+parser and with the expat-backend, reports the time spent by each of
+them and checks that the resulting trees are the same.
+
+Copyright 2026 Bavarian Academy of Sciences and Humanities
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import glob
+import os
+import sys
+import time
+
+scriptpath = os.path.dirname(__file__) or '.'
+sys.path.append(os.path.abspath(os.path.join(scriptpath, '..')))
+
+from DHParser.nodetree import parse_xml
+
+
+def benchmark(filename: str):
+    with open(filename, 'r', encoding='utf-8') as f:
+        xml = f.read()
+    trees = []
+    for backend in ('python', 'expat'):
+        empty_tags = set()
+        t = time.perf_counter()
+        tree = parse_xml(xml, out_empty_tags=empty_tags, strict_mode=False, backend=backend)
+        t = time.perf_counter() - t
+        print(f'{os.path.basename(filename)}: {len(xml)} chars, backend "{backend}": {t:.3f}s')
+        trees.append((tree.as_sxpr(), empty_tags))
+    assert trees[0] == trees[1], "results differ!"
+
+
+if __name__ == "__main__":
+    files = sys.argv[1:] or sorted(glob.glob(os.path.join(scriptpath, 'data', '*.xml')))
+    for filename in files:
+        benchmark(filename)
@@ -136,6 +136,30 @@ class TestCompilerClass:
         tree = comp(tree)
         assert tree.as_sxpr() == '(A (x (A (x "1") (x "2")) (x "3")) (x "4"))'
 
+    def test_method_table(self):
+        assert not ZeroTestCompiler().has_attribute_visitors
+        assert AttrTestCompiler().has_attribute_visitors
+        compiler = SerializingTestCompiler()
+        s = compiler(copy.deepcopy(self.original))
+        assert s == "(A (B 1) (C (D (E 2) (F 3))))"
+        assert all(compiler.method_dict[name] == getattr(compiler, 'on_' + name)
+                   for name in 'ABCDEF')
+        s = compiler(copy.deepcopy(self.original), cancel_query=lambda: False)
+        assert s == "(A (B 1) (C (D (E 2) (F 3))))"
+
+        class AnonymousTestCompiler(Compiler):
+            def on_Text__(self, node):
+                node.name = 'TEXT'
+                return node
+
+            def on_3aWhitespace(self, node):
+                node.name = 'WS'
+                return node
+
+        tree = parse_sxpr('(A (:Text "1") (:Whitespace " ") (B (:Text "2")))')
+        tree = AnonymousTestCompiler()(tree)
+        assert tree.as_sxpr() == '(A (TEXT "1") (WS " ") (B (TEXT "2")))', tree.as_sxpr()
+
 
 if __name__ == "__main__":
     from DHParser.testing import runner
@@ -163,6 +163,70 @@ class TestCompilerGeneration:
         assert not result.errors, str(result.errors)
 
 
+class TestProcessFile:
+    def test_parallel_serialization(self):
+        import tempfile
+        from DHParser.configuration import set_config_value, get_config_value
+        from DHParser.dsl import process_file
+        from DHParser.nodetree import parse_binary
+        from DHParser.preprocess import nil_preprocessor
+        parser = create_parser(ARITHMETIC_EBNF)
+        source = ' + '.join(str(i) + ' * ' + str(i + 1) for i in range(20))
+        formats = ['sxpr', 'xml', 'json', 'tree', 'binary']
+        outputs = []
+        save = get_config_value('serialization_parallelization')
+        with tempfile.TemporaryDirectory() as tmpdir:
+            try:
+                for mode in ('off', 'multithreading', 'multicore'):
+                    set_config_value('serialization_parallelization', mode)
+                    out_dir = os.path.join(tmpdir, mode)
+                    assert process_file(source, out_dir, lambda: nil_preprocessor,
+                                        lambda: parser, set(), {'CST'}, {'CST': formats}) == ''
+                    data = dict()
+                    for ext in formats:
+                        with open(os.path.join(out_dir, 'CST',
+                                               'unknown_document_name.CST.' + ext), 'rb') as f:
+                            data[ext] = f.read()
+                    outputs.append(data)
+            finally:
+                set_config_value('serialization_parallelization', save)
+        assert outputs[0] == outputs[1] == outputs[2]
+        assert parse_binary(outputs[0]['binary']).equals(parser(source))
+
+    def test_parallel_serialization_of_root_fields(self):
+        import copy
+        import tempfile
+        from DHParser.configuration import set_config_value, get_config_value
+        from DHParser.dsl import write_serializations
+        from DHParser.nodetree import RootNode, parse_sxpr
+        tree = RootNode(parse_sxpr('(doc (p (:Text "a ") (b "bold") (:Text " c")) (br))'))
+        tree.inline_tags = {'p'}
+        tree.empty_tags = {'br'}
+        unpicklable = copy.deepcopy(tree)
+        unpicklable.data = lambda: None
+        outputs = []
+        save = get_config_value('serialization_parallelization')
+        with tempfile.TemporaryDirectory() as tmpdir:
+            try:
+                for mode in ('off', 'multicore'):
+                    set_config_value('serialization_parallelization', mode)
+                    jobs = [(tree, 'xml', os.path.join(tmpdir, mode + '.xml')),
+                            (tree, 'sxpr', os.path.join(tmpdir, mode + '.sxpr')),
+                            (unpicklable, 'xml', os.path.join(tmpdir, mode + '_u.xml'))]
+                    write_serializations(jobs)
+                    data = []
+                    for _, _, filename in jobs:
+                        with open(filename, 'r', encoding='utf-8') as f:
+                            data.append(f.read())
+                    outputs.append(data)
+            finally:
+                set_config_value('serialization_parallelization', save)
+        assert outputs[0] == outputs[1]
+        assert outputs[0][0] == outputs[0][2]
+        assert '<p>a <b>bold</b> c</p>' in outputs[0][0]
+        assert '<br/>' in outputs[0][0]
+
+
 if __name__ == "__main__":
     from DHParser.testing import runner
     runner("", globals())
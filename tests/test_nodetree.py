@@ -33,7 +33,7 @@ sys.path.append(os.path.abspath(os.path.join(scriptpath, '..')))
 from DHParser.configuration import get_config_value, set_config_value
 from DHParser.nodetree import (Node, RootNode, parse_sxpr, parse_xml, flatten_sxpr, \
     flatten_xml, parse_json, ZOMBIE_TAG, EMPTY_NODE, ANY_NODE, next_path, \
-    prev_path, pick_from_path, ContentMapping, leaf_paths, NO_PATH, \
+    prev_path, pick_from_path, ContentMapping, LazyContentMapping, leaf_paths, NO_PATH, \
     select_path_if, pick_path, LEAF_PATH, TOKEN_PTYPE, content_of, strlen_of, \
     gen_chain_ID, parse_sxml, DIVISIBLES, reflow_as_oneliner, has_token, eq_tokens, \
     add_class, has_class, remove_class, HTML_EMPTY_TAGS, get_next_leaf)
@@ -116,6 +116,24 @@ class TestParseSxpression:
         tree = parse_sxpr(r'(LINEFEED "\\")')
         assert tree
 
+    def test_single_pass_reader(self):
+        from DHParser.nodetree import _parse_sxpr_fast
+        for sxpr in ('(a)', '(a (b c )  )', '(a `(id "1") `(pos 3) (b "x" "y"))',
+                     '(a (@ (id "1") (pos "5")) "t")', "(a '''x\ny''' \"z\")", '(:Text "x")',
+                     '(a `(pos 48))', '(a `(x "a)b(c") (b \'say "hi"\'))', '(a:b "x")'):
+            tree = _parse_sxpr_fast(sxpr)
+            assert tree is not None, sxpr
+            assert tree.as_sxpr(src='') == parse_sxpr(sxpr).as_sxpr(src='')
+        assert parse_sxpr('(a `(pos 48))').pos == 48
+        assert parse_sxpr('(a (@ (id "1") (pos "5")) "t")').as_sxpr(src='') \
+            == '(a `(id "1") `(pos 5) "t")'
+        # irregular S-expressions are left to the general parser
+        for sxpr in ('(a x "y")', '(a `(err "`x`") "y")', '(a (b "x") junk)', '(a "x"',
+                     '(r (a """x"y"""))', '(a `( pos 7) "x")'):
+            assert _parse_sxpr_fast(sxpr) is None, sxpr
+        assert parse_sxpr('(a x "y")').content == 'x "y"'
+        assert not parse_sxpr('(a `(err "`x`") "y")').has_attr()
+
     def test_flatten_sxpr(self):
         tree = parse_sxpr('(a (b "  ") (d (e f) (h i)))')
         sxpr = tree.as_sxpr()
@@ -272,6 +290,34 @@ class TestParseXML:
         tree = parse_xml(XML_EXAMPLE_2)
         assert True  # yeah, no endless loop!
 
+    def test_expat_backend(self):
+        documents = [
+            '<a>alpha <b>beta</b> gamma</a>',
+            ' <a>\n  <b>beta</b>\n  </a> ',
+            '<?xml version="1.0"?>\n<!DOCTYPE a>\n<a x="1 &amp; 2" y="b>c">'
+            'x &amp; y &lt; z&nbsp;<b/> <c>k</c>\n <d _pos="3">  </d><!-- c -->'
+            't<?pi x?>\u00fc<Text__>q</Text__><e:f>g</e:f></a> tail',
+            XML_EXAMPLE_2,
+            '<xml><a>x & y</a></xml>',  # not well-formed
+        ]
+        for xml in documents:
+            empty_tags_1, empty_tags_2 = set(), set()
+            tree_1 = parse_xml(xml, out_empty_tags=empty_tags_1)
+            tree_2 = parse_xml(xml, out_empty_tags=empty_tags_2, backend='expat')
+            assert tree_1.equals(tree_2)
+            assert tree_1.as_sxpr() == tree_2.as_sxpr()
+            assert empty_tags_1 == empty_tags_2
+            assert [nd._pos for nd in tree_1.select_if(lambda nd: True, include_root=True)] \
+                == [nd._pos for nd in tree_2.select_if(lambda nd: True, include_root=True)]
+        tree = parse_xml(documents[2], backend='expat')
+        assert tree.attr['x'] == "1 &amp; 2" and tree.attr['y'] == "b>c"
+        assert tree.pick('d')._pos == 3
+        try:
+            _ = parse_xml('<xml><a>xxx</b></xml>', backend='expat')
+            assert False, "ValueError because of tag-mismatch expected!"
+        except ValueError as e:
+            assert str(e).find('1:6 - 1:16') >= 0
+
     def test_serialize_xml(self):
         root = RootNode(parse_xml(XML_EXAMPLE))
         root.string_tags.update({':Text'})
@@ -319,6 +365,32 @@ class TestParseJSON:
         tree_copy = parse_json(s)
         assert tree_copy.equals(new_tree)
 
+    def test_single_pass_json(self):
+        tree = copy.deepcopy(self.tree)
+        tree.pick('e').attr['quote'] = 'say "\\u00e4"\n'
+        tree.pick('h').result = 'a "quoted" \\ back\tslash'
+        for indent in (None, 0, 2):
+            for ensure_ascii in (False, True):
+                for include_pos in (False, True):
+                    s = tree.as_json(indent=indent, ensure_ascii=ensure_ascii,
+                                     include_pos=include_pos)
+                    assert s == json.dumps(tree.to_json_obj(include_pos=include_pos),
+                                           indent=indent or None, ensure_ascii=ensure_ascii,
+                                           separators=(', ', ': ') if indent else (',', ':'))
+                    tree_copy = parse_json(s)
+                    assert tree_copy.equals(tree) and tree_copy.content == tree.content
+                    assert [nd._pos for nd in tree_copy.walk_tree(include_root=True)] \
+                        == [nd._pos if include_pos else -1
+                            for nd in tree.walk_tree(include_root=True)]
+        assert parse_json('["a", "b"]').equals(Node('a', 'b'))
+        for malformed in ('["a", "b" "c"]', '["a", [["b", "c"] ["d", "e"]]]',
+                          '["a", [["b", "c"]]] x'):
+            try:
+                parse_json(malformed)
+                assert False, "JSONDecodeError expected!"
+            except json.JSONDecodeError:
+                pass
+
     def test_attr_serialization_and_parsing(self):
         n = Node('employee', 'James Bond').with_pos(46)
         n.attr['branch'] = 'Secret Service'
@@ -459,6 +531,25 @@ class TestNode:
         assert tree.lbreaks == tree_copy.lbreaks
         assert tree.errors == tree_copy.errors
 
+    def test_deepcopy_error_nodes_and_attributes(self):
+        import gc
+        tree = RootNode(parse_sxpr('(a (b `(class "x") c) (d (e f) (h i)))'), "cfi")
+        tree.with_pos(0)
+        tree.new_error(tree.pick('h'), 'Test Error')
+        tree_copy = copy.deepcopy(tree)
+        assert gc.isenabled()
+        assert tree_copy.equals(tree)
+        h = tree_copy.pick('h')
+        assert h is not tree.pick('h')
+        assert tree_copy.node_errors(h)
+        assert tree_copy.node_errors(h) == tree.node_errors(tree.pick('h'))
+        tree_copy.pick('b').attr['class'] = 'y'
+        assert tree.pick('b').attr['class'] == 'x'
+        deep = Node('x', 'y')
+        for _ in range(5000):
+            deep = Node('x', (deep,))
+        assert copy.deepcopy(deep).equals(deep)
+
 
     def test_str(self):
         assert str(self.unique_tree) == "ceh"
@@ -1080,6 +1171,225 @@ class TestSerialization:
         assert tree.as_sxpr() == r'(A "\x0d")'
         assert t2.as_sxpr() == r'(A "\x0d")'
 
+    def test_streaming_serialization(self):
+        import io
+        tree = parse_xml('<doc><p xml:space="preserve">a <b>bold</b>\n c</p><e/>'
+                         '<x>  \n text \n  </x><y a="1">\r</y></doc>')
+        tree.pick('e').result = ''
+        samples = [tree, parse_sxpr('(a (b "x") (c "") (d (e "1") (f "q")))'),
+                   get_ebnf_grammar()('doc = "a" { /b/ ~ } §"c"')]
+        samples[1].pick('b').result = 'x\n  y\n'
+        for t in samples:
+            for kwargs in ({}, {'compact': False}, {'flatten_threshold': 0}, {'sxml': 2},
+                           {'src': ''}, {'flatten_threshold': 1000}):
+                fp = io.StringIO()
+                t.write_sxpr(fp, **kwargs)
+                assert fp.getvalue() == t.as_sxpr(**kwargs)
+            for kwargs in ({}, {'inline_tags': {'p', 'b'}}, {'string_tags': set()},
+                           {'indentation': 0}, {'src': ''}):
+                fp = io.StringIO()
+                t.write_xml(fp, strict_mode=False, **kwargs)
+                assert fp.getvalue() == t.as_xml(strict_mode=False, **kwargs)
+            for kwargs in ({'indent': None}, {'indent': 0, 'ensure_ascii': True},
+                           {'indent': 2}, {'as_dict': True}):
+                fp = io.StringIO()
+                t.write_json(fp, **kwargs)
+                assert fp.getvalue() == t.as_json(**kwargs)
+            for how in ('xml', 'sxpr', 'sxml2', 'json', 'jsondict', 'tree', 'default'):
+                fp = io.StringIO()
+                t.serialize_to(fp, how)
+                assert fp.getvalue() == t.serialize(how)
+
+    def test_binary_serialization(self):
+        import io
+        from DHParser.nodetree import parse_binary, deserialize
+        tree = parse_xml('<doc><p xml:space="preserve">a <b>bold</b>\n c</p><e/>'
+                         '<x k="\u00e4">  \n t\u00e9xt \n  </x><y a="1">\r</y></doc>').with_pos(0)
+        tree.pick('e').result = ''
+        data = tree.as_binary()
+        assert tree.serialize('binary') == data
+        for t in (parse_binary(data), deserialize(data)):
+            assert t.equals(tree) and t.as_sxpr() == tree.as_sxpr()
+            assert [nd.pos for nd in t.walk_tree(include_root=True)] \
+                == [nd.pos for nd in tree.walk_tree(include_root=True)]
+        assert all(nd._pos < 0 for nd in parse_binary(tree.as_binary(include_pos=False))
+                   .walk_tree(include_root=True))
+        fp = io.BytesIO()
+        tree.serialize_to(fp, 'binary')
+        assert fp.getvalue() == data
+        assert len(data) < len(tree.as_json(indent=None).encode('utf-8'))
+
+        cst = get_ebnf_grammar()('doc = "a" { /b/ ~ } §"c" \n rest = ( /x/ = \n more = "m"')
+        assert cst.errors
+        restored = parse_binary(cst.as_binary())
+        assert restored.equals(cst)
+        assert [str(e) for e in restored.errors] == [str(e) for e in cst.errors]
+        assert restored.error_flag == cst.error_flag
+        assert restored.as_xml(src='') == cst.as_xml(src='')
+        try:
+            parse_binary(b'DHPX' + data[4:])
+            assert False, "ValueError expected!"
+        except ValueError:
+            pass
+
+
+class TestTreeFile:
+    def setup_class(self):
+        self.tree = parse_xml('<doc><p a="1">a <b>b\u00f6ld</b>\n c</p><e/>'
+                              '<x k="\u00e4">  t\u00e9xt </x><y><z>deep</z></y></doc>').with_pos(0)
+        self.tree.pick('e').result = ''
+
+    def test_roundtrip(self):
+        import tempfile
+        from DHParser.nodetree import write_tree_file, open_tree_file, LazyNode
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, 'tree.dhpl')
+            write_tree_file(self.tree, filename)
+            root = open_tree_file(filename)
+            assert isinstance(root, LazyNode)
+            assert root.equals(self.tree)
+            root.close()
+            root = open_tree_file(filename)
+            assert root.as_sxpr() == self.tree.as_sxpr()
+            for a, b in zip(self.tree.select_if(lambda nd: True, include_root=True),
+                            root.select_if(lambda nd: True, include_root=True)):
+                assert a.name == b.name and a.pos == b.pos and a.content == b.content
+                assert a.strlen() == b.strlen()
+                assert (a.attr if a.has_attr() else {}) == (b.attr if b.has_attr() else {})
+            copied = copy.deepcopy(root)
+            assert not isinstance(copied, LazyNode) and copied.equals(self.tree)
+            copied.pick('z').result = 'changed'
+            try:
+                root.pick('z').result = 'changed'
+                assert False, "TypeError expected!"
+            except TypeError:
+                pass
+            root.close()
+
+    def test_lazy_loading(self):
+        import tempfile
+        from DHParser.nodetree import write_tree_file, open_tree_file
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, 'tree.dhpl')
+            write_tree_file(self.tree, filename)
+            with open_tree_file(filename) as root:
+                assert root.content == self.tree.content
+                assert root._lazy_result is None  # content has been read without loading children
+                y = root['y']
+                assert y._lazy_result is None
+                assert root['p']._lazy_result is None
+                assert y.pick('z').content == 'deep'
+                assert y._lazy_result is not None
+
+    def test_close(self):
+        import tempfile
+        from DHParser.nodetree import write_tree_file, open_tree_file
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, 'tree.dhpl')
+            write_tree_file(self.tree, filename)
+            with open_tree_file(filename) as root:
+                x = root.pick('x')
+                assert x.content == self.tree.pick('x').content
+                tree_file = root._file
+                assert not tree_file.mm.closed
+            assert tree_file.mm.closed
+            assert x.content == self.tree.pick('x').content  # already read
+            try:
+                root.pick('z')
+                assert False, "ValueError expected!"
+            except ValueError:
+                pass
+            not_a_tree_file = os.path.join(tmpdir, 'no_tree.dhpl')
+            with open(not_a_tree_file, 'wb') as f:
+                f.write(b'\x00' * 64)
+            try:
+                open_tree_file(not_a_tree_file)
+                assert False, "ValueError expected!"
+            except ValueError as e:
+                assert 'not a tree-file' in str(e)
+            os.remove(not_a_tree_file)  # fails on Windows, if the file is still mapped
+
+    def test_compiled_mode(self):
+        # if compiled with Cython, the whole tree is read and the file closed
+        import tempfile
+        import DHParser.nodetree
+        from DHParser.nodetree import write_tree_file, open_tree_file, LazyNode
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, 'tree.dhpl')
+            write_tree_file(self.tree, filename)
+            compiled = DHParser.nodetree.cython.compiled
+            DHParser.nodetree.cython.compiled = True
+            try:
+                with open_tree_file(filename) as root:
+                    assert not isinstance(root, LazyNode)
+                    assert root.equals(self.tree) and root.pos == self.tree.pos
+                root.close()
+                assert root.pick('z').content == 'deep'
+            finally:
+                DHParser.nodetree.cython.compiled = compiled
+            os.remove(filename)  # fails on Windows, if the file is still mapped
+
+
+class TestDeepTrees:
+    """Tree-traversals must not be limited by Python's recursion limit."""
+
+    def setup_class(self):
+        self.depth = 3 * sys.getrecursionlimit()
+        node = Node('item', str(self.depth))
+        for i in range(self.depth - 1, 0, -1):
+            node = Node('list', (Node('item', str(i)), node))
+        self.tree = RootNode(node)
+        self.content = ''.join(str(i) for i in range(1, self.depth + 1))
+
+    def test_traversal(self):
+        tree = self.tree
+        assert sum(1 for _ in tree.walk_tree(include_root=True)) == 2 * self.depth - 1
+        assert sum(1 for _ in tree.select('item', reverse=True)) == self.depth
+        assert len(list(tree.walk_tree_paths())[-1]) == self.depth
+        assert tree.content == self.content
+        assert tree.strlen() == len(self.content)
+        assert tree.locate(len(self.content) - 1).name == 'item'
+
+    def test_copy_and_positions(self):
+        tree = copy.deepcopy(self.tree)
+        assert tree.equals(self.tree)
+        tree.with_pos(0)
+        last = tree.pick('item', reverse=True)
+        assert last.pos == len(self.content) - len(last.content)
+
+    def test_serialization(self):
+        tree = self.tree
+        xml = tree.as_xml(indentation=0)
+        assert xml.count('<item>') == self.depth
+        sxpr = tree.as_sxpr(indentation=0, flatten_threshold=0)
+        assert sxpr.count('(item') == self.depth
+        import io
+        fp = io.StringIO()
+        tree.write_xml(fp, indentation=0)
+        assert fp.getvalue() == xml
+        data = tree.as_json(indent=None)
+        fp = io.StringIO()
+        tree.write_json(fp, indent=None)
+        assert fp.getvalue() == data
+        assert tree.to_json_obj()[0] == 'list'
+
+    def test_traverse_and_compile(self):
+        from DHParser.compile import Compiler
+        tree = copy.deepcopy(self.tree)
+        counter = [0]
+        def count(path):
+            counter[0] += 1
+        traverse(tree, {'item': count})
+        assert counter[0] == self.depth
+
+        class ItemCompiler(Compiler):
+            def on_item(self, node):
+                return Node('ITEM', node.content)
+
+        result = ItemCompiler()(tree)
+        assert sum(1 for _ in result.select('ITEM')) == self.depth
+
+
 class TestSegementExtraction:
     def test_get_path(self):
         tree = parse_sxpr('(A (F (X "a") (Y "b")) (G "c"))')
@@ -1687,6 +1997,67 @@ class TestMarkupInsertion:
                '(p (b "I") (:Text " ") (i (Klassifikation "gener.") ' \
                '(:Text ":")) (:Text "[MFSP]") (b "A"))'
 
+    def test_markup_many(self):
+        tree = parse_xml('<doc>wenn wir bei <hi rend="italic">Cicero</hi><note type="footnote" n="29)">'
+            '<pb n="225"/>In Verr. acc. 1. 3, 120. </note> die meist nicht erhebli<lb/>chen Zahlen</doc>')
+        X = copy.deepcopy(tree)
+        cm = ContentMapping(X)
+        spans = [(m.start(), m.end(), 'w') for m in re.finditer(r'\w+', cm.content)]
+        spans.append((cm.content.find('Cicero'), cm.content.find('Verr.') + 5, 'ref'))
+        spans.append((cm.content.find('120.'), cm.content.find('120.'), 'milestone'))
+        for span in sorted(spans, key=lambda span: (span[0], -span[1])):
+            cm.markup(*span)
+        Y = copy.deepcopy(tree)
+        cm_many = ContentMapping(Y)
+        cm_many.markup_many(reversed(spans))
+        assert Y.equals(X)
+        assert str(cm_many) == str(ContentMapping(Y))
+        try:
+            cm_many.markup_many([(0, 5, 'a'), (3, 8, 'b')])
+            assert False, "ValueError expected for overlapping spans!"
+        except ValueError:
+            pass
+        try:
+            cm_many.markup_many([(0, len(cm_many.content) + 1, 'a')])
+            assert False, "ValueError expected for span beyond the content!"
+        except ValueError:
+            pass
+
+    def test_lazy_content_mapping(self):
+        tree = parse_xml('<doc>wenn wir bei <hi rend="italic">Cicero</hi><note type="footnote" n="29)">'
+            '<pb n="225"/>In Verr. acc. 1. 3, 120. </note> die meist nicht erhebli<lb/>chen Zahlen</doc>')
+        cm = ContentMapping(tree, ignore='note')
+        lazy = LazyContentMapping(tree, ignore='note')
+        for pattern in (r'\w+', r'\w*', r'(?<=i)\w', r'^\w+|\w+$', r'erhebli\s*chen'):
+            expected = [m.span() for m in re.finditer(pattern, cm.content)]
+            assert [m.span() for m in lazy.finditer(pattern, chunk_size=3, max_match_length=16)] \
+                == expected, pattern
+            assert [m.span() for m in lazy.finditer(pattern, 5, 30, 3, 16)] \
+                == [m.span() for m in re.finditer(pattern, cm.content[:30])
+                    if m.start() >= 5], pattern
+        assert lazy._index is None
+        assert lazy.content == cm.content
+        assert list(lazy.pos_list) == cm.pos_list
+        assert all(a == b for a, b in zip(lazy.path_list, cm.path_list))
+        assert str(lazy) == str(cm)
+        i = cm.content.find('Zahlen')
+        segment = lazy.segment(i, i + 6)
+        assert segment._index is lazy._index
+        assert segment.content == 'chen Zahlen'
+        assert [m.start() + segment.pos_offset for m in segment.finditer('Zahlen')] == [i]
+        try:
+            segment.markup(0, 4, 'x')
+            assert False, "ValueError expected for changing the tree via a segment!"
+        except ValueError:
+            pass
+        X, Y = copy.deepcopy(tree), copy.deepcopy(tree)
+        lazy, cm = LazyContentMapping(X, ignore='note'), ContentMapping(Y, ignore='note')
+        for m in list(lazy.finditer(r'\w+')):
+            lazy.markup(m.start(), m.end(), 'w')
+            cm.markup(m.start(), m.end(), 'w')
+        assert X.equals(Y)
+        assert str(lazy) == str(cm)
+
     def test_deep_split(self):
         print()
         urtree = tree = parse_sxpr(
@@ -1831,6 +2202,21 @@ class TestSerializationMapping:
         k = sm.content_pos(path[-1], ser_pos, i - ser_pos, part)
         assert k == 6
 
+    def test_lazy_mapping(self):
+        from DHParser.nodetree import SerializationMapping
+        tree = parse_sxpr('(a (b "x") (c) (d "yz"))')
+        raw_mapping = {}
+        sxpr = tree.as_sxpr(mapping=raw_mapping)
+        assert raw_mapping[tree.pick('c')] == (3, 4, 1)
+        sm = SerializationMapping(tree, sxpr, raw_mapping)
+        assert len(sm._pos_list) == 0
+        i = sxpr.find('(c)')
+        path, ser_pos, offset, part = sm.get_path(i + 1)
+        assert [nd.name for nd in path] == ['a', 'c'] and part == -1
+        assert len(sm._pos_list) == 2 * 4
+        path, ser_pos, offset, part = sm.get_path(sxpr.find('yz') + 1)
+        assert [nd.name for nd in path] == ['a', 'd'] and part == 0
+
 
 
 
@@ -1955,6 +2341,15 @@ class TestReflow:
   </div>
 </body>"""
 
+    def test_reflow_preserve(self):
+        tree = parse_xml('<doc><p>Ein   Satz\n   mit <pre xml:space="preserve">viel   \n  Raum'
+                         '</pre> und\n  <em>noch   mehr</em>  Raum.</p><e/></doc>')
+        xml = tree.as_xml(inline_tags={'p'}, reflow_col=30)
+        assert xml.startswith('<doc>\n  <p>Ein Satz mit <pre') and xml.endswith('<e/>\n</doc>')
+        # reflowing makes the leaves one-liners unless xml:space="preserve" is set
+        assert tree.pick('pre').content == 'viel   \n  Raum'
+        assert tree.pick('em').content == 'noch mehr'
+
 
 
 if __name__ == "__main__":
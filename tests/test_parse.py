@@ -35,18 +35,20 @@ from DHParser.error import Error, is_error, add_source_locations, MANDATORY_CONT
     MALFORMED_ERROR_STRING, MANDATORY_CONTINUATION_AT_EOF, RESUME_NOTICE, \
     PARSER_STOPPED_BEFORE_END, PARSER_NEVER_TOUCHES_DOCUMENT, \
     CAPTURE_DROPPED_CONTENT_WARNING, PARSER_STOPPED_BEFORE_END_WARNING, \
-    MANDATORY_CONTINUATION_AT_EOF_NON_ROOT, INFINITE_LOOP_WARNING, ErrorCode
+    MANDATORY_CONTINUATION_AT_EOF_NON_ROOT, INFINITE_LOOP_WARNING, ERROR_BUDGET_EXHAUSTED, \
+    CANCELED, ErrorCode
 from DHParser.parse import ParserError, Parser, Grammar, Forward, TKN, ZeroOrMore, RE, \
     RegExp, Lookbehind, NegativeLookahead, OneOrMore, Series, Alternative, \
     Interleave, CombinedParser, Text, EMPTY_NODE, Capture, Drop, Whitespace, \
     GrammarError, Counted, Always, longest_match, extract_error_code, \
-    Option, DTKN, RegExp, ensure_drop_propagation, Option, SmartRE
+    Option, DTKN, RegExp, ensure_drop_propagation, Option, SmartRE, \
+    ReentryScanner, reentry_point
 from DHParser.preprocess import gen_neutral_srcmap_func
 from DHParser.compile import compile_source
 from DHParser.ebnf import get_ebnf_grammar, get_ebnf_transformer, get_ebnf_compiler, \
     parse_ebnf, DHPARSER_IMPORTS, compile_ebnf
 from DHParser.dsl import grammar_provider, create_parser
-from DHParser.nodetree import Node, parse_sxpr, ANY_NODE
+from DHParser.nodetree import Node, parse_sxpr, ANY_NODE, ZOMBIE_TAG
 from DHParser.stringview import StringView
 from DHParser.trace import set_tracer, trace_history, resume_notices_on
 
@@ -1484,6 +1486,152 @@ def next_valid_letter(text, start, end):
         assert locations == [(36, 37), (37, 1), (47, 19), (51, 1), (53, 5),
                              (57, 1), (59, 27), (60, 1), (65, 1), (66, 1)]
 
+    def test_reentry_scanner(self):
+        comment_rx = re.compile(r'#[^\n]*')
+        text = 'a = 1 # ; } \n b 2; # } ; ; \n c = 3; }\n'
+        rules = [';', re.compile(r'(?=\})'), re.compile('@@END@@')]
+        scanner = ReentryScanner(text, comment_rx)
+        inside_comment = {i for m in comment_rx.finditer(text) for i in range(m.start() + 1, m.end())}
+        for window in (-1, 5, 10, 50000):
+            for i in range(len(text)):
+                if i in inside_comment:
+                    continue
+                rest = StringView(text)[i:]
+                for rule in rules:
+                    if 0 <= window < len(rest) and not isinstance(rule, str):
+                        # the scanner does not cut regular expressions short at the
+                        # end of the search window, which makes a difference for
+                        # lookaheads that reach beyond the window
+                        continue
+                    expected = reentry_point(rest, [rule], comment_rx, window)[0]
+                    result = reentry_point(rest, [rule], comment_rx, window, '', scanner)[0]
+                    assert result == expected, f'{i} {rule} {window}: {result} != {expected}'
+        assert scanner.matches
+
+    def test_reentry_scanner_many_errors(self):
+        lang = r'''
+            @ whitespace = vertical
+            @ literalws = right
+            @ comment = /#[^\n]*/
+            @ statement_resume = /;/, /(?=\})/
+            @ block_resume = /\}/
+            document = { ~ (block | statement) } ~
+            block = "{" { ~ statement } ~ §"}"
+            statement = word §"=" value ";"
+            word = /[a-z]+/~
+            value = /[0-9]+/~
+            '''
+        gr = grammar_provider(lang)()
+        block = '{\n' + 'a = 1;\n# ; } comment\nb 2;\n# ; } comment\n' * 50 + '}\n'
+        cst = gr(block * 10)
+        assert len(cst.errors) == 500
+        assert gr.reentry_scanner__.matches
+        assert all(err.code == MANDATORY_CONTINUATION for err in cst.errors)
+
+    def test_error_budget(self):
+        lang = r'''
+            @ whitespace = vertical
+            @ literalws = right
+            @ statement_resume = /;/
+            @ block_skip = /(?=\w+\s*=)/
+            document = { ~ (block | statement) } ~
+            block = "{" §{ ~ statement } ~ "}"
+            statement = word §"=" value ";"
+            word = /[a-z]+/~
+            value = /[0-9]+/~
+            '''
+        gr = grammar_provider(lang)()
+        doc = '{\n' + 'a = 1;\nb 2;\n' * 50 + '}\n' + 'c = 3;\nd 4;\n' * 50
+        cst = gr(doc)
+        assert len(cst.errors) == 100
+        assert gr.error_budget_exhausted__ is None
+
+        gr.max_resumptions__ = 10
+        cst = gr(doc)
+        assert cst.content == doc
+        assert 10 < len(cst.errors) < 20
+        budget_errors = [e for e in cst.errors if e.code == ERROR_BUDGET_EXHAUSTED]
+        assert len(budget_errors) == 1
+        assert budget_errors[0].pos == gr.error_budget_exhausted__[0]
+        assert gr.suppressed_errors__ > 0
+
+        gr.max_resumptions__ = -1
+        gr.max_errors_per_region__ = 3
+        gr.error_region_size__ = 100
+        cst = gr(doc)
+        assert cst.content == doc
+        assert len([e for e in cst.errors if e.code == ERROR_BUDGET_EXHAUSTED]) == 1
+        assert len(cst.errors) == 4
+
+
+class TestCancellation:
+    lang = r'''
+        @ literalws = right
+        doc = { item }
+        item = /\w+/~ ","~
+        '''
+
+    def setup_class(self):
+        self.doc = "abc, " * 5000
+
+    def test_call_limit(self):
+        gr = grammar_provider(self.lang)()
+        cst = gr(self.doc)
+        assert not cst.errors
+        gr.parser_call_limit__ = 2500
+        cst = gr(self.doc)
+        assert len(cst.errors) == 1 and cst.errors[0].code == CANCELED
+        assert cst.errors[0].message.find('parser-calls') >= 0
+        # the partial result is preserved
+        assert cst.content == self.doc
+        assert cst.pick('item') is not None
+        assert cst[-1].name == ZOMBIE_TAG
+        # cancellation is deterministic
+        assert gr(self.doc).as_sxpr() == cst.as_sxpr()
+        gr.parser_call_limit__ = -1
+        assert not gr(self.doc).errors
+
+    def test_time_limit(self):
+        gr = grammar_provider(self.lang)()
+        gr.parser_time_limit__ = 1e-6
+        cst = gr(self.doc)
+        assert len(cst.errors) == 1 and cst.errors[0].code == CANCELED
+        assert cst.errors[0].message.find('time-limit') >= 0
+
+    def test_cancel_query(self):
+        gr = grammar_provider(self.lang)()
+        gr.cancel_query__ = lambda: True
+        cst = gr(self.doc)
+        assert len(cst.errors) == 1 and cst.errors[0].code == CANCELED
+        gr.cancel_query__ = None
+        assert not gr(self.doc).errors
+
+    def test_cancel_with_tracing(self):
+        gr = grammar_provider(self.lang)()
+        set_tracer(gr, trace_history)
+        gr.history_tracking__ = True
+        gr.parser_call_limit__ = 2500
+        cst = gr(self.doc)
+        assert len(cst.errors) == 1 and cst.errors[0].code == CANCELED
+        assert cst.content == self.doc
+        gr.cancel_query__ = lambda: False
+        gr.parser_call_limit__ = -1
+        assert not gr(self.doc).errors
+
+    def test_deprecated_cancel_proxy(self):
+        from DHParser.parse import cancel_proxy, LeafParser
+        gr = grammar_provider(self.lang)()
+        gr.parser_call_limit__ = 2500
+        expected = gr(self.doc).as_sxpr()
+        for p in gr.all_parsers__:
+            if isinstance(p, LeafParser):
+                p.set_proxy(cancel_proxy)
+        # the deprecated proxy neither cancels parsing by itself nor
+        # changes the number of parser-calls until the cancellation
+        assert gr(self.doc).as_sxpr() == expected
+        gr.parser_call_limit__ = -1
+        gr.cancel_query__ = lambda: False
+        assert not gr(self.doc).errors
 
 
 class TestConfiguredErrorMessages:
@@ -20,8 +20,10 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-import sys
 import os
+import shutil
+import sys
+import tempfile
 from functools import partial
 from typing import Set
 
@@ -31,7 +33,7 @@ scriptpath = os.path.dirname(__file__) or '.'
 sys.path.append(os.path.abspath(os.path.join(scriptpath, '..')))
 
 from DHParser.compile import Compiler
-from DHParser.configuration import CONFIG_PRESET
+from DHParser.configuration import CONFIG_PRESET, get_config_value, set_config_value
 from DHParser.error import Error, FATAL, CANCELED
 from DHParser.nodetree import Node, RootNode
 from DHParser.parse import Grammar, Forward, CombinedParser, mixin_comment, Whitespace, Drop, \
@@ -409,6 +411,145 @@ class TestCancellation:
         assert result[1][0].code == CANCELED
 
 
+class WordCounter(Compiler):
+    def prepare(self, root: RootNode) -> None:
+        root.stage = "words"
+
+    def on_document(self, node: Node) -> int:
+        return len(node.content.split())
+
+
+class XMLSerializer(Compiler):
+    def prepare(self, root: RootNode) -> None:
+        root.stage = "xml"
+
+    def on_document(self, node: Node) -> str:
+        return node.as_xml()
+
+
+class TestParallelPipeline:
+    """Tests the concurrent processing of independent junctions, here the
+    junctions from the AST to the DOM, to the word-count and to XML."""
+
+    def setup_method(self):
+        self.save = get_config_value('pipeline_parallelization')
+        self.junctions = junctions | {create_junction(WordCounter, "AST", "words"),
+                                      create_junction(XMLSerializer, "AST", "xml")}
+        self.targets = {'AST', 'DOM', 'html', 'words', 'xml'}
+
+    def teardown_method(self):
+        set_config_value('pipeline_parallelization', self.save)
+
+    def pipeline(self, mode: str, source: str = EXAMPLE_OUTLINE):
+        set_config_value('pipeline_parallelization', mode)
+        results = full_pipeline(source, preprocessing.factory, parsing.factory,
+                                self.junctions, self.targets)
+        return {t: (r.as_sxpr() if isinstance(r, Node) else r,
+                    [(e.pos, e.code) for e in errors])
+                for t, (r, errors) in results.items()}
+
+    def test_same_results(self):
+        expected = self.pipeline('off')
+        assert isinstance(expected['words'][0], int) and expected['words'][0] > 0
+        assert expected['xml'][0].startswith('<document>')
+        for source in (EXAMPLE_OUTLINE, BAD_NESTING_EXAMPLE):
+            expected = self.pipeline('off', source)
+            assert self.pipeline('multithreading', source) == expected
+            assert self.pipeline('multicore', source) == expected
+
+
+class AlternativeDOMCompiler(DOMCompiler):
+    def on_emphasis(self, node):
+        node = super().on_emphasis(node)
+        node.name = "em"
+        return node
+
+
+class TestStageCache:
+    def setup_method(self):
+        self.save = get_config_value('pipeline_stage_cache')
+        self.save_history_tracking = get_config_value('history_tracking')
+        set_config_value('history_tracking', False)  # history tracking would turn off the stage cache
+        self.cache_dir = tempfile.mkdtemp()
+
+    def teardown_method(self):
+        set_config_value('pipeline_stage_cache', self.save)
+        set_config_value('history_tracking', self.save_history_tracking)
+        shutil.rmtree(self.cache_dir)
+
+    def pipeline(self, junctions, targets, cache_dir):
+        set_config_value('pipeline_stage_cache', cache_dir)
+        results = full_pipeline(EXAMPLE_OUTLINE, preprocessing.factory, parsing.factory,
+                                junctions, targets)
+        return {t: (r.as_sxpr() if isinstance(r, Node) else r, [str(e) for e in errors])
+                for t, (r, errors) in results.items()}
+
+    def cached_stages(self) -> int:
+        return sum(len(files) for _, _, files in os.walk(self.cache_dir))
+
+    def test_stage_cache(self):
+        expected = self.pipeline(junctions, {'html'}, '')
+        assert expected.keys() == {'CST', 'AST', 'DOM', 'html'}
+        results = self.pipeline(junctions, {'html'}, self.cache_dir)
+        assert results['html'] == expected['html']
+        assert results.keys() == expected.keys()
+        assert self.cached_stages() == 4
+        # the same stages are returned, no matter whether they are taken from the cache
+        results = self.pipeline(junctions, {'html'}, self.cache_dir)
+        assert results.keys() == expected.keys()
+        assert results['html'] == expected['html']
+        # intermediary stages have been cached, too
+        results = self.pipeline(junctions, {'DOM'}, self.cache_dir)
+        assert results.keys() == {'CST', 'AST', 'DOM'}
+        assert results['DOM'] == expected['DOM']
+        assert self.cached_stages() == 4
+
+    def test_changed_stage(self):
+        alternative = {ASTTransformation, serializing,
+                       create_junction(AlternativeDOMCompiler, "AST", "DOM")}
+        expected = self.pipeline(alternative, {'html'}, '')
+        self.pipeline(junctions, {'html'}, self.cache_dir)
+        assert self.cached_stages() == 4
+        results = self.pipeline(alternative, {'html'}, self.cache_dir)
+        # the CST and AST are taken from the cache, the DOM and html are recomputed
+        assert self.cached_stages() == 6
+        assert results.keys() == expected.keys()
+        assert results['html'] == expected['html']
+
+
+    def test_code_fingerprint(self):
+        from DHParser.pipeline import _code_fingerprint
+        import importlib
+        module_dir = tempfile.mkdtemp()
+        try:
+            for name, result in (('stage_cache_base_a', 'node'), ('stage_cache_base_b', 'None')):
+                with open(os.path.join(module_dir, name + '.py'), 'w', encoding='utf-8') as f:
+                    f.write(f'def helper(node):\n    return {result}\n\n\n'
+                            f'class Base:\n    def on_x(self, node):\n'
+                            f'        return helper(node)\n')
+            sys.path.insert(0, module_dir)
+            try:
+                modules = [importlib.import_module(name)
+                           for name in ('stage_cache_base_a', 'stage_cache_base_b')]
+            finally:
+                sys.path.remove(module_dir)
+
+            def derive(base, version=''):
+                class Derived(base):
+                    cache_version__ = version
+                return Derived
+
+            a, b = derive(modules[0].Base), derive(modules[1].Base)
+            # the base classes only differ in the helper function of their module
+            assert _code_fingerprint(a) != _code_fingerprint(b)
+            assert _code_fingerprint(a) == _code_fingerprint(derive(modules[0].Base))
+            assert _code_fingerprint(a) != _code_fingerprint(derive(modules[0].Base, '2'))
+        finally:
+            for name in ('stage_cache_base_a', 'stage_cache_base_b'):
+                sys.modules.pop(name, None)
+            shutil.rmtree(module_dir)
+
+
 class TestPiplineGraph:
     def junctions_set1(self) -> Set[Junction]:
         junctions = set()
@@ -34,9 +34,10 @@ from DHParser.transform import traverse, remove_whitespace, remove_empty, \
 from DHParser.dsl import grammar_provider, create_parser
 from DHParser.error import PARSER_LOOKAHEAD_FAILURE_ONLY, PARSER_LOOKAHEAD_MATCH_ONLY, \
     MANDATORY_CONTINUATION_AT_EOF, MANDATORY_CONTINUATION_AT_EOF_NON_ROOT, ERROR
+from DHParser.configuration import get_config_value, set_config_value
 from DHParser.log import start_logging
 from DHParser.testing import get_report, grammar_unit, unit_from_file, merge_test_units, \
-    unit_from_config, clean_report, unique_name, reset_unit, unit_to_config
+    unit_from_config, clean_report, unique_name, reset_unit, unit_to_config, fingerprint
 from DHParser.trace import set_tracer, trace_history
 
 CFG_FILE_1 = '''
@@ -691,6 +692,76 @@ M1: "The little dog jumped over the hedge"""
 
 
 
+class TestResultCache:
+    grammar = r"""document = word { L word }
+    word = /\w+/
+    L    = /\s+/
+    """
+    test_unit = """
+[match:document]
+M1: "The little dog jumped over the hedge"
+M2: "The cat"
+
+[AST:document]
+M2: (document (word "The") (L " ") (word "cat"))
+
+[fail:word]
+F1: "two words"
+"""
+
+    def setup_class(self):
+        self.save_dir = os.getcwd()
+        os.chdir(scriptpath)
+        self.save_cache = get_config_value('test_result_cache')
+        self.save_history_tracking = get_config_value('history_tracking')
+        set_config_value('history_tracking', False)
+        self.cache_dir = unique_name('TEST_CACHE')
+        self.unit_file = unique_name('test_result_cache.ini')
+        with open(self.unit_file, 'w', encoding='utf-8') as f:
+            f.write(self.test_unit)
+        set_config_value('test_result_cache', self.cache_dir)
+
+    def teardown_class(self):
+        set_config_value('test_result_cache', self.save_cache)
+        set_config_value('history_tracking', self.save_history_tracking)
+        set_config_value('test_force_rerun', False)
+        if os.path.exists(self.unit_file):  os.remove(self.unit_file)
+        if os.path.exists(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                os.remove(os.path.join(self.cache_dir, name))
+            os.rmdir(self.cache_dir)
+        os.chdir(self.save_dir)
+
+    def run_unit(self, capsys, grammar=None) -> str:
+        parser_factory = grammar_provider(grammar or TestResultCache.grammar)
+        errata = grammar_unit(self.unit_file, parser_factory, lambda: lambda _: _, '')
+        assert not errata, str(errata)
+        return capsys.readouterr().out
+
+    def test_result_cache(self, capsys):
+        set_config_value('test_force_rerun', False)
+        assert self.run_unit(capsys).find('0 hits, 3 misses') >= 0
+        assert self.run_unit(capsys).find('3 hits, 0 misses') >= 0
+        set_config_value('test_force_rerun', True)
+        assert self.run_unit(capsys).find('0 hits, 3 misses') >= 0
+        set_config_value('test_force_rerun', False)
+        # a changed grammar invalidates all cached results
+        changed = TestResultCache.grammar.replace(r'/\s+/', r'/ +/')
+        assert self.run_unit(capsys, changed).find('0 hits, 3 misses') >= 0
+        assert self.run_unit(capsys, changed).find('3 hits, 0 misses') >= 0
+        # a changed test-case invalidates only this case
+        with open(self.unit_file, 'w', encoding='utf-8') as f:
+            f.write(self.test_unit.replace('The cat', 'The  cat')
+                    .replace('(L " ")', '(L "  ")'))
+        assert self.run_unit(capsys, changed).find('2 hits, 1 misses') >= 0
+
+    def test_fingerprint(self):
+        assert fingerprint({'a': 1, 'b': {2, 1}}) == fingerprint({'b': {1, 2}, 'a': 1})
+        assert fingerprint(partial(traverse, transformation_table={'a': [flatten]})) \
+            != fingerprint(partial(traverse, transformation_table={'a': [remove_empty]}))
+        assert fingerprint(lambda x: x + 1) != fingerprint(lambda x: x - 1)
+
+
 if __name__ == "__main__":
     from DHParser.testing import runner
     runner("", globals())
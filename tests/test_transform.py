@@ -35,7 +35,10 @@ from DHParser.transform import traverse, reduce_single_child, remove_whitespace,
     merge_adjacent, is_one_of, not_one_of, swap_attributes, delimit_children, merge_treetops, \
     positions_of, insert, node_maker, apply_if, change_name, add_attributes, add_error, \
     merge_leaves, BLOCK_ANONYMOUS_LEAVES, pick_longest_content, fix_content, merge_connected, \
-    is_a, update_attr, swap_nested_nodes, has_child
+    is_a, update_attr, swap_nested_nodes, has_child, flatten, replace_by_single_child, \
+    fuse_transformations, neg, BLOCK_LEAVES, BLOCK_CHILDREN, transformer, \
+    traverse_subtrees_in_parallel, batch_condition, is_anonymous, is_anonymous_leaf, is_empty, \
+    is_token, content_matches, has_content, any_of, all_of, remove_children_if, keep_children_if
 from typing import AbstractSet, List, Sequence, Tuple
 
 
@@ -229,6 +232,33 @@ class TestConditionalTransformations:
         # whitespace after "facitergula", but not after "bona" should have been removed
         assert str(cst) == "faciterculasim.bona fide"
 
+    def test_batch_condition(self):
+        tree = parse_sxpr('(A (B (:Text "+") (C "1") (:Whitespace " ") (:Series (D "2")) '
+                          '(:Text "") (B "x")))')
+        path = [tree, tree[0]]
+        children = tree[0].children
+        conditions = [is_anonymous, is_anonymous_leaf, is_empty, contains_only_whitespace,
+                      is_token, is_token('+'), is_one_of('C', 'D'), not_one_of('B'), is_a('C'),
+                      content_matches(r'\d'), has_content('x'), has_parent('B'),
+                      has_ancestor({'A'}), has_ancestor({'A'}, 1), has_ancestor({'C'}),
+                      neg(is_anonymous), any_of(is_token, has_content('1')),
+                      all_of(is_anonymous, neg(is_empty))]
+        for condition in conditions:
+            evaluate = batch_condition(condition)
+            assert evaluate is not None, str(condition)
+            expected = [bool(condition(path + [child])) for child in children]
+            assert evaluate(path, children) == expected, str(condition)
+        assert batch_condition(lambda path: len(path) > 2) is None
+        assert batch_condition(has_ancestor({'A'}, until='B')) is None
+        assert batch_condition(neg(lambda path: True)) is None
+
+        tree = parse_sxpr('(A (:Text "+") (C "1") (:Whitespace " ") (:Text "-"))')
+        remove_children_if([tree], any_of(is_token('+', '-'), contains_only_whitespace))
+        assert tree.as_sxpr() == '(A (C "1"))'
+        tree = parse_sxpr('(A (:Text "+") (C "1") (:Whitespace " ") (:Text "-"))')
+        keep_children_if([tree], is_token)
+        assert tree.as_sxpr() == '(A (:Text "+") (:Text "-"))'
+
 class TestComplexTransformations:
     Text = 'Text'  # TOKEN_PTYPE
 
@@ -577,6 +607,211 @@ class TestOptimizations:
         assert tree.equals(parse_sxpr('(array (number "1") (number "2.0") (string "a string"))'))
 
 
+class TestCompiledTransformations:
+    def transform(self, tree, table, compiled: bool):
+        from DHParser.configuration import set_config_value, get_config_value
+        save = get_config_value('compile_transformations')
+        set_config_value('compile_transformations', compiled)
+        try:
+            return traverse(copy.deepcopy(tree), table.copy())
+        finally:
+            set_config_value('compile_transformations', save)
+
+    def test_same_results(self):
+        from DHParser.ebnf import get_ebnf_grammar, EBNF_AST_transformation_table
+        with open(os.path.join(scriptpath, '..', 'examples', 'LaTeX', 'LaTeX.ebnf'),
+                  encoding='utf-8') as f:
+            ebnf = f.read()
+        cst = get_ebnf_grammar()(ebnf)
+        table = EBNF_AST_transformation_table
+        assert self.transform(cst, table, True).equals(self.transform(cst, table, False))
+        tree = parse_sxpr('(A (B (:Text "+") (C "1")) (B (D "2")) (B (:Text "-") (:Series (E "3"))))')
+        table = {'B': [apply_if((remove_tokens('+'), reduce_single_child), has_child('C')),
+                       apply_if(change_name('X'), is_one_of('Y')), flatten,
+                       remove_tokens, replace_by_single_child]}
+        compiled = self.transform(tree, table, True)
+        assert compiled.equals(self.transform(tree, table, False))
+        assert compiled.as_sxpr() == '(A (B "1") (D "2") (E "3"))'
+        tree = parse_sxpr('(A (B (X (Y (:Text "1") (:Whitespace " ")) (Z "2")) (X (:Text "-"))))')
+        table = {'B': [flatten(is_one_of('X', 'Y')),
+                       remove_children_if(any_of(contains_only_whitespace, is_token('-'))),
+                       keep_children_if(neg(is_a('Z')))]}
+        compiled = self.transform(tree, table, True)
+        assert compiled.equals(self.transform(tree, table, False))
+        assert compiled.as_sxpr() == '(A (B (:Text "1")))'
+
+    def test_error_messages(self):
+        def fail(path: Path):
+            raise ValueError('failure')
+        tree = parse_sxpr('(A (B "1"))')
+        table = {'B': [reduce_single_child, apply_if(fail, is_one_of('B'))]}
+        messages = []
+        for compiled in (True, False):
+            try:
+                self.transform(tree, table, compiled)
+                assert False, "AssertionError expected!"
+            except AssertionError as e:
+                messages.append(str(e))
+        assert messages[0] == messages[1]
+        assert messages[0].find('ValueError: failure') >= 0
+
+    def test_switching_modes(self):
+        import traceback
+        from DHParser.configuration import set_config_value, get_config_value
+
+        def fail(path: Path):
+            raise ValueError('failure')
+        tree = parse_sxpr('(A (B "1"))')
+        table = {'B': [reduce_single_child, fail]}
+        save = get_config_value('compile_transformations')
+        try:
+            for compiled in (True, False, True):
+                set_config_value('compile_transformations', compiled)
+                try:
+                    traverse(copy.deepcopy(tree), table)  # always the same table
+                    assert False, "AssertionError expected!"
+                except AssertionError as e:
+                    frames = [frame.name for frame in traceback.extract_tb(e.__traceback__)]
+                assert ('apply' in frames) != compiled, frames
+        finally:
+            set_config_value('compile_transformations', save)
+
+
+class TestFusedTransformations:
+    grammar = r"""@ drop = whitespace, strings
+        expression = term { ("+" | "-") term }
+        term = factor { ("*" | "/") factor }
+        factor = [sign] (number | group)
+        group = "(" expression ")"
+        sign = /[+-]/
+        number = /\d+/~
+        """
+
+    table = {'expression, term': [flatten, replace_by_single_child],
+             'factor': [apply_if(reduce_single_child, neg(has_parent('group')))],
+             'group': [replace_by_single_child],
+             'number': [change_name('num')]}
+
+    def create_parser(self):
+        from DHParser.configuration import set_config_value, get_config_value
+        from DHParser.dsl import create_parser
+        save = get_config_value('history_tracking')
+        set_config_value('history_tracking', False)
+        try:
+            return create_parser(self.grammar)
+        finally:
+            set_config_value('history_tracking', save)
+
+    def test_same_results(self):
+        parser = self.create_parser()
+        fused_parser = self.create_parser()
+        remaining = fuse_transformations(fused_parser, self.table.copy())
+        # factor depends on its parent and thus group, term and expression
+        # cannot be transformed while parsing either
+        cst = fused_parser('-2*(3+4)')
+        assert cst.pick('num') and cst.pick('sign') and not cst.pick('number')
+        assert cst.pick('factor') and cst.pick('group')
+        for expr in ('1', '-2 * (3 + 4)', '(((5)))/6 - +7*8'):
+            expected = traverse(parser(expr), self.table.copy())
+            fused = traverse(fused_parser(expr), remaining)
+            assert fused.equals(expected), fused.as_sxpr() + ' != ' + expected.as_sxpr()
+            assert not fused.pick('number')
+
+    def test_error_recovery(self):
+        self.grammar = self.grammar.replace('"(" expression ")"', '"(" § expression ")"')
+        parser = self.create_parser()
+        fused_parser = self.create_parser()
+        table = {'expression, term': [flatten, replace_by_single_child],
+                 'group': [remove_tokens('(', ')'), replace_by_single_child],
+                 'number': [change_name('num')]}
+        remaining = fuse_transformations(fused_parser, table.copy())
+        for expr in ('(1+2', '3*(4+x)-5', '((6)', '-(7*(8)'):
+            expected = traverse(parser(expr), table.copy())
+            fused = traverse(fused_parser(expr), remaining)
+            assert fused.equals(expected), fused.as_sxpr() + ' != ' + expected.as_sxpr()
+            assert [str(e) for e in fused.errors_sorted] \
+                == [str(e) for e in expected.errors_sorted]
+            assert not fused.pick('number')
+
+    def test_declined(self):
+        parser = self.create_parser()
+        table = {'number': [change_name('num')], '*': [BLOCK_LEAVES, replace_by_single_child]}
+        assert fuse_transformations(parser, table) is table
+        assert not parser('1+2').pick('num')
+
+
+def number_check(path: Path):
+    if not path[-1].content.isdigit():
+        path[0].new_error(path[-1], 'not a number')
+
+
+def fail_on_x7(path: Path):
+    if path[-1].content == 'x7':
+        raise ValueError('x7')
+
+
+class TestParallelTransformation:
+    table = {'__subtree_local__': True,
+             'record': [flatten, remove_tokens(',')],
+             'field': [reduce_single_child],
+             'value': [number_check, reduce_single_child],
+             'doc': [change_name('document')]}
+
+    def transform(self, tree, parallelization: str):
+        from DHParser.configuration import set_config_value, get_config_value
+        save = get_config_value('transformation_parallelization')
+        set_config_value('transformation_parallelization', parallelization)
+        try:
+            return transformer(copy.deepcopy(tree), self.table.copy())
+        finally:
+            set_config_value('transformation_parallelization', save)
+
+    def test_same_results(self):
+        records = ''.join(f'(record (:Series (field (value "{i}"))) (:Text ",") '
+                          f'(field (value "x{i}")))' for i in range(20))
+        tree = RootNode(parse_sxpr(f'(doc {records})').with_pos(0))
+        tree.new_error(tree.pick('value'), 'syntax error')
+        expected = self.transform(tree, 'off')
+        result = self.transform(tree, 'multicore')
+        assert result.equals(expected)
+        assert result.name == 'document'
+        assert not result.pick(':Text')
+        assert [str(e) for e in result.errors_sorted] == [str(e) for e in expected.errors_sorted]
+        assert len(result.errors) == 21
+        assert traverse_subtrees_in_parallel(copy.deepcopy(tree), self.table.copy())
+        node_ids = {id(nd) for nd in result.select_if(lambda nd: True, include_root=True)}
+        assert set(result.error_nodes.keys()) <= node_ids
+
+    def test_errors_of_removed_nodes(self):
+        records = ''.join(f'(record (:Series (field (value "{i}"))) (:Text ",") '
+                          f'(field (value "{i}")))' for i in range(20))
+        tree = RootNode(parse_sxpr(f'(doc {records})').with_pos(0))
+        tree.new_error(tree.pick(':Text'), 'bad token')
+        expected = self.transform(tree, 'off')
+        result = self.transform(tree, 'multicore')
+        assert result.equals(expected)
+        assert not result.pick(':Text')
+        assert [str(e) for e in result.errors_sorted] == [str(e) for e in expected.errors_sorted]
+        assert len(result.errors) == 1 and result.errors[0].message == 'bad token'
+
+    def test_errors_kept_on_failure(self):
+        records = ''.join(f'(record (:Series (field (value "{i}"))) (:Text ",") '
+                          f'(field (value "x{i}")))' for i in range(20))
+        tree = RootNode(parse_sxpr(f'(doc {records})').with_pos(0))
+        tree.new_error(tree.pick('value'), 'syntax error')
+        errors = [str(e) for e in tree.errors_sorted]
+        table = self.table.copy()
+        table['value'] = [fail_on_x7]
+        try:
+            traverse_subtrees_in_parallel(tree, table)
+            failed = False
+        except AssertionError as e:
+            failed = 'ValueError: x7' in str(e)
+        assert failed
+        assert [str(e) for e in tree.errors_sorted] == errors
+        assert id(tree.pick('value')) in tree.error_nodes
+
+
 class TestGlobalPreAndPost:
     def test_global_pre_post(self):
         def pre(p: Path):